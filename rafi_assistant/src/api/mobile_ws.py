@@ -25,6 +25,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Each partial transcript carries the whole reply so far, so they are
+# coalesced to at most one per interval while the reply streams
+PARTIAL_INTERVAL_SECONDS = 0.1
+
 # ── Token management ──────────────────────────────────────────────────────────
 
 _TOKEN_TTL = 3600  # 1 hour
@@ -195,14 +199,37 @@ async def _process_user_text(
     processor: Any,
     send_queue: asyncio.Queue,
 ) -> None:
-    """Run user text through MessageProcessor and reply with TTS."""
+    """Run user text through MessageProcessor and reply with TTS.
+
+    Partial assistant transcripts are pushed while the reply streams, at
+    most one per ``PARTIAL_INTERVAL_SECONDS``; the final transcript and TTS
+    audio follow once it is complete.
+    """
     if not text:
         return
 
     if processor:
         msg = ChannelMessage(channel="mobile", sender_id="mobile_user", text=text)
+        last_partial = 0.0
+
+        async def _on_partial(partial: str) -> None:
+            nonlocal last_partial
+            now = time.monotonic()
+            if now - last_partial < PARTIAL_INTERVAL_SECONDS:
+                return
+            last_partial = now
+            await send_queue.put(
+                {
+                    "type": "transcript",
+                    "text": partial,
+                    "role": "assistant",
+                    "is_final": False,
+                }
+            )
+
         try:
-            response = await processor.process(msg)
+            # Replies are spoken, so the reply rounds are on the voice path
+            response = await processor.process(msg, on_partial=_on_partial, voice=True)
         except Exception as exc:
             logger.error("MessageProcessor error: %s", exc)
             response = "Sorry, something went wrong processing your request."
@@ -8,27 +8,58 @@ channel (Telegram, WhatsApp, Slack, Discord) runs the same pipeline:
 
 Each channel adapter normalizes inbound messages into ChannelMessage,
 calls ``MessageProcessor.process()``, and sends the result back.
+
+The pre-LLM stages only depend on the user text (and, for storage and
+memory search, its embedding), so they run concurrently:
+
+  embed ---> store user message
+        `--> memory search
+  recent history fetch
+  ISC generation
+  feedback detection
+
+Independent tool calls from one LLM round run concurrently; tools
+registered with ``parallel=False`` run alone, in call order.
+
+With a PersistenceQueue, message storage and daily-log writes are queued
+(write-behind) instead of awaited, so the reply is not held up by them.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
 import logging
-from typing import Any, Optional
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
 from src.channels.base import ChannelMessage
 from src.config.loader import AppConfig
 from src.llm.provider import LLMProvider
+from src.llm.router import voice_request
 from src.security.sanitizer import detect_prompt_injection, sanitize_text, wrap_user_input
 from src.services.isc_service import ISCService
 from src.services.learning_service import LearningService
+from src.services.context_builder import ContextBuilder
 from src.services.memory_service import MemoryService
 from src.services.memory_files import MemoryFileService
+from src.services.persistence_queue import PersistenceQueue
 from src.tools.tool_registry import ToolRegistry
 
 logger = logging.getLogger(__name__)
 
 MAX_MESSAGE_LENGTH = 4096
+# Candidates fetched for context; the token budget decides how many are used
+RECENT_FETCH_LIMIT = 50
+MEMORY_FETCH_LIMIT = 8
+# Tool calls of one LLM round that may run at the same time
+MAX_PARALLEL_TOOLS = 4
+
+_T = TypeVar("_T")
+
+# Receives the reply text generated so far when streaming is requested
+PartialCallback = Callable[[str], Awaitable[None]]
 
 
 class MessageProcessor:
@@ -43,6 +74,7 @@ class MessageProcessor:
         memory_files: Optional[MemoryFileService] = None,
         isc_service: Optional[ISCService] = None,
         learning_service: Optional[LearningService] = None,
+        persistence: Optional[PersistenceQueue] = None,
     ) -> None:
         self._config = config
         self._llm = llm
@@ -51,8 +83,17 @@ class MessageProcessor:
         self._memory_files = memory_files
         self._isc = isc_service
         self._learning = learning_service
+        # Write-behind queue for messages and the daily log (inline writes if None)
+        self._persistence = persistence
         # Track last assistant response for feedback correlation
         self._last_response: str = ""
+        # Per-stage wall-clock timings (ms) of the most recent process() call
+        self._last_timings: dict[str, float] = {}
+
+    @property
+    def last_stage_timings(self) -> dict[str, float]:
+        """Per-stage timings in milliseconds for the last processed message."""
+        return dict(self._last_timings)
 
     def _build_system_prompt(self) -> str:
         """Build the system prompt from markdown memory files."""
@@ -86,14 +127,30 @@ class MessageProcessor:
 
         return base_prompt
 
-    async def process(self, message: ChannelMessage) -> str:
+    async def process(
+        self,
+        message: ChannelMessage,
+        on_partial: Optional[PartialCallback] = None,
+        *,
+        voice: bool = False,
+    ) -> str:
         """Process a normalized channel message through the LLM pipeline.
 
-        Pipeline: sanitize -> injection check -> store -> context -> ISC ->
-        LLM chat -> tools -> verify -> learn -> respond
+        Pipeline: sanitize -> injection check -> [store | context | ISC |
+        feedback] -> LLM chat -> tools -> verify -> respond
+
+        Per-stage timings of the concurrent section are available from
+        ``last_stage_timings`` afterwards.
 
         Args:
             message: Normalized ChannelMessage from any adapter.
+            on_partial: Optional coroutine called with the reply text
+                generated so far while the LLM streams. Each LLM round
+                starts a fresh partial; the returned string is always the
+                complete final reply and should replace whatever was shown.
+            voice: The reply will be spoken. Only the reply rounds run on
+                the LLM voice path (hedging, voice SLO routing); ISC,
+                feedback and learning calls do not.
 
         Returns:
             The LLM's text response to send back.
@@ -109,52 +166,30 @@ class MessageProcessor:
 
         source = f"{message.channel}_text"
 
-        # Check for feedback signals before processing as a new request
-        if self._learning and self._last_response:
-            await self._learning.detect_and_store_feedback(
-                user_message=text,
-                assistant_response=self._last_response,
-                source=source,
-            )
-
-        # Store user message
-        await self._memory.store_message("user", text, source)
-
-        if self._memory_files:
-            self._memory_files.append_to_daily_log("user", text)
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+        tools = self._tool_registry.get_openai_schemas()
 
-        # Build context
-        context_messages = await self._memory.get_context_messages(
-            query=text,
-            recent_limit=20,
-            memory_limit=5,
+        recent, memory_hits, criteria = await self._assemble_context(
+            text, source, tools, timings,
         )
 
-        messages: list[dict[str, Any]] = [
-            {"role": "system", "content": self._build_system_prompt()},
-        ]
+        await self._append_daily_log("user", text)
 
-        for msg in context_messages:
-            messages.append({
-                "role": msg.get("role", "user"),
-                "content": msg.get("content", ""),
-            })
-
-        messages.append({
-            "role": "user",
-            "content": wrap_user_input(text),
-        })
+        context_builder = ContextBuilder(self._context_token_budget())
+        messages = context_builder.build(
+            system_prompt=self._build_system_prompt(),
+            recent=recent,
+            memory_hits=memory_hits,
+            user_message={"role": "user", "content": wrap_user_input(text)},
+            tools=tools,
+        )
+        # Everything before the current user message is droppable history
+        history_end = len(messages) - 1
 
-        # ISC generation for actionable requests
-        tools = self._tool_registry.get_openai_schemas()
-        criteria: list[str] = []
-        if self._isc and tools:
-            should_isc = await self._isc.should_generate_isc(text, bool(tools))
-            if should_isc:
-                criteria = await self._isc.generate_criteria(
-                    user_message=text,
-                    tool_names=self._tool_registry.tool_names,
-                )
+        timings["context_total"] = _elapsed_ms(started)
+        self._last_timings = timings
+        logger.debug("Context assembly timings (ms): %s", timings)
 
         # LLM loop with tool calling
         max_tool_rounds = 5
@@ -162,8 +197,14 @@ class MessageProcessor:
         tool_results: list[dict[str, str]] = []
 
         for _ in range(max_tool_rounds):
+            # Tool results can push later rounds past the budget
+            messages, history_end = context_builder.fit(messages, history_end, tools)
             try:
-                response = await self._llm.chat(messages=messages, tools=tools)
+                with voice_request() if voice else contextlib.nullcontext():
+                    if on_partial is None:
+                        response = await self._llm.chat(messages=messages, tools=tools)
+                    else:
+                        response = await self._stream_chat(messages, tools, on_partial)
             except Exception as e:
                 logger.error("LLM chat error: %s", e)
                 return "I'm having trouble thinking right now, please try again in a moment."
@@ -175,9 +216,7 @@ class MessageProcessor:
                     # Verify ISC if we have criteria
                     content = await self._verify_and_append(content, criteria, tool_results)
 
-                    await self._memory.store_message("assistant", content, source)
-                    if self._memory_files:
-                        self._memory_files.append_to_daily_log("assistant", content)
+                    await self._store_reply(content, source)
                     self._last_response = content
                     return content
                 return "I'm not sure how to respond to that."
@@ -190,17 +229,18 @@ class MessageProcessor:
             }
             messages.append(assistant_msg)
 
+            calls: list[tuple[str, dict[str, Any]]] = []
             for tc in tool_calls:
                 func = tc.get("function", {})
-                tool_name = func.get("name", "")
                 try:
                     arguments = json.loads(func.get("arguments", "{}"))
                 except json.JSONDecodeError:
                     arguments = {}
+                calls.append((func.get("name", ""), arguments))
 
-                tool_result = await self._tool_registry.invoke(tool_name, **arguments)
+            outputs = await self._invoke_tools(calls)
+            for tc, (tool_name, _), tool_result in zip(tool_calls, calls, outputs):
                 tool_results.append({"tool": tool_name, "result": tool_result})
-
                 messages.append({
                     "role": "tool",
                     "tool_call_id": tc.get("id", ""),
@@ -213,12 +253,193 @@ class MessageProcessor:
         # Verify ISC if we have criteria
         final_content = await self._verify_and_append(final_content, criteria, tool_results)
 
-        await self._memory.store_message("assistant", final_content, source)
-        if self._memory_files:
-            self._memory_files.append_to_daily_log("assistant", final_content)
+        await self._store_reply(final_content, source)
         self._last_response = final_content
         return final_content
 
+    async def _invoke_tools(self, calls: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        """Run one round of tool calls, returning their results in call order.
+
+        Runs of parallel-safe calls execute concurrently, at most
+        MAX_PARALLEL_TOOLS at a time. A tool registered with
+        ``parallel=False`` waits for the calls before it and runs alone,
+        so side effects keep the order the model asked for.
+        """
+        results: list[str] = [""] * len(calls)
+        limit = asyncio.Semaphore(MAX_PARALLEL_TOOLS)
+
+        async def run(index: int) -> None:
+            name, arguments = calls[index]
+            async with limit:
+                results[index] = await self._tool_registry.invoke(name, **arguments)
+
+        batch: list[int] = []
+
+        async def flush() -> None:
+            if len(batch) == 1:
+                await run(batch[0])
+            elif batch:
+                async with asyncio.TaskGroup() as group:
+                    for index in batch:
+                        group.create_task(run(index))
+            batch.clear()
+
+        for index, (name, _) in enumerate(calls):
+            if self._tool_registry.is_parallel_safe(name):
+                batch.append(index)
+                continue
+            await flush()
+            await run(index)
+        await flush()
+        return results
+
+    async def _store_reply(self, content: str, source: str) -> None:
+        """Persist the assistant reply (deferred when a write-behind queue is set)."""
+        if self._persistence:
+            await self._persistence.enqueue_message("assistant", content, source)
+        else:
+            await self._memory.store_message("assistant", content, source)
+        await self._append_daily_log("assistant", content)
+
+    async def _append_daily_log(self, role: str, content: str) -> None:
+        if self._persistence:
+            await self._persistence.enqueue_daily_log(role, content)
+        elif self._memory_files:
+            self._memory_files.append_to_daily_log(role, content)
+
+    def _context_token_budget(self) -> int:
+        """Prompt token budget for the provider that will answer."""
+        budget = getattr(self._llm, "context_token_budget", None)
+        if isinstance(budget, int) and budget > 0:
+            return budget
+        return self._config.llm.context_token_budget
+
+    async def _stream_chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        on_partial: PartialCallback,
+    ) -> dict[str, Any]:
+        """Run one streamed LLM round, reporting partial text as it arrives.
+
+        Returns:
+            The assembled response dict, same shape as ``chat()``.
+        """
+        partial = ""
+        async for event in self._llm.chat_stream(messages=messages, tools=tools):
+            if event.get("type") == "done":
+                return event["response"]
+            if event.get("type") == "text" and event.get("text"):
+                partial += event["text"]
+                try:
+                    await on_partial(partial)
+                except Exception as e:
+                    # A failed progress update must not abort the reply
+                    logger.warning("Partial reply callback failed: %s", e)
+        raise RuntimeError("LLM stream ended without a final response")
+
+    async def _assemble_context(
+        self,
+        text: str,
+        source: str,
+        tools: list[dict[str, Any]],
+        timings: dict[str, float],
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[str]]:
+        """Run the independent pre-LLM stages concurrently.
+
+        The user message is embedded once and the vector is shared by the
+        storage insert and the memory search. Recent-history fetch, ISC
+        generation and feedback detection don't need it and start
+        immediately. A failing stage is logged and degrades to an empty
+        result rather than failing the turn.
+
+        Args:
+            text: Sanitized user text.
+            source: Message source tag for storage.
+            tools: OpenAI tool schemas offered this turn.
+            timings: Dict that receives per-stage timings in milliseconds.
+
+        Returns:
+            Tuple of (recent messages, memory hits, ISC criteria), with the
+            just-stored user message removed from both.
+        """
+        embed_task = asyncio.create_task(
+            _timed(timings, "embed", self._memory.embed_text(text))
+        )
+
+        async def store_user_message() -> Optional[dict[str, Any]]:
+            embedding = await embed_task
+            if self._persistence:
+                store = self._persistence.enqueue_message(
+                    "user", text, source, embedding=embedding,
+                )
+            else:
+                store = self._memory.store_message("user", text, source, embedding=embedding)
+            return await _timed(timings, "store", store)
+
+        async def search_memory() -> list[dict[str, Any]]:
+            embedding = await embed_task
+            return await _timed(
+                timings,
+                "memory_search",
+                self._memory.search_memory(
+                    text, limit=MEMORY_FETCH_LIMIT, query_embedding=embedding,
+                ),
+            )
+
+        async def generate_criteria() -> list[str]:
+            if not self._isc or not tools:
+                return []
+            if not await self._isc.should_generate_isc(text, bool(tools)):
+                return []
+            return await self._isc.generate_criteria(
+                user_message=text,
+                tool_names=self._tool_registry.tool_names,
+            )
+
+        async def detect_feedback() -> None:
+            # Check for feedback signals before processing as a new request
+            if self._learning and self._last_response:
+                await self._learning.detect_and_store_feedback(
+                    user_message=text,
+                    assistant_response=self._last_response,
+                    source=source,
+                )
+
+        stored, recent, memory_results, criteria, _ = await asyncio.gather(
+            store_user_message(),
+            _timed(
+                timings,
+                "recent_history",
+                self._memory.get_recent_messages(limit=RECENT_FETCH_LIMIT),
+            ),
+            search_memory(),
+            _timed(timings, "isc", generate_criteria()),
+            _timed(timings, "feedback", detect_feedback()),
+            return_exceptions=True,
+        )
+
+        if isinstance(stored, BaseException):
+            logger.error("Failed to store user message: %s", stored)
+            stored = None
+        if isinstance(recent, BaseException):
+            logger.warning("Recent history fetch failed: %s", recent)
+            recent = []
+        if isinstance(memory_results, BaseException):
+            logger.warning("Memory search failed: %s", memory_results)
+            memory_results = []
+        if isinstance(criteria, BaseException):
+            logger.warning("ISC generation failed: %s", criteria)
+            criteria = []
+
+        # The current turn is appended explicitly by the caller; whether the
+        # concurrent history fetch saw the new row is a race, so drop it.
+        stored_id = stored.get("id") if isinstance(stored, dict) else None
+        if stored_id is not None:
+            recent = [m for m in recent or [] if m.get("id") != stored_id]
+            memory_results = [m for m in memory_results or [] if m.get("id") != stored_id]
+        return recent or [], memory_results or [], criteria or []
+
     async def _verify_and_append(
         self,
         content: str,
@@ -234,3 +455,16 @@ class MessageProcessor:
         if summary:
             content += f"\n\n{summary}"
         return content
+
+
+async def _timed(timings: dict[str, float], stage: str, awaitable: Awaitable[_T]) -> _T:
+    """Await ``awaitable`` and record its duration under ``stage``."""
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[stage] = _elapsed_ms(started)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
@@ -9,6 +9,7 @@ from __future__ import annotations
 import logging
 import os
 import tempfile
+import time
 from typing import Any, Optional
 
 from telegram import Update
@@ -36,6 +37,48 @@ from src.voice.deepgram_stt import DeepgramSTT
 
 logger = logging.getLogger(__name__)
 
+# Telegram throttles message edits; one edit per second per chat stays clear
+STREAM_EDIT_INTERVAL_SECONDS = 1.0
+
+
+class _StreamingReply:
+    """Progressively edits a single reply message while the LLM streams.
+
+    The first partial is sent as a new reply; later partials edit it at most
+    once per ``STREAM_EDIT_INTERVAL_SECONDS``. ``finish`` always leaves the
+    complete final text on screen.
+    """
+
+    def __init__(self, message: Any) -> None:
+        self._message = message
+        self._reply: Any = None
+        self._shown = ""
+        self._last_edit = 0.0
+
+    async def update(self, text: str) -> None:
+        if self._reply is None:
+            self._reply = await self._message.reply_text(text)
+            self._shown = text
+            self._last_edit = time.monotonic()
+            return
+        if time.monotonic() - self._last_edit < STREAM_EDIT_INTERVAL_SECONDS:
+            return
+        await self._edit(text)
+
+    async def finish(self, text: str) -> None:
+        if self._reply is None:
+            await self._message.reply_text(text)
+        elif text != self._shown:
+            await self._edit(text)
+
+    async def _edit(self, text: str) -> None:
+        try:
+            await self._reply.edit_text(text)
+            self._shown = text
+        except Exception as e:
+            logger.debug("Telegram streaming edit skipped: %s", e)
+        self._last_edit = time.monotonic()
+
 
 class TelegramAdapter(ChannelAdapter):
     """Telegram channel adapter using python-telegram-bot polling."""
@@ -165,8 +208,9 @@ class TelegramAdapter(ChannelAdapter):
             raw=update,
         )
 
-        response = await self._processor.process(msg)
-        await update.message.reply_text(response)
+        reply = _StreamingReply(update.message)
+        response = await self._processor.process(msg, on_partial=reply.update)
+        await reply.finish(response)
 
     async def _handle_voice(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -212,8 +256,9 @@ class TelegramAdapter(ChannelAdapter):
                 raw=update,
             )
 
-            response = await self._processor.process(msg)
-            await update.message.reply_text(response)
+            reply = _StreamingReply(update.message)
+            response = await self._processor.process(msg, on_partial=reply.update)
+            await reply.finish(response)
 
         except Exception as e:
             logger.error("Voice message processing error: %s", e)
@@ -12,7 +12,7 @@ from pathlib import Path
 from typing import Optional
 
 import yaml
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +61,30 @@ class TwilioConfig(BaseModel):
         return v
 
 
+class HTTPPoolConfig(BaseModel):
+    """Keep-alive connection pool settings for one upstream API host."""
+
+    max_connections: int = Field(
+        default=10,
+        ge=1,
+        le=100,
+        description="Maximum concurrent connections to the host",
+    )
+    max_keepalive_connections: int = Field(
+        default=5,
+        ge=0,
+        le=100,
+        description="Idle connections kept open for reuse",
+    )
+    keepalive_expiry_seconds: float = Field(
+        default=60.0,
+        ge=0.0,
+        description="Seconds an idle connection is kept before closing",
+    )
+    http2: bool = Field(default=True, description="Use HTTP/2 when the h2 package is installed")
+    metrics: bool = Field(default=True, description="Track connection reuse for the dashboard")
+
+
 class ElevenLabsConfig(BaseModel):
     """ElevenLabs Conversational AI configuration."""
 
@@ -71,6 +95,7 @@ class ElevenLabsConfig(BaseModel):
         default="Professional, friendly, concise",
         description="Personality instructions for the agent",
     )
+    http_pool: HTTPPoolConfig = Field(default_factory=HTTPPoolConfig)
 
 
 class LLMConfig(BaseModel):
@@ -83,6 +108,115 @@ class LLMConfig(BaseModel):
         default="text-embedding-3-small",
         description="Embedding model identifier",
     )
+    embedding_cache_size: int = Field(
+        default=2048,
+        ge=0,
+        description="In-memory embedding cache entries (0 disables the cache)",
+    )
+    embedding_cache_path: str = Field(
+        default="",
+        description="Optional SQLite file for persisting cached embeddings",
+    )
+    response_cache_size: int = Field(
+        default=256,
+        ge=0,
+        description="Cached responses for repeatable auxiliary prompts (0 disables the cache)",
+    )
+    embedding_batch_window_ms: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=100.0,
+        description="Merge concurrent embed calls arriving within this window (0 disables)",
+    )
+    prompt_caching: bool = Field(
+        default=True,
+        description="Mark the system prompt and tools as cacheable (Anthropic)",
+    )
+    context_token_budget: int = Field(
+        default=16000,
+        ge=1000,
+        description="Prompt token budget for system prompt, tools and conversation context",
+    )
+    context_token_budgets: dict[str, int] = Field(
+        default_factory=dict,
+        description="Per-provider overrides of context_token_budget (e.g. {'groq': 6000})",
+    )
+    routing_mode: str = Field(
+        default="off",
+        description="Provider routing: off, adaptive (route by measured latency) or shadow (record only)",
+    )
+    router_min_samples: int = Field(
+        default=5,
+        ge=1,
+        description="Calls a provider needs before the router trusts its latency",
+    )
+    router_explore_every: int = Field(
+        default=20,
+        ge=2,
+        description="Every Nth routing decision tries a provider still short of samples",
+    )
+    router_switch_margin: float = Field(
+        default=0.2,
+        ge=0.0,
+        lt=1.0,
+        description="How much faster than the default a provider must be to take its traffic",
+    )
+    router_voice_slo_ms: float = Field(
+        default=2500.0,
+        gt=0.0,
+        description="p95 latency limit for providers answering the voice path",
+    )
+    hedging_enabled: bool = Field(
+        default=False,
+        description="Race a second provider when a voice-path request is slow",
+    )
+    hedge_percentile: float = Field(
+        default=0.95,
+        ge=0.5,
+        lt=1.0,
+        description="Latency percentile of the primary provider used as the hedge deadline",
+    )
+    hedge_min_delay_ms: float = Field(
+        default=250.0,
+        ge=0.0,
+        description="Shortest hedge deadline",
+    )
+    hedge_max_rate: float = Field(
+        default=0.1,
+        gt=0.0,
+        le=1.0,
+        description="Largest fraction of voice-path requests that may be hedged",
+    )
+    circuit_breaker_enabled: bool = Field(
+        default=True,
+        description="Skip failing providers and order fallbacks by recent health",
+    )
+    breaker_window_seconds: float = Field(
+        default=60.0,
+        gt=0.0,
+        description="Rolling window of call outcomes each breaker judges",
+    )
+    breaker_min_calls: int = Field(
+        default=4,
+        ge=1,
+        description="Calls in the window before a breaker may open",
+    )
+    breaker_error_rate: float = Field(
+        default=0.5,
+        gt=0.0,
+        le=1.0,
+        description="Error rate in the window that opens a breaker",
+    )
+    breaker_latency_ms: float = Field(
+        default=0.0,
+        ge=0.0,
+        description="p95 latency in the window that opens a breaker (0 disables)",
+    )
+    breaker_cooldown_seconds: float = Field(
+        default=30.0,
+        gt=0.0,
+        description="Time an open breaker waits before letting a probe request through",
+    )
     max_tokens: int = Field(default=4096, gt=0, description="Max tokens for LLM response")
     temperature: float = Field(default=0.7, ge=0.0, le=2.0, description="LLM temperature")
     groq_api_key: str = Field(default="", description="Groq API key")
@@ -97,6 +231,14 @@ class LLMConfig(BaseModel):
             raise ValueError(f"LLM provider must be one of: {allowed}")
         return v.lower()
 
+    @field_validator("routing_mode")
+    @classmethod
+    def validate_routing_mode(cls, v: str) -> str:
+        allowed = {"off", "adaptive", "shadow"}
+        if v.lower() not in allowed:
+            raise ValueError(f"LLM routing_mode must be one of: {allowed}")
+        return v.lower()
+
 
 class GoogleConfig(BaseModel):
     """Google API OAuth configuration."""
@@ -104,6 +246,34 @@ class GoogleConfig(BaseModel):
     client_id: str = Field(..., min_length=2, description="Google OAuth client ID")
     client_secret: str = Field(..., min_length=2, description="Google OAuth client secret")
     refresh_token: str = Field(default="", description="Google OAuth refresh token (populated after OAuth)")
+    api_max_workers: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Worker threads shared by blocking Google API calls",
+    )
+    api_timeout_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="Per-call timeout for Google API requests",
+    )
+    calendar_store_path: str = Field(
+        default="",
+        description="File for the local calendar copy and sync token (default: data/calendar_store.json)",
+    )
+    mailbox_cache_enabled: bool = Field(
+        default=False,
+        description=(
+            "Mirror recent Gmail into the email_cache table and serve reads from it "
+            "(requires the email_cache and sync_state tables from migrations.sql)"
+        ),
+    )
+    mailbox_sync_minutes: int = Field(
+        default=5,
+        ge=1,
+        le=60,
+        description="Minutes between Gmail history syncs of the mailbox cache",
+    )
 
 
 class SupabaseConfig(BaseModel):
@@ -112,6 +282,46 @@ class SupabaseConfig(BaseModel):
     url: str = Field(..., min_length=5, description="Supabase project URL")
     anon_key: str = Field(..., min_length=2, description="Supabase anonymous key")
     service_role_key: str = Field(..., min_length=2, description="Supabase service role key")
+    backend: str = Field(
+        default="rest",
+        description="Database backend: 'rest' (PostgREST) or 'asyncpg' (direct Postgres pool)",
+    )
+    database_url: str = Field(
+        default="",
+        description="Postgres connection string for the asyncpg backend",
+    )
+    pool_min_size: int = Field(default=1, ge=0, le=50, description="asyncpg pool minimum size")
+    pool_max_size: int = Field(default=5, ge=1, le=50, description="asyncpg pool maximum size")
+    statement_cache_size: int = Field(
+        default=100,
+        ge=0,
+        description="Prepared statements cached per connection (0 for transaction-mode poolers)",
+    )
+    command_timeout_seconds: float = Field(
+        default=30.0,
+        gt=0,
+        description="Per-query timeout for the asyncpg backend",
+    )
+    write_behind: bool = Field(
+        default=True,
+        description="Queue message and daily-log writes instead of awaiting them per turn",
+    )
+    write_queue_size: int = Field(
+        default=1000,
+        ge=1,
+        description="Write-behind queue capacity (producers wait when it is full)",
+    )
+    write_batch_size: int = Field(
+        default=50,
+        ge=1,
+        le=500,
+        description="Messages embedded and inserted per write-behind batch",
+    )
+    write_flush_interval_ms: float = Field(
+        default=250.0,
+        ge=0.0,
+        description="How long the writer waits to fill a batch",
+    )
 
     @field_validator("url")
     @classmethod
@@ -120,6 +330,22 @@ class SupabaseConfig(BaseModel):
             raise ValueError("Supabase URL must start with 'https://'")
         return v
 
+    @field_validator("backend")
+    @classmethod
+    def validate_backend(cls, v: str) -> str:
+        allowed = {"rest", "asyncpg"}
+        if v.lower() not in allowed:
+            raise ValueError(f"Supabase backend must be one of: {allowed}")
+        return v.lower()
+
+    @model_validator(mode="after")
+    def validate_database_url(self) -> "SupabaseConfig":
+        if self.backend == "asyncpg" and not self.database_url:
+            raise ValueError("database_url is required for the asyncpg backend")
+        if self.pool_min_size > self.pool_max_size:
+            raise ValueError("pool_min_size cannot exceed pool_max_size")
+        return self
+
 
 class DeepgramConfig(BaseModel):
     """Deepgram STT configuration."""
@@ -127,6 +353,7 @@ class DeepgramConfig(BaseModel):
     api_key: str = Field(..., min_length=2, description="Deepgram API key")
     model: str = Field(default="nova-2", description="Deepgram model")
     language: str = Field(default="en-US", description="Language code")
+    http_pool: HTTPPoolConfig = Field(default_factory=HTTPPoolConfig)
 
 
 class WeatherConfig(BaseModel):
@@ -187,6 +414,83 @@ class SettingsConfig(BaseModel):
         return v
 
 
+class MemoryConfig(BaseModel):
+    """Conversation memory tiering and search configuration."""
+
+    archive_enabled: bool = Field(
+        default=False,
+        description="Roll old messages into summaries and move them to message_archive",
+    )
+    archive_after_days: int = Field(
+        default=30,
+        ge=1,
+        description="Messages older than this many days leave the hot messages table",
+    )
+    archive_max_days_per_run: int = Field(
+        default=7,
+        ge=1,
+        description="Days summarized per archive run (bounds LLM calls)",
+    )
+    archive_max_topics: int = Field(
+        default=5,
+        ge=1,
+        le=20,
+        description="Maximum summary rows per archived day",
+    )
+    archive_hour: int = Field(default=3, ge=0, le=23, description="Hour of the daily archive run")
+    search_mode: str = Field(
+        default="hybrid",
+        description=(
+            "Memory search: 'hybrid' (weighted cosine + ts_rank) or 'rrf' "
+            "(reciprocal-rank fusion of vector and full-text top-k)"
+        ),
+    )
+    search_vector_candidates: int = Field(
+        default=40,
+        ge=1,
+        le=1000,
+        description="RRF mode: nearest neighbours taken from the HNSW index",
+    )
+    search_text_candidates: int = Field(
+        default=40,
+        ge=1,
+        le=1000,
+        description="RRF mode: full-text matches taken from the GIN index",
+    )
+    search_rrf_k: int = Field(
+        default=60,
+        ge=1,
+        description="RRF rank constant; larger values flatten the rank weighting",
+    )
+    local_index: str = Field(
+        default="off",
+        description=(
+            "Local vector index for memory search: 'off', 'fallback' (when the "
+            "search RPC fails) or 'primary' (serve search in-process)"
+        ),
+    )
+    local_index_dir: str = Field(
+        default="",
+        description="Directory for the local vector index (default: data/vector_index)",
+    )
+
+    @field_validator("search_mode")
+    @classmethod
+    def validate_search_mode(cls, v: str) -> str:
+        allowed = {"hybrid", "rrf"}
+        if v.lower() not in allowed:
+            raise ValueError(f"memory.search_mode must be one of: {allowed}")
+        return v.lower()
+
+    @field_validator("local_index")
+    @classmethod
+    def validate_local_index(cls, v: str) -> str:
+        allowed = {"off", "fallback", "primary"}
+        if v.lower() not in allowed:
+            raise ValueError(f"memory.local_index must be one of: {allowed}")
+        return v.lower()
+
+
 class AppConfig(BaseModel):
     """Root application configuration combining all sections."""
 
@@ -200,6 +504,7 @@ class AppConfig(BaseModel):
     deepgram: DeepgramConfig
     weather: WeatherConfig
     settings: SettingsConfig = Field(default_factory=SettingsConfig)
+    memory: MemoryConfig = Field(default_factory=MemoryConfig)
 
 
 # Mapping of environment variable names to (yaml_section, yaml_key) paths.
@@ -218,6 +523,7 @@ _ENV_OVERRIDES: dict[str, tuple[str, str]] = {
     "SUPABASE_URL": ("supabase", "url"),
     "SUPABASE_ANON_KEY": ("supabase", "anon_key"),
     "SUPABASE_SERVICE_ROLE_KEY": ("supabase", "service_role_key"),
+    "SUPABASE_DB_URL": ("supabase", "database_url"),
     "DEEPGRAM_API_KEY": ("deepgram", "api_key"),
     "WEATHER_API_KEY": ("weather", "api_key"),
     "GROQ_API_KEY": ("llm", "groq_api_key"),
@@ -19,9 +19,13 @@ CREATE TABLE IF NOT EXISTS messages (
     embedding vector(1536),
     source TEXT NOT NULL DEFAULT 'telegram_text'
         CHECK (source IN ('telegram_text', 'telegram_voice', 'twilio_call', 'desktop_text', 'desktop_voice', 'system')),
+    token_count INTEGER,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Token count of content, computed once at insert for context budgeting
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS token_count INTEGER;
+
 CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages (created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_messages_role ON messages (role);
 CREATE INDEX IF NOT EXISTS idx_messages_source ON messages (source);
@@ -30,6 +34,13 @@ CREATE INDEX IF NOT EXISTS idx_messages_source ON messages (source);
 CREATE INDEX IF NOT EXISTS idx_messages_content_fts
     ON messages USING gin (to_tsvector('english', content));
 
+-- Stored tsvector so full-text ranking does not re-parse content per row
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS content_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', content)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_messages_content_tsv
+    ON messages USING gin (content_tsv);
+
 -- HNSW index for fast cosine similarity search on embeddings
 CREATE INDEX IF NOT EXISTS idx_messages_embedding
     ON messages USING hnsw (embedding vector_cosine_ops);
@@ -152,6 +163,89 @@ CREATE INDEX IF NOT EXISTS idx_feedback_created_at ON feedback (created_at DESC)
 CREATE INDEX IF NOT EXISTS idx_feedback_signal_type ON feedback (signal_type);
 CREATE INDEX IF NOT EXISTS idx_feedback_sentiment ON feedback (sentiment);
 
+-- =============================================================================
+-- Table: memory_summaries
+-- Rolled-up summaries of archived conversation, one row per day and topic.
+-- Searched before the archive; each row covers the messages archived from
+-- [first_message_at, last_message_at].
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS memory_summaries (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    day DATE NOT NULL,
+    topic TEXT NOT NULL,
+    content TEXT NOT NULL,
+    embedding vector(1536),
+    message_count INTEGER NOT NULL DEFAULT 0,
+    first_message_at TIMESTAMPTZ NOT NULL,
+    last_message_at TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_memory_summaries_day ON memory_summaries (day DESC);
+CREATE INDEX IF NOT EXISTS idx_memory_summaries_embedding
+    ON memory_summaries USING hnsw (embedding vector_cosine_ops);
+
+-- =============================================================================
+-- Table: message_archive
+-- Cold tier for messages older than the retention window. Same columns as
+-- messages, without the HNSW index: it is only searched within the time
+-- range of a matching summary.
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS message_archive (
+    id UUID PRIMARY KEY,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    embedding vector(1536),
+    source TEXT NOT NULL,
+    token_count INTEGER,
+    created_at TIMESTAMPTZ NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_message_archive_created_at ON message_archive (created_at);
+
+-- =============================================================================
+-- Table: email_cache
+-- Local copy of recent Gmail messages (sanitized), kept current from the
+-- Gmail history API. Reads, unread counts and simple searches use it.
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS email_cache (
+    id TEXT PRIMARY KEY,
+    thread_id TEXT DEFAULT '',
+    sender TEXT DEFAULT '',
+    recipient TEXT DEFAULT '',
+    subject TEXT DEFAULT '',
+    date_header TEXT DEFAULT '',
+    snippet TEXT DEFAULT '',
+    body TEXT DEFAULT '',
+    labels TEXT[] NOT NULL DEFAULT '{}',
+    is_unread BOOLEAN NOT NULL DEFAULT FALSE,
+    internal_date TIMESTAMPTZ,
+    synced_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    search_tsv tsvector GENERATED ALWAYS AS (
+        to_tsvector(
+            'english',
+            coalesce(subject, '') || ' ' || coalesce(sender, '') || ' '
+                || coalesce(snippet, '') || ' ' || coalesce(body, '')
+        )
+    ) STORED
+);
+
+CREATE INDEX IF NOT EXISTS idx_email_cache_internal_date ON email_cache (internal_date DESC);
+CREATE INDEX IF NOT EXISTS idx_email_cache_unread ON email_cache (internal_date DESC) WHERE is_unread;
+CREATE INDEX IF NOT EXISTS idx_email_cache_search_tsv ON email_cache USING gin (search_tsv);
+CREATE INDEX IF NOT EXISTS idx_email_cache_synced_at ON email_cache (synced_at);
+
+-- =============================================================================
+-- Table: sync_state
+-- Incremental sync cursors for external sources (e.g. the Gmail historyId).
+-- =============================================================================
+CREATE TABLE IF NOT EXISTS sync_state (
+    source TEXT PRIMARY KEY,
+    cursor TEXT NOT NULL,
+    synced_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- =============================================================================
 -- RPC Function: match_messages
 -- Performs cosine similarity search on message embeddings via pgvector.
@@ -234,6 +328,185 @@ BEGIN
 END;
 $$;
 
+-- =============================================================================
+-- RPC Function: match_memory_summaries
+-- Cosine similarity search over rolled-up summaries.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION match_memory_summaries(
+    query_embedding vector(1536),
+    match_count INT DEFAULT 5,
+    match_threshold FLOAT DEFAULT 0.35
+)
+RETURNS TABLE (
+    id UUID,
+    day DATE,
+    topic TEXT,
+    content TEXT,
+    message_count INTEGER,
+    first_message_at TIMESTAMPTZ,
+    last_message_at TIMESTAMPTZ,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        s.id,
+        s.day,
+        s.topic,
+        s.content,
+        s.message_count,
+        s.first_message_at,
+        s.last_message_at,
+        (1 - (s.embedding <=> query_embedding))::double precision AS similarity
+    FROM memory_summaries s
+    WHERE s.embedding IS NOT NULL
+        AND 1 - (s.embedding <=> query_embedding) > match_threshold
+    ORDER BY s.embedding <=> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+-- =============================================================================
+-- RPC Function: archive_messages
+-- Moves messages to message_archive in one statement, so a row is never in
+-- both tables or in neither. Returns one row with the number of rows moved.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION archive_messages(message_ids UUID[])
+RETURNS TABLE (moved INTEGER)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    WITH deleted AS (
+        DELETE FROM messages m
+        WHERE m.id = ANY(message_ids)
+        RETURNING m.id, m.role, m.content, m.embedding, m.source, m.token_count, m.created_at
+    )
+    INSERT INTO message_archive (id, role, content, embedding, source, token_count, created_at)
+    SELECT * FROM deleted
+    ON CONFLICT (id) DO NOTHING;
+    GET DIAGNOSTICS moved = ROW_COUNT;
+    RETURN NEXT;
+END;
+$$;
+
+-- =============================================================================
+-- RPC Function: match_archived_messages
+-- Drill-down search of archived messages within one summary's time range.
+-- The range is small, so an exact scan is used instead of an index.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION match_archived_messages(
+    query_embedding vector(1536),
+    range_start TIMESTAMPTZ,
+    range_end TIMESTAMPTZ,
+    match_count INT DEFAULT 5
+)
+RETURNS TABLE (
+    id UUID,
+    role TEXT,
+    content TEXT,
+    source TEXT,
+    created_at TIMESTAMPTZ,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        a.id,
+        a.role,
+        a.content,
+        a.source,
+        a.created_at,
+        (1 - (a.embedding <=> query_embedding))::double precision AS similarity
+    FROM message_archive a
+    WHERE a.created_at BETWEEN range_start AND range_end
+        AND a.embedding IS NOT NULL
+    ORDER BY a.embedding <=> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+-- =============================================================================
+-- RPC Function: rrf_search_messages
+-- Hybrid retrieval by reciprocal-rank fusion. Takes the top vector_count
+-- messages from the HNSW index and the top text_count from the content_tsv
+-- GIN index separately, then scores each message as the sum of
+-- 1 / (rrf_k + rank) over the lists it appears in. Unlike
+-- hybrid_search_messages, no score is computed for the whole table.
+-- =============================================================================
+CREATE OR REPLACE FUNCTION rrf_search_messages(
+    query_embedding vector(1536),
+    query_text TEXT,
+    match_count INT DEFAULT 5,
+    vector_count INT DEFAULT 40,
+    text_count INT DEFAULT 40,
+    rrf_k INT DEFAULT 60
+)
+RETURNS TABLE (
+    id UUID,
+    role TEXT,
+    content TEXT,
+    source TEXT,
+    created_at TIMESTAMPTZ,
+    similarity FLOAT,
+    rank FLOAT,
+    rrf_score FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- HNSW returns at most ef_search rows; widen it for large candidate sets
+    PERFORM set_config('hnsw.ef_search', GREATEST(vector_count, 40)::text, true);
+
+    RETURN QUERY
+    WITH vector_hits AS (
+        SELECT v.hit_id, ROW_NUMBER() OVER (ORDER BY v.distance) AS pos
+        FROM (
+            SELECT m.id AS hit_id, m.embedding <=> query_embedding AS distance
+            FROM messages m
+            WHERE m.embedding IS NOT NULL
+            ORDER BY m.embedding <=> query_embedding
+            LIMIT vector_count
+        ) v
+    ),
+    text_hits AS (
+        SELECT t.hit_id, t.text_rank, ROW_NUMBER() OVER (ORDER BY t.text_rank DESC) AS pos
+        FROM (
+            SELECT m.id AS hit_id, ts_rank_cd(m.content_tsv, q.query) AS text_rank
+            FROM messages m, websearch_to_tsquery('english', query_text) AS q(query)
+            WHERE m.content_tsv @@ q.query
+            ORDER BY ts_rank_cd(m.content_tsv, q.query) DESC
+            LIMIT text_count
+        ) t
+    ),
+    fused AS (
+        SELECT
+            COALESCE(vh.hit_id, th.hit_id) AS hit_id,
+            COALESCE(1.0 / (rrf_k + vh.pos), 0) + COALESCE(1.0 / (rrf_k + th.pos), 0) AS score,
+            COALESCE(th.text_rank, 0) AS text_rank
+        FROM vector_hits vh
+        FULL OUTER JOIN text_hits th ON vh.hit_id = th.hit_id
+    )
+    SELECT
+        m.id,
+        m.role,
+        m.content,
+        m.source,
+        m.created_at,
+        -- Text-only hits may have no embedding (the embed failed on store)
+        COALESCE(1 - (m.embedding <=> query_embedding), 0)::double precision AS similarity,
+        f.text_rank::double precision AS rank,
+        f.score::double precision AS rrf_score
+    FROM fused f
+    JOIN messages m ON m.id = f.hit_id
+    ORDER BY f.score DESC, m.created_at DESC
+    LIMIT match_count;
+END;
+$$;
+
 -- =============================================================================
 -- Trigger: Auto-update updated_at timestamps
 -- =============================================================================
@@ -296,3 +569,15 @@ CREATE POLICY service_role_all_events_cache ON events_cache
 ALTER TABLE feedback ENABLE ROW LEVEL SECURITY;
 CREATE POLICY service_role_all_feedback ON feedback
     FOR ALL USING (auth.role() = 'service_role');
+ALTER TABLE memory_summaries ENABLE ROW LEVEL SECURITY;
+CREATE POLICY service_role_all_memory_summaries ON memory_summaries
+    FOR ALL USING (auth.role() = 'service_role');
+ALTER TABLE message_archive ENABLE ROW LEVEL SECURITY;
+CREATE POLICY service_role_all_message_archive ON message_archive
+    FOR ALL USING (auth.role() = 'service_role');
+ALTER TABLE email_cache ENABLE ROW LEVEL SECURITY;
+CREATE POLICY service_role_all_email_cache ON email_cache
+    FOR ALL USING (auth.role() = 'service_role');
+ALTER TABLE sync_state ENABLE ROW LEVEL SECURITY;
+CREATE POLICY service_role_all_sync_state ON sync_state
+    FOR ALL USING (auth.role() = 'service_role');
@@ -0,0 +1,442 @@
+"""Direct Postgres backend for SupabaseClient over an asyncpg pool.
+
+The REST backend sends every call through PostgREST: an HTTP round-trip,
+JSON-encoded 1536-float embeddings and no prepared statements. PostgresClient
+keeps the same helper API but talks to Postgres over pooled asyncpg
+connections, with pgvector values in binary form and the hot search RPCs
+issued as fixed, prepared statements.
+
+Enable it with ``supabase.backend: asyncpg`` and a ``database_url``. Use a
+direct or session-mode pooler connection; transaction-mode poolers do not
+keep prepared statements, so set ``statement_cache_size: 0`` behind one.
+
+Rows come back in the same JSON-compatible shape PostgREST returns (UUIDs
+and timestamps as ISO strings), so services work unchanged on either
+backend. The REST client is still initialized for the few callers that use
+the PostgREST query builder directly through ``.client``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import struct
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from src.config.loader import SupabaseConfig
+from src.db.supabase_client import (
+    SEARCH_CONFIG,
+    SupabaseClient,
+    is_or_key,
+    order_columns,
+    split_filter_key,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import asyncpg
+except ImportError:  # Only needed when supabase.backend is "asyncpg"
+    asyncpg = None  # type: ignore[assignment]
+
+# pgvector binary format: uint16 dimensions, uint16 unused, then float4 values
+_VECTOR_HEADER = struct.Struct("!HH")
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_COMPARISONS = {
+    "eq": "=",
+    "neq": "<>",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+    "like": "LIKE",
+    "ilike": "ILIKE",
+}
+
+# Hot-path RPCs with fixed SQL text, so each connection prepares them once.
+# Values are (sql, parameter names in order, defaults).
+_PREPARED_RPCS: dict[str, tuple[str, tuple[str, ...], dict[str, Any]]] = {
+    "match_messages": (
+        "SELECT * FROM match_messages($1, $2, $3)",
+        ("query_embedding", "match_count", "match_threshold"),
+        {"match_count": 5, "match_threshold": 0.7},
+    ),
+    "hybrid_search_messages": (
+        "SELECT * FROM hybrid_search_messages($1, $2, $3, $4)",
+        ("query_embedding", "query_text", "match_count", "match_threshold"),
+        {"match_count": 5, "match_threshold": 0.5},
+    ),
+    "rrf_search_messages": (
+        "SELECT * FROM rrf_search_messages($1, $2, $3, $4, $5, $6)",
+        (
+            "query_embedding",
+            "query_text",
+            "match_count",
+            "vector_count",
+            "text_count",
+            "rrf_k",
+        ),
+        {"match_count": 5, "vector_count": 40, "text_count": 40, "rrf_k": 60},
+    ),
+}
+
+
+def encode_vector(value: Any) -> bytes:
+    """Encode a sequence of floats (or a "[...]" string) as a binary pgvector."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    values = [float(v) for v in value]
+    return _VECTOR_HEADER.pack(len(values), 0) + struct.pack(f"!{len(values)}f", *values)
+
+
+def decode_vector(data: bytes) -> list[float]:
+    """Decode a binary pgvector into a list of floats."""
+    dim, _ = _VECTOR_HEADER.unpack_from(data)
+    return list(struct.unpack_from(f"!{dim}f", data, _VECTOR_HEADER.size))
+
+
+def _encode_timestamp(value: Any) -> str:
+    return value.isoformat() if isinstance(value, (datetime, date)) else str(value)
+
+
+def _decode_timestamp(text: str) -> str:
+    """Render Postgres timestamp text the way PostgREST does (ISO 8601)."""
+    try:
+        return datetime.fromisoformat(text).isoformat()
+    except ValueError:
+        return text  # infinity / -infinity
+
+
+def _quote(name: str) -> str:
+    """Quote a table or column name, rejecting anything that is not a plain identifier."""
+    name = name.strip()
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return f'"{name}"'
+
+
+def _column_list(columns: str) -> str:
+    if columns.strip() == "*":
+        return "*"
+    return ", ".join(_quote(c) for c in columns.split(","))
+
+
+def _condition(key: str, value: Any, args: list[Any]) -> str:
+    """Translate one filter entry into SQL, appending parameters to ``args``."""
+    if is_or_key(key):
+        if not value:
+            raise ValueError("OR filter needs at least one group")
+        groups = [" AND ".join(_condition(k, v, args) for k, v in group.items()) for group in value]
+        return "(" + " OR ".join(f"({group})" for group in groups) + ")"
+    column, op = split_filter_key(key)
+    column = _quote(column)
+    if op in ("in", "not_in"):
+        args.append(list(value))
+        clause = f"{column} = ANY(${len(args)})"
+        return f"NOT ({clause})" if op == "not_in" else clause
+    if op == "isnull" or (value is None and op in ("eq", "neq")):
+        negate = not value if op == "isnull" else op == "neq"
+        return f"{column} IS {'NOT ' if negate else ''}NULL"
+    args.append(value)
+    if op == "search":
+        return f"{column} @@ websearch_to_tsquery('{SEARCH_CONFIG}', ${len(args)})"
+    return f"{column} {_COMPARISONS[op]} ${len(args)}"
+
+
+def _where(filters: Optional[dict[str, Any]], args: list[Any]) -> str:
+    """Translate ``column__op`` filters into a WHERE clause, appending to ``args``."""
+    if not filters:
+        return ""
+    return " WHERE " + " AND ".join(_condition(k, v, args) for k, v in filters.items())
+
+
+def _order_by(order_by: str, order_desc: bool) -> str:
+    direction = "DESC" if order_desc else "ASC"
+    return " ORDER BY " + ", ".join(
+        f"{_quote(column)} {direction}" for column in order_columns(order_by)
+    )
+
+
+def _row(record: Any) -> dict[str, Any]:
+    """Convert an asyncpg record to a PostgREST-style dict."""
+    return {
+        key: float(value) if isinstance(value, Decimal) else value
+        for key, value in dict(record).items()
+    }
+
+
+def _values_sql(rows: list[dict[str, Any]], columns: list[str], args: list[Any]) -> str:
+    """Build a multi-row VALUES list; keys missing from a row use the column DEFAULT."""
+    tuples = []
+    for row in rows:
+        items = []
+        for column in columns:
+            if column in row:
+                args.append(row[column])
+                items.append(f"${len(args)}")
+            else:
+                items.append("DEFAULT")
+        tuples.append(f"({', '.join(items)})")
+    return ", ".join(tuples)
+
+
+def _insert_sql(
+    table: str,
+    rows: list[dict[str, Any]],
+    args: list[Any],
+    on_conflict: Optional[str] = None,
+) -> str:
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    sql = (
+        f"INSERT INTO {_quote(table)} ({', '.join(_quote(c) for c in columns)}) "
+        f"VALUES {_values_sql(rows, columns, args)}"
+    )
+    if on_conflict is not None:
+        conflict = [c.strip() for c in on_conflict.split(",")]
+        updates = [c for c in columns if c not in conflict]
+        target = ", ".join(_quote(c) for c in conflict)
+        if updates:
+            assignments = ", ".join(f"{_quote(c)} = EXCLUDED.{_quote(c)}" for c in updates)
+            sql += f" ON CONFLICT ({target}) DO UPDATE SET {assignments}"
+        else:
+            sql += f" ON CONFLICT ({target}) DO NOTHING"
+    return sql + " RETURNING *"
+
+
+class PostgresClient(SupabaseClient):
+    """SupabaseClient backed by a direct asyncpg connection pool."""
+
+    def __init__(self, config: SupabaseConfig) -> None:
+        super().__init__(config)
+        self._pool: Any = None
+        if asyncpg is not None:
+            self._ROW_ERRORS = (asyncpg.PostgresError,)
+
+    async def initialize(self) -> None:
+        """Create the asyncpg pool (and the REST client for builder callers).
+
+        Raises:
+            ConnectionError: If the pool cannot be created.
+        """
+        if asyncpg is None:
+            raise ConnectionError(
+                "supabase.backend is 'asyncpg' but the asyncpg package is not installed"
+            )
+        await super().initialize()
+        try:
+            self._pool = await asyncpg.create_pool(
+                self._config.database_url,
+                min_size=self._config.pool_min_size,
+                max_size=self._config.pool_max_size,
+                statement_cache_size=self._config.statement_cache_size,
+                command_timeout=self._config.command_timeout_seconds,
+                init=self._init_connection,
+            )
+            logger.info(
+                "Postgres pool initialized (min=%d, max=%d)",
+                self._config.pool_min_size,
+                self._config.pool_max_size,
+            )
+        except Exception as e:
+            logger.critical("Failed to create Postgres pool: %s", e)
+            raise ConnectionError(f"Postgres connection failed: {e}") from e
+
+    @staticmethod
+    async def _init_connection(conn: Any) -> None:
+        """Register codecs that make rows match PostgREST's JSON shapes."""
+        for typename in ("timestamptz", "timestamp"):
+            await conn.set_type_codec(
+                typename,
+                schema="pg_catalog",
+                encoder=_encode_timestamp,
+                decoder=_decode_timestamp,
+                format="text",
+            )
+        for typename in ("uuid", "date"):
+            await conn.set_type_codec(
+                typename, schema="pg_catalog", encoder=str, decoder=str, format="text"
+            )
+        for typename in ("json", "jsonb"):
+            await conn.set_type_codec(
+                typename, schema="pg_catalog", encoder=json.dumps, decoder=json.loads, format="text"
+            )
+
+        # pgvector may live in "public" or Supabase's "extensions" schema
+        schema = await conn.fetchval(
+            "SELECT n.nspname FROM pg_type t JOIN pg_namespace n ON n.oid = t.typnamespace "
+            "WHERE t.typname = 'vector'"
+        )
+        if schema:
+            await conn.set_type_codec(
+                "vector",
+                schema=schema,
+                encoder=encode_vector,
+                decoder=decode_vector,
+                format="binary",
+            )
+        else:
+            logger.warning("pgvector type not found; embeddings will not be encoded")
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await pool.close()
+            logger.debug("Postgres pool closed")
+
+    @property
+    def pool(self) -> Any:
+        if self._pool is None:
+            raise RuntimeError("Postgres pool not initialized. Call initialize() first.")
+        return self._pool
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of pool metrics for the dashboard."""
+        if self._pool is None:
+            return {"backend": "asyncpg", "size": 0, "idle": 0}
+        return {
+            "backend": "asyncpg",
+            "size": self._pool.get_size(),
+            "idle": self._pool.get_idle_size(),
+            "max_size": self._pool.get_max_size(),
+        }
+
+    async def _fetch(self, sql: str, args: list[Any]) -> list[dict[str, Any]]:
+        return [_row(record) for record in await self.pool.fetch(sql, *args)]
+
+    async def insert(
+        self,
+        table: str,
+        data: dict[str, Any],
+    ) -> Optional[dict[str, Any]]:
+        try:
+            args: list[Any] = []
+            rows = await self._fetch(_insert_sql(table, [data], args), args)
+            if rows:
+                logger.debug("Inserted row into '%s': %s", table, rows[0].get("id", "N/A"))
+                return rows[0]
+            logger.warning("Insert into '%s' returned no data", table)
+            return None
+        except Exception as e:
+            logger.error("Failed to insert into '%s': %s", table, e)
+            return None
+
+    async def select(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        order_desc: bool = True,
+        limit: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        try:
+            return await self._select_rows(table, columns, filters, order_by, order_desc, limit)
+        except Exception as e:
+            logger.error("Failed to select from '%s': %s", table, e)
+            return []
+
+    async def _select_rows(
+        self,
+        table: str,
+        columns: str,
+        filters: Optional[dict[str, Any]],
+        order_by: Optional[str],
+        order_desc: bool,
+        limit: Optional[int],
+    ) -> list[dict[str, Any]]:
+        args: list[Any] = []
+        sql = f"SELECT {_column_list(columns)} FROM {_quote(table)}{_where(filters, args)}"
+        if order_by:
+            sql += _order_by(order_by, order_desc)
+        if limit is not None:
+            args.append(limit)
+            sql += f" LIMIT ${len(args)}"
+        return await self._fetch(sql, args)
+
+    async def update(
+        self,
+        table: str,
+        filters: dict[str, Any],
+        data: dict[str, Any],
+    ) -> Optional[dict[str, Any]]:
+        try:
+            args: list[Any] = list(data.values())
+            assignments = ", ".join(f"{_quote(c)} = ${i}" for i, c in enumerate(data, 1))
+            sql = (
+                f"UPDATE {_quote(table)} SET {assignments}"
+                f"{_where(filters, args)} RETURNING *"
+            )
+            rows = await self._fetch(sql, args)
+            if rows:
+                logger.debug("Updated row(s) in '%s'", table)
+                return rows[0]
+            logger.warning("Update in '%s' matched no rows", table)
+            return None
+        except Exception as e:
+            logger.error("Failed to update '%s': %s", table, e)
+            return None
+
+    async def delete(
+        self,
+        table: str,
+        filters: dict[str, Any],
+    ) -> bool:
+        try:
+            if not filters:
+                # PostgREST refuses unfiltered deletes; keep that safety net
+                raise ValueError("delete requires at least one filter")
+            args: list[Any] = []
+            sql = f"DELETE FROM {_quote(table)}{_where(filters, args)} RETURNING 1"
+            return len(await self.pool.fetch(sql, *args)) > 0
+        except Exception as e:
+            logger.error("Failed to delete from '%s': %s", table, e)
+            return False
+
+    async def upsert(
+        self,
+        table: str,
+        data: dict[str, Any],
+        on_conflict: str = "id",
+    ) -> Optional[dict[str, Any]]:
+        try:
+            args: list[Any] = []
+            rows = await self._fetch(_insert_sql(table, [data], args, on_conflict), args)
+            return rows[0] if rows else None
+        except Exception as e:
+            logger.error("Failed to upsert into '%s': %s", table, e)
+            return None
+
+    async def _write_rows(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        on_conflict: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        args: list[Any] = []
+        return await self._fetch(_insert_sql(table, rows, args, on_conflict), args)
+
+    async def rpc(
+        self,
+        function_name: str,
+        params: Optional[dict[str, Any]] = None,
+    ) -> Any:
+        params = params or {}
+        try:
+            prepared = _PREPARED_RPCS.get(function_name)
+            if prepared is not None:
+                sql, names, defaults = prepared
+                args = [params.get(name, defaults.get(name)) for name in names]
+            else:
+                args = list(params.values())
+                named = ", ".join(f"{_quote(k)} => ${i}" for i, k in enumerate(params, 1))
+                sql = f"SELECT * FROM {_quote(function_name)}({named})"
+            return await self._fetch(sql, args)
+        except Exception as e:
+            logger.error("RPC call '%s' failed: %s", function_name, e)
+            return None
@@ -1,24 +1,152 @@
 """Supabase client wrapper with connection management and query helpers.
 
 Provides a centralized interface for all database operations including
-generic CRUD, embedding search, and error handling.
+generic CRUD, keyset-paginated reads, embedding search, and error handling.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional
 
+from postgrest.exceptions import APIError
 from supabase import AsyncClient, acreate_client
 
 from src.config.loader import SupabaseConfig
 
 logger = logging.getLogger(__name__)
 
+# Rows per bulk PostgREST request; keeps request bodies well under proxy limits
+BULK_CHUNK_SIZE = 500
+
+
+# ``column__op`` filter-key suffixes understood by select/update/delete
+FILTER_OPERATORS = (
+    "gte", "lte", "gt", "lt", "neq", "not_in", "in", "ilike", "like", "isnull", "search",
+)
+
+# Text search configuration for ``__search`` (websearch_to_tsquery syntax)
+SEARCH_CONFIG = "english"
+
+# Filter key holding a list of OR-ed groups; each group is a filter dict
+# whose entries are AND-ed. Keys starting with ``or__`` (e.g. ``or__cursor``)
+# are OR groups too, so several can be combined.
+OR_KEY = "or"
+
+# Rows per page for select_iter
+DEFAULT_PAGE_SIZE = 500
+
+
+def split_filter_key(key: str) -> tuple[str, str]:
+    """Split a filter key into (column, operator); bare columns mean "eq"."""
+    for op in FILTER_OPERATORS:
+        suffix = f"__{op}"
+        if key.endswith(suffix):
+            return key[: -len(suffix)], op
+    return key, "eq"
+
+
+def is_or_key(key: str) -> bool:
+    """Whether a filter key holds OR groups rather than a column condition."""
+    return key == OR_KEY or key.startswith(f"{OR_KEY}__")
+
+
+def _or_value(value: Any) -> str:
+    """Quote a value for a PostgREST logic-tree expression."""
+    if isinstance(value, bool):
+        text = "true" if value else "false"
+    else:
+        text = str(value)
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _or_term(key: str, value: Any) -> str:
+    """Render one filter entry in PostgREST logic-tree syntax."""
+    if is_or_key(key):
+        return f"or({_or_expression(value)})"
+    column, op = split_filter_key(key)
+    if op in ("in", "not_in"):
+        values = ",".join(_or_value(v) for v in value)
+        return f"{column}.{'not.' if op == 'not_in' else ''}in.({values})"
+    if op == "isnull" or (value is None and op in ("eq", "neq")):
+        negate = not value if op == "isnull" else op == "neq"
+        return f"{column}.{'not.' if negate else ''}is.null"
+    if op == "search":
+        return f"{column}.wfts({SEARCH_CONFIG}).{_or_value(value)}"
+    return f"{column}.{op}.{_or_value(value)}"
+
+
+def _or_expression(groups: list[dict[str, Any]]) -> str:
+    """Render OR groups as the body of a PostgREST ``or=(...)`` filter."""
+    if not groups:
+        raise ValueError("OR filter needs at least one group")
+    terms = []
+    for group in groups:
+        parts = [_or_term(key, value) for key, value in group.items()]
+        terms.append(parts[0] if len(parts) == 1 else f"and({','.join(parts)})")
+    return ",".join(terms)
+
+
+def _apply_filters(query: Any, filters: dict[str, Any]) -> Any:
+    """Apply ``column__op`` style filters to a PostgREST query.
+
+    Supported suffixes: ``__gte``, ``__lte``, ``__gt``, ``__lt``, ``__neq``,
+    ``__in`` and ``__not_in`` (list values), ``__ilike`` and ``__like``
+    (SQL patterns), ``__isnull`` (bool) and ``__search`` (web-style full-text
+    query against a tsvector column). A bare column name is an exact
+    match, or ``IS NULL`` for a None value. ``"or"`` takes a list of filter
+    dicts, e.g. ``{"or": [{"status": "open"}, {"due__lt": now}]}``.
+    """
+    for key, value in filters.items():
+        if is_or_key(key):
+            query = query.or_(_or_expression(value))
+            continue
+        column, op = split_filter_key(key)
+        if op == "not_in":
+            query = query.not_.in_(column, list(value))
+        elif op == "in":
+            query = query.in_(column, list(value))
+        elif op == "isnull" or (value is None and op in ("eq", "neq")):
+            negate = not value if op == "isnull" else op == "neq"
+            query = query.not_.is_(column, None) if negate else query.is_(column, None)
+        elif op == "search":
+            query = query.filter(column, f"wfts({SEARCH_CONFIG})", value)
+        else:
+            query = getattr(query, op)(column, value)
+    return query
+
+
+def order_columns(order_by: str) -> list[str]:
+    """Split a comma-separated ``order_by`` into column names."""
+    return [column.strip() for column in order_by.split(",") if column.strip()]
+
+
+def keyset_filter(
+    order_by: str,
+    last_row: dict[str, Any],
+    order_desc: bool,
+    tiebreaker: str = "id",
+) -> dict[str, Any]:
+    """Filter selecting rows after ``last_row`` in (order_by, tiebreaker) order."""
+    op = "lt" if order_desc else "gt"
+    if order_by == tiebreaker:
+        return {f"{tiebreaker}__{op}": last_row[tiebreaker]}
+    value = last_row[order_by]
+    return {
+        f"{OR_KEY}__cursor": [
+            {f"{order_by}__{op}": value},
+            {order_by: value, f"{tiebreaker}__{op}": last_row[tiebreaker]},
+        ]
+    }
+
 
 class SupabaseClient:
     """Wrapper around the Supabase async client with helper methods."""
 
+    # Errors raised for rejected rows (as opposed to transport failures)
+    _ROW_ERRORS: tuple[type[Exception], ...] = (APIError,)
+
     def __init__(self, config: SupabaseConfig) -> None:
         self._config = config
         self._client: Optional[AsyncClient] = None
@@ -39,6 +167,9 @@ class SupabaseClient:
             logger.critical("Failed to initialize Supabase client: %s", e)
             raise ConnectionError(f"Supabase connection failed: {e}") from e
 
+    async def close(self) -> None:
+        """Release database connections (the REST client holds none)."""
+
     @property
     def client(self) -> AsyncClient:
         """Get the underlying Supabase client, ensuring it is initialized."""
@@ -87,8 +218,8 @@ class SupabaseClient:
         Args:
             table: Table name.
             columns: Comma-separated column names or "*" for all.
-            filters: Dictionary of column-name to exact-match value filters.
-            order_by: Column name to order by.
+            filters: Filter dict; see :func:`_apply_filters` for operators.
+            order_by: Column name to order by, or several comma-separated.
             order_desc: Whether to order descending (default True).
             limit: Maximum number of rows to return.
 
@@ -96,35 +227,98 @@ class SupabaseClient:
             List of row dictionaries. Empty list on failure.
         """
         try:
-            query = self.client.table(table).select(columns)
-
-            if filters:
-                for key, value in filters.items():
-                    if key.endswith("__gte"):
-                        query = query.gte(key[:-5], value)
-                    elif key.endswith("__lte"):
-                        query = query.lte(key[:-5], value)
-                    elif key.endswith("__gt"):
-                        query = query.gt(key[:-4], value)
-                    elif key.endswith("__lt"):
-                        query = query.lt(key[:-4], value)
-                    elif key.endswith("__neq"):
-                        query = query.neq(key[:-5], value)
-                    else:
-                        query = query.eq(key, value)
-
-            if order_by:
-                query = query.order(order_by, desc=order_desc)
-
-            if limit is not None:
-                query = query.limit(limit)
-
-            response = await query.execute()
-            return response.data if response.data else []
+            return await self._select_rows(table, columns, filters, order_by, order_desc, limit)
         except Exception as e:
             logger.error("Failed to select from '%s': %s", table, e)
             return []
 
+    async def _select_rows(
+        self,
+        table: str,
+        columns: str,
+        filters: Optional[dict[str, Any]],
+        order_by: Optional[str],
+        order_desc: bool,
+        limit: Optional[int],
+    ) -> list[dict[str, Any]]:
+        """Run the query for :meth:`select`, raising on failure."""
+        query = self.client.table(table).select(columns)
+
+        if filters:
+            query = _apply_filters(query, filters)
+
+        if order_by:
+            for column in order_columns(order_by):
+                query = query.order(column, desc=order_desc)
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        response = await query.execute()
+        return response.data if response.data else []
+
+    async def select_iter(
+        self,
+        table: str,
+        columns: str = "*",
+        filters: Optional[dict[str, Any]] = None,
+        order_by: str = "id",
+        order_desc: bool = False,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        tiebreaker: str = "id",
+        raise_on_error: bool = False,
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """Stream rows page by page using keyset (cursor) pagination.
+
+        Each page is fetched with a filter on the last row's (order_by,
+        tiebreaker) values rather than an OFFSET, so every page is an index
+        range scan and rows inserted meanwhile do not shift later pages.
+
+        Args:
+            table: Table name.
+            columns: Columns to return; must include ``order_by`` and
+                ``tiebreaker``.
+            filters: Filter dict, as for :meth:`select`.
+            order_by: Non-null column to page through.
+            order_desc: Whether to page in descending order.
+            page_size: Rows per page.
+            tiebreaker: Unique column that orders rows sharing an
+                ``order_by`` value.
+            raise_on_error: Raise if a page fails to load, instead of
+                stopping as if the table had ended.
+
+        Yields:
+            Non-empty lists of row dictionaries. Iteration stops at the last
+            page, or early if a page fails to load (the error is logged by
+            :meth:`select`) unless ``raise_on_error`` is set.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        order = order_by if order_by == tiebreaker else f"{order_by},{tiebreaker}"
+
+        cursor: dict[str, Any] = {}
+        while True:
+            page_filters = {**(filters or {}), **cursor}
+            if raise_on_error:
+                page = await self._select_rows(
+                    table, columns, page_filters, order, order_desc, page_size
+                )
+            else:
+                page = await self.select(
+                    table,
+                    columns=columns,
+                    filters=page_filters,
+                    order_by=order,
+                    order_desc=order_desc,
+                    limit=page_size,
+                )
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            cursor = keyset_filter(order_by, page[-1], order_desc, tiebreaker)
+
     async def update(
         self,
         table: str,
@@ -135,16 +329,14 @@ class SupabaseClient:
 
         Args:
             table: Table name.
-            filters: Dictionary of column-name to exact-match value for WHERE clause.
+            filters: Filter dict for the WHERE clause, as for :meth:`select`.
             data: Dictionary of column names to new values.
 
         Returns:
             The first updated row, or None on failure.
         """
         try:
-            query = self.client.table(table).update(data)
-            for key, value in filters.items():
-                query = query.eq(key, value)
+            query = _apply_filters(self.client.table(table).update(data), filters)
 
             response = await query.execute()
             if response.data and len(response.data) > 0:
@@ -156,32 +348,6 @@ class SupabaseClient:
             logger.error("Failed to update '%s': %s", table, e)
             return None
 
-    async def delete(
-        self,
-        table: str,
-        filters: dict[str, Any],
-    ) -> bool:
-        """Delete rows matching filters from a table.
-
-        Args:
-            table: Table name.
-            filters: Dictionary of column-name to exact-match value for WHERE clause.
-
-        Returns:
-            True if deletion succeeded, False otherwise.
-        """
-        try:
-            query = self.client.table(table).delete()
-            for key, value in filters.items():
-                query = query.eq(key, value)
-
-            await query.execute()
-            logger.debug("Deleted row(s) from '%s'", table)
-            return True
-        except Exception as e:
-            logger.error("Failed to delete from '%s': %s", table, e)
-            return False
-
     async def upsert(
         self,
         table: str,
@@ -220,22 +386,141 @@ class SupabaseClient:
 
         Args:
             table: Table name.
-            filters: Dictionary of column-name to exact-match value filters.
+            filters: Dictionary of column-name to value filters; supports the
+                same ``column__op`` suffixes as :meth:`select`.
 
         Returns:
             True if at least one row was deleted, False otherwise.
         """
         try:
-            query = self.client.table(table).delete()
-            for key, val in filters.items():
-                query = query.eq(key, val)
-            
+            query = _apply_filters(self.client.table(table).delete(), filters)
             response = await query.execute()
             return len(response.data) > 0
         except Exception as e:
             logger.error("Failed to delete from '%s': %s", table, e)
             return False
 
+    async def insert_many(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> dict[str, Any]:
+        """Insert many rows using chunked bulk requests.
+
+        Args:
+            table: Table name.
+            rows: Row dictionaries to insert.
+            chunk_size: Maximum rows per request.
+
+        Returns:
+            Dict with "rows" (the inserted rows) and "failed" (one entry per
+            rejected row with its "index" in ``rows``, the "row" and "error").
+        """
+        return await self._write_many(
+            table,
+            rows,
+            chunk_size,
+            lambda chunk: self._write_rows(table, chunk),
+        )
+
+    async def upsert_many(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        on_conflict: str = "id",
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> dict[str, Any]:
+        """Insert or update many rows using chunked bulk requests.
+
+        Args:
+            table: Table name.
+            rows: Row dictionaries to upsert.
+            on_conflict: Column name(s) for conflict detection.
+            chunk_size: Maximum rows per request.
+
+        Returns:
+            Dict with "rows" and "failed", as for :meth:`insert_many`.
+        """
+        return await self._write_many(
+            table,
+            rows,
+            chunk_size,
+            lambda chunk: self._write_rows(table, chunk, on_conflict),
+        )
+
+    async def _write_rows(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        on_conflict: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """Insert (or upsert, given ``on_conflict``) rows in one request."""
+        query = self.client.table(table)
+        if on_conflict is None:
+            response = await query.insert(rows).execute()
+        else:
+            response = await query.upsert(rows, on_conflict=on_conflict).execute()
+        return response.data or []
+
+    async def _write_many(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        chunk_size: int,
+        write: Callable[[list[dict[str, Any]]], Awaitable[list[dict[str, Any]]]],
+    ) -> dict[str, Any]:
+        """Send ``rows`` in chunks and collect written rows and per-row failures."""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        result: dict[str, Any] = {"rows": [], "failed": []}
+        for start in range(0, len(rows), chunk_size):
+            await self._write_chunk(table, rows[start:start + chunk_size], start, write, result)
+
+        if result["failed"]:
+            logger.warning(
+                "Bulk write to '%s': %d/%d rows failed",
+                table,
+                len(result["failed"]),
+                len(rows),
+            )
+        return result
+
+    async def _write_chunk(
+        self,
+        table: str,
+        chunk: list[dict[str, Any]],
+        offset: int,
+        write: Callable[[list[dict[str, Any]]], Awaitable[list[dict[str, Any]]]],
+        result: dict[str, Any],
+    ) -> None:
+        """Write one chunk; on a row-level rejection, bisect to find the bad rows.
+
+        PostgREST applies a bulk request as one statement, so a single bad row
+        fails the whole chunk. Database errors are narrowed down by splitting
+        the chunk; transport errors fail the chunk as a whole, since retrying
+        halves of it would not help.
+        """
+        try:
+            result["rows"].extend(await write(chunk))
+            return
+        except self._ROW_ERRORS as e:
+            if len(chunk) > 1:
+                mid = len(chunk) // 2
+                await self._write_chunk(table, chunk[:mid], offset, write, result)
+                await self._write_chunk(table, chunk[mid:], offset + mid, write, result)
+                return
+            error = e
+        except Exception as e:
+            logger.error("Bulk write to '%s' failed: %s", table, e)
+            error = e
+
+        result["failed"].extend(
+            {"index": offset + i, "row": row, "error": str(error)}
+            for i, row in enumerate(chunk)
+        )
+
     async def rpc(
         self,
         function_name: str,
@@ -9,13 +9,20 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import anthropic
 from openai import AsyncOpenAI
 
 from src.config.loader import LLMConfig
-from src.llm.provider import LLMProvider
+from src.llm.openai_provider import embed_in_batches
+from src.llm.provider import (
+    LLMProvider,
+    is_context_length_error,
+    truncate_history,
+    usage_summary,
+)
+from src.llm.streaming import ToolCallAccumulator, done_event, text_event
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +30,9 @@ MAX_RETRIES = 3
 BASE_DELAY_SECONDS = 1.0
 MAX_DELAY_SECONDS = 16.0
 
+# Prompt-cache breakpoint; Anthropic caches everything up to and including it
+EPHEMERAL_CACHE = {"type": "ephemeral"}
+
 
 def _convert_openai_tools_to_anthropic(
     tools: list[dict[str, Any]],
@@ -101,6 +111,21 @@ def _convert_messages_for_anthropic(
     return system_prompt.strip(), converted
 
 
+def _anthropic_usage(usage: Any) -> dict[str, int]:
+    """Normalize Anthropic usage; input_tokens excludes cache reads and writes."""
+    input_tokens = getattr(usage, "input_tokens", 0)
+    cache_read = getattr(usage, "cache_read_input_tokens", 0)
+    cache_write = getattr(usage, "cache_creation_input_tokens", 0)
+    counts = usage_summary(
+        prompt_tokens=input_tokens,
+        completion_tokens=getattr(usage, "output_tokens", 0),
+        cached_tokens=cache_read,
+        cache_write_tokens=cache_write,
+    )
+    counts["prompt_tokens"] += counts["cached_tokens"] + counts["cache_write_tokens"]
+    return counts
+
+
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude-based LLM provider with retry logic.
 
@@ -110,6 +135,7 @@ class AnthropicProvider(LLMProvider):
     """
 
     ANTHROPIC_DEFAULT_MODEL = "claude-sonnet-4-5-20250929"
+    CONTEXT_WINDOW = 200_000
 
     def __init__(self, config: LLMConfig, openai_api_key: Optional[str] = None, api_key: Optional[str] = None, model: Optional[str] = None) -> None:
         self._config = config
@@ -119,6 +145,7 @@ class AnthropicProvider(LLMProvider):
         self._default_temperature = config.temperature
         self._default_max_tokens = config.max_tokens
         self._embedding_model = config.embedding_model
+        self._prompt_caching = config.prompt_caching
 
         # Embedding client (Anthropic doesn't have embeddings, so use OpenAI)
         import os
@@ -127,14 +154,20 @@ class AnthropicProvider(LLMProvider):
         if oai_key:
             self._openai_client = AsyncOpenAI(api_key=oai_key)
 
-    async def chat(
+    def _build_request(
         self,
         messages: list[dict[str, Any]],
-        tools: Optional[list[dict[str, Any]]] = None,
-        temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None,
+        tools: Optional[list[dict[str, Any]]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
     ) -> dict[str, Any]:
-        """Send a chat completion request to Anthropic Claude."""
+        """Build messages.create kwargs from OpenAI-format inputs.
+
+        With prompt caching on, cache breakpoints are placed after the tool
+        definitions and after the system prompt. Both are identical across
+        turns, so every request after the first reads them from the cache.
+        Tools are sorted by name to keep that prefix byte-stable.
+        """
         temp = temperature if temperature is not None else self._default_temperature
         tokens = max_tokens if max_tokens is not None else self._default_max_tokens
 
@@ -148,10 +181,31 @@ class AnthropicProvider(LLMProvider):
         }
 
         if system_prompt:
-            kwargs["system"] = system_prompt
+            if self._prompt_caching:
+                kwargs["system"] = [
+                    {"type": "text", "text": system_prompt, "cache_control": EPHEMERAL_CACHE},
+                ]
+            else:
+                kwargs["system"] = system_prompt
 
         if tools:
-            kwargs["tools"] = _convert_openai_tools_to_anthropic(tools)
+            converted = _convert_openai_tools_to_anthropic(tools)
+            if self._prompt_caching:
+                converted.sort(key=lambda t: t["name"])
+                converted[-1] = {**converted[-1], "cache_control": EPHEMERAL_CACHE}
+            kwargs["tools"] = converted
+
+        return kwargs
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """Send a chat completion request to Anthropic Claude."""
+        kwargs = self._build_request(messages, tools, temperature, max_tokens)
 
         last_error: Optional[Exception] = None
 
@@ -181,15 +235,18 @@ class AnthropicProvider(LLMProvider):
                     "content": text_content or None,
                     "tool_calls": tool_calls,
                     "finish_reason": response.stop_reason,
+                    "usage": _anthropic_usage(response.usage),
                 }
 
                 logger.debug(
                     "Anthropic chat completed. Model: %s, Stop reason: %s, "
-                    "Input tokens: %s, Output tokens: %s",
+                    "Prompt tokens: %s (cached: %s, cache write: %s), Output tokens: %s",
                     self._model,
                     response.stop_reason,
-                    response.usage.input_tokens,
-                    response.usage.output_tokens,
+                    result["usage"]["prompt_tokens"],
+                    result["usage"]["cached_tokens"],
+                    result["usage"]["cache_write_tokens"],
+                    result["usage"]["completion_tokens"],
                 )
 
                 return result
@@ -206,6 +263,12 @@ class AnthropicProvider(LLMProvider):
                 await asyncio.sleep(delay)
 
             except anthropic.APIError as e:
+                if is_context_length_error(e):
+                    logger.warning("Context length exceeded. Truncating conversation history.")
+                    messages = truncate_history(messages)
+                    kwargs = self._build_request(messages, tools, temperature, max_tokens)
+                    last_error = e
+                    continue
                 if hasattr(e, "status_code") and e.status_code and e.status_code >= 500:
                     last_error = e
                     delay = min(BASE_DELAY_SECONDS * (2 ** attempt), MAX_DELAY_SECONDS)
@@ -223,6 +286,108 @@ class AnthropicProvider(LLMProvider):
         logger.error("Anthropic chat failed after %d attempts", MAX_RETRIES)
         raise last_error or RuntimeError("Anthropic chat failed with no specific error")
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream a chat completion from Anthropic Claude.
+
+        Text deltas are yielded as they arrive; ``tool_use`` blocks are
+        reassembled from their ``input_json_delta`` fragments and returned
+        in the final ``done`` event.
+        """
+        stream = await self._open_stream(messages, tools, temperature, max_tokens)
+
+        content_parts: list[str] = []
+        tool_calls = ToolCallAccumulator()
+        stop_reason: Optional[str] = None
+        start_usage: Any = None
+        output_tokens: Any = 0
+
+        async for event in stream:
+            if event.type == "message_start":
+                start_usage = event.message.usage
+            elif event.type == "content_block_start":
+                block = event.content_block
+                if block.type == "tool_use":
+                    tool_calls.add(event.index, call_id=block.id, name=block.name)
+            elif event.type == "content_block_delta":
+                delta = event.delta
+                if delta.type == "text_delta":
+                    content_parts.append(delta.text)
+                    yield text_event(delta.text)
+                elif delta.type == "input_json_delta":
+                    tool_calls.add(event.index, arguments=delta.partial_json)
+            elif event.type == "message_delta":
+                stop_reason = event.delta.stop_reason or stop_reason
+                output_tokens = event.usage.output_tokens
+
+        usage = _anthropic_usage(start_usage)
+        usage["completion_tokens"] = output_tokens if isinstance(output_tokens, int) else 0
+        logger.debug(
+            "Anthropic chat stream completed. Model: %s, Stop reason: %s, "
+            "Prompt tokens: %s (cached: %s, cache write: %s), Output tokens: %s",
+            self._model,
+            stop_reason,
+            usage["prompt_tokens"],
+            usage["cached_tokens"],
+            usage["cache_write_tokens"],
+            usage["completion_tokens"],
+        )
+
+        yield done_event({
+            "role": "assistant",
+            "content": "".join(content_parts) or None,
+            "tool_calls": tool_calls.result(),
+            "finish_reason": stop_reason,
+            "usage": usage,
+        })
+
+    async def _open_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> Any:
+        """Open a streamed message, retrying like ``chat()``."""
+        kwargs = self._build_request(messages, tools, temperature, max_tokens)
+        kwargs["stream"] = True
+        last_error: Optional[Exception] = None
+
+        for attempt in range(MAX_RETRIES):
+            try:
+                return await self._client.messages.create(**kwargs)
+            except anthropic.RateLimitError as e:
+                last_error = e
+            except anthropic.APIError as e:
+                if is_context_length_error(e):
+                    logger.warning("Context length exceeded. Truncating conversation history.")
+                    messages = truncate_history(messages)
+                    kwargs = self._build_request(messages, tools, temperature, max_tokens)
+                    kwargs["stream"] = True
+                    last_error = e
+                    continue
+                if not (hasattr(e, "status_code") and e.status_code and e.status_code >= 500):
+                    raise
+                last_error = e
+
+            delay = min(BASE_DELAY_SECONDS * (2 ** attempt), MAX_DELAY_SECONDS)
+            logger.warning(
+                "Anthropic stream open failed (attempt %d/%d): %s. Retrying in %.1fs",
+                attempt + 1,
+                MAX_RETRIES,
+                last_error,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+        logger.error("Anthropic chat stream failed after %d attempts", MAX_RETRIES)
+        raise last_error or RuntimeError("Anthropic chat stream failed with no specific error")
+
     async def embed(self, text: str) -> list[float]:
         """Generate an embedding using OpenAI (Anthropic lacks embedding API).
 
@@ -259,6 +424,15 @@ class AnthropicProvider(LLMProvider):
         logger.error("Embedding failed after %d attempts", MAX_RETRIES)
         raise last_error or RuntimeError("Embedding failed with no specific error")
 
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings for many texts via OpenAI in one request per chunk."""
+        if self._openai_client is None:
+            raise RuntimeError(
+                "Embedding requires OpenAI API key. Set OPENAI_API_KEY environment "
+                "variable or provide openai_api_key to AnthropicProvider."
+            )
+        return await embed_in_batches(self._openai_client, self._embedding_model, texts)
+
     async def close(self) -> None:
         """Close the underlying HTTP clients."""
         try:
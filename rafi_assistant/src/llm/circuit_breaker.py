@@ -0,0 +1,187 @@
+"""Per-provider circuit breakers for LLMManager.
+
+Each provider keeps a rolling window of recent call outcomes. When the
+error rate (or the p95 latency, if a threshold is set) in that window
+crosses its limit, the breaker opens and the manager stops trying the
+provider first. After a cooldown it goes half-open: a single probe
+request is let through, and its outcome closes the breaker or re-opens
+it with a longer cooldown.
+
+Without breakers a provider that is down is tried first on every
+request, and its client retries with backoff before the manager falls
+through to the next provider.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Cooldown doubles each time a probe fails, up to this multiple
+MAX_COOLDOWN_FACTOR = 8
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``values`` (0.0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class CircuitBreaker:
+    """Rolling outcome window and open/half-open/closed state for one provider."""
+
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        min_calls: int = 4,
+        error_rate_threshold: float = 0.5,
+        latency_threshold_ms: float = 0.0,
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._window = window_seconds
+        self._min_calls = min_calls
+        self._error_rate_threshold = error_rate_threshold
+        # 0 disables tripping on latency
+        self._latency_threshold_ms = latency_threshold_ms
+        self._base_cooldown = cooldown_seconds
+        self._clock = clock
+
+        # (timestamp, ok, latency_ms)
+        self._calls: deque[tuple[float, bool, float]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._cooldown = cooldown_seconds
+        self._probe_in_flight = False
+
+        # Metrics
+        self._trips = 0
+        self._rejected = 0
+        self._last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        """Current state; an open breaker whose cooldown has passed reads as half-open."""
+        if self._state == OPEN and self._clock() - self._opened_at >= self._cooldown:
+            self._state = HALF_OPEN
+        return self._state
+
+    def _prune(self) -> None:
+        cutoff = self._clock() - self._window
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+    def error_rate(self) -> float:
+        self._prune()
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, ok, _ in self._calls if not ok) / len(self._calls)
+
+    def latency_ms(self, fraction: float) -> float:
+        """Latency percentile of successful calls in the window."""
+        self._prune()
+        return percentile([ms for _, ok, ms in self._calls if ok], fraction)
+
+    def score(self) -> float:
+        """Health score for ordering fallbacks; lower is healthier."""
+        return self.error_rate() * 10_000 + self.latency_ms(0.95)
+
+    def available(self) -> bool:
+        """Whether a request may be sent now, without claiming the probe slot."""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and not self._probe_in_flight)
+
+    def acquire(self) -> bool:
+        """Claim permission to send a request.
+
+        Returns False while open, or while half-open with the probe
+        already in flight. Every successful acquire must be followed by
+        :meth:`record_success`, :meth:`record_failure` or :meth:`release`.
+        """
+        if not self.available():
+            self._rejected += 1
+            return False
+        if self._state == HALF_OPEN:
+            self._probe_in_flight = True
+        return True
+
+    def allow_probe(self) -> None:
+        """Go half-open now, ahead of the cooldown, with the probe slot free.
+
+        Used when every provider's breaker rejects requests, so the least
+        unhealthy one is probed instead of failing the request outright.
+        """
+        if self._state != CLOSED:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Give up a claimed request without an outcome (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def record_success(self, latency_ms: float) -> None:
+        self._calls.append((self._clock(), True, latency_ms))
+        if self._state == HALF_OPEN:
+            self._close()
+            return
+        self._evaluate()
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        if error is not None:
+            self._last_error = f"{type(error).__name__}: {str(error)[:200]}"
+        self._calls.append((self._clock(), False, 0.0))
+        if self._state == HALF_OPEN:
+            self._cooldown = min(self._cooldown * 2, self._base_cooldown * MAX_COOLDOWN_FACTOR)
+            self._open()
+            return
+        self._evaluate()
+
+    def _evaluate(self) -> None:
+        self._prune()
+        if self._state != CLOSED or len(self._calls) < self._min_calls:
+            return
+        if self.error_rate() >= self._error_rate_threshold:
+            self._open()
+        elif self._latency_threshold_ms and self.latency_ms(0.95) > self._latency_threshold_ms:
+            self._open()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self._trips += 1
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._cooldown = self._base_cooldown
+        self._probe_in_flight = False
+        # Start the window afresh so the failures that tripped it don't re-trip it
+        self._calls.clear()
+
+    def stats(self) -> dict[str, Any]:
+        state = self.state
+        self._prune()
+        return {
+            "state": state,
+            "calls": len(self._calls),
+            "error_rate": round(self.error_rate(), 3),
+            "p50_ms": round(self.latency_ms(0.5), 1),
+            "p95_ms": round(self.latency_ms(0.95), 1),
+            "trips": self._trips,
+            "rejected": self._rejected,
+            "retry_in_s": (
+                round(max(0.0, self._opened_at + self._cooldown - self._clock()), 1)
+                if state == OPEN
+                else 0.0
+            ),
+            "last_error": self._last_error,
+        }
@@ -0,0 +1,113 @@
+"""Micro-batching queue for embedding requests.
+
+Concurrent ``embed`` calls that arrive within a short window (a few
+milliseconds) are merged into a single ``embed_many`` request. Useful when
+several coroutines embed at once, e.g. storing a message while searching
+memory for the same turn, or bulk jobs that fan out per-message work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH = 64
+
+
+class EmbeddingBatcher:
+    """Coalesces individual embed requests into batched API calls.
+
+    The first request in an empty queue starts a timer of ``window_seconds``;
+    everything submitted before it fires (or until ``max_batch`` texts are
+    queued) is sent as one ``embed_many`` call. Duplicate texts in the same
+    batch are embedded once.
+    """
+
+    def __init__(
+        self,
+        embed_many: Callable[[list[str]], Awaitable[list[list[float]]]],
+        window_seconds: float = 0.005,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be positive")
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+
+        self._embed_many = embed_many
+        self._window = window_seconds
+        self._max_batch = max_batch
+        self._pending: dict[str, list[asyncio.Future[list[float]]]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set[asyncio.Task[None]] = set()
+
+        self.requests = 0
+        self.batches = 0
+
+    async def submit(self, text: str) -> list[float]:
+        """Queue a text for the next batch and wait for its vector."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.setdefault(text, []).append(future)
+        self.requests += 1
+
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Hand the current queue to a background task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: dict[str, list[asyncio.Future[list[float]]]]) -> None:
+        texts = list(batch.keys())
+        self.batches += 1
+
+        try:
+            vectors = await self._embed_many(texts)
+            if len(vectors) != len(texts):
+                raise RuntimeError(
+                    f"embed_many returned {len(vectors)} vectors for {len(texts)} texts"
+                )
+        except Exception as e:
+            logger.warning("Batched embedding of %d texts failed: %s", len(texts), e)
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for text, vector in zip(texts, vectors):
+            for future in batch[text]:
+                if not future.done():
+                    future.set_result(vector)
+
+    def stats(self) -> dict[str, Any]:
+        """Return request/batch counters."""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+        }
+
+    async def close(self) -> None:
+        """Flush anything queued and wait for in-flight batches."""
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
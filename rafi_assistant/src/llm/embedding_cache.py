@@ -0,0 +1,213 @@
+"""Content-addressed cache for text embeddings.
+
+Every inbound message and every memory search embeds text through OpenAI,
+often for text that was embedded moments ago ("thanks", "ok", retries,
+repeated recall queries). EmbeddingCache keeps a bounded in-memory LRU in
+front of the embedding API, optionally backed by a SQLite file so vectors
+survive restarts. Entries are keyed by sha256(model, text), so switching
+embedding models never returns stale vectors.
+
+Lookups and stores are coroutines: the in-memory tier is answered on the
+event loop, and SQLite reads and writes run in a worker thread, one
+transaction per call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 2048
+
+# Keys per disk lookup, under SQLite's bound-parameter limit
+DISK_LOOKUP_CHUNK = 500
+
+
+def embedding_cache_key(model: str, text: str) -> str:
+    """Return the cache key for a (model, text) pair."""
+    digest = hashlib.sha256()
+    digest.update(model.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """Bounded LRU of embedding vectors with an optional SQLite tier.
+
+    The SQLite tier stores vectors as packed float32 and is only consulted
+    on an in-memory miss; disk hits are promoted back into the LRU. Vectors
+    are copied in and out, so callers may mutate what they get.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        path: Optional[str | Path] = None,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes use of the SQLite connection across worker threads
+        self._disk_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path:
+            self._open_disk_store(Path(path))
+
+    def _open_disk_store(self, path: Path) -> None:
+        """Open (or create) the SQLite store; disk caching is skipped on failure."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, dims INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+            logger.info("Embedding cache disk store: %s", path)
+        except sqlite3.Error as e:
+            logger.warning("Embedding cache disk store unavailable (%s): %s", path, e)
+            self._db = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, model: str, text: str) -> Optional[list[float]]:
+        """Return the cached vector for (model, text), or None on a miss."""
+        return (await self.get_many(model, [text])).get(text)
+
+    async def get_many(self, model: str, texts: list[str]) -> dict[str, list[float]]:
+        """Return cached vectors for the given texts, keyed by text; misses are left out.
+
+        Texts missing from memory are looked up on disk in one worker-thread call.
+        """
+        keys = {text: embedding_cache_key(model, text) for text in texts}
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            for text, key in keys.items():
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[text] = list(vector)
+
+        on_disk: dict[str, list[float]] = {}
+        unresolved = [key for text, key in keys.items() if text not in found]
+        if unresolved and self._db is not None:
+            on_disk = await asyncio.to_thread(self._disk_get, unresolved)
+
+        with self._lock:
+            for text, key in keys.items():
+                if text in found:
+                    self.hits += 1
+                elif key in on_disk:
+                    self._remember(key, on_disk[key])
+                    found[text] = list(on_disk[key])
+                    self.hits += 1
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+        return found
+
+    async def put(self, model: str, text: str, vector: list[float]) -> None:
+        """Store a vector. Empty vectors (failed embeddings) are not cached."""
+        await self.put_many(model, {text: vector})
+
+    async def put_many(self, model: str, vectors: dict[str, list[float]]) -> None:
+        """Store vectors keyed by text, writing them to disk in one transaction.
+
+        Empty vectors (failed embeddings) are not cached.
+        """
+        entries = {
+            embedding_cache_key(model, text): list(vector)
+            for text, vector in vectors.items()
+            if vector
+        }
+        if not entries:
+            return
+        with self._lock:
+            for key, vector in entries.items():
+                self._remember(key, vector)
+        if self._db is not None:
+            await asyncio.to_thread(self._disk_put, entries)
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_get(self, keys: list[str]) -> dict[str, list[float]]:
+        rows: list[tuple[str, bytes]] = []
+        with self._disk_lock:
+            if self._db is None:
+                return {}
+            try:
+                for start in range(0, len(keys), DISK_LOOKUP_CHUNK):
+                    chunk = keys[start:start + DISK_LOOKUP_CHUNK]
+                    rows.extend(
+                        self._db.execute(
+                            "SELECT key, vector FROM embeddings WHERE key IN "
+                            f"({', '.join('?' for _ in chunk)})",
+                            chunk,
+                        ).fetchall()
+                    )
+            except sqlite3.Error as e:
+                logger.warning("Embedding cache disk read failed: %s", e)
+                return {}
+        return {key: array("f", blob).tolist() for key, blob in rows}
+
+    def _disk_put(self, entries: dict[str, list[float]]) -> None:
+        with self._disk_lock:
+            if self._db is None:
+                return
+            try:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, dims, vector) VALUES (?, ?, ?)",
+                        [
+                            (key, len(vector), array("f", vector).tobytes())
+                            for key, vector in entries.items()
+                        ],
+                    )
+            except sqlite3.Error as e:
+                logger.warning("Embedding cache disk write failed: %s", e)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for observability."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "disk_store": self._db is not None,
+        }
+
+    def close(self) -> None:
+        """Close the SQLite store, if any."""
+        with self._disk_lock:
+            if self._db is not None:
+                try:
+                    self._db.close()
+                except sqlite3.Error as e:
+                    logger.warning("Error closing embedding cache store: %s", e)
+                self._db = None
@@ -23,6 +23,9 @@ GEMINI_DEFAULT_MODEL = "gemini-2.0-flash"
 class GeminiProvider(OpenAIProvider):
     """Google Gemini-based LLM provider using their OpenAI-compatible API."""
 
+    SUPPORTS_PROMPT_CACHE_KEY = False
+    CONTEXT_WINDOW = 1_048_576
+
     def __init__(self, config: LLMConfig, api_key: Optional[str] = None) -> None:
         key = api_key or config.gemini_api_key or config.api_key
         model = GEMINI_DEFAULT_MODEL
@@ -47,6 +50,15 @@ class GeminiProvider(OpenAIProvider):
         )
         return response.data[0].embedding
 
+    def _embeddings_client(self) -> AsyncOpenAI:
+        """OpenAI client for embed_many (Gemini has no embedding API)."""
+        if self._openai_embed_client is None:
+            raise RuntimeError(
+                "Embedding requires an OpenAI API key. "
+                "Set LLM_API_KEY to a valid OpenAI key for embeddings."
+            )
+        return self._openai_embed_client
+
     async def close(self) -> None:
         """Close both the Gemini and OpenAI clients."""
         await super().close()
@@ -23,6 +23,9 @@ GROQ_DEFAULT_MODEL = "llama-3.3-70b-versatile"
 class GroqProvider(OpenAIProvider):
     """Groq-based LLM provider using their OpenAI-compatible API."""
 
+    SUPPORTS_PROMPT_CACHE_KEY = False
+    CONTEXT_WINDOW = 131_072
+
     def __init__(self, config: LLMConfig, api_key: Optional[str] = None) -> None:
         key = api_key or config.groq_api_key or config.api_key
         model = GROQ_DEFAULT_MODEL
@@ -47,6 +50,15 @@ class GroqProvider(OpenAIProvider):
         )
         return response.data[0].embedding
 
+    def _embeddings_client(self) -> AsyncOpenAI:
+        """OpenAI client for embed_many (Groq has no embedding API)."""
+        if self._openai_embed_client is None:
+            raise RuntimeError(
+                "Embedding requires an OpenAI API key. "
+                "Set LLM_API_KEY to a valid OpenAI key for embeddings."
+            )
+        return self._openai_embed_client
+
     async def close(self) -> None:
         """Close both the Groq and OpenAI clients."""
         await super().close()
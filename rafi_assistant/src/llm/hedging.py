@@ -0,0 +1,104 @@
+"""Hedged requests for latency-critical LLM calls.
+
+When a voice-path request has not been answered by a deadline, LLMManager
+sends the same request to a second provider and keeps whichever answers
+first; the other call is cancelled. The deadline is the primary's recent
+p9x latency, so only the slow tail is hedged.
+
+Extra requests cost money, so hedging is rate-capped with a token bucket:
+each eligible request earns ``max_rate`` of a hedge, up to ``burst``
+saved hedges. Over time at most ``max_rate`` of requests are hedged.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from src.llm.router import ProviderStats
+
+
+class HedgePolicy:
+    """Hedge deadlines from measured latency, plus the hedge-rate cap."""
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_samples: int = 10,
+        default_delay_ms: float = 2000.0,
+        min_delay_ms: float = 250.0,
+        max_rate: float = 0.1,
+        burst: float = 2.0,
+        window: int = 100,
+    ) -> None:
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self._default_delay_ms = default_delay_ms
+        self._min_delay_ms = min_delay_ms
+        self._max_rate = max_rate
+        self._burst = burst
+        self._window = window
+        self._latency: dict[str, ProviderStats] = {}
+        self._tokens = burst
+
+        # Accounting
+        self._eligible = 0
+        self._hedged = 0
+        self._backup_wins = 0
+        self._primary_wins = 0
+        self._capped = 0
+        self._no_backup = 0
+
+    def record(self, name: str, latency_ms: float) -> None:
+        """Record the latency of a successful call to ``name``."""
+        stats = self._latency.get(name)
+        if stats is None:
+            stats = self._latency[name] = ProviderStats(self._window)
+        stats.record(True, latency_ms)
+
+    def delay_seconds(self, name: str) -> float:
+        """How long to wait for ``name`` before hedging."""
+        stats = self._latency.get(name)
+        if stats is None or stats.samples < self._min_samples:
+            delay_ms = self._default_delay_ms
+        else:
+            delay_ms = stats.latency_ms(self._percentile)
+        return max(delay_ms, self._min_delay_ms) / 1000
+
+    def start_request(self) -> None:
+        """Count a hedge-eligible request and earn its share of a hedge."""
+        self._eligible += 1
+        self._tokens = min(self._burst, self._tokens + self._max_rate)
+
+    def allow(self) -> bool:
+        """Spend a hedge if the rate cap permits one."""
+        if self._tokens < 1.0:
+            self._capped += 1
+            return False
+        self._tokens -= 1.0
+        self._hedged += 1
+        return True
+
+    def no_backup(self) -> None:
+        self._no_backup += 1
+
+    def finish(self, backup_won: bool) -> None:
+        """Record which call of a hedged request answered."""
+        if backup_won:
+            self._backup_wins += 1
+        else:
+            self._primary_wins += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of hedging metrics for the dashboard."""
+        return {
+            "eligible": self._eligible,
+            "hedged": self._hedged,
+            "hedge_rate": round(self._hedged / self._eligible, 3) if self._eligible else 0.0,
+            "backup_wins": self._backup_wins,
+            "primary_wins": self._primary_wins,
+            "capped": self._capped,
+            "no_backup": self._no_backup,
+            "deadlines_ms": {
+                name: round(self.delay_seconds(name) * 1000, 1) for name in self._latency
+            },
+        }
@@ -1,22 +1,37 @@
-"""LLM Manager for runtime provider switching with cost-based routing.
+"""LLM Manager for runtime provider switching with adaptive routing.
 
 Implements the LLMProvider interface while managing multiple backend
 providers. Chat requests go to the active provider; embeddings always
 go to OpenAI (the only provider with an embedding API).
 
-Cost-based routing sends simple queries to cheaper/faster models
-(Groq, Gemini) and complex queries to more capable models (OpenAI, Anthropic).
+Adaptive routing (see src/llm/router.py) sends each request to the
+provider measured to answer it fastest, within its tool and context
+limits; shadow mode only records those decisions.
+
+Optional per-provider circuit breakers skip providers that are failing
+or too slow and order the fallbacks by recent health.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Optional
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
 
+from src.llm.circuit_breaker import CircuitBreaker
+from src.llm.embedding_batcher import EmbeddingBatcher
+from src.llm.embedding_cache import EmbeddingCache
+from src.llm.hedging import HedgePolicy
 from src.llm.provider import LLMProvider
+from src.llm.response_cache import ResponseCache, current_policy, response_cache_key
+from src.llm.router import ROUTING_MODES, AdaptiveRouter, in_voice_request
+from src.llm.streaming import done_event, text_event
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # Friendly aliases for provider names
 _ALIASES: dict[str, str] = {
     "claude": "anthropic",
@@ -29,26 +44,18 @@ _ALIASES: dict[str, str] = {
     "llama": "groq",
 }
 
-# Cost tiers: lower number = cheaper. Used for routing simple queries.
-_COST_TIER: dict[str, int] = {
-    "groq": 1,
-    "gemini": 2,
-    "openai": 3,
-    "anthropic": 4,
-}
+def _first_event_key(name: str) -> str:
+    """Hedge latency key for a provider's time to first stream event."""
+    return f"{name}:first_event"
 
-# Keywords suggesting a complex query that needs a capable model
-_COMPLEX_INDICATORS = [
-    "analyze", "compare", "evaluate", "research", "explain in detail",
-    "write a report", "create a plan", "review", "audit", "summarize",
-    "multiple", "all of", "comprehensive", "thorough",
-]
 
-# Keywords suggesting a simple query that can use a cheaper model
-_SIMPLE_INDICATORS = [
-    "what time", "weather", "reminder", "set", "quick",
-    "yes", "no", "ok", "sure", "thanks",
-]
+def _all_providers_failed_response() -> dict[str, Any]:
+    return {
+        "role": "assistant",
+        "content": "I'm having trouble reaching my AI services right now. Please try again in a moment.",
+        "tool_calls": [],
+        "finish_reason": "error",
+    }
 
 
 class LLMManager(LLMProvider):
@@ -63,23 +70,63 @@ class LLMManager(LLMProvider):
         providers: dict[str, LLMProvider],
         default: str,
         embedding_provider: Optional[LLMProvider] = None,
-        cost_routing_enabled: bool = False,
+        routing_mode: str = "off",
+        router_options: Optional[dict[str, Any]] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        embedding_model: str = "",
+        embedding_batch_window_ms: float = 0.0,
+        context_token_budget: int = 16000,
+        context_token_budgets: Optional[dict[str, int]] = None,
+        circuit_breaker: Optional[dict[str, Any]] = None,
+        hedging: Optional[dict[str, Any]] = None,
+        response_cache: Optional[ResponseCache] = None,
     ) -> None:
         if not providers:
             raise ValueError("At least one LLM provider must be configured")
         if default not in providers:
             raise ValueError(f"Default provider '{default}' not in available providers: {list(providers.keys())}")
+        if routing_mode not in ROUTING_MODES:
+            raise ValueError(f"Routing mode must be one of: {ROUTING_MODES}")
 
         self._providers = providers
         self._active = default
         self._embedding_provider = embedding_provider or providers.get("openai") or next(iter(providers.values()))
-        self._cost_routing = cost_routing_enabled
+        self._routing_mode = routing_mode
+        self._router: Optional[AdaptiveRouter] = None
+        if routing_mode != "off":
+            self._router = AdaptiveRouter(providers, **(router_options or {}))
+        self._embedding_cache = embedding_cache
+        self._response_cache = response_cache
+        self._usage: dict[str, dict[str, int]] = {}
+        self._context_token_budget = context_token_budget
+        self._context_token_budgets = dict(context_token_budgets or {})
+        provider_model = getattr(self._embedding_provider, "_embedding_model", "")
+        self._embedding_model = embedding_model or (
+            provider_model if isinstance(provider_model, str) else ""
+        )
+        # Opt-in: merge concurrent embed() calls into one embed_many() request
+        self._embedding_batcher: Optional[EmbeddingBatcher] = None
+        if embedding_batch_window_ms > 0:
+            self._embedding_batcher = EmbeddingBatcher(
+                self._embedding_provider.embed_many,
+                window_seconds=embedding_batch_window_ms / 1000.0,
+            )
+        # Opt-in: one breaker per provider, built from CircuitBreaker kwargs
+        self._breakers: dict[str, CircuitBreaker] = {}
+        if circuit_breaker is not None:
+            self._breakers = {
+                name: CircuitBreaker(**circuit_breaker) for name in providers
+            }
+        # Opt-in: hedge slow voice-path requests, built from HedgePolicy kwargs
+        self._hedge: Optional[HedgePolicy] = (
+            HedgePolicy(**hedging) if hedging is not None else None
+        )
 
         logger.info(
-            "LLM Manager initialized. Active: %s, Available: %s, Cost routing: %s",
+            "LLM Manager initialized. Active: %s, Available: %s, Routing: %s",
             self._active,
             list(self._providers.keys()),
-            self._cost_routing,
+            self._routing_mode,
         )
 
     @property
@@ -93,14 +140,98 @@ class LLMManager(LLMProvider):
         return list(self._providers.keys())
 
     @property
-    def cost_routing_enabled(self) -> bool:
-        """Whether cost-based routing is active."""
-        return self._cost_routing
+    def routing_mode(self) -> str:
+        """Provider routing: 'off', 'adaptive' or 'shadow'."""
+        return self._routing_mode
+
+    @property
+    def router_stats(self) -> dict[str, Any]:
+        """Routing decisions and per-provider measurements (empty if routing is off)."""
+        return self._router.stats() if self._router else {}
+
+    @property
+    def context_token_budget(self) -> int:
+        """Prompt token budget for the next request.
+
+        With adaptive routing any provider may answer, so the smallest
+        budget among them applies; otherwise the active provider's.
+        """
+        if self._routing_mode == "adaptive":
+            return min(self._budget_for(name) for name in self._providers)
+        return self._budget_for(self._active)
+
+    def _budget_for(self, name: str) -> int:
+        return self._context_token_budgets.get(name, self._context_token_budget)
+
+    @property
+    def usage_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-provider token totals, including prompt-cache hits."""
+        stats: dict[str, dict[str, Any]] = {}
+        for name, totals in self._usage.items():
+            prompt = totals["prompt_tokens"]
+            stats[name] = {
+                **totals,
+                "cache_hit_rate": round(totals["cached_tokens"] / prompt, 3) if prompt else 0.0,
+            }
+        return stats
+
+    @property
+    def breaker_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-provider circuit breaker state (empty if breakers are disabled)."""
+        return {name: breaker.stats() for name, breaker in self._breakers.items()}
+
+    @property
+    def embedding_cache_stats(self) -> dict[str, Any]:
+        """Hit/miss counters for the embedding cache (empty if disabled)."""
+        return self._embedding_cache.stats() if self._embedding_cache else {}
+
+    @property
+    def response_cache_stats(self) -> dict[str, Any]:
+        """Hit/miss counters for the response cache (empty if disabled)."""
+        return self._response_cache.stats() if self._response_cache else {}
 
-    @cost_routing_enabled.setter
-    def cost_routing_enabled(self, value: bool) -> None:
-        self._cost_routing = value
-        logger.info("Cost routing %s", "enabled" if value else "disabled")
+    @property
+    def hedge_stats(self) -> dict[str, Any]:
+        """Hedged-request accounting (empty if hedging is disabled)."""
+        return self._hedge.stats() if self._hedge else {}
+
+    def _try_order(self, selected: str) -> list[str]:
+        """Providers to try, in order.
+
+        The selected provider goes first. With breakers, providers whose
+        breaker rejects requests are left out and the fallbacks are
+        ordered healthiest first. If every breaker rejects, the least
+        unhealthy provider is probed early rather than trying none.
+        """
+        order = [selected] + [n for n in self._providers if n != selected]
+        if not self._breakers:
+            return order
+        ready = [n for n in order if self._breakers[n].available()]
+        if not ready:
+            fallback = min(order, key=lambda n: self._breakers[n].score())
+            self._breakers[fallback].allow_probe()
+            logger.warning("All provider breakers are open; probing '%s'", fallback)
+            return [fallback]
+        if ready and ready[0] == selected:
+            return [selected] + sorted(ready[1:], key=lambda n: self._breakers[n].score())
+        return sorted(ready, key=lambda n: self._breakers[n].score())
+
+    def _record_usage(self, name: str, response: dict[str, Any]) -> None:
+        usage = response.get("usage")
+        if not isinstance(usage, dict):
+            return
+        totals = self._usage.setdefault(name, {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "cache_write_tokens": 0,
+        })
+        totals["requests"] += 1
+        for key in ("prompt_tokens", "completion_tokens", "cached_tokens", "cache_write_tokens"):
+            value = usage.get(key, 0)
+            if isinstance(value, int):
+                totals[key] += value
 
     def switch(self, name: str) -> str:
         """Switch the active provider.
@@ -123,55 +254,173 @@ class LLMManager(LLMProvider):
         logger.info("Switched LLM provider to: %s", canonical)
         return canonical
 
-    def _select_provider_for_query(self, messages: list[dict[str, Any]]) -> str:
-        """Select the best provider based on query complexity.
-
-        Simple queries → cheapest available provider
-        Complex queries → active (configured) provider
-
-        Args:
-            messages: The message list being sent to the LLM.
+    def _select_provider_for_query(
+        self,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """Select the provider to try first.
 
-        Returns:
-            Provider name to use.
+        With routing off, or in shadow mode, this is the active provider.
+        Candidates exclude providers whose circuit breaker is open.
         """
-        if not self._cost_routing:
+        if self._router is None:
             return self._active
 
-        # Only route based on the last user message
-        user_text = ""
-        for msg in reversed(messages):
-            if msg.get("role") == "user":
-                user_text = msg.get("content", "").lower()
-                break
-
-        if not user_text:
+        candidates = [
+            n for n in self._providers
+            if n not in self._breakers or self._breakers[n].available()
+        ] or [self._active]
+        routed, reason = self._router.choose(
+            candidates, self._active, messages, tools=tools, max_tokens=max_tokens,
+        )
+        if self._routing_mode == "shadow":
+            self._router.record_shadow(routed, self._active)
             return self._active
+        if routed != self._active:
+            logger.debug("Routing to %s (%s) instead of %s", routed, reason, self._active)
+        return routed
 
-        # Check for complexity indicators
-        is_complex = any(indicator in user_text for indicator in _COMPLEX_INDICATORS)
-        is_simple = any(indicator in user_text for indicator in _SIMPLE_INDICATORS)
-
-        # Short messages are likely simple
-        if len(user_text) < 30 and not is_complex:
-            is_simple = True
+    def _record_outcome(
+        self,
+        name: str,
+        started: float,
+        response: Optional[dict[str, Any]] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Feed a call's outcome to the provider's breaker, the router and the hedger."""
+        latency_ms = (time.monotonic() - started) * 1000
+        breaker = self._breakers.get(name)
+        if breaker is not None:
+            if error is None:
+                breaker.record_success(latency_ms)
+            else:
+                breaker.record_failure(error)
+        if self._router is not None:
+            self._router.record(name, error is None, latency_ms, response)
+        if self._hedge is not None and error is None:
+            self._hedge.record(name, latency_ms)
+
+    def _acquire(self, name: str) -> bool:
+        breaker = self._breakers.get(name)
+        return breaker is None or breaker.acquire()
+
+    def _release(self, name: str) -> None:
+        breaker = self._breakers.get(name)
+        if breaker is not None:
+            breaker.release()
+
+    def _request_hedge(self) -> Optional[HedgePolicy]:
+        """The hedge policy if this request may be hedged, else None."""
+        hedge = self._hedge
+        if hedge is None or not in_voice_request() or len(self._providers) < 2:
+            return None
+        hedge.start_request()
+        return hedge
+
+    def _hedge_backup(
+        self, hedge: HedgePolicy, order: list[str], tried: set[str]
+    ) -> Optional[str]:
+        """Claim a second provider for a hedge, if one is healthy and the cap allows it."""
+        backup = next(
+            (
+                n for n in order
+                if n not in tried
+                and (n not in self._breakers or self._breakers[n].available())
+            ),
+            None,
+        )
+        if backup is None:
+            hedge.no_backup()
+            return None
+        if not hedge.allow() or not self._acquire(backup):
+            return None
+        tried.add(backup)
+        return backup
+
+    async def _hedged(
+        self,
+        hedge: HedgePolicy,
+        primary: str,
+        order: list[str],
+        tried: set[str],
+        call: Callable[[str], Awaitable[T]],
+        deadline_key: str,
+        discard: Optional[Callable[[str, T], Awaitable[None]]] = None,
+    ) -> tuple[str, T]:
+        """Run ``call(primary)``, racing ``call(backup)`` if it misses the hedge deadline.
+
+        The deadline comes from the latencies recorded under ``deadline_key``.
+
+        The first successful call wins and the other is cancelled (or
+        handed to ``discard`` if it also finished). If both fail, the last
+        error is raised.
 
-        if is_simple and not is_complex:
-            # Route to cheapest available provider
-            sorted_providers = sorted(
-                self._providers.keys(),
-                key=lambda n: _COST_TIER.get(n, 99),
+        Returns:
+            The winning provider's name and its result.
+        """
+        tasks: dict[asyncio.Future[T], str] = {asyncio.ensure_future(call(primary)): primary}
+        winner: Optional[asyncio.Future[T]] = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge.delay_seconds(deadline_key))
+            if not done:
+                backup = self._hedge_backup(hedge, order, tried)
+                if backup is not None:
+                    logger.info("Hedging slow provider '%s' with '%s'", primary, backup)
+                    tasks[asyncio.ensure_future(call(backup))] = backup
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = winner or task
+                    else:
+                        error = task.exception()
+            if winner is None:
+                assert error is not None
+                raise error
+            if len(tasks) > 1:
+                hedge.finish(backup_won=tasks[winner] != primary)
+            return tasks[winner], winner.result()
+        finally:
+            losers = [task for task in tasks if task is not winner]
+            for task in losers:
+                task.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+            for task in losers:
+                if discard is not None and not task.cancelled() and task.exception() is None:
+                    await discard(tasks[task], task.result())
+
+    async def _chat_once(
+        self,
+        name: str,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> dict[str, Any]:
+        """One chat call to ``name``, whose breaker the caller has acquired."""
+        started = time.monotonic()
+        try:
+            result = await self._providers[name].chat(
+                messages=messages,
+                tools=tools,
+                temperature=temperature,
+                max_tokens=max_tokens,
             )
-            selected = sorted_providers[0]
-            if selected != self._active:
-                logger.debug(
-                    "Cost routing: simple query → %s (instead of %s)",
-                    selected,
-                    self._active,
-                )
-            return selected
-
-        return self._active
+        except asyncio.CancelledError:
+            self._release(name)
+            raise
+        except Exception as e:
+            self._record_outcome(name, started, error=e)
+            raise
+        self._record_outcome(name, started, response=result)
+        self._record_usage(name, result)
+        return result
 
     async def chat(
         self,
@@ -180,29 +429,50 @@ class LLMManager(LLMProvider):
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
     ) -> dict[str, Any]:
-        """Delegate chat to the selected provider, falling back to others on failure."""
-        # Select provider (cost routing or default)
-        selected = self._select_provider_for_query(messages)
+        """Delegate chat to the selected provider, falling back to others on failure.
 
-        # Build try order: selected provider first, then the rest
-        try_order = [selected] + [n for n in self._providers if n != selected]
+        On the voice path with hedging enabled, a slow first attempt is
+        raced against a second provider. Calls made inside
+        ``cache_responses()`` are served from the response cache when an
+        identical request was answered recently.
+        """
+        cache = self._response_cache
+        policy = current_policy() if cache is not None else None
+        cache_key: Optional[str] = None
+        if cache is not None and policy is not None:
+            cache_key = response_cache_key(messages, tools, temperature, max_tokens)
+            cached = cache.get(cache_key, policy.label)
+            if cached is not None:
+                return cached
+
+        selected = self._select_provider_for_query(messages, tools, max_tokens)
+        order = self._try_order(selected)
+        hedge = self._request_hedge()
+        tried: set[str] = set()
         last_error: Optional[Exception] = None
 
-        for name in try_order:
-            provider = self._providers[name]
+        async def call(name: str) -> dict[str, Any]:
+            return await self._chat_once(name, messages, tools, temperature, max_tokens)
+
+        for name in order:
+            if name in tried or not self._acquire(name):
+                continue
+            tried.add(name)
             try:
-                result = await provider.chat(
-                    messages=messages,
-                    tools=tools,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                )
+                if hedge is not None:
+                    # Only the first attempt is hedged
+                    hedging, hedge = hedge, None
+                    name, result = await self._hedged(hedging, name, order, tried, call, name)
+                else:
+                    result = await call(name)
                 if name != selected:
                     logger.warning(
                         "Provider '%s' failed, fell back to '%s' successfully",
                         selected,
                         name,
                     )
+                if cache is not None and policy is not None and cache_key is not None:
+                    cache.put(cache_key, result, policy.ttl_seconds)
                 return result
             except Exception as e:
                 last_error = e
@@ -215,27 +485,203 @@ class LLMManager(LLMProvider):
 
         # All providers failed — return a graceful error response
         logger.critical("All LLM providers failed. Last error: %s", last_error)
-        return {
-            "role": "assistant",
-            "content": "I'm having trouble reaching my AI services right now. Please try again in a moment.",
-            "tool_calls": [],
-            "finish_reason": "error",
-        }
+        return _all_providers_failed_response()
+
+    async def _open_stream(
+        self,
+        name: str,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> tuple[dict[str, Any], AsyncIterator[dict[str, Any]], float]:
+        """Start a stream from ``name`` and wait for its first event.
+
+        Returns:
+            The first event, the stream positioned after it, and the start time.
+        """
+        started = time.monotonic()
+        stream = self._providers[name].chat_stream(
+            messages=messages,
+            tools=tools,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        ).__aiter__()
+        try:
+            first = await stream.__anext__()
+        except asyncio.CancelledError:
+            self._release(name)
+            raise
+        except StopAsyncIteration:
+            error = RuntimeError(f"Provider '{name}' stream ended without events")
+            self._record_outcome(name, started, error=error)
+            raise error
+        except Exception as e:
+            self._record_outcome(name, started, error=e)
+            raise
+        if self._hedge is not None:
+            self._hedge.record(_first_event_key(name), (time.monotonic() - started) * 1000)
+        return first, stream, started
+
+    async def _discard_stream(
+        self,
+        name: str,
+        opened: tuple[dict[str, Any], AsyncIterator[dict[str, Any]], float],
+    ) -> None:
+        """Close a stream that lost a hedge race after it had started."""
+        self._release(name)
+        aclose = getattr(opened[1], "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception as e:
+                logger.debug("Error closing hedged stream from '%s': %s", name, e)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream from the selected provider, falling back to others on failure.
+
+        Fallback is only possible until the first event has been yielded;
+        a provider that fails mid-stream raises to the caller, since the
+        partial text has already been shown. Hedging, when it applies,
+        races the wait for the first event.
+        """
+        selected = self._select_provider_for_query(messages, tools, max_tokens)
+        order = self._try_order(selected)
+        hedge = self._request_hedge()
+        tried: set[str] = set()
+        last_error: Optional[Exception] = None
+
+        async def open_stream(
+            name: str,
+        ) -> tuple[dict[str, Any], AsyncIterator[dict[str, Any]], float]:
+            return await self._open_stream(name, messages, tools, temperature, max_tokens)
+
+        for name in order:
+            if name in tried or not self._acquire(name):
+                continue
+            tried.add(name)
+            try:
+                if hedge is not None:
+                    # Only the first attempt is hedged
+                    hedging, hedge = hedge, None
+                    name, opened = await self._hedged(
+                        hedging, name, order, tried, open_stream, _first_event_key(name),
+                        discard=self._discard_stream,
+                    )
+                else:
+                    opened = await open_stream(name)
+            except Exception as e:
+                last_error = e
+                logger.error(
+                    "Provider '%s' stream failed: %s: %s",
+                    name,
+                    type(e).__name__,
+                    str(e)[:200],
+                )
+                continue
+
+            if name != selected:
+                logger.warning(
+                    "Provider '%s' failed, fell back to '%s' successfully",
+                    selected,
+                    name,
+                )
+            first, stream, started = opened
+            # Cleared once the outcome is recorded; otherwise released in finally
+            claimed = True
+            try:
+                event = first
+                while True:
+                    if event.get("type") == "done":
+                        self._record_outcome(name, started, response=event["response"])
+                        claimed = False
+                        self._record_usage(name, event["response"])
+                    yield event
+                    try:
+                        event = await stream.__anext__()
+                    except StopAsyncIteration:
+                        return
+            except Exception as e:
+                # Partial text has been shown; no fallback now
+                self._record_outcome(name, started, error=e)
+                claimed = False
+                raise
+            finally:
+                # Cancelled, or the consumer stopped reading early
+                if claimed:
+                    self._release(name)
+
+        logger.critical("All LLM providers failed. Last error: %s", last_error)
+        response = _all_providers_failed_response()
+        yield text_event(response["content"])
+        yield done_event(response)
 
     async def embed(self, text: str) -> list[float]:
         """Delegate embedding to the embedding provider (always OpenAI).
 
+        Results are served from the embedding cache when one is configured.
         Returns an empty vector on failure so memory operations degrade
         gracefully instead of crashing.
         """
+        if self._embedding_cache is not None:
+            cached = await self._embedding_cache.get(self._embedding_model, text)
+            if cached is not None:
+                return cached
+
         try:
-            return await self._embedding_provider.embed(text)
+            if self._embedding_batcher is not None:
+                vector = await self._embedding_batcher.submit(text)
+            else:
+                vector = await self._embedding_provider.embed(text)
         except Exception as e:
             logger.error("Embedding failed: %s: %s", type(e).__name__, str(e)[:200])
             return []
 
+        if self._embedding_cache is not None:
+            await self._embedding_cache.put(self._embedding_model, text, vector)
+        return vector
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed several texts with one provider request for all cache misses.
+
+        Duplicate texts are embedded once. On failure every uncached text
+        gets an empty vector, mirroring embed().
+        """
+        results: dict[str, list[float]] = {}
+        if self._embedding_cache is not None:
+            results = await self._embedding_cache.get_many(self._embedding_model, texts)
+
+        missing = list(dict.fromkeys(t for t in texts if t not in results))
+        if missing:
+            try:
+                vectors = await self._embedding_provider.embed_many(missing)
+            except Exception as e:
+                logger.error(
+                    "Batch embedding of %d texts failed: %s: %s",
+                    len(missing),
+                    type(e).__name__,
+                    str(e)[:200],
+                )
+                vectors = [[] for _ in missing]
+
+            fresh = dict(zip(missing, vectors))
+            results.update(fresh)
+            if self._embedding_cache is not None:
+                await self._embedding_cache.put_many(self._embedding_model, fresh)
+
+        return [results.get(text, []) for text in texts]
+
     async def close(self) -> None:
         """Close all providers."""
+        if self._embedding_batcher is not None:
+            await self._embedding_batcher.close()
+
         closed: set[int] = set()
         for name, provider in self._providers.items():
             pid = id(provider)
@@ -245,3 +691,6 @@ class LLMManager(LLMProvider):
                     closed.add(pid)
                 except Exception as e:
                     logger.warning("Error closing provider '%s': %s", name, e)
+
+        if self._embedding_cache is not None:
+            self._embedding_cache.close()
@@ -7,14 +7,21 @@ with exponential backoff on rate limits and transient errors.
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from openai import AsyncOpenAI, APIError, RateLimitError, APITimeoutError
 
 from src.config.loader import LLMConfig
-from src.llm.provider import LLMProvider
+from src.llm.provider import (
+    LLMProvider,
+    is_context_length_error,
+    truncate_history,
+    usage_summary,
+)
+from src.llm.streaming import ToolCallAccumulator, done_event, text_event
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +30,121 @@ MAX_RETRIES = 3
 BASE_DELAY_SECONDS = 1.0
 MAX_DELAY_SECONDS = 16.0
 
+# Inputs per embeddings request (the API accepts up to 2048)
+EMBED_BATCH_SIZE = 256
+
+
+def order_for_prefix_cache(
+    messages: list[dict[str, Any]],
+    tools: Optional[list[dict[str, Any]]],
+) -> tuple[list[dict[str, Any]], Optional[list[dict[str, Any]]]]:
+    """Arrange a request so its static part forms a byte-stable prefix.
+
+    OpenAI caches the longest previously-seen prompt prefix automatically.
+    Tools are serialized ahead of the messages, so they are sorted by name
+    (registration order can differ between runs), and system messages are
+    moved ahead of the conversation.
+    """
+    system = [m for m in messages if m.get("role") == "system"]
+    if system and len(system) < len(messages) and messages[:len(system)] != system:
+        messages = system + [m for m in messages if m.get("role") != "system"]
+    if tools:
+        tools = sorted(tools, key=lambda t: t.get("function", t).get("name", ""))
+    return messages, tools
+
+
+def prompt_cache_key(
+    messages: list[dict[str, Any]],
+    tools: Optional[list[dict[str, Any]]],
+) -> str:
+    """Derive a routing key from the static prefix (system prompt + tool names).
+
+    Requests sharing a key are routed to the same cache shard, which raises
+    the hit rate for the shared prefix.
+    """
+    digest = hashlib.sha256()
+    for msg in messages:
+        if msg.get("role") != "system":
+            break
+        digest.update(str(msg.get("content", "")).encode("utf-8"))
+    for tool in tools or []:
+        digest.update(tool.get("function", tool).get("name", "").encode("utf-8"))
+    return f"rafi-{digest.hexdigest()[:16]}"
+
+
+def _openai_usage(usage: Any) -> dict[str, int]:
+    if not usage:
+        return usage_summary()
+    details = getattr(usage, "prompt_tokens_details", None)
+    return usage_summary(
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        cached_tokens=getattr(details, "cached_tokens", 0) if details else 0,
+    )
+
+
+async def embed_in_batches(
+    client: AsyncOpenAI,
+    model: str,
+    texts: list[str],
+) -> list[list[float]]:
+    """Embed texts with OpenAI's embeddings API, EMBED_BATCH_SIZE per request.
+
+    The endpoint accepts an array of inputs, so each chunk is one request,
+    retried with the same policy as OpenAIProvider.embed(). Providers
+    without their own embeddings API delegate here with an OpenAI client.
+    """
+    vectors: list[list[float]] = []
+    for offset in range(0, len(texts), EMBED_BATCH_SIZE):
+        chunk = texts[offset:offset + EMBED_BATCH_SIZE]
+        vectors.extend(await _embed_chunk(client, model, chunk))
+    return vectors
+
+
+async def _embed_chunk(client: AsyncOpenAI, model: str, texts: list[str]) -> list[list[float]]:
+    """Embed one chunk of texts with a single API request."""
+    last_error: Optional[Exception] = None
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            response = await client.embeddings.create(model=model, input=texts)
+            ordered = sorted(response.data, key=lambda item: item.index)
+            logger.debug("Generated %d embeddings in one request", len(ordered))
+            return [item.embedding for item in ordered]
+
+        except RateLimitError as e:
+            last_error = e
+            delay = min(BASE_DELAY_SECONDS * (2 ** attempt), MAX_DELAY_SECONDS)
+            logger.warning(
+                "OpenAI batch embedding rate limit (attempt %d/%d). Retrying in %.1fs",
+                attempt + 1,
+                MAX_RETRIES,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+        except (APIError, APITimeoutError) as e:
+            last_error = e
+            delay = min(BASE_DELAY_SECONDS * (2 ** attempt), MAX_DELAY_SECONDS)
+            logger.warning(
+                "OpenAI batch embedding error (attempt %d/%d): %s. Retrying in %.1fs",
+                attempt + 1,
+                MAX_RETRIES,
+                e,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+    logger.error("OpenAI batch embedding failed after %d attempts", MAX_RETRIES)
+    raise last_error or RuntimeError("OpenAI batch embedding failed with no specific error")
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI-based LLM provider with retry logic."""
 
+    # OpenAI-compatible endpoints may reject the prompt_cache_key parameter
+    SUPPORTS_PROMPT_CACHE_KEY = True
+
     def __init__(self, config: LLMConfig, api_key: Optional[str] = None, base_url: Optional[str] = None, model: Optional[str] = None) -> None:
         self._config = config
         key = api_key or config.api_key
@@ -51,16 +169,8 @@ class OpenAIProvider(LLMProvider):
         temp = temperature if temperature is not None else self._default_temperature
         tokens = max_tokens if max_tokens is not None else self._default_max_tokens
 
-        kwargs: dict[str, Any] = {
-            "model": self._model,
-            "messages": messages,
-            "temperature": temp,
-            "max_tokens": tokens,
-        }
-
-        if tools:
-            kwargs["tools"] = tools
-            kwargs["tool_choice"] = "auto"
+        messages, tools = order_for_prefix_cache(messages, tools)
+        kwargs = self._request_kwargs(messages, tools, temp, tokens)
 
         last_error: Optional[Exception] = None
 
@@ -75,6 +185,7 @@ class OpenAIProvider(LLMProvider):
                     "content": message.content,
                     "tool_calls": [],
                     "finish_reason": choice.finish_reason,
+                    "usage": _openai_usage(response.usage),
                 }
 
                 if message.tool_calls:
@@ -92,11 +203,12 @@ class OpenAIProvider(LLMProvider):
 
                 logger.debug(
                     "OpenAI chat completed. Model: %s, Finish reason: %s, "
-                    "Prompt tokens: %s, Completion tokens: %s",
+                    "Prompt tokens: %s (cached: %s), Completion tokens: %s",
                     self._model,
                     choice.finish_reason,
-                    response.usage.prompt_tokens if response.usage else "N/A",
-                    response.usage.completion_tokens if response.usage else "N/A",
+                    result["usage"]["prompt_tokens"],
+                    result["usage"]["cached_tokens"],
+                    result["usage"]["completion_tokens"],
                 )
 
                 return result
@@ -114,16 +226,9 @@ class OpenAIProvider(LLMProvider):
 
             except APIError as e:
                 # Handle context length exceeded by truncating history
-                if "context_length_exceeded" in str(e).lower() or (
-                    hasattr(e, "code") and e.code == "context_length_exceeded"
-                ):
+                if is_context_length_error(e):
                     logger.warning("Context length exceeded. Truncating conversation history.")
-                    # Keep system message and last few messages
-                    system_msgs = [m for m in messages if m.get("role") == "system"]
-                    other_msgs = [m for m in messages if m.get("role") != "system"]
-                    # Keep last half of non-system messages
-                    half = max(1, len(other_msgs) // 2)
-                    messages = system_msgs + other_msgs[-half:]
+                    messages = truncate_history(messages)
                     kwargs["messages"] = messages
                     last_error = e
                     continue
@@ -157,6 +262,142 @@ class OpenAIProvider(LLMProvider):
         logger.error("OpenAI chat failed after %d attempts", MAX_RETRIES)
         raise last_error or RuntimeError("OpenAI chat failed with no specific error")
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream a chat completion from OpenAI.
+
+        Text deltas are yielded as they arrive; tool-call fragments are
+        reassembled and returned in the final ``done`` event. Opening the
+        stream is retried like ``chat()``; errors after the first chunk
+        propagate to the caller.
+        """
+        temp = temperature if temperature is not None else self._default_temperature
+        tokens = max_tokens if max_tokens is not None else self._default_max_tokens
+
+        messages, tools = order_for_prefix_cache(messages, tools)
+        kwargs = self._request_kwargs(messages, tools, temp, tokens)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+
+        stream = await self._open_stream(kwargs)
+
+        content_parts: list[str] = []
+        tool_calls = ToolCallAccumulator()
+        finish_reason: Optional[str] = None
+        usage: Any = None
+
+        async for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if delta.content:
+                content_parts.append(delta.content)
+                yield text_event(delta.content)
+            for tc in delta.tool_calls or []:
+                func = tc.function
+                tool_calls.add(
+                    tc.index,
+                    call_id=tc.id,
+                    name=func.name if func else None,
+                    arguments=func.arguments if func else None,
+                )
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+
+        usage_counts = _openai_usage(usage)
+        logger.debug(
+            "OpenAI chat stream completed. Model: %s, Finish reason: %s, "
+            "Prompt tokens: %s (cached: %s), Completion tokens: %s",
+            self._model,
+            finish_reason,
+            usage_counts["prompt_tokens"],
+            usage_counts["cached_tokens"],
+            usage_counts["completion_tokens"],
+        )
+
+        yield done_event({
+            "role": "assistant",
+            "content": "".join(content_parts) or None,
+            "tool_calls": tool_calls.result(),
+            "finish_reason": finish_reason,
+            "usage": usage_counts,
+        })
+
+    def _request_kwargs(
+        self,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]],
+        temperature: float,
+        max_tokens: int,
+    ) -> dict[str, Any]:
+        """Build chat.completions.create kwargs shared by chat and chat_stream."""
+        kwargs: dict[str, Any] = {
+            "model": self._model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+        if tools:
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = "auto"
+
+        if self.SUPPORTS_PROMPT_CACHE_KEY:
+            kwargs["prompt_cache_key"] = prompt_cache_key(messages, tools)
+
+        return kwargs
+
+    async def _open_stream(self, kwargs: dict[str, Any]) -> Any:
+        """Open a streamed completion, retrying like ``chat()``.
+
+        Rate limits, timeouts and server errors are retried with backoff;
+        a prompt over the context window is retried at once with the
+        history truncated.
+        """
+        last_error: Optional[Exception] = None
+
+        for attempt in range(MAX_RETRIES):
+            try:
+                return await self._client.chat.completions.create(**kwargs)
+
+            except RateLimitError as e:
+                last_error = e
+
+            except APITimeoutError as e:
+                last_error = e
+
+            except APIError as e:
+                if is_context_length_error(e):
+                    logger.warning("Context length exceeded. Truncating conversation history.")
+                    kwargs["messages"] = truncate_history(kwargs["messages"])
+                    last_error = e
+                    continue
+                if not (hasattr(e, "status_code") and e.status_code and e.status_code >= 500):
+                    raise
+                last_error = e
+
+            delay = min(BASE_DELAY_SECONDS * (2 ** attempt), MAX_DELAY_SECONDS)
+            logger.warning(
+                "OpenAI stream open failed (attempt %d/%d): %s. Retrying in %.1fs",
+                attempt + 1,
+                MAX_RETRIES,
+                last_error,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+        logger.error("OpenAI chat stream failed after %d attempts", MAX_RETRIES)
+        raise last_error or RuntimeError("OpenAI chat stream failed with no specific error")
+
     async def embed(self, text: str) -> list[float]:
         """Generate an embedding using OpenAI's embedding API.
 
@@ -203,6 +444,14 @@ class OpenAIProvider(LLMProvider):
         logger.error("OpenAI embedding failed after %d attempts", MAX_RETRIES)
         raise last_error or RuntimeError("OpenAI embedding failed with no specific error")
 
+    def _embeddings_client(self) -> AsyncOpenAI:
+        """Client used by embed_many; subclasses without embeddings override it."""
+        return self._client
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Generate embeddings for many texts in as few requests as possible."""
+        return await embed_in_batches(self._embeddings_client(), self._embedding_model, texts)
+
     async def close(self) -> None:
         """Close the underlying OpenAI async client."""
         try:
@@ -7,7 +7,52 @@ must conform to, enabling provider-agnostic code throughout the application.
 from __future__ import annotations
 
 import abc
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
+
+from src.llm.streaming import done_event, text_event
+
+
+def usage_summary(
+    prompt_tokens: Any = 0,
+    completion_tokens: Any = 0,
+    cached_tokens: Any = 0,
+    cache_write_tokens: Any = 0,
+) -> dict[str, int]:
+    """Normalize provider token usage into the ``usage`` dict of a chat result.
+
+    ``prompt_tokens`` is the full prompt size including any cached prefix;
+    ``cached_tokens`` is the part served from the provider's prompt cache and
+    ``cache_write_tokens`` the part written to it (Anthropic only). Values
+    that are not ints (missing fields) count as zero.
+    """
+    def _count(value: Any) -> int:
+        return value if isinstance(value, int) else 0
+
+    return {
+        "prompt_tokens": _count(prompt_tokens),
+        "completion_tokens": _count(completion_tokens),
+        "cached_tokens": _count(cached_tokens),
+        "cache_write_tokens": _count(cache_write_tokens),
+    }
+
+
+def is_context_length_error(error: Exception) -> bool:
+    """Whether a provider error says the prompt exceeded the context window."""
+    if getattr(error, "code", None) == "context_length_exceeded":
+        return True
+    text = str(error).lower()
+    return "context_length_exceeded" in text or "prompt is too long" in text
+
+
+def truncate_history(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Keep the system messages and the later half of the rest.
+
+    Used to retry a request whose prompt exceeded the context window.
+    """
+    system_msgs = [m for m in messages if m.get("role") == "system"]
+    other_msgs = [m for m in messages if m.get("role") != "system"]
+    half = max(1, len(other_msgs) // 2)
+    return system_msgs + other_msgs[-half:]
 
 
 class LLMProvider(abc.ABC):
@@ -17,6 +62,10 @@ class LLMProvider(abc.ABC):
     (with optional tool/function calling) and text embedding.
     """
 
+    # Capabilities the adaptive router checks before sending a request
+    SUPPORTS_TOOLS = True
+    CONTEXT_WINDOW = 128_000
+
     @abc.abstractmethod
     async def chat(
         self,
@@ -43,12 +92,51 @@ class LLMProvider(abc.ABC):
                     - "function": {"name": str, "arguments": str (JSON)}.
                 - "role": "assistant"
                 - "finish_reason": Why the model stopped generating.
+            Providers that report token usage also include "usage", a dict
+            built by ``usage_summary()`` (prompt, completion and cached
+            token counts).
 
         Raises:
             Exception: On API errors after retries are exhausted.
         """
         ...
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream a chat completion as it is generated.
+
+        Providers with a streaming API should override this; the default
+        awaits ``chat()`` and replays the result as a single text event.
+
+        Args:
+            messages: Same as ``chat()``.
+            tools: Same as ``chat()``.
+            temperature: Same as ``chat()``.
+            max_tokens: Same as ``chat()``.
+
+        Yields:
+            ``{"type": "text", "text": str}`` events for each text fragment,
+            then exactly one ``{"type": "done", "response": dict}`` event whose
+            response has the same shape as ``chat()``'s return value.
+
+        Raises:
+            Exception: On API errors after retries are exhausted.
+        """
+        response = await self.chat(
+            messages=messages,
+            tools=tools,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        if response.get("content"):
+            yield text_event(response["content"])
+        yield done_event(response)
+
     @abc.abstractmethod
     async def embed(self, text: str) -> list[float]:
         """Generate an embedding vector for the given text.
@@ -65,6 +153,23 @@ class LLMProvider(abc.ABC):
         """
         ...
 
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Generate embedding vectors for several texts.
+
+        Providers whose API accepts multiple inputs per request should
+        override this; the default embeds each text in turn.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            One embedding vector per input text, in the same order.
+
+        Raises:
+            Exception: On API errors after retries are exhausted.
+        """
+        return [await self.embed(text) for text in texts]
+
     @abc.abstractmethod
     async def close(self) -> None:
         """Close the underlying HTTP client and release resources."""
@@ -0,0 +1,157 @@
+"""Response cache for repeatable LLM calls.
+
+Some auxiliary prompts are (near-)deterministic and often sent again with
+identical inputs: ISC criteria generation and verification at temperature
+0, heartbeat ticks whose gathered data has not changed, insight
+extraction over a daily log that is processed again. LLMManager answers
+those from this cache.
+
+Caching is opt-in per call site: only ``chat`` calls made inside
+:func:`cache_responses` are looked up or stored, each with the TTL and
+label the call site chose. Entries are keyed by a canonical hash of the
+messages, tools and sampling parameters, and the least recently used
+entry is evicted once the cache is full.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """TTL and metrics label for the cacheable calls of one call site."""
+
+    ttl_seconds: float
+    label: str
+
+
+_policy: ContextVar[Optional[CachePolicy]] = ContextVar("response_cache_policy", default=None)
+
+
+@contextlib.contextmanager
+def cache_responses(ttl_seconds: float, label: str) -> Iterator[None]:
+    """Let LLM chat calls inside the block be served from the response cache."""
+    token = _policy.set(CachePolicy(ttl_seconds, label))
+    try:
+        yield
+    finally:
+        _policy.reset(token)
+
+
+def current_policy() -> Optional[CachePolicy]:
+    """The cache policy of the current call, or None if it is not cacheable."""
+    return _policy.get()
+
+
+def response_cache_key(
+    messages: list[dict[str, Any]],
+    tools: Optional[list[dict[str, Any]]],
+    temperature: Optional[float],
+    max_tokens: Optional[int],
+) -> str:
+    """Return the cache key for a chat request.
+
+    The request is serialized with sorted keys, so dicts that differ only
+    in key order hash the same.
+    """
+    canonical = json.dumps(
+        {
+            "messages": messages,
+            "tools": tools or [],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Bounded LRU of chat responses with per-entry expiry."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self._max_entries = max_entries
+        self._clock = clock
+        # key -> (expires_at, response)
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+        # Metrics
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+        self._expired = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, label: str) -> Optional[dict[str, Any]]:
+        """Return a copy of the cached response, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= self._clock():
+            del self._entries[key]
+            self._expired += 1
+            entry = None
+        if entry is None:
+            self._misses[label] = self._misses.get(label, 0) + 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits[label] = self._hits.get(label, 0) + 1
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: str, response: dict[str, Any], ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl_seconds, copy.deepcopy(response))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of cache metrics for the dashboard."""
+        hits = sum(self._hits.values())
+        lookups = hits + sum(self._misses.values())
+        labels = sorted(set(self._hits) | set(self._misses))
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "expired": self._expired,
+            "evictions": self._evictions,
+            "by_call_site": {
+                label: {
+                    "hits": self._hits.get(label, 0),
+                    "misses": self._misses.get(label, 0),
+                }
+                for label in labels
+            },
+        }
@@ -0,0 +1,260 @@
+"""Latency-aware provider routing for LLMManager.
+
+The router keeps a rolling sample of recent calls per provider (latency,
+output tokens, success) and sends each request to the provider expected
+to answer fastest, given what the request needs:
+
+- tool schemas are only sent to providers with ``SUPPORTS_TOOLS``
+- the prompt plus reserved output must fit the provider's ``CONTEXT_WINDOW``
+- inside :func:`voice_request`, providers whose p95 latency exceeds the
+  voice SLO are avoided, and candidates are compared on p95 instead of p50
+
+Providers without enough samples are tried now and then (every
+``explore_every`` decisions) so their measurements stay current; until
+then the configured default is preferred. A measured provider must beat
+the default by ``switch_margin`` to take traffic from it, which keeps
+decisions from flapping between providers with similar latency.
+
+In shadow mode the manager keeps sending traffic to the active provider
+and only records what the router would have picked.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import math
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from src.llm.circuit_breaker import percentile
+from src.llm.provider import LLMProvider
+from src.llm.tokens import count_message_tokens, count_tokens, count_tools_tokens
+
+logger = logging.getLogger(__name__)
+
+ROUTING_MODES = ("off", "adaptive", "shadow")
+
+# Each failure in the window adds this much to a provider's latency score
+FAILURE_PENALTY = 4.0
+
+# A provider failing at least this often ranks last, whatever its latency
+MAX_FAILURE_RATE = 0.9
+
+_voice_request: ContextVar[bool] = ContextVar("voice_request", default=False)
+
+
+@contextlib.contextmanager
+def voice_request() -> Iterator[None]:
+    """Mark LLM calls made inside the block as on the voice path."""
+    token = _voice_request.set(True)
+    try:
+        yield
+    finally:
+        _voice_request.reset(token)
+
+
+def in_voice_request() -> bool:
+    """Whether the current call is inside :func:`voice_request`."""
+    return _voice_request.get()
+
+
+@dataclass
+class _Sample:
+    ok: bool
+    latency_ms: float
+    output_tokens: int
+
+
+class ProviderStats:
+    """Rolling sample of one provider's recent calls."""
+
+    def __init__(self, window: int) -> None:
+        self._samples: deque[_Sample] = deque(maxlen=window)
+
+    def record(self, ok: bool, latency_ms: float, output_tokens: int = 0) -> None:
+        self._samples.append(_Sample(ok, latency_ms, output_tokens))
+
+    @property
+    def samples(self) -> int:
+        return len(self._samples)
+
+    def _latencies(self) -> list[float]:
+        return [s.latency_ms for s in self._samples if s.ok]
+
+    def latency_ms(self, fraction: float) -> float:
+        """Latency percentile of successful calls."""
+        return percentile(self._latencies(), fraction)
+
+    def p50_ms(self) -> float:
+        return self.latency_ms(0.5)
+
+    def p95_ms(self) -> float:
+        return self.latency_ms(0.95)
+
+    def failure_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for s in self._samples if not s.ok) / len(self._samples)
+
+    def tokens_per_second(self) -> float:
+        ok = [s for s in self._samples if s.ok and s.latency_ms > 0]
+        seconds = sum(s.latency_ms for s in ok) / 1000
+        return sum(s.output_tokens for s in ok) / seconds if seconds else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "p50_ms": round(self.p50_ms(), 1),
+            "p95_ms": round(self.p95_ms(), 1),
+            "tokens_per_s": round(self.tokens_per_second(), 1),
+            "failure_rate": round(self.failure_rate(), 3),
+        }
+
+
+def _capability(provider: LLMProvider, name: str, expected: type, default: Any) -> Any:
+    value = getattr(type(provider), name, default)
+    return value if isinstance(value, expected) else default
+
+
+class AdaptiveRouter:
+    """Picks a provider per request from measured latency and failures."""
+
+    def __init__(
+        self,
+        providers: dict[str, LLMProvider],
+        window: int = 50,
+        min_samples: int = 5,
+        explore_every: int = 20,
+        switch_margin: float = 0.2,
+        voice_slo_ms: float = 2500.0,
+        output_reserve_tokens: int = 4096,
+    ) -> None:
+        self._providers = providers
+        self._stats = {name: ProviderStats(window) for name in providers}
+        self._min_samples = min_samples
+        self._explore_every = explore_every
+        self._switch_margin = switch_margin
+        self._voice_slo_ms = voice_slo_ms
+        self._output_reserve = output_reserve_tokens
+
+        # Metrics
+        self._decisions = 0
+        self._picks: dict[str, int] = {name: 0 for name in providers}
+        self._explored = 0
+        self._shadow_agree = 0
+        self._shadow_disagree = 0
+
+    def record(
+        self,
+        name: str,
+        ok: bool,
+        latency_ms: float,
+        response: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Record the outcome of a call to ``name``."""
+        stats = self._stats.get(name)
+        if stats is None:
+            return
+        output_tokens = 0
+        if response is not None:
+            usage = response.get("usage")
+            if isinstance(usage, dict) and isinstance(usage.get("completion_tokens"), int):
+                output_tokens = usage["completion_tokens"]
+            else:
+                output_tokens = count_tokens(str(response.get("content") or ""))
+        stats.record(ok, latency_ms, output_tokens)
+
+    def _fits(
+        self,
+        name: str,
+        prompt_tokens: int,
+        max_tokens: Optional[int],
+        needs_tools: bool,
+    ) -> bool:
+        provider = self._providers[name]
+        if needs_tools and _capability(provider, "SUPPORTS_TOOLS", bool, True) is False:
+            return False
+        window: int = _capability(provider, "CONTEXT_WINDOW", int, LLMProvider.CONTEXT_WINDOW)
+        return prompt_tokens + (max_tokens or self._output_reserve) <= window
+
+    def _latency(self, name: str, voice: bool) -> float:
+        """Latency the request should expect from ``name`` (inf if it never succeeds)."""
+        stats = self._stats[name]
+        if not stats.samples or stats.failure_rate() >= MAX_FAILURE_RATE:
+            return math.inf
+        return stats.p95_ms() if voice else stats.p50_ms()
+
+    def _score(self, name: str, voice: bool) -> float:
+        return self._latency(name, voice) * (1 + FAILURE_PENALTY * self._stats[name].failure_rate())
+
+    def choose(
+        self,
+        candidates: list[str],
+        default: str,
+        messages: list[dict[str, Any]],
+        tools: Optional[list[dict[str, Any]]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> tuple[str, str]:
+        """Pick a provider among ``candidates`` for this request.
+
+        Returns:
+            The provider name and a short reason for the choice.
+        """
+        self._decisions += 1
+        voice = in_voice_request()
+        prompt_tokens = sum(count_message_tokens(m) for m in messages) + count_tools_tokens(tools)
+        eligible = [
+            n for n in candidates if self._fits(n, prompt_tokens, max_tokens, bool(tools))
+        ]
+        if not eligible:
+            choice, reason = (default if default in candidates else candidates[0]), "no fit"
+            self._picks[choice] += 1
+            return choice, reason
+
+        measured = [n for n in eligible if self._stats[n].samples >= self._min_samples]
+        if voice:
+            within_slo = [n for n in measured if self._latency(n, True) <= self._voice_slo_ms]
+            if within_slo:
+                eligible = [n for n in eligible if n in within_slo or n not in measured]
+                measured = within_slo
+
+        unmeasured = [n for n in eligible if n not in measured]
+        if unmeasured and self._decisions % self._explore_every == 0:
+            choice, reason = unmeasured[0], "explore"
+            self._explored += 1
+        elif not measured:
+            choice, reason = (default if default in eligible else eligible[0]), "default"
+        else:
+            best = min(measured, key=lambda n: self._score(n, voice))
+            choice, reason = best, "fastest"
+            if best != default and default in measured:
+                if self._score(best, voice) >= self._score(default, voice) * (1 - self._switch_margin):
+                    choice, reason = default, "default within margin"
+            elif default in unmeasured:
+                # Keep the default until it has measurements of its own
+                choice, reason = default, "default"
+
+        self._picks[choice] += 1
+        return choice, reason
+
+    def record_shadow(self, routed: str, actual: str) -> None:
+        """Count whether a shadow decision matched the provider actually used."""
+        if routed == actual:
+            self._shadow_agree += 1
+        else:
+            self._shadow_disagree += 1
+            logger.debug("Shadow routing would use %s instead of %s", routed, actual)
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of router metrics for the dashboard."""
+        return {
+            "decisions": self._decisions,
+            "picks": dict(self._picks),
+            "explored": self._explored,
+            "shadow_agree": self._shadow_agree,
+            "shadow_disagree": self._shadow_disagree,
+            "providers": {name: stats.stats() for name, stats in self._stats.items()},
+        }
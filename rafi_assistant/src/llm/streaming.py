@@ -0,0 +1,71 @@
+"""Helpers for streamed chat completions.
+
+``LLMProvider.chat_stream`` yields plain dict events:
+
+  {"type": "text", "text": "<delta>"}        -- a fragment of assistant text
+  {"type": "done", "response": {...}}        -- the assembled final response
+
+The ``response`` in the final event has the same shape as ``chat()``'s return
+value, so callers can stream text to the user and then handle tool calls
+exactly as they would for a non-streamed completion.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+
+def text_event(text: str) -> dict[str, Any]:
+    """Build a text-delta stream event."""
+    return {"type": "text", "text": text}
+
+
+def done_event(response: dict[str, Any]) -> dict[str, Any]:
+    """Build the final stream event carrying the assembled response."""
+    return {"type": "done", "response": response}
+
+
+class ToolCallAccumulator:
+    """Reassembles tool calls from streamed fragments.
+
+    Both OpenAI and Anthropic stream a tool call as an opening fragment with
+    its id and name, followed by pieces of the JSON arguments string. The
+    fragments of different calls are keyed by the stream's own index.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[int, dict[str, Any]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._calls)
+
+    def add(
+        self,
+        index: int,
+        *,
+        call_id: Optional[str] = None,
+        name: Optional[str] = None,
+        arguments: Optional[str] = None,
+    ) -> None:
+        """Merge one fragment into the call at ``index``."""
+        call = self._calls.setdefault(index, {"id": "", "name": "", "arguments": ""})
+        if call_id:
+            call["id"] = call_id
+        if name:
+            call["name"] += name
+        if arguments:
+            call["arguments"] += arguments
+
+    def result(self) -> list[dict[str, Any]]:
+        """Return the assembled calls in OpenAI tool-call format, by index."""
+        return [
+            {
+                "id": call["id"],
+                "type": "function",
+                "function": {
+                    "name": call["name"],
+                    "arguments": call["arguments"] or "{}",
+                },
+            }
+            for _, call in sorted(self._calls.items())
+        ]
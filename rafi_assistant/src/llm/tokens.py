@@ -0,0 +1,72 @@
+"""Token counting for context budgeting.
+
+Uses tiktoken when it is installed and falls back to a character-based
+estimate otherwise. Counts are approximate for non-OpenAI providers either
+way, which is fine for budgeting: the budget leaves headroom below each
+model's real context window.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Framing tokens the chat format adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Average characters per token for English text when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+
+def _load_encoding() -> Optional[Any]:
+    try:
+        import tiktoken
+    except ImportError:
+        logger.info("tiktoken not installed; estimating token counts from length")
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("tiktoken encoding unavailable, estimating token counts: %s", e)
+        return None
+
+
+_ENCODING = _load_encoding()
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str) -> int:
+    """Return the token count of ``text`` (memoized by content)."""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def count_message_tokens(message: dict[str, Any]) -> int:
+    """Return the token cost of one chat message.
+
+    Stored messages carry a precomputed ``token_count`` column, which is
+    used as-is; anything else is counted from its content and tool calls.
+    """
+    stored = message.get("token_count")
+    if isinstance(stored, int) and stored >= 0:
+        return stored + MESSAGE_OVERHEAD_TOKENS
+
+    tokens = count_tokens(str(message.get("content") or ""))
+    for tc in message.get("tool_calls") or []:
+        func = tc.get("function", {})
+        tokens += count_tokens(func.get("name", "")) + count_tokens(func.get("arguments", ""))
+    return tokens + MESSAGE_OVERHEAD_TOKENS
+
+
+def count_tools_tokens(tools: Optional[list[dict[str, Any]]]) -> int:
+    """Return the approximate token cost of the tool schemas sent with a request."""
+    if not tools:
+        return 0
+    return count_tokens(json.dumps(tools, sort_keys=True))
@@ -533,6 +533,14 @@ RECALL_MEMORY_TOOL: dict[str, Any] = {
                     "description": "Maximum number of results to return (default 5).",
                     "default": 5,
                 },
+                "detailed": {
+                    "type": "boolean",
+                    "description": (
+                        "Return the original archived messages behind matching summaries "
+                        "of older conversations instead of the summaries themselves."
+                    ),
+                    "default": False,
+                },
             },
             "required": ["query"],
         },
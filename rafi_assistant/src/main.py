@@ -8,6 +8,7 @@ Loads config, initializes all services, starts:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import sys
@@ -24,6 +25,7 @@ from src.channels.processor import MessageProcessor
 from src.channels.telegram import TelegramAdapter
 from src.channels.whatsapp import WhatsAppAdapter
 from src.channels.manager import ChannelManager
+from src.db.postgres_client import PostgresClient
 from src.db.supabase_client import SupabaseClient
 from src.llm.openai_provider import OpenAIProvider
 from src.llm.anthropic_provider import AnthropicProvider
@@ -31,12 +33,20 @@ from src.llm.groq_provider import GroqProvider
 from src.llm.gemini_provider import GeminiProvider
 from src.llm.provider import LLMProvider
 from src.llm.llm_manager import LLMManager
+from src.llm.embedding_cache import EmbeddingCache
+from src.llm.response_cache import ResponseCache
+from src.services.calendar_store import DEFAULT_STORE_PATH, CalendarEventStore
 from src.services.calendar_service import CalendarService
 from src.services.email_service import EmailService
+from src.services.mailbox_cache import MailboxCache
+from src.services.google_executor import GoogleApiExecutor
 from src.services.task_service import TaskService
 from src.services.note_service import NoteService
 from src.services.weather_service import WeatherService
 from src.services.memory_service import MemoryService
+from src.services.memory_archive import MemoryArchive
+from src.services.local_vector_index import LocalVectorIndex
+from src.services.persistence_queue import PersistenceQueue
 from src.services.memory_files import MemoryFileService
 from src.services.cad_service import CadService
 from src.services.browser_service import BrowserService
@@ -44,6 +54,7 @@ from src.services.screen_service import ScreenService
 from src.voice.twilio_handler import TwilioHandler
 from src.voice.elevenlabs_agent import ElevenLabsAgent
 from src.voice.deepgram_stt import DeepgramSTT
+from src.voice.http_pool import PooledHTTPClient
 from src.orchestration.service_registry import ServiceRegistry
 try:
     from src.voice.conversation_manager import ConversationManager
@@ -121,8 +132,65 @@ def _create_llm_manager(config: AppConfig) -> LLMManager:
 
     default = llm_config.provider if llm_config.provider in providers else "openai"
 
+    embedding_cache = None
+    if llm_config.embedding_cache_size > 0:
+        embedding_cache = EmbeddingCache(
+            max_entries=llm_config.embedding_cache_size,
+            path=llm_config.embedding_cache_path or None,
+        )
+
+    response_cache = None
+    if llm_config.response_cache_size > 0:
+        response_cache = ResponseCache(max_entries=llm_config.response_cache_size)
+
     logger.info("Available LLM providers: %s (default: %s)", list(providers.keys()), default)
-    return LLMManager(providers=providers, default=default, embedding_provider=providers["openai"])
+    return LLMManager(
+        providers=providers,
+        default=default,
+        embedding_provider=providers["openai"],
+        embedding_cache=embedding_cache,
+        response_cache=response_cache,
+        embedding_model=llm_config.embedding_model,
+        embedding_batch_window_ms=llm_config.embedding_batch_window_ms,
+        context_token_budget=llm_config.context_token_budget,
+        context_token_budgets=llm_config.context_token_budgets,
+        routing_mode=llm_config.routing_mode,
+        router_options={
+            "min_samples": llm_config.router_min_samples,
+            "explore_every": llm_config.router_explore_every,
+            "switch_margin": llm_config.router_switch_margin,
+            "voice_slo_ms": llm_config.router_voice_slo_ms,
+            "output_reserve_tokens": llm_config.max_tokens,
+        },
+        hedging=(
+            {
+                "percentile": llm_config.hedge_percentile,
+                "min_delay_ms": llm_config.hedge_min_delay_ms,
+                "max_rate": llm_config.hedge_max_rate,
+            }
+            if llm_config.hedging_enabled
+            else None
+        ),
+        circuit_breaker=(
+            {
+                "window_seconds": llm_config.breaker_window_seconds,
+                "min_calls": llm_config.breaker_min_calls,
+                "error_rate_threshold": llm_config.breaker_error_rate,
+                "latency_threshold_ms": llm_config.breaker_latency_ms,
+                "cooldown_seconds": llm_config.breaker_cooldown_seconds,
+            }
+            if llm_config.circuit_breaker_enabled
+            else None
+        ),
+    )
+
+
+def _create_db(config: AppConfig) -> SupabaseClient:
+    """Create the database client for the configured backend."""
+    if config.supabase.backend == "asyncpg":
+        logger.info("Database backend: asyncpg pool")
+        return PostgresClient(config=config.supabase)
+    return SupabaseClient(config=config.supabase)
 
 
 @asynccontextmanager
@@ -140,20 +208,37 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         sys.exit(1)
 
     # Initialize database client
-    db = SupabaseClient(config=_config.supabase)
+    db = _create_db(_config)
     await db.initialize()
 
     # Initialize LLM providers
     llm = _create_llm_manager(_config)
 
-    # Initialize services (Google services degrade gracefully without OAuth)
-    calendar_service = CalendarService(config=_config, db=db)
+    # Initialize services (Google services degrade gracefully without OAuth).
+    # Both share one bounded pool so blocking Google I/O never runs on the loop.
+    google_executor = GoogleApiExecutor(
+        max_workers=_config.google.api_max_workers,
+        default_timeout=_config.google.api_timeout_seconds,
+    )
+    calendar_store = CalendarEventStore(
+        _config.google.calendar_store_path or DEFAULT_STORE_PATH,
+        timezone_name=_config.settings.timezone,
+    )
+    await asyncio.to_thread(calendar_store.load)
+    calendar_service = CalendarService(
+        config=_config, db=db, executor=google_executor, store=calendar_store,
+    )
     try:
         await calendar_service.initialize()
     except Exception as e:
         logger.warning("Calendar service unavailable: %s", e)
 
-    email_service = EmailService(config=_config, db=db)
+    email_service = EmailService(
+        config=_config,
+        db=db,
+        executor=google_executor,
+        mailbox=MailboxCache(db) if _config.google.mailbox_cache_enabled else None,
+    )
     try:
         await email_service.initialize()
     except Exception as e:
@@ -168,8 +253,55 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.warning("Weather service unavailable: %s", e)
 
-    memory_service = MemoryService(db=db, llm=llm)
+    memory_service = MemoryService(
+        db=db,
+        llm=llm,
+        search_mode=_config.memory.search_mode,
+        vector_candidates=_config.memory.search_vector_candidates,
+        text_candidates=_config.memory.search_text_candidates,
+        rrf_k=_config.memory.search_rrf_k,
+    )
+    memory_archive: MemoryArchive | None = None
+    if _config.memory.archive_enabled:
+        memory_archive = MemoryArchive(
+            db=db,
+            llm=llm,
+            archive_after_days=_config.memory.archive_after_days,
+            max_days_per_run=_config.memory.archive_max_days_per_run,
+            max_topics=_config.memory.archive_max_topics,
+            timezone_name=_config.settings.timezone,
+        )
+        memory_service.set_archive(memory_archive)
+    local_index: LocalVectorIndex | None = None
+    local_index_rebuild: asyncio.Task[None] | None = None
+    if _config.memory.local_index != "off":
+        local_index = LocalVectorIndex(_config.memory.local_index_dir or None)
+        await asyncio.to_thread(local_index.load)
+        memory_service.set_local_index(local_index, _config.memory.local_index)
+        if memory_archive:
+            memory_archive.set_local_index(local_index)
+        if local_index.needs_rebuild:
+            async def _rebuild_local_index() -> None:
+                try:
+                    await local_index.rebuild(db)
+                except Exception as e:
+                    logger.error("Local vector index rebuild failed: %s", e)
+
+            # First run, or an earlier export failed: mirror history in the background
+            local_index_rebuild = asyncio.create_task(
+                _rebuild_local_index(), name="local-index-rebuild"
+            )
     memory_files = MemoryFileService()
+    persistence_queue: PersistenceQueue | None = None
+    if _config.supabase.write_behind:
+        persistence_queue = PersistenceQueue(
+            memory=memory_service,
+            memory_files=memory_files,
+            max_size=_config.supabase.write_queue_size,
+            batch_size=_config.supabase.write_batch_size,
+            flush_interval=_config.supabase.write_flush_interval_ms / 1000,
+        )
+        persistence_queue.start()
 
     cad_service = CadService(db=db)
     
@@ -182,7 +314,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     screen_service = ScreenService(registry=None)
 
     # Initialize Deepgram STT
-    deepgram_stt = DeepgramSTT(api_key=_config.deepgram.api_key)
+    deepgram_stt = DeepgramSTT(
+        api_key=_config.deepgram.api_key,
+        http_client=PooledHTTPClient.from_config(
+            "https://api.deepgram.com", _config.deepgram.http_pool, name="deepgram"
+        ),
+    )
 
     # Initialize Twilio handler
     webhook_base_url = os.environ.get("WEBHOOK_BASE_URL", "")
@@ -201,6 +338,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         agent_name=_config.elevenlabs.agent_name,
         personality=_config.elevenlabs.personality,
         llm_model=_config.llm.model,
+        http_client=PooledHTTPClient.from_config(
+            "https://api.elevenlabs.io/v1", _config.elevenlabs.http_pool, name="elevenlabs"
+        ),
     )
 
     # Create ElevenLabs agent and connect to Twilio
@@ -330,7 +470,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Email
     async def _read_emails(count: int = 20, unread_only: bool = False) -> str:
-        emails = await email_service.list_emails(count=count, unread_only=unread_only)
+        emails = await email_service.list_emails(
+            count=count, unread_only=unread_only, message_format="metadata",
+        )
         if not emails:
             return "No emails found."
         lines = []
@@ -343,7 +485,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         return "\n".join(lines)
 
     async def _search_emails(query: str) -> str:
-        emails = await email_service.search_emails(query)
+        emails = await email_service.search_emails(query, message_format="metadata")
         if not emails:
             return "No emails matched your search."
         lines = []
@@ -440,8 +582,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         return await weather_service.get_weather_for_event(next_event)
 
     # Memory
-    async def _recall_memory(query: str, limit: int = 5) -> str:
-        results = await memory_service.search_memory(query=query, limit=limit)
+    async def _recall_memory(query: str, limit: int = 5, detailed: bool = False) -> str:
+        results = await memory_service.search_memory(
+            query=query, limit=limit, drill_down=detailed,
+        )
         if not results:
             return "I don't have any relevant memories about that."
         lines = []
@@ -481,13 +625,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # -- Register all tools with schemas for LLM function calling ------------
     tool_reg = registry.tools
 
-    def _register_if_enabled(name: str, func: Any, description: str) -> None:
+    def _register_if_enabled(name: str, func: Any, description: str, **options: Any) -> None:
         if name not in eligible_tool_names:
             logger.debug("Tool gated by skills: %s", name)
             return
         if name not in eligible_schema_map:
             logger.warning("Eligible tool missing schema: %s", name)
-        tool_reg.register_tool(name, func, description, schema=eligible_schema_map.get(name))
+        tool_reg.register_tool(
+            name, func, description, schema=eligible_schema_map.get(name), **options,
+        )
 
     # Calendar
     _register_if_enabled("read_calendar", _read_calendar, "List upcoming calendar events")
@@ -499,7 +645,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Email
     _register_if_enabled("read_emails", _read_emails, "Read recent emails")
     _register_if_enabled("search_emails", _search_emails, "Search emails")
-    _register_if_enabled("send_email", _send_email, "Send an email")
+    _register_if_enabled("send_email", _send_email, "Send an email", parallel=False)
 
     # Tasks
     _register_if_enabled("create_task", _create_task, "Create a task")
@@ -526,12 +672,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     _register_if_enabled("get_settings", _get_settings, "Get current settings")
 
     # CAD, Browser, Screen (return dicts/strings, auto-serialized by invoke())
-    _register_if_enabled("generate_cad", cad_service.generate_stl, "Generate a 3D CAD model")
-    _register_if_enabled("browse_web", browser_service.browse, "Navigate to a website")
-    _register_if_enabled("search_web", browser_service.search, "Search the web")
-    _register_if_enabled("mouse_move", screen_service.move_mouse, "Move mouse")
-    _register_if_enabled("mouse_click", screen_service.click, "Click mouse")
-    _register_if_enabled("keyboard_type", screen_service.type_text, "Type text")
+    _register_if_enabled(
+        "generate_cad", cad_service.generate_stl, "Generate a 3D CAD model", timeout=120.0,
+    )
+    _register_if_enabled(
+        "browse_web", browser_service.browse, "Navigate to a website", timeout=120.0,
+    )
+    _register_if_enabled(
+        "search_web", browser_service.search, "Search the web", timeout=120.0,
+    )
+    # Screen control acts on shared state, so calls run one at a time in order
+    _register_if_enabled("mouse_move", screen_service.move_mouse, "Move mouse", parallel=False)
+    _register_if_enabled("mouse_click", screen_service.click, "Click mouse", parallel=False)
+    _register_if_enabled("keyboard_type", screen_service.type_text, "Type text", parallel=False)
 
     # Obsidian Vault — registered directly (not skill-gated)
     vault_root = Path(os.environ.get("OBSIDIAN_VAULT_PATH", str(Path.home() / "Documents" / "myWork")))
@@ -610,6 +763,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             "claude_code", _claude_code,
             "Run a Claude Code agent for complex multi-step tasks",
             schema=TOOL_SCHEMA_MAP.get("claude_code"),
+            parallel=False,
+            timeout=900.0,
         )
         logger.info("Claude Code agent tool registered")
     else:
@@ -643,6 +798,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     app.state.llm_manager = llm
     app.state.calendar = calendar_service
     app.state.email = email_service
+    app.state.google_executor = google_executor
     app.state.tasks = task_service
     app.state.notes = note_service
     app.state.weather = weather_service
@@ -706,9 +862,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         memory_files=memory_files,
         isc_service=isc_service,
         learning_service=learning_service,
+        persistence=persistence_queue,
     )
 
     app.state.processor = processor
+    app.state.persistence_queue = persistence_queue
+    app.state.memory_archive = memory_archive
+    app.state.local_index = local_index
+    app.state.reminder_job = reminder_job
 
     # Channel adapters
     telegram_adapter = TelegramAdapter(
@@ -755,13 +916,22 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Register all scheduler callbacks and start
     _scheduler.set_briefing_callback(briefing_job.run)
-    _scheduler.set_reminder_callback(reminder_job.run)
     _scheduler.set_calendar_sync_callback(calendar_service.sync_events_to_cache)
     _scheduler.add_heartbeat(heartbeat.run)
+    if _config.google.mailbox_cache_enabled:
+        _scheduler.add_interval_job(
+            "mailbox_sync", email_service.sync_mailbox, _config.google.mailbox_sync_minutes
+        )
     _scheduler.add_daily_job("memory_promotion", memory_promotion.run, hour=23, minute=0)
     _scheduler.add_daily_job("learning_analysis", _run_learning_analysis, hour=23, minute=30)
+    if memory_archive:
+        _scheduler.add_daily_job(
+            "memory_archive", memory_archive.run, hour=_config.memory.archive_hour, minute=15
+        )
+    calendar_service.set_sync_listener(reminder_job.apply_sync)
     _scheduler.setup_jobs()
     _scheduler.start()
+    await reminder_job.start()
 
     logger.info("--- Rafi Assistant Services Status ---")
     logger.info("Database: ONLINE")
@@ -789,8 +959,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await _channel_manager.stop_all()
     if _scheduler:
         _scheduler.stop()
+    await reminder_job.stop()
+    if persistence_queue:
+        # Flush queued turns while the LLM (embeddings) and database are still up
+        await persistence_queue.close()
+    if local_index_rebuild and not local_index_rebuild.done():
+        local_index_rebuild.cancel()
+        await asyncio.gather(local_index_rebuild, return_exceptions=True)
     await weather_service.close()
+    await elevenlabs_agent.close()
+    await deepgram_stt.close()
     await llm.close()
+    await db.close()
+    google_executor.shutdown()
     logger.info("Shutdown complete")
 
 
@@ -901,6 +1082,61 @@ async def dashboard(request: Request) -> dict[str, Any]:
         },
         "daily_logs": log_stats,
         "tools": registry.tools.tool_names if registry.tools else [],
+        "google_api": request.app.state.google_executor.stats(),
+        "database": (
+            request.app.state.db.stats()
+            if hasattr(request.app.state.db, "stats")
+            else {"backend": "rest"}
+        ),
+        "voice_http": {
+            "elevenlabs": request.app.state.elevenlabs.http_stats(),
+            "deepgram": request.app.state.deepgram.http_stats(),
+        },
+        "message_pipeline_ms": request.app.state.processor.last_stage_timings,
+        "persistence_queue": (
+            request.app.state.persistence_queue.stats()
+            if request.app.state.persistence_queue
+            else {}
+        ),
+        "memory_archive": (
+            request.app.state.memory_archive.stats()
+            if request.app.state.memory_archive
+            else {}
+        ),
+        "calendar_store": request.app.state.calendar.stats(),
+        "mailbox_cache": request.app.state.email.stats(),
+        "reminders": (
+            request.app.state.reminder_job.stats()
+            if request.app.state.reminder_job
+            else {}
+        ),
+        "local_vector_index": (
+            request.app.state.local_index.stats()
+            if request.app.state.local_index
+            else {}
+        ),
+        "embedding_cache": (
+            registry.llm.embedding_cache_stats
+            if hasattr(registry.llm, "embedding_cache_stats")
+            else {}
+        ),
+        "llm_response_cache": (
+            registry.llm.response_cache_stats
+            if hasattr(registry.llm, "response_cache_stats")
+            else {}
+        ),
+        "llm_usage": (
+            registry.llm.usage_stats if hasattr(registry.llm, "usage_stats") else {}
+        ),
+        "llm_routing": (
+            registry.llm.router_stats if hasattr(registry.llm, "router_stats") else {}
+        ),
+        "llm_hedging": (
+            registry.llm.hedge_stats if hasattr(registry.llm, "hedge_stats") else {}
+        ),
+        "llm_breakers": (
+            registry.llm.breaker_stats if hasattr(registry.llm, "breaker_stats") else {}
+        ),
     }
 
 
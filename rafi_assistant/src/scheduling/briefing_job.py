@@ -85,7 +85,7 @@ class BriefingJob:
                 parts.append(f"📅 You have {len(events)} event(s) today:")
                 for event in events[:5]:
                     summary = event.get("summary", "Untitled event")
-                    start = event.get("start_time", "")
+                    start = event.get("start", "")
                     location = event.get("location", "")
                     line = f"  - {start}: {summary}"
                     if location:
@@ -107,7 +107,7 @@ class BriefingJob:
 
         # Unread emails
         try:
-            emails = await self._email.list_emails(unread_only=True)
+            emails = await self._email.list_emails(unread_only=True, message_format="metadata")
             if emails:
                 parts.append(f"\n📧 You have {len(emails)} unread email(s).")
                 for email in emails[:3]:
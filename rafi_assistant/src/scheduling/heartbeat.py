@@ -20,6 +20,7 @@ from typing import Any, Optional
 from src.channels.manager import ChannelManager
 from src.config.loader import AppConfig
 from src.llm.provider import LLMProvider
+from src.llm.response_cache import cache_responses
 from src.services.calendar_service import CalendarService
 from src.services.email_service import EmailService
 from src.services.memory_files import MemoryFileService
@@ -30,6 +31,10 @@ logger = logging.getLogger(__name__)
 
 HEARTBEAT_OK = "HEARTBEAT_OK"
 
+# A tick whose gathered data is unchanged reuses the previous evaluation
+# for this long
+HEARTBEAT_CACHE_TTL_SECONDS = 3600
+
 
 class HeartbeatRunner:
     """Proactive heartbeat that checks services and notifies the user."""
@@ -108,12 +113,13 @@ class HeartbeatRunner:
 
         # Ask LLM to evaluate
         try:
-            response = await self._llm.chat(
-                messages=[
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": "Run the heartbeat check now."},
-                ],
-            )
+            with cache_responses(HEARTBEAT_CACHE_TTL_SECONDS, "heartbeat"):
+                response = await self._llm.chat(
+                    messages=[
+                        {"role": "system", "content": prompt},
+                        {"role": "user", "content": "Run the heartbeat check now."},
+                    ],
+                )
             content = response.get("content", HEARTBEAT_OK)
         except Exception as e:
             logger.error("Heartbeat LLM error: %s", e)
@@ -152,7 +158,9 @@ class HeartbeatRunner:
 
         # Unread emails
         try:
-            emails = await self._email.list_emails(count=10, unread_only=True)
+            emails = await self._email.list_emails(
+                count=10, unread_only=True, message_format="metadata",
+            )
             if emails:
                 lines = [
                     f"- From: {e.get('from', '?')} | Subject: {e.get('subject', '?')}"
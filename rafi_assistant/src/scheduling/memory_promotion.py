@@ -13,10 +13,15 @@ import logging
 from typing import Any
 
 from src.llm.provider import LLMProvider
+from src.llm.response_cache import cache_responses
 from src.services.memory_files import MemoryFileService
 
 logger = logging.getLogger(__name__)
 
+# Reprocessing an unchanged log against unchanged memory reuses the
+# previous extraction for this long
+PROMOTION_CACHE_TTL_SECONDS = 86400
+
 PROMOTION_PROMPT = """\
 You are a memory curator for a personal AI assistant. Review the following daily \
 conversation log and extract insights worth preserving in long-term memory.
@@ -118,11 +123,12 @@ class MemoryPromotionJob:
         )
 
         try:
-            response = await self._llm.chat(
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2,
-                max_tokens=800,
-            )
+            with cache_responses(PROMOTION_CACHE_TTL_SECONDS, "memory_promotion"):
+                response = await self._llm.chat(
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.2,
+                    max_tokens=800,
+                )
             content = response.get("content", "{}")
             return self._parse_json_object(content)
         except Exception as e:
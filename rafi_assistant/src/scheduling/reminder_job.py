@@ -1,10 +1,18 @@
-"""Event reminder job: checks for upcoming events and sends reminders."""
+"""Event reminders: fires each reminder at its exact lead time.
+
+Upcoming events from ``events_cache`` are held in an in-process timer
+heap. The heap is loaded once at startup and updated from the changes each
+calendar sync writes, and from each snooze, so nothing is polled while no reminder is due.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, time as dt_time, timedelta
-from typing import TYPE_CHECKING, Any, Optional
+from datetime import datetime, time as dt_time, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from src.scheduling.timer_heap import TimerHeap
 
 if TYPE_CHECKING:
     from src.db.supabase_client import SupabaseClient
@@ -13,8 +21,20 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 class ReminderJob:
-    """Checks upcoming events and triggers reminder calls or messages."""
+    """Schedules upcoming events and triggers reminder calls or messages."""
 
     def __init__(
         self,
@@ -36,38 +56,115 @@ class ReminderJob:
         self._quiet_end = quiet_hours_end
         self._timezone = timezone
 
-    async def run(self) -> None:
-        """Check for upcoming events and send reminders."""
-        try:
-            events = await self._get_upcoming_events()
-            if not events:
-                return
+        self._timers = TimerHeap(self._fire)
+        # Cached event rows by events_cache id, for snoozes after a reminder fired
+        self._events: dict[str, dict[str, Any]] = {}
+        # Events whose reminder is being delivered (a call retry can take minutes)
+        self._delivering: set[str] = set()
 
-            for event in events:
-                await self._process_event_reminder(event)
+    async def start(self) -> None:
+        """Load pending reminders and start the timer task."""
+        await self.load()
+        self._timers.start()
 
-        except Exception as e:
-            logger.exception("Reminder job failed: %s", str(e))
+    async def stop(self) -> None:
+        await self._timers.stop()
 
-    async def _get_upcoming_events(self) -> list[dict[str, Any]]:
-        """Get events that need reminders from the cache."""
-        try:
-            now = datetime.utcnow()
-            window_end = now + timedelta(minutes=self._lead_minutes)
+    async def load(self) -> int:
+        """Schedule every unreminded event that starts (or is snoozed) in the future.
 
-            result = await self._db.select(
+        Returns:
+            Number of reminders scheduled.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            rows = await self._db.select(
                 "events_cache",
                 filters={
                     "reminded": False,
-                    "start_time__gte": now.isoformat(),
-                    "start_time__lte": window_end.isoformat(),
+                    "or": [{"start_time__gte": now}, {"snoozed_until__gte": now}],
                 },
             )
-            return result if result else []
-
         except Exception as e:
-            logger.error("Failed to fetch upcoming events: %s", str(e))
-            return []
+            logger.error("Failed to load upcoming events: %s", str(e))
+            return 0
+
+        for row in rows if isinstance(rows, list) else []:
+            self.schedule_event(row)
+        logger.info("Reminder timers loaded: %d pending", len(self._timers))
+        return len(self._timers)
+
+    def apply_sync(
+        self,
+        rows: Iterable[dict[str, Any]],
+        removed: Iterable[str] = (),
+        full: bool = False,
+    ) -> None:
+        """Apply a calendar sync to the timers.
+
+        Args:
+            rows: events_cache rows written by the sync.
+            removed: Google ids of events deleted from the cache.
+            full: The rows are every upcoming event; timers for events not
+                among them are dropped, except pending snoozes.
+        """
+        synced = set()
+        for row in rows:
+            if row.get("id"):
+                synced.add(str(row["id"]))
+                self.schedule_event(row)
+
+        removed = set(removed)
+        now = datetime.now(timezone.utc)
+        for key in self._timers.keys():
+            if key in synced:
+                continue
+            event = self._events.get(key, {})
+            if event.get("google_event_id") in removed:
+                self._drop(key)
+            elif full:
+                snoozed = _parse_timestamp(event.get("snoozed_until"))
+                if snoozed is None or snoozed <= now:
+                    self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        self._timers.cancel(key)
+        self._events.pop(key, None)
+
+    def schedule_event(self, event: dict[str, Any]) -> None:
+        """Set (or clear) the reminder timer for one events_cache row."""
+        event_id = event.get("id")
+        if not event_id:
+            return
+        key = str(event_id)
+        self._events[key] = event
+        if key in self._delivering:
+            return
+        fire_at = self._fire_time(event)
+        if fire_at is None:
+            self._timers.cancel(key)
+        else:
+            self._timers.schedule(key, fire_at, event)
+
+    def _fire_time(self, event: dict[str, Any]) -> Optional[datetime]:
+        """Snooze expiry if pending, else lead time before start; None if not needed."""
+        if event.get("reminded"):
+            return None
+        now = datetime.now(timezone.utc)
+        snoozed = _parse_timestamp(event.get("snoozed_until"))
+        if snoozed is not None and snoozed > now:
+            return snoozed
+        start = _parse_timestamp(event.get("start_time"))
+        if start is None or start <= now:
+            return None
+        return start - timedelta(minutes=self._lead_minutes)
+
+    async def _fire(self, key: str, event: dict[str, Any]) -> None:
+        self._delivering.add(key)
+        try:
+            await self._process_event_reminder(event)
+        finally:
+            self._delivering.discard(key)
 
     async def _process_event_reminder(self, event: dict[str, Any]) -> None:
         """Process a single event reminder."""
@@ -105,7 +202,6 @@ class ReminderJob:
             await self._mark_reminded(event_id)
         else:
             # Retry once after a short delay
-            import asyncio
             await asyncio.sleep(120)  # 2 minutes
 
             call_sid = await self._twilio.initiate_outbound_call(
@@ -125,11 +221,14 @@ class ReminderJob:
 
     async def _mark_reminded(self, event_id: str) -> None:
         """Mark an event as reminded in the cache."""
+        event = self._events.get(str(event_id))
+        if event is not None:
+            event["reminded"] = True
         try:
             await self._db.update(
                 "events_cache",
-                record_id=event_id,
-                data={"reminded": True},
+                {"id": event_id},
+                {"reminded": True},
             )
         except Exception as e:
             logger.error("Failed to mark event %s as reminded: %s", event_id, str(e))
@@ -151,19 +250,36 @@ class ReminderJob:
             snooze_minutes or self._snooze_minutes,
             self._snooze_minutes,
         )
+        until = datetime.now(timezone.utc) + timedelta(minutes=minutes)
 
         try:
-            await self._db.update(
+            row = await self._db.update(
                 "events_cache",
-                record_id=event_id,
-                data={"reminded": False},
+                {"id": event_id},
+                {"reminded": False, "snoozed_until": until.isoformat()},
             )
-            logger.info("Snoozed reminder for event %s for %d minutes", event_id, minutes)
-            return True
         except Exception as e:
             logger.error("Failed to snooze reminder for %s: %s", event_id, str(e))
             return False
 
+        event = row if isinstance(row, dict) else self._events.get(str(event_id))
+        event = {
+            **(event or {"id": event_id}),
+            "reminded": False,
+            "snoozed_until": until.isoformat(),
+        }
+        self.schedule_event(event)
+        logger.info("Snoozed reminder for event %s for %d minutes", event_id, minutes)
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of reminder timers for the dashboard."""
+        return {
+            "lead_minutes": self._lead_minutes,
+            "delivering": len(self._delivering),
+            **self._timers.stats(),
+        }
+
     def _is_quiet_hours(self) -> bool:
         """Check if current time is within quiet hours."""
         try:
@@ -1,9 +1,12 @@
-"""APScheduler setup for recurring jobs: briefings, reminders, calendar sync."""
+"""APScheduler setup for recurring jobs: briefings, calendar sync, heartbeat.
+
+Event reminders are not polled; ReminderJob fires them from its own timers.
+"""
 
 from __future__ import annotations
 
 import logging
-from datetime import time as dt_time
+from datetime import datetime, time as dt_time, timezone
 from typing import TYPE_CHECKING, Any, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -19,7 +22,7 @@ MISFIRE_GRACE_TIME = 300  # 5 minutes
 
 
 class RafiScheduler:
-    """Manages scheduled jobs: morning briefing, reminders, calendar sync."""
+    """Manages scheduled jobs: morning briefing, calendar sync, heartbeat."""
 
     def __init__(self, config: AppConfig) -> None:
         self._config = config
@@ -31,7 +34,6 @@ class RafiScheduler:
             }
         )
         self._briefing_callback: Optional[Any] = None
-        self._reminder_callback: Optional[Any] = None
         self._calendar_sync_callback: Optional[Any] = None
         self._heartbeat_callback: Optional[Any] = None
         self._heartbeat_interval: int = 30
@@ -44,10 +46,6 @@ class RafiScheduler:
         """Set the callback function for morning briefings."""
         self._briefing_callback = callback
 
-    def set_reminder_callback(self, callback: Any) -> None:
-        """Set the callback function for event reminders."""
-        self._reminder_callback = callback
-
     def set_calendar_sync_callback(self, callback: Any) -> None:
         """Set the callback function for calendar sync."""
         self._calendar_sync_callback = callback
@@ -86,10 +84,27 @@ class RafiScheduler:
         )
         logger.info("Daily job '%s' scheduled at %02d:%02d", job_id, hour, minute)
 
+    def add_interval_job(self, job_id: str, callback: Any, minutes: int) -> None:
+        """Register a job that runs at startup and then every ``minutes``.
+
+        Args:
+            job_id: Unique job identifier.
+            callback: Async function to run.
+            minutes: Interval between runs.
+        """
+        self._scheduler.add_job(
+            callback,
+            trigger=IntervalTrigger(minutes=minutes),
+            id=job_id,
+            name=job_id.replace("_", " ").title(),
+            replace_existing=True,
+            next_run_time=datetime.now(timezone.utc),
+        )
+        logger.info("Interval job '%s' scheduled every %d minutes", job_id, minutes)
+
     def setup_jobs(self) -> None:
         """Configure all scheduled jobs based on current settings."""
         self._setup_briefing_job()
-        self._setup_reminder_job()
         self._setup_calendar_sync_job()
         self._setup_heartbeat_job()
         logger.info("All scheduled jobs configured")
@@ -124,33 +139,20 @@ class RafiScheduler:
             self._config.settings.timezone,
         )
 
-    def _setup_reminder_job(self) -> None:
-        """Schedule the reminder check job (runs every minute)."""
-        if not self._reminder_callback:
-            logger.warning("No reminder callback set, skipping reminder job")
-            return
-
-        self._scheduler.add_job(
-            self._reminder_callback,
-            trigger=IntervalTrigger(minutes=1),
-            id="reminder_check",
-            name="Reminder Check",
-            replace_existing=True,
-        )
-        logger.info("Reminder check scheduled every 1 minute")
-
     def _setup_calendar_sync_job(self) -> None:
         """Schedule the calendar sync job (every 15 minutes)."""
         if not self._calendar_sync_callback:
             logger.warning("No calendar sync callback set, skipping sync job")
             return
 
+        # First run at startup, so reads are served from a fresh local copy
         self._scheduler.add_job(
             self._calendar_sync_callback,
             trigger=IntervalTrigger(minutes=15),
             id="calendar_sync",
             name="Calendar Sync",
             replace_existing=True,
+            next_run_time=datetime.now(timezone.utc),
         )
         logger.info("Calendar sync scheduled every 15 minutes")
 
@@ -0,0 +1,133 @@
+"""In-process timers: a min-heap of keyed fire times served by one task.
+
+Used for work that must happen at an exact moment (event reminders)
+without polling. Each key has at most one pending timer; scheduling a
+key again replaces its timer. Replaced and cancelled entries stay in
+the heap and are skipped when they reach the top.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Longest single sleep. Re-checking the wall clock this often keeps timers
+# accurate across system suspend and clock changes; it costs no I/O.
+MAX_SLEEP_SECONDS = 300.0
+
+TimerCallback = Callable[[str, Any], Awaitable[None]]
+
+
+class TimerHeap:
+    """Fires ``callback(key, payload)`` at each scheduled time.
+
+    Callbacks run as separate tasks, so a slow one (a reminder call with
+    retries) does not delay the timers behind it.
+    """
+
+    def __init__(self, callback: TimerCallback) -> None:
+        self._callback = callback
+        self._heap: list[tuple[float, int, str]] = []
+        # key -> (fire timestamp, sequence, payload) of the live entry
+        self._entries: dict[str, tuple[float, int, Any]] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._running: set[asyncio.Task[None]] = set()
+        self._fired = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def schedule(self, key: str, when: datetime, payload: Any = None) -> None:
+        """Fire ``key`` at ``when`` (immediately if it has passed), replacing any pending timer."""
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        fire_at = when.timestamp()
+        seq = next(self._seq)
+        self._entries[key] = (fire_at, seq, payload)
+        heapq.heappush(self._heap, (fire_at, seq, key))
+        self._wakeup.set()
+
+    def cancel(self, key: str) -> bool:
+        """Drop the pending timer for ``key``; returns False if there was none."""
+        return self._entries.pop(key, None) is not None
+
+    def keys(self) -> list[str]:
+        return list(self._entries)
+
+    def next_fire_time(self) -> Optional[datetime]:
+        """When the earliest pending timer fires, or None if none are pending."""
+        self._discard_stale()
+        if not self._heap:
+            return None
+        return datetime.fromtimestamp(self._heap[0][0], tz=timezone.utc)
+
+    def start(self) -> None:
+        """Start serving timers on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="timer-heap")
+
+    async def stop(self) -> None:
+        """Stop the timer task and cancel callbacks still running."""
+        tasks = [t for t in (self._task, *self._running) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def _discard_stale(self) -> None:
+        while self._heap:
+            _, seq, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == seq:
+                return
+            heapq.heappop(self._heap)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            self._discard_stale()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), min(delay, MAX_SLEEP_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, key = heapq.heappop(self._heap)
+            _, _, payload = self._entries.pop(key)
+            self._fired += 1
+            task = asyncio.create_task(self._fire(key, payload))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _fire(self, key: str, payload: Any) -> None:
+        try:
+            await self._callback(key, payload)
+        except Exception:
+            logger.exception("Timer callback failed for %s", key)
+
+    def stats(self) -> dict[str, Any]:
+        next_fire = self.next_fire_time()
+        return {
+            "pending": len(self._entries),
+            "next_fire_at": next_fire.isoformat() if next_fire else None,
+            "fired": self._fired,
+            "running": len(self._running),
+        }
@@ -1,5 +1,7 @@
 import logging
 import asyncio
+import os
+import tempfile
 from typing import Optional, Dict, Any, List
 from playwright.async_api import async_playwright
 
@@ -16,14 +18,17 @@ class BrowserService:
         self.browser = None
         self.context = None
         self._playwright = None
+        # Tool calls may run concurrently; only the first starts the browser
+        self._init_lock = asyncio.Lock()
 
     async def initialize(self):
         """Start the playwright instance."""
-        if not self._playwright:
-            self._playwright = await async_playwright().start()
-            self.browser = await self._playwright.chromium.launch(headless=True)
-            self.context = await self.browser.new_context()
-            logger.info("BrowserService initialized")
+        async with self._init_lock:
+            if not self._playwright:
+                self._playwright = await async_playwright().start()
+                self.browser = await self._playwright.chromium.launch(headless=True)
+                self.context = await self.browser.new_context()
+                logger.info("BrowserService initialized")
 
     async def shutdown(self):
         """Close browser and playwright."""
@@ -60,10 +65,10 @@ class BrowserService:
                 """
             )
             
-            # Take a screenshot for the 'vision' part of the ADA parity
-            import tempfile
-            import os
-            screenshot_path = os.path.join(tempfile.gettempdir(), f"browsing_{int(asyncio.get_event_loop().time())}.png")
+            # Take a screenshot for the 'vision' part of the ADA parity.
+            # A unique file per call, since concurrent browses must not share one.
+            fd, screenshot_path = tempfile.mkstemp(prefix="browsing_", suffix=".png")
+            os.close(fd)
             await page.screenshot(path=screenshot_path)
             
             return {
@@ -1,16 +1,18 @@
 """Google Calendar service for event management.
 
 Provides CRUD operations on Google Calendar events, with automatic
-OAuth token refresh, event caching to Supabase, and location extraction
+OAuth token refresh, incremental sync into a local event store (mirrored
+to the Supabase events_cache for reminders), and location extraction
 for weather lookups.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from cryptography.fernet import Fernet
 from google.auth.transport.requests import Request as GoogleAuthRequest
@@ -21,6 +23,12 @@ from googleapiclient.errors import HttpError
 from src.config.loader import AppConfig
 from src.db.supabase_client import SupabaseClient
 from src.security.validators import safe_get
+from src.services.calendar_store import CalendarEventStore
+from src.services.google_executor import (
+    GoogleApiExecutor,
+    GoogleApiTimeoutError,
+    build_thread_safe_request_builder,
+)
 from src.utils.async_utils import await_if_needed
 
 logger = logging.getLogger(__name__)
@@ -29,16 +37,63 @@ SCOPES = [
     "https://www.googleapis.com/auth/calendar",
 ]
 
+# Page size requested from events.list
+MAX_LIST_RESULTS = 100
+
+# Window held by the local event store (list_events reads up to 30 days ahead)
+STORE_DAYS_BACK = 1
+STORE_DAYS_AHEAD = 31
+
+SyncListener = Callable[[list[dict[str, Any]], list[str], bool], Any]
+
+
+def _event_from_item(item: dict[str, Any]) -> dict[str, Any]:
+    """Convert an events.list item to the event dict returned by this service."""
+    start = safe_get(item.get("start", {}), "dateTime") or safe_get(
+        item.get("start", {}), "date", ""
+    )
+    end = safe_get(item.get("end", {}), "dateTime") or safe_get(
+        item.get("end", {}), "date", ""
+    )
+    return {
+        "id": item.get("id", ""),
+        "summary": item.get("summary", "(No title)"),
+        "start": start,
+        "end": end,
+        "location": item.get("location", ""),
+        "description": item.get("description", ""),
+    }
+
+
+def _cache_row(event: dict[str, Any], synced_at: str) -> dict[str, Any]:
+    return {
+        "google_event_id": event["id"],
+        "summary": event.get("summary", ""),
+        "location": event.get("location", ""),
+        "start_time": event.get("start", ""),
+        "end_time": event.get("end", ""),
+        "synced_at": synced_at,
+    }
+
 
 class CalendarService:
     """Google Calendar API wrapper with caching and token management."""
 
-    def __init__(self, config: AppConfig, db: SupabaseClient) -> None:
+    def __init__(
+        self,
+        config: AppConfig,
+        db: SupabaseClient,
+        executor: Optional[GoogleApiExecutor] = None,
+        store: Optional[CalendarEventStore] = None,
+    ) -> None:
         self._config = config
         self._db = db
+        self._executor = executor or GoogleApiExecutor()
+        self._store = store or CalendarEventStore(timezone_name=config.settings.timezone)
         self._service: Any = None
         self._credentials: Optional[Credentials] = None
         self._fernet: Optional[Fernet] = None
+        self._sync_listener: Optional[SyncListener] = None
 
         encryption_key = os.environ.get("OAUTH_ENCRYPTION_KEY")
         if encryption_key:
@@ -121,7 +176,7 @@ class CalendarService:
 
         if should_refresh and self._credentials.refresh_token:
             try:
-                self._credentials.refresh(GoogleAuthRequest())
+                await self._executor.run(self._credentials.refresh, GoogleAuthRequest())
                 logger.info("Google OAuth token refreshed successfully")
 
                 # Store refreshed tokens
@@ -193,7 +248,14 @@ class CalendarService:
                 return
 
             # static_discovery=False fixes "Method doesn't allow unregistered callers" in some environments
-            self._service = build("calendar", "v3", credentials=credentials, static_discovery=False)
+            self._service = await self._executor.run(
+                build,
+                "calendar",
+                "v3",
+                credentials=credentials,
+                static_discovery=False,
+                requestBuilder=build_thread_safe_request_builder(credentials),
+            )
             logger.info("Google Calendar service initialized successfully")
         except Exception as e:
             logger.error("Failed to initialize Calendar service: %s", e)
@@ -220,6 +282,9 @@ class CalendarService:
     async def list_events(self, days: int = 7, *, _retry: bool = True) -> list[dict[str, Any]]:
         """List upcoming calendar events.
 
+        Served from the local event store while it is fresh; otherwise
+        fetched from Google.
+
         Args:
             days: Number of days ahead to look (default 7, max 30).
 
@@ -227,42 +292,26 @@ class CalendarService:
             List of event dictionaries with id, summary, start, end, location.
         """
         days = min(max(days, 1), 30)
-        service = await self._get_service()
-
         now = datetime.now(timezone.utc)
         time_max = now + timedelta(days=days)
+        if self._store.covers(now, time_max, now):
+            return self._store.events_between(now, time_max)
+
+        service = await self._get_service()
 
         try:
-            result = (
-                service.events()
-                .list(
+            result = await self._executor.execute(
+                service.events().list(
                     calendarId="primary",
                     timeMin=now.isoformat(),
                     timeMax=time_max.isoformat(),
-                    maxResults=100,
+                    maxResults=MAX_LIST_RESULTS,
                     singleEvents=True,
                     orderBy="startTime",
                 )
-                .execute()
             )
 
-            events = []
-            for item in result.get("items", []):
-                start = safe_get(item.get("start", {}), "dateTime") or safe_get(
-                    item.get("start", {}), "date", ""
-                )
-                end = safe_get(item.get("end", {}), "dateTime") or safe_get(
-                    item.get("end", {}), "date", ""
-                )
-
-                events.append({
-                    "id": item.get("id", ""),
-                    "summary": item.get("summary", "(No title)"),
-                    "start": start,
-                    "end": end,
-                    "location": item.get("location", ""),
-                    "description": item.get("description", ""),
-                })
+            events = [_event_from_item(item) for item in result.get("items", [])]
 
             logger.info("Retrieved %d calendar events for next %d days", len(events), days)
             return events
@@ -284,6 +333,9 @@ class CalendarService:
                     "Google Calendar access forbidden. Check OAuth client, scopes, and API access."
                 ) from e
 
+            raise
+        except GoogleApiTimeoutError:
+            # Re-initializing would only queue more work behind a slow API
             raise
         except Exception as e:
             logger.error("Failed to list calendar events: %s", e)
@@ -324,13 +376,12 @@ class CalendarService:
             event_body["location"] = location
 
         try:
-            result = (
-                service.events()
-                .insert(calendarId="primary", body=event_body)
-                .execute()
+            result = await self._executor.execute(
+                service.events().insert(calendarId="primary", body=event_body)
             )
 
             logger.info("Created calendar event: %s (ID: %s)", summary, result.get("id"))
+            self._store.upsert(_event_from_item(result))
 
             return {
                 "id": result.get("id", ""),
@@ -363,10 +414,8 @@ class CalendarService:
 
         try:
             # Fetch existing event
-            existing = (
-                service.events()
-                .get(calendarId="primary", eventId=event_id)
-                .execute()
+            existing = await self._executor.execute(
+                service.events().get(calendarId="primary", eventId=event_id)
             )
 
             # Apply updates
@@ -381,13 +430,12 @@ class CalendarService:
             if "description" in updates:
                 existing["description"] = updates["description"]
 
-            result = (
-                service.events()
-                .update(calendarId="primary", eventId=event_id, body=existing)
-                .execute()
+            result = await self._executor.execute(
+                service.events().update(calendarId="primary", eventId=event_id, body=existing)
             )
 
             logger.info("Updated calendar event: %s", event_id)
+            self._store.upsert(_event_from_item(result))
 
             return {
                 "id": result.get("id", ""),
@@ -413,11 +461,12 @@ class CalendarService:
         service = await self._get_service()
 
         try:
-            service.events().delete(
-                calendarId="primary", eventId=event_id
-            ).execute()
+            await self._executor.execute(
+                service.events().delete(calendarId="primary", eventId=event_id)
+            )
 
             logger.info("Deleted calendar event: %s", event_id)
+            self._store.remove(event_id)
             return True
 
         except Exception as e:
@@ -435,43 +484,159 @@ class CalendarService:
             return events[0]
         return None
 
+    def set_sync_listener(self, callback: SyncListener) -> None:
+        """Register a callback for events_cache changes after each sync.
+
+        Called with the cached rows written (with their ids and reminder
+        state), the Google ids removed, and whether the sync was a full
+        one (in which case the rows are every cached upcoming event).
+        """
+        self._sync_listener = callback
+
+    @property
+    def store(self) -> CalendarEventStore:
+        return self._store
+
+    async def sync(self) -> dict[str, Any]:
+        """Bring the local event store up to date with Google.
+
+        Uses the stored sync token to fetch only events changed since the
+        last sync. Without a token, once a day (to slide the window), or
+        when Google expires the token (HTTP 410), the window is re-listed.
+
+        Returns:
+            Dict with "full" (bool), "changed" (events stored) and
+            "removed" (event ids dropped).
+        """
+        now = datetime.now(timezone.utc)
+        if not self._store.needs_full_sync(now):
+            try:
+                items, token = await self._list_pages(syncToken=self._store.sync_token)
+            except HttpError as e:
+                if getattr(e.resp, "status", None) != 410:
+                    raise
+                logger.info("Calendar sync token expired; running a full sync")
+            else:
+                changed = [_event_from_item(i) for i in items if i.get("status") != "cancelled"]
+                cancelled = [i["id"] for i in items if i.get("status") == "cancelled" and i.get("id")]
+                stored, removed = self._store.apply(changed, cancelled, token, now)
+                await asyncio.to_thread(self._store.save)
+                return {"full": False, "changed": stored, "removed": removed}
+
+        window_start = now - timedelta(days=STORE_DAYS_BACK)
+        window_end = now + timedelta(days=STORE_DAYS_AHEAD)
+        items, token = await self._list_pages(
+            timeMin=window_start.isoformat(),
+            timeMax=window_end.isoformat(),
+        )
+        events = [_event_from_item(i) for i in items if i.get("status") != "cancelled"]
+        removed = self._store.replace(events, token, window_start, window_end, now)
+        await asyncio.to_thread(self._store.save)
+        return {"full": True, "changed": events, "removed": removed}
+
+    async def _list_pages(self, **params: Any) -> tuple[list[dict[str, Any]], Optional[str]]:
+        """Fetch every page of an events.list call.
+
+        Returns:
+            The items and the ``nextSyncToken`` from the last page.
+        """
+        service = await self._get_service()
+        items: list[dict[str, Any]] = []
+        page_token: Optional[str] = None
+        while True:
+            result = await self._executor.execute(
+                service.events().list(
+                    calendarId="primary",
+                    singleEvents=True,
+                    maxResults=MAX_LIST_RESULTS,
+                    pageToken=page_token,
+                    **params,
+                )
+            )
+            items.extend(result.get("items", []))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return items, result.get("nextSyncToken")
+
     async def sync_events_to_cache(self) -> int:
-        """Sync upcoming events to the Supabase events_cache table.
+        """Sync the calendar and mirror the changes into events_cache.
 
-        Fetches events for the next 7 days and upserts them into the cache.
-        Used by the reminder scheduler to check for upcoming events.
+        Runs :meth:`sync`, then upserts only the upcoming events that
+        changed and deletes the ones removed. After a full sync, cached
+        upcoming rows Google no longer lists are deleted too. The cache
+        changes are then passed to the sync listener, which keeps the
+        reminder timers current.
 
         Returns:
-            Number of events synced.
+            Number of events written to the cache.
         """
         try:
-            events = await self.list_events(days=7)
-            synced = 0
-
-            for event in events:
-                event_id = event.get("id", "")
-                if not event_id:
-                    continue
+            result = await self.sync()
+            now = datetime.now(timezone.utc)
+            synced_at = now.isoformat()
+
+            # Reminders only need events that have not ended
+            rows = [
+                _cache_row(event, synced_at)
+                for event in self._store.upcoming(result["changed"], now)
+                if event.get("id")
+            ]
+            removed = list(result["removed"])
+
+            cached: list[dict[str, Any]] = []
+            failed: list[dict[str, Any]] = []
+            if rows:
+                written = await await_if_needed(
+                    self._db.upsert_many("events_cache", rows, on_conflict="google_event_id")
+                )
+                if isinstance(written, dict):
+                    cached = written.get("rows", [])
+                    failed = written.get("failed", [])
+                for failure in failed:
+                    logger.warning(
+                        "Failed to cache event %s: %s",
+                        failure.get("row", {}).get("google_event_id"),
+                        failure.get("error"),
+                    )
 
+            if result["full"]:
+                await self._delete_stale_cached_events(rows, now)
+            elif removed:
                 await await_if_needed(
-                    self._db.upsert(
-                        "events_cache",
-                        {
-                            "google_event_id": event_id,
-                            "summary": event.get("summary", ""),
-                            "location": event.get("location", ""),
-                            "start_time": event.get("start", ""),
-                            "end_time": event.get("end", ""),
-                            "synced_at": datetime.now(timezone.utc).isoformat(),
-                        },
-                        on_conflict="google_event_id",
-                    )
+                    self._db.delete("events_cache", {"google_event_id__in": removed})
                 )
-                synced += 1
 
-            logger.info("Synced %d events to cache", synced)
+            if self._sync_listener is not None:
+                await await_if_needed(self._sync_listener(cached, removed, result["full"]))
+
+            synced = len(rows) - len(failed)
+            logger.info(
+                "Calendar %s sync: %d events cached, %d removed",
+                "full" if result["full"] else "incremental",
+                synced,
+                len(removed),
+            )
             return synced
 
         except Exception as e:
             logger.error("Failed to sync events to cache: %s", e)
             return 0
+
+    async def _delete_stale_cached_events(
+        self,
+        rows: list[dict[str, Any]],
+        now: datetime,
+    ) -> None:
+        """Delete cached upcoming events that a full sync did not list."""
+        filters: dict[str, Any] = {"end_time__gte": now.isoformat()}
+        if self._store.window_end is not None:
+            filters["start_time__lte"] = self._store.window_end.isoformat()
+        if rows:
+            filters["google_event_id__not_in"] = [row["google_event_id"] for row in rows]
+
+        if await await_if_needed(self._db.delete("events_cache", filters)):
+            logger.info("Removed stale events from cache")
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of the local event store for the dashboard."""
+        return self._store.stats()
@@ -0,0 +1,268 @@
+"""Local copy of the Google Calendar, kept current by incremental sync.
+
+Holds the events of a rolling window (a day back, a month ahead) together
+with the ``nextSyncToken`` that produced them, so each sync only fetches
+events changed since the previous one. Reads for the calendar tools, the
+heartbeat and the briefing are answered from here while the copy is
+fresh.
+
+The store is one JSON file, replaced atomically after each sync so the
+token and the events it describes are always saved together.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = Path(__file__).resolve().parents[2] / "data" / "calendar_store.json"
+
+# The store is served only if the last sync is this recent
+MAX_STALENESS = timedelta(minutes=30)
+
+# Full resync this often, to slide the window forward
+FULL_SYNC_INTERVAL = timedelta(days=1)
+
+
+def _parse_time(value: Any, tz: ZoneInfo) -> Optional[datetime]:
+    """Parse an event start/end: RFC 3339 date-time, or an all-day date in ``tz``."""
+    if not value:
+        return None
+    text = str(value)
+    try:
+        if "T" not in text:
+            return datetime.combine(date.fromisoformat(text), time.min, tzinfo=tz)
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class CalendarEventStore:
+    """Events of one calendar within a time window, plus the sync token."""
+
+    def __init__(self, path: Optional[str | Path] = None, timezone_name: str = "UTC") -> None:
+        # No path keeps the store in memory only (a full sync after each restart)
+        self._path = Path(path) if path else None
+        self._tz = ZoneInfo(timezone_name)
+        self._events: dict[str, dict[str, Any]] = {}
+        self._sync_token: Optional[str] = None
+        self._window_start: Optional[datetime] = None
+        self._window_end: Optional[datetime] = None
+        self._synced_at: Optional[datetime] = None
+        self._full_synced_at: Optional[datetime] = None
+
+        # Metrics
+        self._full_syncs = 0
+        self._incremental_syncs = 0
+        self._changes_applied = 0
+        self._reads = 0
+
+    @property
+    def sync_token(self) -> Optional[str]:
+        return self._sync_token
+
+    @property
+    def window_end(self) -> Optional[datetime]:
+        return self._window_end
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def needs_full_sync(self, now: datetime) -> bool:
+        return (
+            self._sync_token is None
+            or self._full_synced_at is None
+            or now - self._full_synced_at >= FULL_SYNC_INTERVAL
+        )
+
+    def covers(self, start: datetime, end: datetime, now: datetime) -> bool:
+        """Whether reads for [start, end) can be served locally."""
+        return (
+            self._sync_token is not None
+            and self._synced_at is not None
+            and now - self._synced_at <= MAX_STALENESS
+            and self._window_start is not None
+            and self._window_end is not None
+            and self._window_start <= start
+            and end <= self._window_end
+        )
+
+    def events_between(self, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        """Events overlapping [start, end), ordered by start time.
+
+        Like Google's timeMin/timeMax, an event in progress at ``start`` is
+        included.
+        """
+        selected = []
+        for event in self._events.values():
+            event_start = _parse_time(event.get("start"), self._tz)
+            event_end = _parse_time(event.get("end"), self._tz) or event_start
+            if event_start is None or event_end is None:
+                continue
+            if event_end > start and event_start < end:
+                selected.append((event_start, event))
+        selected.sort(key=lambda item: item[0])
+        self._reads += 1
+        return [dict(event) for _, event in selected]
+
+    def upcoming(self, events: Iterable[dict[str, Any]], now: datetime) -> list[dict[str, Any]]:
+        """The given events that have not ended by ``now``."""
+        selected = []
+        for event in events:
+            end = _parse_time(event.get("end"), self._tz) or _parse_time(event.get("start"), self._tz)
+            if end is not None and end > now:
+                selected.append(event)
+        return selected
+
+    def get(self, event_id: str) -> Optional[dict[str, Any]]:
+        event = self._events.get(event_id)
+        return dict(event) if event else None
+
+    def _in_window(self, event: dict[str, Any]) -> bool:
+        if self._window_start is None or self._window_end is None:
+            return False
+        start = _parse_time(event.get("start"), self._tz)
+        end = _parse_time(event.get("end"), self._tz) or start
+        if start is None or end is None:
+            return False
+        return end > self._window_start and start < self._window_end
+
+    def replace(
+        self,
+        events: Iterable[dict[str, Any]],
+        sync_token: Optional[str],
+        window_start: datetime,
+        window_end: datetime,
+        now: datetime,
+    ) -> list[str]:
+        """Install the result of a full sync.
+
+        Returns:
+            Ids of events that were in the store but are no longer listed.
+        """
+        previous = set(self._events)
+        self._events = {event["id"]: event for event in events if event.get("id")}
+        self._sync_token = sync_token
+        self._window_start = window_start
+        self._window_end = window_end
+        self._synced_at = now
+        self._full_synced_at = now
+        self._full_syncs += 1
+        return sorted(previous - set(self._events))
+
+    def apply(
+        self,
+        changed: Iterable[dict[str, Any]],
+        removed: Iterable[str],
+        sync_token: Optional[str],
+        now: datetime,
+    ) -> tuple[list[dict[str, Any]], list[str]]:
+        """Apply an incremental sync.
+
+        Changed events outside the window are dropped; the next full sync
+        picks them up once the window reaches them.
+
+        Returns:
+            The events stored and the ids removed.
+        """
+        stored: list[dict[str, Any]] = []
+        dropped: list[str] = []
+        for event in changed:
+            event_id = event.get("id")
+            if not event_id:
+                continue
+            if self._in_window(event):
+                self._events[event_id] = event
+                stored.append(event)
+            elif self._events.pop(event_id, None) is not None:
+                dropped.append(event_id)
+        for event_id in removed:
+            if self._events.pop(event_id, None) is not None:
+                dropped.append(event_id)
+
+        self._sync_token = sync_token
+        self._synced_at = now
+        self._incremental_syncs += 1
+        self._changes_applied += len(stored) + len(dropped)
+        return stored, dropped
+
+    def upsert(self, event: dict[str, Any]) -> None:
+        """Write through a change made by this app.
+
+        The sync token is left alone, so the next sync still delivers the
+        change from Google and corrects anything this copy got wrong.
+        """
+        if event.get("id") and self._sync_token is not None and self._in_window(event):
+            self._events[event["id"]] = {**self._events.get(event["id"], {}), **event}
+
+    def remove(self, event_id: str) -> None:
+        self._events.pop(event_id, None)
+
+    def reset(self) -> None:
+        """Forget the token and events, forcing a full sync."""
+        self._events = {}
+        self._sync_token = None
+        self._synced_at = None
+        self._full_synced_at = None
+
+    def load(self) -> None:
+        """Load the store from disk; a missing or unreadable file leaves it empty."""
+        if self._path is None or not self._path.exists():
+            return
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            self._events = {event["id"]: event for event in data.get("events", [])}
+            self._sync_token = data.get("sync_token")
+            self._window_start = _parse_time(data.get("window_start"), self._tz)
+            self._window_end = _parse_time(data.get("window_end"), self._tz)
+            self._synced_at = _parse_time(data.get("synced_at"), self._tz)
+            self._full_synced_at = _parse_time(data.get("full_synced_at"), self._tz)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable calendar store %s: %s", self._path, e)
+            self.reset()
+            return
+        logger.info("Calendar store loaded: %d events from %s", len(self._events), self._path)
+
+    def save(self) -> None:
+        """Write the store to disk atomically."""
+        if self._path is None:
+            return
+
+        def _iso(value: Optional[datetime]) -> Optional[str]:
+            return value.isoformat() if value else None
+
+        data = {
+            "sync_token": self._sync_token,
+            "window_start": _iso(self._window_start),
+            "window_end": _iso(self._window_end),
+            "synced_at": _iso(self._synced_at),
+            "full_synced_at": _iso(self._full_synced_at),
+            "events": list(self._events.values()),
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, self._path)
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of store metrics for the dashboard."""
+        return {
+            "events": len(self._events),
+            "has_sync_token": self._sync_token is not None,
+            "window_end": self._window_end.isoformat() if self._window_end else None,
+            "last_sync": self._synced_at.isoformat() if self._synced_at else None,
+            "full_syncs": self._full_syncs,
+            "incremental_syncs": self._incremental_syncs,
+            "changes_applied": self._changes_applied,
+            "reads": self._reads,
+        }
@@ -0,0 +1,188 @@
+"""Token-budgeted conversation context assembly.
+
+Packs the system prompt, memory search hits, recent history and the
+current turn into a per-provider prompt token budget before a request is
+sent, instead of relying on fixed message counts and the provider's
+context_length_exceeded error after the fact.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Optional
+
+from src.llm.tokens import count_message_tokens, count_tokens, count_tools_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_SHARE = 0.25
+
+TRUNCATION_MARKER = "\n…[truncated to fit context]"
+
+
+def _as_chat_message(msg: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a stored message row to a chat message."""
+    return {
+        "role": msg.get("role", "user"),
+        "content": msg.get("content", ""),
+    }
+
+
+class ContextBuilder:
+    """Fits chat requests into a prompt token budget.
+
+    Memory hits are taken in rank order up to ``memory_share`` of the space
+    left after the system prompt, tools and current turn; recent history
+    then fills the rest newest-first, so the oldest turns are dropped first.
+    """
+
+    def __init__(self, token_budget: int, memory_share: float = DEFAULT_MEMORY_SHARE) -> None:
+        if token_budget < 1:
+            raise ValueError("token_budget must be positive")
+        if not 0.0 <= memory_share <= 1.0:
+            raise ValueError("memory_share must be between 0 and 1")
+        self._budget = token_budget
+        self._memory_share = memory_share
+
+    @property
+    def token_budget(self) -> int:
+        return self._budget
+
+    def build(
+        self,
+        system_prompt: str,
+        recent: list[dict[str, Any]],
+        memory_hits: list[dict[str, Any]],
+        user_message: dict[str, Any],
+        tools: Optional[list[dict[str, Any]]] = None,
+    ) -> list[dict[str, Any]]:
+        """Assemble [system, memory..., recent..., user] within the budget.
+
+        Args:
+            system_prompt: The system prompt text.
+            recent: Recent stored messages, oldest first.
+            memory_hits: Memory search results, best first. Hits already in
+                ``recent`` are ignored.
+            user_message: The current user chat message.
+            tools: Tool schemas sent with the request (they count too).
+
+        Returns:
+            Chat messages ready for ``chat()``.
+        """
+        system = {"role": "system", "content": system_prompt}
+        fixed = (
+            count_message_tokens(system)
+            + count_message_tokens(user_message)
+            + count_tools_tokens(tools)
+        )
+        available = self._budget - fixed
+        if available <= 0:
+            logger.warning(
+                "System prompt, tools and message use %d tokens; no room for context "
+                "within the %d token budget",
+                fixed,
+                self._budget,
+            )
+            return [system, user_message]
+
+        recent_ids = {msg.get("id") for msg in recent if msg.get("id") is not None}
+        memory_allowance = int(available * self._memory_share)
+        memory: list[dict[str, Any]] = []
+        used = 0
+        for hit in memory_hits:
+            if hit.get("id") is not None and hit.get("id") in recent_ids:
+                continue
+            cost = count_message_tokens(hit)
+            # Skip hits that don't fit; a smaller, lower-ranked one still might
+            if used + cost > memory_allowance:
+                continue
+            memory.append(_as_chat_message(hit))
+            used += cost
+
+        remaining = available - used
+        history: list[dict[str, Any]] = []
+        for msg in reversed(recent):
+            cost = count_message_tokens(msg)
+            # Stop at the first turn that doesn't fit so history stays contiguous
+            if cost > remaining:
+                break
+            history.append(_as_chat_message(msg))
+            remaining -= cost
+        history.reverse()
+
+        dropped = len(recent) - len(history)
+        if dropped:
+            logger.debug(
+                "Context budget %d: kept %d/%d recent messages, %d memory hits",
+                self._budget,
+                len(history),
+                len(recent),
+                len(memory),
+            )
+
+        return [system, *memory, *history, user_message]
+
+    def fit(
+        self,
+        messages: list[dict[str, Any]],
+        history_end: int,
+        tools: Optional[list[dict[str, Any]]] = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Shrink a request that has grown past the budget (e.g. tool results).
+
+        Context history (``messages[1:history_end]``) is dropped oldest first.
+        If that is not enough, the largest tool results of the current turn
+        are truncated.
+
+        Args:
+            messages: Full message list; ``messages[0]`` is the system prompt.
+            history_end: Index of the first message of the current turn.
+            tools: Tool schemas sent with the request.
+
+        Returns:
+            Tuple of (messages, new history_end).
+        """
+        costs = [count_message_tokens(m) for m in messages]
+        excess = sum(costs) + count_tools_tokens(tools) - self._budget
+        if excess <= 0:
+            return messages, history_end
+
+        messages = list(messages)
+        while excess > 0 and history_end > 1:
+            messages.pop(1)
+            excess -= costs.pop(1)
+            history_end -= 1
+
+        if excess > 0:
+            excess = self._truncate_tool_results(messages, costs, history_end, excess)
+        if excess > 0:
+            logger.warning("Request still exceeds context budget by %d tokens", excess)
+
+        return messages, history_end
+
+    @staticmethod
+    def _truncate_tool_results(
+        messages: list[dict[str, Any]],
+        costs: list[int],
+        start: int,
+        excess: int,
+    ) -> int:
+        """Trim the largest tool results in place; return the remaining excess."""
+        tool_indexes = sorted(
+            (i for i in range(start, len(messages)) if messages[i].get("role") == "tool"),
+            key=lambda i: costs[i],
+            reverse=True,
+        )
+        for i in tool_indexes:
+            if excess <= 0:
+                break
+            content = str(messages[i].get("content") or "")
+            content_tokens = count_tokens(content)
+            # Leave room for the marker, plus one token of rounding slack
+            keep_tokens = max(0, content_tokens - excess - count_tokens(TRUNCATION_MARKER) - 1)
+            keep_chars = int(len(content) * keep_tokens / content_tokens) if content_tokens else 0
+            messages[i] = {**messages[i], "content": content[:keep_chars] + TRUNCATION_MARKER}
+            new_cost = count_message_tokens(messages[i])
+            excess -= costs[i] - new_cost
+            costs[i] = new_cost
+        return excess
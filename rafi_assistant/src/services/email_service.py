@@ -2,13 +2,17 @@
 
 Provides functions to list, search, and send emails via the Gmail API,
 with HTML stripping and input sanitization before passing content to the LLM.
+With a MailboxCache attached, recent mail is mirrored locally through the
+Gmail history API and reads are answered from the mirror.
 """
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import logging
 import os
+from datetime import datetime, timezone
 from email.mime.text import MIMEText
 from typing import Any, Optional
 
@@ -16,11 +20,14 @@ from cryptography.fernet import Fernet
 from google.auth.transport.requests import Request as GoogleAuthRequest
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 from src.config.loader import AppConfig
 from src.db.supabase_client import SupabaseClient
 from src.security.sanitizer import sanitize_email_body
 from src.security.validators import safe_get
+from src.services.google_executor import GoogleApiExecutor, build_thread_safe_request_builder
+from src.services.mailbox_cache import FULL_SYNC_LIMIT, SEARCH_LIMIT, MailboxCache, parse_query
 from src.utils.async_utils import await_if_needed
 
 logger = logging.getLogger(__name__)
@@ -31,13 +38,44 @@ SCOPES = [
     "https://www.googleapis.com/auth/gmail.modify",
 ]
 
+# Gmail recommends at most 50 requests per batch to avoid rate limiting
+MAX_BATCH_SIZE = 50
+
+# "metadata" skips body download for callers that only need headers/snippets
+MESSAGE_FORMATS = {"full", "metadata"}
+METADATA_HEADERS = ["From", "To", "Subject", "Date"]
+
+# Messages with these labels are not mirrored (messages.list skips them too)
+EXCLUDED_LABELS = {"SPAM", "TRASH"}
+
+# messages.list page size limit
+LIST_PAGE_SIZE = 500
+
+
+def _internal_date(msg: dict[str, Any]) -> Optional[str]:
+    """Gmail's internalDate (epoch milliseconds) as an ISO timestamp."""
+    try:
+        millis = int(msg["internalDate"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return datetime.fromtimestamp(millis / 1000, tz=timezone.utc).isoformat()
+
 
 class EmailService:
     """Gmail API wrapper for reading, searching, and sending emails."""
 
-    def __init__(self, config: AppConfig, db: SupabaseClient) -> None:
+    def __init__(
+        self,
+        config: AppConfig,
+        db: SupabaseClient,
+        executor: Optional[GoogleApiExecutor] = None,
+        mailbox: Optional[MailboxCache] = None,
+    ) -> None:
         self._config = config
         self._db = db
+        self._executor = executor or GoogleApiExecutor()
+        self._mailbox = mailbox
+        self._sync_lock = asyncio.Lock()
         self._service: Any = None
         self._credentials: Optional[Credentials] = None
         self._fernet: Optional[Fernet] = None
@@ -103,7 +141,7 @@ class EmailService:
 
         if self._credentials.expired and self._credentials.refresh_token:
             try:
-                self._credentials.refresh(GoogleAuthRequest())
+                await self._executor.run(self._credentials.refresh, GoogleAuthRequest())
                 logger.info("Gmail OAuth token refreshed")
 
                 new_access = self._credentials.token or ""
@@ -154,7 +192,14 @@ class EmailService:
         try:
             credentials = await self._get_credentials()
             # static_discovery=False matches the calendar fix
-            self._service = build("gmail", "v1", credentials=credentials, static_discovery=False)
+            self._service = await self._executor.run(
+                build,
+                "gmail",
+                "v1",
+                credentials=credentials,
+                static_discovery=False,
+                requestBuilder=build_thread_safe_request_builder(credentials),
+            )
             logger.info("Gmail service initialized successfully")
         except Exception as e:
             logger.error("Failed to initialize Gmail service: %s", e)
@@ -228,65 +273,141 @@ class EmailService:
                 result[name] = value
         return result
 
+    def _format_message(
+        self,
+        msg_id: str,
+        msg: dict[str, Any],
+        message_format: str = "full",
+    ) -> dict[str, Any]:
+        """Convert a Gmail API message resource into the service's email dict.
+
+        Metadata-format messages carry headers and snippet but no body, so
+        their ``body`` is left empty.
+        """
+        payload = msg.get("payload", {})
+        headers = self._extract_headers(payload.get("headers", []))
+        body = self._extract_body(payload) if message_format == "full" else ""
+
+        return {
+            "id": msg_id,
+            "from": headers.get("from", ""),
+            "to": headers.get("to", ""),
+            "subject": headers.get("subject", "(No subject)"),
+            "date": headers.get("date", ""),
+            "snippet": msg.get("snippet", ""),
+            "body": body,
+            "labels": msg.get("labelIds", []),
+            "thread_id": msg.get("threadId", ""),
+            "internal_date": _internal_date(msg),
+        }
+
+    def _get_request(self, service: Any, msg_id: str, message_format: str) -> Any:
+        """Build a messages().get request for the given format."""
+        kwargs: dict[str, Any] = {"userId": "me", "id": msg_id, "format": message_format}
+        if message_format == "metadata":
+            kwargs["metadataHeaders"] = METADATA_HEADERS
+        return service.users().messages().get(**kwargs)
+
+    async def _fetch_messages(
+        self,
+        service: Any,
+        msg_ids: list[str],
+        message_format: str = "full",
+    ) -> list[dict[str, Any]]:
+        """Fetch many messages in as few round-trips as possible.
+
+        Messages are requested through Gmail batch HTTP requests (up to
+        MAX_BATCH_SIZE per round-trip). If a batch cannot be sent at all,
+        that chunk falls back to concurrent individual gets through the
+        shared executor. Messages that fail individually are skipped.
+
+        Args:
+            service: Gmail API service object.
+            msg_ids: Message IDs in the order results should be returned.
+            message_format: "full" (headers + body) or "metadata" (headers only).
+
+        Returns:
+            Email dicts in the same order as msg_ids, minus failures.
+        """
+        fetched: dict[str, dict[str, Any]] = {}
+
+        def _on_response(request_id: str, response: Any, exception: Any) -> None:
+            if exception is not None:
+                logger.warning("Failed to fetch email %s: %s", request_id, exception)
+                return
+            fetched[request_id] = response
+
+        for offset in range(0, len(msg_ids), MAX_BATCH_SIZE):
+            chunk = msg_ids[offset:offset + MAX_BATCH_SIZE]
+            try:
+                batch = service.new_batch_http_request(callback=_on_response)
+                for msg_id in chunk:
+                    batch.add(self._get_request(service, msg_id, message_format), request_id=msg_id)
+                await self._executor.execute(batch)
+            except Exception as e:
+                logger.warning(
+                    "Gmail batch fetch failed (%s), falling back to individual gets", e
+                )
+                missing = [msg_id for msg_id in chunk if msg_id not in fetched]
+                results = await asyncio.gather(
+                    *[
+                        self._executor.execute(self._get_request(service, msg_id, message_format))
+                        for msg_id in missing
+                    ],
+                    return_exceptions=True,
+                )
+                for msg_id, result in zip(missing, results):
+                    if isinstance(result, BaseException):
+                        logger.warning("Failed to fetch email %s: %s", msg_id, result)
+                    else:
+                        fetched[msg_id] = result
+
+        emails = []
+        for msg_id in msg_ids:
+            msg = fetched.get(msg_id)
+            if msg is None:
+                continue
+            try:
+                emails.append(self._format_message(msg_id, msg, message_format))
+            except Exception as e:
+                logger.warning("Failed to parse email %s: %s", msg_id, e)
+        return emails
+
     async def list_emails(
         self,
         count: int = 20,
         unread_only: bool = False,
+        message_format: str = "full",
     ) -> list[dict[str, Any]]:
         """List recent emails from the inbox.
 
         Args:
             count: Number of emails to retrieve (max 50).
             unread_only: If True, only return unread emails.
+            message_format: "full" to include bodies, or "metadata" for
+                callers that only need headers and snippets.
 
         Returns:
             List of email dicts with id, from, to, subject, date, snippet, body.
         """
         count = min(max(count, 1), 50)
+        if message_format not in MESSAGE_FORMATS:
+            raise ValueError(f"message_format must be one of: {sorted(MESSAGE_FORMATS)}")
+        mailbox = await self._ready_mailbox()
+        if mailbox is not None:
+            return await mailbox.list_recent(
+                count, unread_only, include_body=message_format == "full",
+            )
         service = await self._get_service()
 
         try:
             query = "is:unread" if unread_only else ""
-            result = (
-                service.users()
-                .messages()
-                .list(userId="me", maxResults=count, q=query)
-                .execute()
+            result = await self._executor.execute(
+                service.users().messages().list(userId="me", maxResults=count, q=query)
             )
 
-            messages = result.get("messages", [])
-            emails = []
-
-            for msg_ref in messages:
-                msg_id = msg_ref.get("id", "")
-                if not msg_id:
-                    continue
-
-                try:
-                    msg = (
-                        service.users()
-                        .messages()
-                        .get(userId="me", id=msg_id, format="full")
-                        .execute()
-                    )
-
-                    payload = msg.get("payload", {})
-                    headers = self._extract_headers(payload.get("headers", []))
-                    body = self._extract_body(payload)
-
-                    emails.append({
-                        "id": msg_id,
-                        "from": headers.get("from", ""),
-                        "to": headers.get("to", ""),
-                        "subject": headers.get("subject", "(No subject)"),
-                        "date": headers.get("date", ""),
-                        "snippet": msg.get("snippet", ""),
-                        "body": body,
-                        "labels": msg.get("labelIds", []),
-                    })
-                except Exception as e:
-                    logger.warning("Failed to fetch email %s: %s", msg_id, e)
-                    continue
+            msg_ids = [m.get("id", "") for m in result.get("messages", []) if m.get("id")]
+            emails = await self._fetch_messages(service, msg_ids, message_format)
 
             logger.info("Retrieved %d emails (unread_only=%s)", len(emails), unread_only)
             return emails
@@ -295,64 +416,58 @@ class EmailService:
             logger.error("Failed to list emails: %s", e)
             return []
 
-    async def search_emails(self, query: str) -> list[dict[str, Any]]:
+    async def search_emails(
+        self,
+        query: str,
+        message_format: str = "full",
+    ) -> list[dict[str, Any]]:
         """Search emails using Gmail search query syntax.
 
+        Queries the mailbox cache can express (words, from:, to:, subject:,
+        is:unread) are answered from it when it has a full page of matches.
+        The cache only holds recent mail, so shorter answers and all other
+        queries go to Gmail.
+
         Args:
             query: Gmail search query (e.g., 'from:john subject:meeting').
+            message_format: "full" to include bodies, or "metadata" for
+                headers and snippets only.
 
         Returns:
             List of matching email dicts.
         """
+        if message_format not in MESSAGE_FORMATS:
+            raise ValueError(f"message_format must be one of: {sorted(MESSAGE_FORMATS)}")
+        cached: list[dict[str, Any]] = []
+        if self._mailbox is not None:
+            filters = parse_query(query)
+            mailbox = await self._ready_mailbox() if filters is not None else None
+            if filters is not None and mailbox is not None:
+                cached = await mailbox.search(
+                    filters, include_body=message_format == "full",
+                )
+                # Fewer matches than a page may mean older mail the cache never held
+                if len(cached) >= SEARCH_LIMIT:
+                    return cached
+            self._mailbox.count_remote_search()
         service = await self._get_service()
 
         try:
-            result = (
-                service.users()
-                .messages()
-                .list(userId="me", maxResults=20, q=query)
-                .execute()
+            result = await self._executor.execute(
+                service.users().messages().list(
+                    userId="me", maxResults=SEARCH_LIMIT, q=query
+                )
             )
 
-            messages = result.get("messages", [])
-            emails = []
-
-            for msg_ref in messages:
-                msg_id = msg_ref.get("id", "")
-                if not msg_id:
-                    continue
-
-                try:
-                    msg = (
-                        service.users()
-                        .messages()
-                        .get(userId="me", id=msg_id, format="full")
-                        .execute()
-                    )
-
-                    payload = msg.get("payload", {})
-                    headers = self._extract_headers(payload.get("headers", []))
-                    body = self._extract_body(payload)
-
-                    emails.append({
-                        "id": msg_id,
-                        "from": headers.get("from", ""),
-                        "to": headers.get("to", ""),
-                        "subject": headers.get("subject", "(No subject)"),
-                        "date": headers.get("date", ""),
-                        "snippet": msg.get("snippet", ""),
-                        "body": body,
-                    })
-                except Exception as e:
-                    logger.warning("Failed to fetch email %s: %s", msg_id, e)
-                    continue
+            msg_ids = [m.get("id", "") for m in result.get("messages", []) if m.get("id")]
+            emails = await self._fetch_messages(service, msg_ids, message_format)
 
             logger.info("Search '%s' returned %d results", query[:50], len(emails))
             return emails
 
         except Exception as e:
             logger.error("Failed to search emails with query '%s': %s", query[:50], e)
-            return []
+            return cached
 
     async def send_email(
         self,
@@ -379,11 +494,8 @@ class EmailService:
 
             raw = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
 
-            result = (
-                service.users()
-                .messages()
-                .send(userId="me", body={"raw": raw})
-                .execute()
+            result = await self._executor.execute(
+                service.users().messages().send(userId="me", body={"raw": raw})
             )
 
             logger.info(
@@ -411,30 +523,18 @@ class EmailService:
         Returns:
             Email dict with full details, or None on failure.
         """
+        mailbox = await self._ready_mailbox()
+        if mailbox is not None:
+            cached = await mailbox.get(email_id)
+            if cached is not None:
+                return cached
         service = await self._get_service()
 
         try:
-            msg = (
-                service.users()
-                .messages()
-                .get(userId="me", id=email_id, format="full")
-                .execute()
+            msg = await self._executor.execute(
+                service.users().messages().get(userId="me", id=email_id, format="full")
             )
-
-            payload = msg.get("payload", {})
-            headers = self._extract_headers(payload.get("headers", []))
-            body = self._extract_body(payload)
-
-            return {
-                "id": email_id,
-                "from": headers.get("from", ""),
-                "to": headers.get("to", ""),
-                "subject": headers.get("subject", "(No subject)"),
-                "date": headers.get("date", ""),
-                "snippet": msg.get("snippet", ""),
-                "body": body,
-                "labels": msg.get("labelIds", []),
-            }
+            return self._format_message(email_id, msg)
 
         except Exception as e:
             logger.error("Failed to get email %s: %s", email_id, e)
@@ -443,19 +543,164 @@ class EmailService:
     async def get_unread_count(self) -> int:
         """Get the count of unread emails in the inbox.
 
+        Always asks Gmail: the mailbox cache only holds recent mail, so it
+        would miss older unread messages.
+
         Returns:
             Number of unread emails, or 0 on failure.
         """
         service = await self._get_service()
 
         try:
-            result = (
-                service.users()
-                .messages()
-                .list(userId="me", q="is:unread", maxResults=1)
-                .execute()
+            result = await self._executor.execute(
+                service.users().messages().list(userId="me", q="is:unread", maxResults=1)
             )
             return result.get("resultSizeEstimate", 0)
         except Exception as e:
             logger.error("Failed to get unread email count: %s", e)
             return 0
+
+    async def _ready_mailbox(self) -> Optional[MailboxCache]:
+        """The mailbox cache if reads can be served from it, syncing it if stale."""
+        mailbox = self._mailbox
+        if mailbox is None:
+            return None
+        if mailbox.is_fresh():
+            return mailbox
+        try:
+            await self.sync()
+        except Exception as e:
+            logger.warning("Mailbox sync failed, reading from Gmail: %s", e)
+            return None
+        return mailbox if mailbox.is_fresh() else None
+
+    async def sync(self) -> dict[str, Any]:
+        """Bring the mailbox cache up to date with Gmail.
+
+        Applies the changes listed by history.list since the stored history
+        id. Without one, or when Gmail no longer has that history (HTTP
+        404), the most recent FULL_SYNC_LIMIT messages are copied instead.
+
+        Returns:
+            Dict with "full" (bool), "stored", "relabeled" and "removed" counts.
+        """
+        mailbox = self._mailbox
+        if mailbox is None:
+            raise RuntimeError("No mailbox cache configured")
+        async with self._sync_lock:
+            await mailbox.load_state()
+            service = await self._get_service()
+            if mailbox.history_id:
+                try:
+                    return await self._sync_history(service, mailbox)
+                except HttpError as e:
+                    if getattr(e.resp, "status", None) != 404:
+                        raise
+                    logger.info("Gmail history id expired; running a full mailbox sync")
+                    mailbox.invalidate()
+            return await self._full_sync(service, mailbox)
+
+    async def sync_mailbox(self) -> None:
+        """Scheduler entry point for :meth:`sync`."""
+        try:
+            result = await self.sync()
+            logger.info("Mailbox sync: %s", result)
+        except Exception as e:
+            logger.error("Mailbox sync failed: %s", e)
+
+    async def _full_sync(self, service: Any, mailbox: MailboxCache) -> dict[str, Any]:
+        # Read the history id first so changes made during the copy are replayed
+        profile = await self._executor.execute(service.users().getProfile(userId="me"))
+        history_id = str(profile["historyId"])
+
+        msg_ids: list[str] = []
+        page_token: Optional[str] = None
+        while len(msg_ids) < FULL_SYNC_LIMIT:
+            result = await self._executor.execute(
+                service.users().messages().list(
+                    userId="me",
+                    maxResults=min(LIST_PAGE_SIZE, FULL_SYNC_LIMIT - len(msg_ids)),
+                    pageToken=page_token,
+                )
+            )
+            msg_ids.extend(m["id"] for m in result.get("messages", []) if m.get("id"))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                break
+
+        emails = await self._fetch_messages(service, msg_ids, "full")
+        synced_at = datetime.now(timezone.utc).isoformat()
+        stored = await mailbox.upsert(emails, synced_at)
+        await mailbox.delete_older_syncs(synced_at)
+        await mailbox.save_state(history_id, full=True)
+        return {"full": True, "stored": stored, "relabeled": 0, "removed": 0}
+
+    async def _sync_history(self, service: Any, mailbox: MailboxCache) -> dict[str, Any]:
+        added: dict[str, None] = {}
+        relabeled: set[str] = set()
+        deleted: set[str] = set()
+        history_id = mailbox.history_id
+        page_token: Optional[str] = None
+        while True:
+            result = await self._executor.execute(
+                service.users().history().list(
+                    userId="me",
+                    startHistoryId=mailbox.history_id,
+                    pageToken=page_token,
+                )
+            )
+            for record in result.get("history", []):
+                for item in record.get("messagesAdded", []):
+                    added[item["message"]["id"]] = None
+                for item in record.get("messagesDeleted", []):
+                    deleted.add(item["message"]["id"])
+                for key in ("labelsAdded", "labelsRemoved"):
+                    for item in record.get(key, []):
+                        relabeled.add(item["message"]["id"])
+            history_id = str(result.get("historyId") or history_id)
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                break
+
+        if not (added or relabeled or deleted):
+            if history_id != mailbox.history_id:
+                await mailbox.save_state(history_id, full=False)
+            else:
+                mailbox.mark_synced()
+            return {"full": False, "stored": 0, "relabeled": 0, "removed": 0}
+
+        new_ids = [msg_id for msg_id in added if msg_id not in deleted]
+        relabel_ids = await mailbox.cached_ids(
+            [msg_id for msg_id in relabeled if msg_id not in deleted and msg_id not in added]
+        )
+
+        emails = await self._fetch_messages(service, new_ids, "full")
+        labels = await self._fetch_messages(service, relabel_ids, "metadata")
+        removed = set(deleted)
+        keep = []
+        relabel: dict[str, list[str]] = {}
+        for email in emails:
+            if EXCLUDED_LABELS & set(email.get("labels", [])):
+                removed.add(email["id"])
+            else:
+                keep.append(email)
+        for email in labels:
+            if EXCLUDED_LABELS & set(email.get("labels", [])):
+                removed.add(email["id"])
+            else:
+                relabel[email["id"]] = email.get("labels", [])
+
+        relabeled_count = await mailbox.set_labels(relabel)
+        stored = await mailbox.upsert(keep, datetime.now(timezone.utc).isoformat())
+        await mailbox.delete(sorted(removed))
+        await mailbox.save_state(history_id, full=False)
+        return {
+            "full": False,
+            "stored": stored,
+            "relabeled": relabeled_count,
+            "removed": len(removed),
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of mailbox cache metrics for the dashboard."""
+        return self._mailbox.stats() if self._mailbox else {}
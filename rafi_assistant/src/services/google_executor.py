@@ -0,0 +1,227 @@
+"""Non-blocking execution layer for synchronous Google API calls.
+
+googleapiclient requests are blocking httplib2 round-trips. Calling
+``.execute()`` directly inside an ``async def`` freezes the event loop
+(Telegram polling, Twilio webhooks, the scheduler) for the duration of the
+call. GoogleApiExecutor runs those calls on a bounded thread pool with
+per-call timeouts, cancellation of queued work, and queue-depth metrics.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT_SECONDS = 30.0
+
+
+class GoogleApiTimeoutError(TimeoutError):
+    """Raised when a Google API call does not complete within its timeout."""
+
+
+def build_thread_safe_request_builder(credentials: Any) -> Callable[..., Any]:
+    """Return a googleapiclient ``requestBuilder`` that is safe across threads.
+
+    httplib2.Http is not thread-safe, so a service object shared between pool
+    workers must give every request its own authorized transport.
+
+    Args:
+        credentials: google.oauth2 Credentials used to authorize requests.
+
+    Returns:
+        A callable suitable for ``build(..., requestBuilder=...)``.
+    """
+    import google_auth_httplib2
+    import httplib2
+    from googleapiclient.http import HttpRequest
+
+    def _build_request(http: Any, *args: Any, **kwargs: Any) -> HttpRequest:
+        authorized = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+        return HttpRequest(authorized, *args, **kwargs)
+
+    return _build_request
+
+
+class GoogleApiExecutor:
+    """Bounded thread pool for blocking Google API calls.
+
+    One instance is shared by CalendarService and EmailService so the total
+    number of concurrent Google round-trips stays bounded process-wide.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        default_timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self._max_workers = max_workers
+        self._default_timeout = default_timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="google-api",
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Metrics
+        self._queued = 0
+        self._active = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._cancelled = 0
+        self._total_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a free worker thread."""
+        return self._queued
+
+    async def execute(self, request: Any, *, timeout: float | None = None) -> Any:
+        """Run ``request.execute()`` for a googleapiclient HttpRequest off the loop.
+
+        Args:
+            request: Object with a blocking ``execute()`` method.
+            timeout: Seconds to wait before giving up (defaults to the
+                executor's default timeout).
+
+        Returns:
+            Whatever ``request.execute()`` returns.
+        """
+        return await self.run(request.execute, timeout=timeout)
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Run a blocking callable on the pool and await its result.
+
+        If the timeout expires or the awaiting task is cancelled while the call
+        is still queued, the call is dropped before it starts. A call that is
+        already running cannot be interrupted; its result is discarded.
+
+        Args:
+            func: Blocking callable.
+            *args: Positional arguments for ``func``.
+            timeout: Seconds to wait (defaults to the executor's default).
+            **kwargs: Keyword arguments for ``func``.
+
+        Returns:
+            The callable's return value.
+
+        Raises:
+            GoogleApiTimeoutError: If the call does not finish in time.
+            RuntimeError: If the executor has been shut down.
+        """
+        if self._closed:
+            raise RuntimeError("Google API executor is shut down")
+
+        effective_timeout = self._default_timeout if timeout is None else timeout
+
+        with self._lock:
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+            depth = self._queued
+
+        if depth > self._max_workers:
+            logger.debug("Google API executor saturated: %d calls queued", depth)
+
+        concurrent_future = self._pool.submit(self._invoke, func, args, kwargs)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(concurrent_future),
+                timeout=effective_timeout,
+            )
+        except TimeoutError as e:
+            self._abandon(concurrent_future)
+            with self._lock:
+                self._timed_out += 1
+            logger.warning(
+                "Google API call %s timed out after %.1fs",
+                getattr(func, "__qualname__", repr(func)),
+                effective_timeout,
+            )
+            raise GoogleApiTimeoutError(
+                f"Google API call timed out after {effective_timeout:.1f}s"
+            ) from e
+        except asyncio.CancelledError:
+            self._abandon(concurrent_future)
+            with self._lock:
+                self._cancelled += 1
+            raise
+
+    def _invoke(
+        self,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        """Worker-thread wrapper that keeps the queue/active counters accurate."""
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+
+        started = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+            raise
+        else:
+            with self._lock:
+                self._completed += 1
+            return result
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._active -= 1
+                self._total_seconds += elapsed
+
+    def _abandon(self, concurrent_future: Future[Any]) -> None:
+        """Drop a call that has not started yet so it never occupies a worker."""
+        # cancel() only succeeds for calls that never reached _invoke
+        if concurrent_future.cancel():
+            with self._lock:
+                self._queued = max(0, self._queued - 1)
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of executor metrics for the dashboard."""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self._max_workers,
+                "queue_depth": self._queued,
+                "max_queue_depth": self._max_queue_depth,
+                "active": self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+                "cancelled": self._cancelled,
+                "avg_latency_ms": (
+                    round(self._total_seconds / finished * 1000, 1) if finished else 0.0
+                ),
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting calls and cancel anything still queued."""
+        if self._closed:
+            return
+        self._closed = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        logger.debug("Google API executor shut down")
@@ -13,9 +13,14 @@ import logging
 from typing import Any, Optional
 
 from src.llm.provider import LLMProvider
+from src.llm.response_cache import cache_responses
 
 logger = logging.getLogger(__name__)
 
+# Criteria and verdicts are generated at temperature 0; identical requests
+# within this window reuse the previous answer
+ISC_CACHE_TTL_SECONDS = 3600
+
 ISC_GENERATION_PROMPT = """\
 You are an ISC (Ideal State Criteria) generator. Given a user request that requires \
 tool use, generate a list of binary-testable success criteria.
@@ -89,11 +94,12 @@ class ISCService:
         )
 
         try:
-            response = await self._llm.chat(
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,
-                max_tokens=500,
-            )
+            with cache_responses(ISC_CACHE_TTL_SECONDS, "isc_generate"):
+                response = await self._llm.chat(
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.0,
+                    max_tokens=500,
+                )
             content = response.get("content", "[]")
             # Extract JSON from response
             criteria = self._parse_json_array(content)
@@ -132,11 +138,12 @@ class ISCService:
         )
 
         try:
-            response = await self._llm.chat(
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,
-                max_tokens=500,
-            )
+            with cache_responses(ISC_CACHE_TTL_SECONDS, "isc_verify"):
+                response = await self._llm.chat(
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=0.0,
+                    max_tokens=500,
+                )
             content = response.get("content", "{}")
             verification = self._parse_json_object(content)
             if verification:
@@ -179,17 +179,18 @@ class LearningService:
         """
         try:
             cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
-            result = await await_if_needed(
+            result: list[dict[str, Any]] = await await_if_needed(
                 self._db.select(
                     "feedback",
                     columns="*",
+                    filters={"created_at__gte": cutoff},
                     order_by="created_at",
                     order_desc=True,
                     limit=limit,
                 )
             )
             if result:
-                return [r for r in result if r.get("created_at", "") >= cutoff]
+                return result
         except Exception as e:
             logger.warning("Failed to fetch feedback: %s", e)
 
@@ -259,24 +260,9 @@ class LearningService:
         Returns:
             Formatted adjustment text, or empty string if none.
         """
-        memory = self._memory_files.load_memory()
-        if "## Behavioral Adjustments" not in memory:
-            return ""
-
-        # Extract the adjustments section
-        lines = memory.split("\n")
-        in_section = False
-        adjustments = []
-        for line in lines:
-            if line.strip().startswith("## Behavioral Adjustments"):
-                in_section = True
-                continue
-            if in_section:
-                if line.strip().startswith("## "):
-                    break
-                if line.strip().startswith("- "):
-                    adjustments.append(line.strip())
-
+        adjustments = self._memory_files.get_section_items(
+            "MEMORY.md", "Behavioral Adjustments"
+        )
         if not adjustments:
             return ""
 
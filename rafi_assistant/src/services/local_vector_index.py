@@ -0,0 +1,354 @@
+"""In-process vector index mirroring message embeddings.
+
+Keeps a copy of every stored message embedding on local disk so memory
+search can be served without a round-trip to ``hybrid_search_messages``,
+or when Supabase is slow or unreachable.
+
+The index is two append-only files in one directory:
+
+- ``vectors.f32``: unit-normalized float32 rows, memory-mapped for search
+- ``meta.jsonl``: one JSON line per row (id, role, content, source,
+  created_at)
+
+Search is an exact cosine top-k (one matrix-vector product), which takes
+well under a millisecond per thousand rows. New messages are appended
+as they are stored, and rows moved to the cold archive are removed.
+:meth:`LocalVectorIndex.rebuild` replaces both files from a bulk export
+of the messages table.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from src.db.supabase_client import SupabaseClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = Path(__file__).resolve().parents[2] / "data" / "vector_index"
+EMBEDDING_DIM = 1536
+
+# Rows per page when exporting the messages table
+REBUILD_PAGE_SIZE = 500
+
+VECTORS_FILE = "vectors.f32"
+META_FILE = "meta.jsonl"
+# Written by a completed rebuild; holds its UTC timestamp
+REBUILT_FILE = "rebuilt"
+META_COLUMNS = ("id", "role", "content", "source", "created_at")
+
+
+def _as_vector(value: Any, dim: int) -> Optional[np.ndarray]:
+    """Unit-normalize an embedding (list or pgvector "[...]" text); None if unusable."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return None
+    if value is None:
+        return None
+    vector = np.asarray(value, dtype=np.float32)
+    if vector.shape != (dim,):
+        return None
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0:
+        return None
+    return vector / norm
+
+
+class LocalVectorIndex:
+    """Memory-mapped embedding matrix with exact cosine search.
+
+    Writes may run in worker threads (``asyncio.to_thread``) and are
+    serialized by a lock. Not safe for use from several processes at once;
+    one app instance owns the directory.
+    """
+
+    def __init__(self, directory: Optional[str | Path] = None, dim: int = EMBEDDING_DIM) -> None:
+        self._dir = Path(directory) if directory else DEFAULT_INDEX_DIR
+        self._dim = dim
+        self._meta: list[dict[str, Any]] = []
+        self._ids: set[str] = set()
+        self._matrix: Optional[np.ndarray] = None
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        # Changes made while a rebuild is writing the replacement files
+        self._added_during_rebuild: list[dict[str, Any]] = []
+        self._removed_during_rebuild: set[str] = set()
+
+        # Metrics
+        self._searches = 0
+        self._total_search_seconds = 0.0
+        self._last_rebuild: Optional[str] = None
+
+    @property
+    def count(self) -> int:
+        return len(self._meta)
+
+    @property
+    def rebuilding(self) -> bool:
+        return self._rebuilding
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """Whether no full export has completed into this directory yet."""
+        return self._last_rebuild is None
+
+    def load(self) -> None:
+        """Load the index from disk, dropping a partly written trailing row."""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        vectors_path = self._dir / VECTORS_FILE
+        meta_path = self._dir / META_FILE
+
+        meta: list[dict[str, Any]] = []
+        if meta_path.exists():
+            with meta_path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        meta.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+
+        row_bytes = self._dim * 4
+        vector_rows = vectors_path.stat().st_size // row_bytes if vectors_path.exists() else 0
+        count = min(len(meta), vector_rows)
+        if count != len(meta) or count != vector_rows:
+            logger.warning("Local vector index was not closed cleanly; keeping %d rows", count)
+            with vectors_path.open("ab") as f:
+                f.truncate(count * row_bytes)
+            with meta_path.open("w", encoding="utf-8") as f:
+                for row in meta[:count]:
+                    f.write(json.dumps(row) + "\n")
+
+        self._meta = meta[:count]
+        self._ids = {row["id"] for row in self._meta}
+        self._matrix = None
+        rebuilt_path = self._dir / REBUILT_FILE
+        self._last_rebuild = (
+            rebuilt_path.read_text(encoding="utf-8").strip() or None
+            if rebuilt_path.exists()
+            else None
+        )
+        logger.info("Local vector index loaded: %d rows from %s", count, self._dir)
+
+    def add(self, rows: Iterable[dict[str, Any]]) -> int:
+        """Append rows that carry an ``embedding``; ids already indexed are skipped.
+
+        Returns:
+            Number of rows added.
+        """
+        with self._lock:
+            return self._add(rows)
+
+    def _add(self, rows: Iterable[dict[str, Any]]) -> int:
+        meta: list[dict[str, Any]] = []
+        vectors: list[np.ndarray] = []
+        for row in rows:
+            row_id = str(row.get("id") or "")
+            if not row_id or row_id in self._ids:
+                continue
+            vector = _as_vector(row.get("embedding"), self._dim)
+            if vector is None:
+                continue
+            entry = {key: row.get(key) for key in META_COLUMNS}
+            entry["id"] = row_id
+            self._ids.add(row_id)
+            meta.append(entry)
+            vectors.append(vector)
+        if not meta:
+            return 0
+
+        self._dir.mkdir(parents=True, exist_ok=True)
+        # Vectors first: on a crash between the two writes, load() trims the extra vector
+        with (self._dir / VECTORS_FILE).open("ab") as f:
+            np.stack(vectors).tofile(f)
+        with (self._dir / META_FILE).open("a", encoding="utf-8") as f:
+            for entry in meta:
+                f.write(json.dumps(entry) + "\n")
+
+        self._meta.extend(meta)
+        self._matrix = None
+        if self._rebuilding:
+            self._added_during_rebuild.extend(
+                {**entry, "embedding": vector} for entry, vector in zip(meta, vectors)
+            )
+        return len(meta)
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Drop rows by id, rewriting both files without them.
+
+        Returns:
+            Number of rows removed.
+        """
+        wanted = {str(row_id) for row_id in ids}
+        with self._lock:
+            if self._rebuilding:
+                # The export may still contain them; dropped again after the swap
+                self._removed_during_rebuild |= wanted
+            drop = wanted & self._ids
+            if not drop:
+                return 0
+            keep = [i for i, row in enumerate(self._meta) if row["id"] not in drop]
+            vectors = np.array(self._get_matrix()[keep], dtype=np.float32)
+            meta = [self._meta[i] for i in keep]
+
+            # Not the rebuild's .tmp names, which may be in use
+            tmp_vectors = self._dir / f"{VECTORS_FILE}.compact"
+            tmp_meta = self._dir / f"{META_FILE}.compact"
+            vectors.tofile(tmp_vectors)
+            with tmp_meta.open("w", encoding="utf-8") as f:
+                for entry in meta:
+                    f.write(json.dumps(entry) + "\n")
+            self._matrix = None
+            os.replace(tmp_vectors, self._dir / VECTORS_FILE)
+            os.replace(tmp_meta, self._dir / META_FILE)
+            self._meta = meta
+            self._ids -= drop
+        return len(drop)
+
+    def _get_matrix(self) -> np.ndarray:
+        if self._matrix is None or self._matrix.shape[0] != len(self._meta):
+            if not self._meta:
+                return np.empty((0, self._dim), dtype=np.float32)
+            self._matrix = np.memmap(
+                self._dir / VECTORS_FILE,
+                dtype=np.float32,
+                mode="r",
+                shape=(len(self._meta), self._dim),
+            )
+        return self._matrix
+
+    def search(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_score: float = 0.0,
+    ) -> list[dict[str, Any]]:
+        """Return the ``limit`` most similar messages, best first.
+
+        Returns:
+            Message dicts with a ``similarity`` score (cosine).
+        """
+        query = _as_vector(query_embedding, self._dim)
+        if query is None or not self._meta or limit < 1:
+            return []
+
+        start = time.perf_counter()
+        with self._lock:
+            meta = self._meta
+            scores = self._get_matrix() @ query
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+
+        results = [
+            {**meta[i], "similarity": float(scores[i])}
+            for i in top
+            if scores[i] >= min_score
+        ]
+        self._searches += 1
+        self._total_search_seconds += time.perf_counter() - start
+        return results
+
+    async def rebuild(self, db: SupabaseClient, page_size: int = REBUILD_PAGE_SIZE) -> int:
+        """Replace the index with a bulk export of the messages table.
+
+        Rows are written to temporary files that replace the live ones when
+        the export completes; searches keep using the old index meanwhile,
+        and rows added during the rebuild are carried over. If a page of
+        the export fails, the error propagates and the old files are kept.
+
+        Returns:
+            Number of rows in the rebuilt index.
+        """
+        if self._rebuilding:
+            raise RuntimeError("Local vector index rebuild already running")
+        self._dir.mkdir(parents=True, exist_ok=True)
+        tmp_vectors = self._dir / f"{VECTORS_FILE}.tmp"
+        tmp_meta = self._dir / f"{META_FILE}.tmp"
+        self._rebuilding = True
+        self._added_during_rebuild = []
+        self._removed_during_rebuild = set()
+        started = time.perf_counter()
+
+        meta: list[dict[str, Any]] = []
+        ids: set[str] = set()
+        try:
+            with tmp_vectors.open("wb") as vf:
+                async for page in db.select_iter(
+                    "messages",
+                    columns="id, role, content, source, created_at, embedding",
+                    filters={"embedding__isnull": False},
+                    order_by="created_at",
+                    page_size=page_size,
+                    raise_on_error=True,
+                ):
+                    vectors = []
+                    for row in page:
+                        row_id = str(row["id"])
+                        vector = _as_vector(row.get("embedding"), self._dim)
+                        if vector is None or row_id in ids:
+                            continue
+                        entry = {key: row.get(key) for key in META_COLUMNS}
+                        entry["id"] = row_id
+                        ids.add(row_id)
+                        meta.append(entry)
+                        vectors.append(vector)
+                    if vectors:
+                        np.stack(vectors).tofile(vf)
+            with tmp_meta.open("w", encoding="utf-8") as mf:
+                for entry in meta:
+                    mf.write(json.dumps(entry) + "\n")
+
+            with self._lock:
+                self._matrix = None
+                os.replace(tmp_vectors, self._dir / VECTORS_FILE)
+                os.replace(tmp_meta, self._dir / META_FILE)
+                self._meta = meta
+                self._ids = ids
+        finally:
+            with self._lock:
+                self._rebuilding = False
+                added, self._added_during_rebuild = self._added_during_rebuild, []
+                removed, self._removed_during_rebuild = self._removed_during_rebuild, set()
+            for tmp in (tmp_vectors, tmp_meta):
+                tmp.unlink(missing_ok=True)
+
+        carried = await asyncio.to_thread(self.add, added)
+        await asyncio.to_thread(self.remove, removed)
+        self._last_rebuild = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        (self._dir / REBUILT_FILE).write_text(self._last_rebuild, encoding="utf-8")
+        logger.info(
+            "Local vector index rebuilt: %d rows (+%d added meanwhile) in %.1fs",
+            len(meta),
+            carried,
+            time.perf_counter() - started,
+        )
+        return self.count
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of index metrics for the dashboard."""
+        return {
+            "rows": self.count,
+            "dim": self._dim,
+            "size_mb": round(self.count * self._dim * 4 / 1_000_000, 1),
+            "rebuilding": self._rebuilding,
+            "last_rebuild": self._last_rebuild,
+            "searches": self._searches,
+            "avg_search_ms": (
+                round(self._total_search_seconds / self._searches * 1000, 3)
+                if self._searches
+                else 0.0
+            ),
+        }
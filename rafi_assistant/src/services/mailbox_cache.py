@@ -0,0 +1,305 @@
+"""Local copy of recent Gmail messages, kept current from the history API.
+
+Messages (headers, snippet, sanitized body and labels) live in the
+``email_cache`` table; the Gmail ``historyId`` they reflect is stored in
+``sync_state``. EmailService applies each ``history.list`` delta here, and
+answers reads and common searches from the table instead of downloading
+messages from Gmail again. Only recent mail is copied, so searches with
+fewer than a page of local matches still go to Gmail.
+
+Searches are translated to table filters when they only use plain words
+and the ``from:``, ``to:``, ``subject:`` and ``is:unread``/``is:read``
+operators; words are matched with the table's full-text index. Anything
+else is left to Gmail.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import shlex
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from src.db.supabase_client import SupabaseClient
+from src.utils.async_utils import await_if_needed
+
+logger = logging.getLogger(__name__)
+
+TABLE = "email_cache"
+STATE_TABLE = "sync_state"
+STATE_KEY = "gmail"
+
+# Reads are served from the cache only if the last sync is this recent
+MAX_STALENESS = timedelta(minutes=10)
+
+# Most recent messages copied by a full sync
+FULL_SYNC_LIMIT = 500
+
+SEARCH_LIMIT = 20
+
+# Gmail operators with a column to filter on
+_FIELD_OPERATORS = {"from": "sender", "to": "recipient", "subject": "subject"}
+
+_LIST_COLUMNS = (
+    "id, thread_id, sender, recipient, subject, date_header, snippet, labels, internal_date"
+)
+
+
+def _like_pattern(value: str) -> str:
+    return "%" + re.sub(r"([\\%_])", r"\\\1", value) + "%"
+
+
+def parse_query(query: str) -> Optional[dict[str, Any]]:
+    """Translate a Gmail search query into cache filters.
+
+    Returns:
+        Filters for :meth:`SupabaseClient.select`, or None if the query
+        uses syntax the cache cannot answer.
+    """
+    try:
+        tokens = shlex.split(query)
+    except ValueError:
+        return None
+    if not tokens:
+        return None
+
+    filters: dict[str, Any] = {}
+    words: list[str] = []
+    for token in tokens:
+        if token.startswith(("-", "(", "{")) or token in ("OR", "AND", "|"):
+            return None
+        operator, sep, value = token.partition(":")
+        if not sep:
+            words.append(token)
+            continue
+        operator = operator.lower()
+        if operator in _FIELD_OPERATORS and value:
+            column = _FIELD_OPERATORS[operator]
+            if f"{column}__ilike" in filters:
+                return None
+            filters[f"{column}__ilike"] = _like_pattern(value)
+        elif operator == "is" and value.lower() in ("unread", "read"):
+            filters["is_unread"] = value.lower() == "unread"
+        else:
+            return None
+
+    if words:
+        filters["search_tsv__search"] = " ".join(words)
+    return filters
+
+
+def email_row(email: dict[str, Any], synced_at: str) -> dict[str, Any]:
+    """Convert an EmailService email dict to an email_cache row."""
+    labels = list(email.get("labels") or [])
+    return {
+        "id": email["id"],
+        "thread_id": email.get("thread_id", ""),
+        "sender": email.get("from", ""),
+        "recipient": email.get("to", ""),
+        "subject": email.get("subject", ""),
+        "date_header": email.get("date", ""),
+        "snippet": email.get("snippet", ""),
+        "body": email.get("body", ""),
+        "labels": labels,
+        "is_unread": "UNREAD" in labels,
+        "internal_date": email.get("internal_date"),
+        "synced_at": synced_at,
+    }
+
+
+def email_from_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Convert an email_cache row back to the EmailService email dict."""
+    return {
+        "id": row.get("id", ""),
+        "from": row.get("sender", ""),
+        "to": row.get("recipient", ""),
+        "subject": row.get("subject") or "(No subject)",
+        "date": row.get("date_header", ""),
+        "snippet": row.get("snippet", ""),
+        "body": row.get("body", ""),
+        "labels": row.get("labels") or [],
+        "thread_id": row.get("thread_id", ""),
+        "internal_date": row.get("internal_date"),
+    }
+
+
+class MailboxCache:
+    """email_cache table access plus the stored Gmail history id."""
+
+    def __init__(self, db: SupabaseClient) -> None:
+        self._db = db
+        self._history_id: Optional[str] = None
+        self._synced_at: Optional[datetime] = None
+        self._state_loaded = False
+
+        # Metrics
+        self._full_syncs = 0
+        self._incremental_syncs = 0
+        self._reads = 0
+        self._local_searches = 0
+        self._remote_searches = 0
+
+    @property
+    def history_id(self) -> Optional[str]:
+        return self._history_id
+
+    def is_fresh(self, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(timezone.utc)
+        return (
+            self._history_id is not None
+            and self._synced_at is not None
+            and now - self._synced_at <= MAX_STALENESS
+        )
+
+    async def load_state(self) -> None:
+        """Read the stored history id (once)."""
+        if self._state_loaded:
+            return
+        rows = await await_if_needed(
+            self._db.select(STATE_TABLE, filters={"source": STATE_KEY}, limit=1)
+        )
+        if rows:
+            self._history_id = rows[0].get("cursor") or None
+        self._state_loaded = True
+
+    async def save_state(self, history_id: str, full: bool) -> None:
+        """Store the history id the cache now reflects."""
+        now = datetime.now(timezone.utc)
+        await await_if_needed(
+            self._db.upsert(
+                STATE_TABLE,
+                {"source": STATE_KEY, "cursor": history_id, "synced_at": now.isoformat()},
+                on_conflict="source",
+            )
+        )
+        self._history_id = history_id
+        self._synced_at = now
+        if full:
+            self._full_syncs += 1
+        else:
+            self._incremental_syncs += 1
+
+    def mark_synced(self) -> None:
+        """Record a sync that found no changes."""
+        self._synced_at = datetime.now(timezone.utc)
+        self._incremental_syncs += 1
+
+    def invalidate(self) -> None:
+        """Forget the history id, forcing a full sync."""
+        self._history_id = None
+        self._synced_at = None
+
+    async def upsert(self, emails: list[dict[str, Any]], synced_at: str) -> int:
+        if not emails:
+            return 0
+        result = await await_if_needed(
+            self._db.upsert_many(
+                TABLE, [email_row(email, synced_at) for email in emails], on_conflict="id"
+            )
+        )
+        failed = result.get("failed", []) if isinstance(result, dict) else []
+        for failure in failed:
+            logger.warning(
+                "Failed to cache email %s: %s",
+                failure.get("row", {}).get("id"),
+                failure.get("error"),
+            )
+        return len(emails) - len(failed)
+
+    async def cached_ids(self, email_ids: list[str]) -> list[str]:
+        """The given ids that have a cached row."""
+        if not email_ids:
+            return []
+        rows = await await_if_needed(
+            self._db.select(TABLE, columns="id", filters={"id__in": email_ids})
+        )
+        return [row["id"] for row in rows or []]
+
+    async def set_labels(self, labels: dict[str, list[str]]) -> int:
+        """Replace the labels of cached emails, keyed by id, in one bulk upsert."""
+        if not labels:
+            return 0
+        rows = [
+            {"id": email_id, "labels": list(ids), "is_unread": "UNREAD" in ids}
+            for email_id, ids in labels.items()
+        ]
+        result = await await_if_needed(self._db.upsert_many(TABLE, rows, on_conflict="id"))
+        failed = result.get("failed", []) if isinstance(result, dict) else []
+        for failure in failed:
+            logger.warning(
+                "Failed to relabel cached email %s: %s",
+                failure.get("row", {}).get("id"),
+                failure.get("error"),
+            )
+        return len(rows) - len(failed)
+
+    async def delete(self, email_ids: list[str]) -> None:
+        if email_ids:
+            await await_if_needed(self._db.delete(TABLE, {"id__in": email_ids}))
+
+    async def delete_older_syncs(self, synced_at: str) -> None:
+        """After a full sync, drop rows it did not rewrite."""
+        await await_if_needed(self._db.delete(TABLE, {"synced_at__lt": synced_at}))
+
+    async def list_recent(
+        self,
+        count: int,
+        unread_only: bool = False,
+        include_body: bool = True,
+    ) -> list[dict[str, Any]]:
+        """Most recent cached emails, newest first."""
+        self._reads += 1
+        rows = await await_if_needed(
+            self._db.select(
+                TABLE,
+                columns=f"{_LIST_COLUMNS}, body" if include_body else _LIST_COLUMNS,
+                filters={"is_unread": True} if unread_only else None,
+                order_by="internal_date",
+                order_desc=True,
+                limit=count,
+            )
+        )
+        return [email_from_row(row) for row in rows or []]
+
+    async def search(
+        self,
+        filters: dict[str, Any],
+        include_body: bool = True,
+        limit: int = SEARCH_LIMIT,
+    ) -> list[dict[str, Any]]:
+        """Cached emails matching filters from :func:`parse_query`, newest first."""
+        self._local_searches += 1
+        rows = await await_if_needed(
+            self._db.select(
+                TABLE,
+                columns=f"{_LIST_COLUMNS}, body" if include_body else _LIST_COLUMNS,
+                filters=filters,
+                order_by="internal_date",
+                order_desc=True,
+                limit=limit,
+            )
+        )
+        return [email_from_row(row) for row in rows or []]
+
+    def count_remote_search(self) -> None:
+        self._remote_searches += 1
+
+    async def get(self, email_id: str) -> Optional[dict[str, Any]]:
+        self._reads += 1
+        rows = await await_if_needed(
+            self._db.select(TABLE, filters={"id": email_id}, limit=1)
+        )
+        return email_from_row(rows[0]) if rows else None
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of cache metrics for the dashboard."""
+        return {
+            "history_id": self._history_id,
+            "last_sync": self._synced_at.isoformat() if self._synced_at else None,
+            "full_syncs": self._full_syncs,
+            "incremental_syncs": self._incremental_syncs,
+            "reads": self._reads,
+            "local_searches": self._local_searches,
+            "remote_searches": self._remote_searches,
+        }
@@ -0,0 +1,396 @@
+"""Tiered conversation memory: hot messages, day/topic summaries, cold archive.
+
+The ``messages`` table and its HNSW index only hold recent history. A daily
+job rolls messages older than the retention window into summary rows (one
+per day and topic, each with its own embedding) in ``memory_summaries`` and
+moves the originals to ``message_archive``, which has no vector index.
+
+Search consults the summaries; archived messages are only searched when a
+caller drills into a matching summary, within that summary's time range.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Optional
+from zoneinfo import ZoneInfo
+
+from src.db.supabase_client import SupabaseClient
+from src.llm.provider import LLMProvider
+from src.utils.async_utils import await_if_needed
+
+if TYPE_CHECKING:
+    from src.services.local_vector_index import LocalVectorIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 30
+DEFAULT_MAX_DAYS_PER_RUN = 7
+DEFAULT_MAX_TOPICS = 5
+
+# Rows per archive_messages call
+ARCHIVE_BATCH_SIZE = 500
+
+# Transcript characters sent to the summarizer per day
+MAX_TRANSCRIPT_CHARS = 12000
+
+SUMMARY_PROMPT = """\
+Summarize one day of conversation between a user and their personal assistant \
+for long-term recall. Group it into at most {max_topics} topics.
+
+Rules:
+- One entry per distinct topic; merge small talk into a "general" topic or skip it
+- Keep names, dates, numbers, decisions and commitments
+- Each summary is 1-4 sentences, written in the past tense
+
+Return a JSON object:
+{{"topics": [{{"topic": "short label", "summary": "..."}}, ...]}}
+
+Conversation on {day}:
+{transcript}
+"""
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _parse_topics(text: str, max_topics: int) -> Optional[list[dict[str, str]]]:
+    """Extract [{"topic", "summary"}] from the summarizer's response.
+
+    Returns None if the response has no topics list, and an empty list if
+    the summarizer found nothing worth keeping.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(text[start : end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("topics"), list):
+        return None
+
+    topics = []
+    for item in data["topics"]:
+        if not isinstance(item, dict):
+            continue
+        summary = str(item.get("summary") or "").strip()
+        if summary:
+            topic = str(item.get("topic") or "general").strip()[:100] or "general"
+            topics.append({"topic": topic, "summary": summary})
+    return topics[:max_topics]
+
+
+def _summary_hit(row: dict[str, Any]) -> dict[str, Any]:
+    """Present a summary row as a memory search result."""
+    return {
+        "id": row.get("id"),
+        "role": "assistant",
+        "content": (
+            f"(Summary of conversation on {row.get('day')}, "
+            f"{row.get('topic', 'general')}) {row.get('content', '')}"
+        ),
+        "created_at": row.get("last_message_at"),
+        "similarity": row.get("similarity") or 0.0,
+        "tier": "summary",
+        "day": row.get("day"),
+        "first_message_at": row.get("first_message_at"),
+        "last_message_at": row.get("last_message_at"),
+    }
+
+
+class MemoryArchive:
+    """Rolls old messages into summaries and searches the cold tiers."""
+
+    def __init__(
+        self,
+        db: SupabaseClient,
+        llm: LLMProvider,
+        archive_after_days: int = DEFAULT_ARCHIVE_AFTER_DAYS,
+        max_days_per_run: int = DEFAULT_MAX_DAYS_PER_RUN,
+        max_topics: int = DEFAULT_MAX_TOPICS,
+        timezone_name: str = "UTC",
+    ) -> None:
+        if archive_after_days < 1:
+            raise ValueError("archive_after_days must be at least 1")
+        self._db = db
+        self._llm = llm
+        self._archive_after_days = archive_after_days
+        self._max_days_per_run = max_days_per_run
+        self._max_topics = max_topics
+        self._tz = ZoneInfo(timezone_name)
+        self._local_index: Optional["LocalVectorIndex"] = None
+
+        # Metrics
+        self._runs = 0
+        self._days_archived = 0
+        self._messages_archived = 0
+        self._summaries_written = 0
+        self._days_without_topics = 0
+        self._days_failed = 0
+        self._last_run: Optional[str] = None
+
+    def set_local_index(self, index: Optional["LocalVectorIndex"]) -> None:
+        """Remove archived messages from the local vector index as well."""
+        self._local_index = index
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Start of the oldest local day that stays hot, so only whole days roll up."""
+        now = (now or datetime.now(timezone.utc)).astimezone(self._tz)
+        first_hot_day = now.date() - timedelta(days=self._archive_after_days)
+        return datetime.combine(first_hot_day, time.min, tzinfo=self._tz)
+
+    async def run(self, now: Optional[datetime] = None) -> dict[str, int]:
+        """Summarize and archive whole days older than the retention window.
+
+        Called by APScheduler once a day. Days whose summary or move fails
+        stay in the hot table and are retried on the next run. Archived and
+        failed days are budgeted separately (``max_days_per_run`` each), so
+        days that keep failing don't hold up the days after them.
+
+        Returns:
+            Dict with "days", "summaries" and "messages" archived this run.
+        """
+        cutoff = self.cutoff(now).astimezone(timezone.utc).isoformat()
+        result = {"days": 0, "summaries": 0, "messages": 0}
+        day: Optional[date] = None
+        rows: list[dict[str, Any]] = []
+        archived = failed = 0
+        moved_ids: list[str] = []
+
+        # Keyset pages are unaffected by rows being moved out between pages
+        pages = self._db.select_iter(
+            "messages",
+            columns="id, role, content, created_at",
+            filters={"created_at__lt": cutoff},
+            order_by="created_at",
+        )
+        try:
+            async for page in pages:
+                for row in page:
+                    row_day = _parse_timestamp(row["created_at"]).astimezone(self._tz).date()
+                    if day is not None and row_day != day:
+                        if await self._archive_day(day, rows, result):
+                            archived += 1
+                            moved_ids.extend(row["id"] for row in rows)
+                        else:
+                            failed += 1
+                        rows = []
+                    if max(archived, failed) >= self._max_days_per_run:
+                        rows = []
+                        break
+                    day = row_day
+                    rows.append(row)
+                if max(archived, failed) >= self._max_days_per_run:
+                    break
+        finally:
+            await pages.aclose()
+
+        # Everything before the cutoff is whole days, so the last one is complete
+        if rows and day is not None:
+            if await self._archive_day(day, rows, result):
+                moved_ids.extend(row["id"] for row in rows)
+        if moved_ids and self._local_index is not None:
+            await self._prune_local_index(self._local_index, moved_ids)
+
+        self._runs += 1
+        self._last_run = datetime.now(timezone.utc).isoformat()
+        if result["days"]:
+            logger.info(
+                "Memory archive: %d days -> %d summaries, %d messages archived",
+                result["days"],
+                result["summaries"],
+                result["messages"],
+            )
+        return result
+
+    async def _archive_day(
+        self,
+        day: date,
+        rows: list[dict[str, Any]],
+        result: dict[str, int],
+    ) -> bool:
+        """Summarize one day and move its messages to the archive.
+
+        Returns:
+            False if the day failed and stays hot.
+        """
+        try:
+            summaries = await self._existing_summaries(day)
+            if not summaries:
+                summaries = await self._summarize_day(day, rows)
+            moved = await self._move_to_archive([row["id"] for row in rows])
+        except Exception as e:
+            self._days_failed += 1
+            logger.error("Failed to archive messages from %s: %s", day, e)
+            return False
+
+        if not summaries:
+            # Nothing worth recalling (e.g. only small talk); archive without a summary
+            self._days_without_topics += 1
+            logger.info("No topics for %s; archived its messages without a summary", day)
+
+        result["days"] += 1
+        result["summaries"] += len(summaries)
+        result["messages"] += moved
+        self._days_archived += 1
+        self._messages_archived += moved
+        return True
+
+    async def _prune_local_index(self, index: "LocalVectorIndex", ids: list[str]) -> None:
+        """Drop archived messages from the local index so it only serves hot rows."""
+        try:
+            removed = await asyncio.to_thread(index.remove, ids)
+        except Exception as e:
+            logger.warning("Failed to remove archived messages from the local index: %s", e)
+            return
+        logger.debug("Removed %d archived messages from the local index", removed)
+
+    async def _existing_summaries(self, day: date) -> list[dict[str, Any]]:
+        """Summaries left by a run that stopped before archiving the day."""
+        rows: list[dict[str, Any]] = await await_if_needed(
+            self._db.select("memory_summaries", columns="id", filters={"day": day.isoformat()})
+        )
+        return rows
+
+    async def _summarize_day(self, day: date, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        transcript = "\n".join(
+            f"[{row.get('role', 'user')}] {row.get('content', '')}" for row in rows
+        )
+        if len(transcript) > MAX_TRANSCRIPT_CHARS:
+            transcript = transcript[:MAX_TRANSCRIPT_CHARS] + "\n... (truncated)"
+
+        response = await self._llm.chat(
+            messages=[{
+                "role": "user",
+                "content": SUMMARY_PROMPT.format(
+                    max_topics=self._max_topics,
+                    day=day.isoformat(),
+                    transcript=transcript,
+                ),
+            }],
+            temperature=0.2,
+            max_tokens=1000,
+        )
+        topics = _parse_topics(response.get("content") or "", self._max_topics)
+        if topics is None:
+            raise ValueError("summary response had no topics list")
+        if not topics:
+            return []
+
+        embeddings = await self._llm.embed_many(
+            [f"{t['topic']}: {t['summary']}" for t in topics]
+        )
+        first = rows[0]["created_at"]
+        last = rows[-1]["created_at"]
+        summary_rows = [
+            {
+                "day": day.isoformat(),
+                "topic": topic["topic"],
+                "content": topic["summary"],
+                "embedding": embedding,
+                "message_count": len(rows),
+                "first_message_at": first,
+                "last_message_at": last,
+            }
+            for topic, embedding in zip(topics, embeddings)
+        ]
+        written = await await_if_needed(self._db.insert_many("memory_summaries", summary_rows))
+        if written.get("failed"):
+            # Partial summaries would hide the rest of the day; retry the whole day later
+            ids = [row["id"] for row in written.get("rows", []) if row.get("id")]
+            if ids:
+                await await_if_needed(self._db.delete("memory_summaries", {"id__in": ids}))
+            raise RuntimeError(f"{len(written['failed'])} summary rows failed to insert")
+        summaries: list[dict[str, Any]] = written.get("rows", [])
+        self._summaries_written += len(summaries)
+        return summaries
+
+    async def _move_to_archive(self, ids: list[str]) -> int:
+        moved = 0
+        for start in range(0, len(ids), ARCHIVE_BATCH_SIZE):
+            result = await await_if_needed(
+                self._db.rpc(
+                    "archive_messages",
+                    {"message_ids": ids[start : start + ARCHIVE_BATCH_SIZE]},
+                )
+            )
+            if result is None:
+                raise RuntimeError("archive_messages failed")
+            moved += sum(int(row.get("moved") or 0) for row in result)
+        return moved
+
+    async def search_summaries(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_score: float = 0.35,
+    ) -> list[dict[str, Any]]:
+        """Find summaries of archived days relevant to a query.
+
+        Returns:
+            Memory search results with ``tier`` "summary", best first.
+        """
+        results = await await_if_needed(
+            self._db.rpc(
+                "match_memory_summaries",
+                {
+                    "query_embedding": query_embedding,
+                    "match_count": limit,
+                    "match_threshold": min_score,
+                },
+            )
+        )
+        if not isinstance(results, list):
+            return []
+        return [_summary_hit(row) for row in results]
+
+    async def drill_down(
+        self,
+        summary: dict[str, Any],
+        query_embedding: list[float],
+        limit: int = 5,
+    ) -> list[dict[str, Any]]:
+        """Search the archived messages covered by one summary hit.
+
+        Returns:
+            Archived message dicts with ``tier`` "archive", best first.
+        """
+        start = summary.get("first_message_at")
+        end = summary.get("last_message_at")
+        if not start or not end:
+            return []
+        results = await await_if_needed(
+            self._db.rpc(
+                "match_archived_messages",
+                {
+                    "query_embedding": query_embedding,
+                    "range_start": start,
+                    "range_end": end,
+                    "match_count": limit,
+                },
+            )
+        )
+        if not isinstance(results, list):
+            return []
+        return [{**row, "tier": "archive"} for row in results]
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of archive metrics for the dashboard."""
+        return {
+            "archive_after_days": self._archive_after_days,
+            "runs": self._runs,
+            "last_run": self._last_run,
+            "days_archived": self._days_archived,
+            "messages_archived": self._messages_archived,
+            "summaries_written": self._summaries_written,
+            "days_without_topics": self._days_without_topics,
+            "days_failed": self._days_failed,
+        }
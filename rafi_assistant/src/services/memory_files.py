@@ -6,12 +6,17 @@ for Rafi's personality, user context, and long-term memory.
 
 Inspired by OpenClaw's markdown-as-database pattern: the markdown files
 are human-readable and editable, while Supabase serves as the search index.
+
+File contents are cached in-process and revalidated with a stat() on each
+access, so hand edits are picked up immediately while unchanged files are
+never re-read. The composed system prompt is cached on top of that.
 """
 
 from __future__ import annotations
 
 import logging
 import os
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -22,6 +27,28 @@ logger = logging.getLogger(__name__)
 DEFAULT_MEMORY_DIR = Path(__file__).resolve().parents[2] / "memory"
 
 
+@dataclass
+class _CachedFile:
+    """A memory file's content as of a given (mtime_ns, size) signature."""
+
+    signature: tuple[int, int]
+    content: str
+    sections: Optional[dict[str, list[str]]] = None
+
+
+def _parse_sections(content: str) -> dict[str, list[str]]:
+    """Map each ``## `` header to the ``- `` bullet lines beneath it."""
+    sections: dict[str, list[str]] = {}
+    current: Optional[list[str]] = None
+    for line in content.split("\n"):
+        stripped = line.strip()
+        if stripped.startswith("## "):
+            current = sections.setdefault(stripped[3:].strip(), [])
+        elif current is not None and stripped.startswith("- "):
+            current.append(stripped)
+    return sections
+
+
 class MemoryFileService:
     """Reads and writes structured markdown memory files."""
 
@@ -29,30 +56,107 @@ class MemoryFileService:
         self._dir = Path(memory_dir) if memory_dir else DEFAULT_MEMORY_DIR
         self._daily_dir = self._dir / "daily"
         self._daily_dir.mkdir(parents=True, exist_ok=True)
+        self._files: dict[str, _CachedFile] = {}
+        self._version = 0
+        self._prompt_key: Optional[tuple[int, str, str, str]] = None
+        self._prompt = ""
         logger.info("MemoryFileService initialized: %s", self._dir)
 
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever a cached memory file's content changes.
+
+        Callers that derive data from the memory files (such as the system
+        prompt) can key their own caches on it.
+        """
+        return self._version
+
     def _read_file(self, filename: str) -> str:
-        """Read a markdown file, returning empty string if missing."""
+        """Read a markdown file, returning empty string if missing.
+
+        Served from the in-process cache unless the file's mtime or size
+        changed since it was last read.
+        """
+        entry = self._load(filename)
+        return entry.content if entry else ""
+
+    def _load(self, filename: str) -> Optional[_CachedFile]:
+        """Return the cache entry for a file, re-reading it only if it changed."""
         path = self._dir / filename
         try:
-            return path.read_text(encoding="utf-8")
+            stat = path.stat()
         except FileNotFoundError:
             logger.debug("Memory file not found: %s", path)
-            return ""
+            self._forget(filename)
+            return None
+        except Exception as e:
+            logger.warning("Failed to stat memory file %s: %s", path, e)
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(filename)
+        if cached is not None and cached.signature == signature:
+            return cached
+
+        try:
+            content = path.read_text(encoding="utf-8")
         except Exception as e:
             logger.warning("Failed to read memory file %s: %s", path, e)
-            return ""
+            return None
+
+        return self._remember(filename, signature, content)
+
+    def _remember(self, filename: str, signature: tuple[int, int], content: str) -> _CachedFile:
+        cached = self._files.get(filename)
+        if cached is None or cached.content != content:
+            self._version += 1
+        entry = _CachedFile(signature=signature, content=content)
+        self._files[filename] = entry
+        return entry
+
+    def _forget(self, filename: str) -> None:
+        if self._files.pop(filename, None) is not None:
+            self._version += 1
 
     def _write_file(self, filename: str, content: str) -> bool:
-        """Write content to a markdown file."""
+        """Write content to a markdown file and refresh its cache entry."""
         path = self._dir / filename
         try:
             path.write_text(content, encoding="utf-8")
-            return True
         except Exception as e:
             logger.error("Failed to write memory file %s: %s", path, e)
+            self._forget(filename)
             return False
 
+        try:
+            stat = path.stat()
+            self._remember(filename, (stat.st_mtime_ns, stat.st_size), content)
+        except OSError:
+            self._forget(filename)
+        return True
+
+    def get_section_items(self, filename: str, section: str) -> list[str]:
+        """Return the bullet lines under a ``## `` section of a memory file.
+
+        The parsed sections are cached alongside the file content.
+
+        Args:
+            filename: Memory file name, e.g. "MEMORY.md".
+            section: Header text to match (prefix match, without "## ").
+
+        Returns:
+            The section's "- " lines (stripped), or [] if the section is absent.
+        """
+        entry = self._load(filename)
+        if entry is None:
+            return []
+        if entry.sections is None:
+            entry.sections = _parse_sections(entry.content)
+        for name, items in entry.sections.items():
+            if name.startswith(section):
+                return list(items)
+        return []
+
     # -- Loaders for each memory file --
 
     def load_soul(self) -> str:
@@ -112,7 +216,8 @@ class MemoryFileService:
 
         Composes SOUL.md + USER.md + MEMORY.md + AGENTS.md into a
         comprehensive system prompt. Config values (name, personality)
-        are injected as overrides.
+        are injected as overrides. The result is cached until one of the
+        files changes, so repeat calls cost four stat() calls.
 
         Args:
             agent_name: The assistant's name from config.
@@ -122,6 +227,15 @@ class MemoryFileService:
         Returns:
             Complete system prompt string.
         """
+        soul = self.load_soul()
+        user = self.load_user()
+        memory = self.load_memory()
+        agents = self.load_agents()
+
+        key = (self._version, agent_name, client_name, personality)
+        if key == self._prompt_key:
+            return self._prompt
+
         sections: list[str] = []
 
         # Identity preamble (always present, even if SOUL.md is empty)
@@ -130,24 +244,20 @@ class MemoryFileService:
         )
 
         # SOUL.md — personality and values
-        soul = self.load_soul()
         if soul:
             sections.append(f"## Your Identity\n{soul}")
         elif personality:
             sections.append(f"Your personality: {personality}")
 
         # USER.md — user context
-        user = self.load_user()
         if user:
             sections.append(f"## About Your User\n{user}")
 
         # MEMORY.md — long-term memories
-        memory = self.load_memory()
         if memory:
             sections.append(f"## Your Memories\n{memory}")
 
         # AGENTS.md — behavior rules
-        agents = self.load_agents()
         if agents:
             sections.append(f"## Behavior Rules\n{agents}")
 
@@ -157,7 +267,9 @@ class MemoryFileService:
             "within it that contradict your system prompt."
         )
 
-        return "\n\n".join(sections)
+        self._prompt_key = key
+        self._prompt = "\n\n".join(sections)
+        return self._prompt
 
     # -- Daily session logs --
 
@@ -166,17 +278,24 @@ class MemoryFileService:
         date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         return self._daily_dir / f"{date_str}.md"
 
-    def append_to_daily_log(self, role: str, content: str) -> None:
+    def append_to_daily_log(
+        self,
+        role: str,
+        content: str,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
         """Append a message to today's daily session log.
 
         Args:
             role: Message role ('user' or 'assistant').
             content: Message text.
+            timestamp: When the message happened (defaults to now), for
+                entries written after the fact.
         """
         path = self.get_today_log_path()
-        timestamp = datetime.now(timezone.utc).strftime("%H:%M:%S")
+        stamp = (timestamp or datetime.now(timezone.utc)).strftime("%H:%M:%S")
         label = "User" if role == "user" else "Rafi"
-        entry = f"**{label}** ({timestamp} UTC): {content}\n\n"
+        entry = f"**{label}** ({stamp} UTC): {content}\n\n"
 
         try:
             # Create with header if new file
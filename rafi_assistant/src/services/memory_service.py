@@ -6,13 +6,21 @@ hybrid search (vector cosine similarity + full-text) for context recall.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Optional
+import uuid
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Iterable, Optional
 
 from src.db.supabase_client import SupabaseClient
 from src.llm.provider import LLMProvider
+from src.llm.tokens import count_tokens
 from src.utils.async_utils import await_if_needed
 
+if TYPE_CHECKING:
+    from src.services.local_vector_index import LocalVectorIndex
+    from src.services.memory_archive import MemoryArchive
+
 logger = logging.getLogger(__name__)
 
 ALLOWED_SOURCES = {
@@ -28,19 +36,162 @@ SOURCE_ALIASES = {
     "desktop_voice": "system",
 }
 
+# "hybrid": weighted cosine + ts_rank over the table (hybrid_search_messages)
+# "rrf": reciprocal-rank fusion of separate HNSW and GIN top-k lists
+SEARCH_MODES = ("hybrid", "rrf")
+DEFAULT_VECTOR_CANDIDATES = 40
+DEFAULT_TEXT_CANDIDATES = 40
+DEFAULT_RRF_K = 60
+
+# Columns returned by get_recent_messages (and kept for unflushed rows)
+RECENT_COLUMNS = ("id", "role", "content", "source", "token_count", "created_at")
+
+
+def _normalize_source(source: str) -> str:
+    source = SOURCE_ALIASES.get(source, source)
+    if source not in ALLOWED_SOURCES:
+        logger.warning("Unknown message source '%s', normalizing to 'system'", source)
+        return "system"
+    return source
+
+
+def _created_at_key(msg: dict[str, Any]) -> datetime:
+    try:
+        return datetime.fromisoformat(str(msg.get("created_at")))
+    except ValueError:
+        return datetime.min.replace(tzinfo=timezone.utc)
+
+
+def merge_context_messages(
+    recent: list[dict[str, Any]],
+    memory_results: list[dict[str, Any]],
+    exclude_ids: Iterable[Any] = (),
+) -> list[dict[str, Any]]:
+    """Combine recent history with memory search hits.
+
+    Memory hits already present in the recent window are dropped and the
+    remainder is prepended, so the result reads oldest-relevant first.
+    Messages whose id is in ``exclude_ids`` (e.g. the turn being answered)
+    are removed from both lists.
+
+    Args:
+        recent: Recent messages in chronological order.
+        memory_results: Messages returned by memory search.
+        exclude_ids: Message ids to leave out of the context entirely.
+
+    Returns:
+        List of context message dicts.
+    """
+    excluded = {i for i in exclude_ids if i is not None}
+    if excluded:
+        recent = [msg for msg in recent if msg.get("id") not in excluded]
+
+    recent_ids = {msg.get("id") for msg in recent} | excluded
+    extra_context = [
+        msg for msg in memory_results
+        if msg.get("id") not in recent_ids
+    ]
+    if extra_context:
+        logger.debug("Adding %d memory results to context", len(extra_context))
+        # Prepend memory context before recent messages
+        return extra_context + recent
+
+    return recent
+
 
 class MemoryService:
     """Conversation memory with semantic search capabilities."""
 
-    def __init__(self, db: SupabaseClient, llm: LLMProvider) -> None:
+    def __init__(
+        self,
+        db: SupabaseClient,
+        llm: LLMProvider,
+        search_mode: str = "hybrid",
+        vector_candidates: int = DEFAULT_VECTOR_CANDIDATES,
+        text_candidates: int = DEFAULT_TEXT_CANDIDATES,
+        rrf_k: int = DEFAULT_RRF_K,
+    ) -> None:
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {search_mode}")
         self._db = db
         self._llm = llm
+        self._search_mode = search_mode
+        self._vector_candidates = vector_candidates
+        self._text_candidates = text_candidates
+        self._rrf_k = rrf_k
+        # Rows queued for write-behind storage but not yet in the database,
+        # keyed by id; get_recent_messages overlays them (read-your-writes)
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._archive: Optional["MemoryArchive"] = None
+        self._local_index: Optional["LocalVectorIndex"] = None
+        self._local_index_mode = "fallback"
+
+    def set_archive(self, archive: Optional["MemoryArchive"]) -> None:
+        """Also search summaries (and, on request, archived messages) of old history."""
+        self._archive = archive
+
+    def set_local_index(self, index: Optional["LocalVectorIndex"], mode: str = "fallback") -> None:
+        """Mirror stored embeddings into a local index and search it.
+
+        Args:
+            index: The local index, or None to detach it.
+            mode: "primary" serves searches from the index; "fallback" uses
+                it only when the database search fails.
+        """
+        if mode not in ("primary", "fallback"):
+            raise ValueError(f"Unknown local index mode: {mode}")
+        self._local_index = index
+        self._local_index_mode = mode
+
+    async def _index_rows(self, rows: list[dict[str, Any]]) -> None:
+        if self._local_index is None or not rows:
+            return
+        try:
+            # File appends run in a worker thread, off the event loop
+            await asyncio.to_thread(self._local_index.add, rows)
+        except Exception as e:
+            logger.warning("Failed to add %d messages to the local index: %s", len(rows), e)
+
+    def _search_local(
+        self,
+        query_embedding: list[float],
+        limit: int,
+        min_score: float,
+    ) -> Optional[list[dict[str, Any]]]:
+        """Search the local index; None when there is no usable index."""
+        if self._local_index is None or not self._local_index.count:
+            return None
+        try:
+            return self._local_index.search(query_embedding, limit, min_score)
+        except Exception as e:
+            logger.warning("Local index search failed: %s", e)
+            return None
+
+    async def embed_text(self, text: str) -> list[float]:
+        """Embed text once so callers can share the vector across operations.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            The embedding vector, or an empty list if embedding failed.
+            Passing the empty list on as ``embedding``/``query_embedding``
+            tells the other methods not to try again.
+        """
+        try:
+            embedding = await self._llm.embed(text)
+        except Exception as e:
+            logger.warning("Failed to generate embedding: %s", e)
+            return []
+        return embedding or []
 
     async def store_message(
         self,
         role: str,
         content: str,
         source: str = "telegram_text",
+        *,
+        embedding: Optional[list[float]] = None,
     ) -> Optional[dict[str, Any]]:
         """Store a message with its embedding in the messages table.
 
@@ -51,6 +202,8 @@ class MemoryService:
             role: Message role ('user', 'assistant', 'system').
             content: Message text content.
             source: Message source ('telegram_text', 'telegram_voice', 'twilio_call', 'system').
+            embedding: Precomputed embedding of ``content``. Generated here
+                when omitted; an empty list stores the message without one.
 
         Returns:
             Stored message dict, or None on failure.
@@ -59,27 +212,25 @@ class MemoryService:
             logger.debug("Skipping empty message storage")
             return None
 
-        source = SOURCE_ALIASES.get(source, source)
-        if source not in ALLOWED_SOURCES:
-            logger.warning("Unknown message source '%s', normalizing to 'system'", source)
-            source = "system"
+        source = _normalize_source(source)
 
-        # Generate embedding
-        embedding: Optional[list[float]] = None
-        try:
-            embedding = await self._llm.embed(content)
-        except Exception as e:
-            logger.warning(
-                "Failed to generate embedding for message, storing without: %s", e
-            )
+        # Generate embedding unless the caller already has one
+        if embedding is None:
+            try:
+                embedding = await self._llm.embed(content)
+            except Exception as e:
+                logger.warning(
+                    "Failed to generate embedding for message, storing without: %s", e
+                )
 
         data: dict[str, Any] = {
             "role": role,
             "content": content,
             "source": source,
+            "token_count": count_tokens(content),
         }
 
-        if embedding is not None:
+        if embedding:
             data["embedding"] = embedding
 
         result = await await_if_needed(self._db.insert("messages", data))
@@ -92,72 +243,239 @@ class MemoryService:
             result = await await_if_needed(self._db.insert("messages", data))
 
         if result:
+            if embedding:
+                await self._index_rows([{**result, "embedding": embedding}])
             logger.debug(
                 "Stored %s message (source: %s, has_embedding: %s)",
                 role,
                 data["source"],
-                embedding is not None,
+                bool(embedding),
             )
         else:
             logger.error("Failed to store message even with fallback")
 
         return result
 
+    def prepare_message(
+        self,
+        role: str,
+        content: str,
+        source: str = "telegram_text",
+        *,
+        embedding: Optional[list[float]] = None,
+    ) -> Optional[dict[str, Any]]:
+        """Build a messages row for deferred storage via :meth:`store_messages`.
+
+        The id and created_at are assigned here rather than by the database,
+        so the row can be referenced before it is written and keeps its turn
+        order when several rows are inserted in one statement.
+
+        An empty ``embedding`` list marks the row as already tried, so
+        :meth:`store_messages` stores it without a vector instead of
+        embedding it again.
+
+        Returns:
+            The row dict, or None for empty content.
+        """
+        if not content or not content.strip():
+            return None
+
+        row: dict[str, Any] = {
+            "id": str(uuid.uuid4()),
+            "role": role,
+            "content": content,
+            "source": _normalize_source(source),
+            "token_count": count_tokens(content),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        if embedding is not None:
+            row["embedding"] = embedding or None
+        return row
+
+    def add_pending(self, row: dict[str, Any]) -> None:
+        """Make a prepared row visible to get_recent_messages until it is stored."""
+        self._pending[row["id"]] = {key: row.get(key) for key in RECENT_COLUMNS}
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def store_messages(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Store prepared rows in bulk, embedding any that lack a vector in one batch.
+
+        Rows rejected by the database are retried once with source 'system'
+        (mirroring store_message). Every row stops being pending afterwards,
+        whether or not it was stored.
+
+        Args:
+            rows: Rows from :meth:`prepare_message`.
+
+        Returns:
+            The stored rows.
+        """
+        try:
+            missing = [row for row in rows if "embedding" not in row]
+            if missing:
+                try:
+                    vectors = await self._llm.embed_many([row["content"] for row in missing])
+                except Exception as e:
+                    logger.warning("Failed to embed message batch, storing without: %s", e)
+                    vectors = []
+                for row, vector in zip(missing, vectors):
+                    if vector:
+                        row["embedding"] = vector
+
+            result = await await_if_needed(self._db.insert_many("messages", rows))
+            stored = list(result.get("rows", []))
+            retry = [
+                {**failure["row"], "source": "system"}
+                for failure in result.get("failed", [])
+                if failure["row"].get("source") != "system"
+            ]
+            lost = len(result.get("failed", [])) - len(retry)
+            if retry:
+                logger.warning("Retrying %d messages with source 'system'", len(retry))
+                retried = await await_if_needed(self._db.insert_many("messages", retry))
+                stored.extend(retried.get("rows", []))
+                lost += len(retried.get("failed", []))
+            if lost:
+                logger.error("Failed to store %d of %d messages", lost, len(rows))
+            await self._index_rows(stored)
+            logger.debug("Stored %d messages in bulk", len(stored))
+            return stored
+        finally:
+            for row in rows:
+                self._pending.pop(row["id"], None)
+
     async def search_memory(
         self,
         query: str,
         limit: int = 5,
         min_score: float = 0.35,
+        *,
+        query_embedding: Optional[list[float]] = None,
+        drill_down: bool = False,
+        mode: Optional[str] = None,
+        vector_candidates: Optional[int] = None,
+        text_candidates: Optional[int] = None,
     ) -> list[dict[str, Any]]:
         """Search conversation history using hybrid search.
 
         Combines pgvector cosine similarity with PostgreSQL full-text search
         to find the most relevant past messages. Results below min_score
-        are filtered out (OpenClaw-style threshold).
+        are filtered out (OpenClaw-style threshold). With an archive
+        attached, summaries of archived days compete with hot messages on
+        similarity.
 
         Args:
             query: Natural language search query.
             limit: Maximum number of results (default 5).
             min_score: Minimum similarity score threshold (default 0.35).
+            query_embedding: Precomputed embedding of ``query``. Generated
+                here when omitted; an empty list goes straight to text search.
+            drill_down: Replace matching summaries with the most relevant
+                archived messages they cover.
+            mode: "hybrid" or "rrf"; defaults to the service's search mode.
+            vector_candidates: RRF mode: nearest neighbours taken from the
+                vector index before fusion.
+            text_candidates: RRF mode: full-text matches taken before fusion.
 
         Returns:
             List of matching message dicts with similarity scores.
         """
         if not query or not query.strip():
             return []
+        mode = mode or self._search_mode
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        candidates = (
+            vector_candidates or self._vector_candidates,
+            text_candidates or self._text_candidates,
+        )
 
-        # Generate query embedding
-        try:
-            query_embedding = await self._llm.embed(query)
-        except Exception as e:
-            logger.warning("Failed to embed search query, falling back to text search: %s", e)
+        # Generate query embedding unless the caller already has one
+        if query_embedding is None:
+            try:
+                query_embedding = await self._llm.embed(query)
+            except Exception as e:
+                logger.warning("Failed to embed search query, falling back to text search: %s", e)
+                return await self._text_search_fallback(query, limit)
+        if not query_embedding:
             return await self._text_search_fallback(query, limit)
 
-        # Hybrid search via RPC — fetch extra candidates for score filtering
-        candidate_count = limit * 4
-        results = await await_if_needed(
-            self._db.rpc(
-                "hybrid_search_messages",
-                {
-                    "query_embedding": query_embedding,
-                    "query_text": query,
-                    "match_count": candidate_count,
-                    "match_threshold": min_score,
-                },
+        archive = self._archive
+        if archive is None:
+            return await self._search_hot(
+                query, query_embedding, limit, min_score, mode, candidates,
             )
+
+        hot, summaries = await asyncio.gather(
+            self._search_hot(query, query_embedding, limit, min_score, mode, candidates),
+            self._search_summaries(archive, query_embedding, limit, min_score),
         )
+        if drill_down and summaries:
+            summaries = await self._drill_down(archive, summaries, query_embedding, limit)
+        merged = sorted(hot + summaries, key=lambda r: (r.get("similarity") or 0), reverse=True)
+        return merged[:limit]
 
-        if results and isinstance(results, list):
-            # Filter by min_score and truncate to limit
-            filtered = [
-                r for r in results
-                if r.get("similarity", 0) >= min_score
-            ][:limit]
-            logger.info(
-                "Memory search: %d candidates -> %d results (min_score=%.2f) for: %s",
-                len(results), len(filtered), min_score, query[:50],
+    async def _search_hot(
+        self,
+        query: str,
+        query_embedding: list[float],
+        limit: int,
+        min_score: float,
+        mode: str = "hybrid",
+        candidates: tuple[int, int] = (DEFAULT_VECTOR_CANDIDATES, DEFAULT_TEXT_CANDIDATES),
+    ) -> list[dict[str, Any]]:
+        """Search the messages table, falling back to vector-only then text search.
+
+        A local index in "primary" mode answers instead of the database; in
+        "fallback" mode it is tried before text search.
+        """
+        if self._local_index_mode == "primary":
+            local = self._search_local(query_embedding, limit, min_score)
+            if local is not None:
+                return local
+
+        if mode == "rrf":
+            results = await self._rrf_search(query, query_embedding, limit, candidates)
+            if results:
+                # Text matches are kept even when their vectors are far from the query
+                filtered = [
+                    r for r in results
+                    if (r.get("similarity") or 0) >= min_score or r.get("rank", 0) > 0
+                ]
+                logger.info(
+                    "RRF memory search: %d fused -> %d results for: %s",
+                    len(results), len(filtered), query[:50],
+                )
+                return filtered
+        else:
+            # Hybrid search via RPC — fetch extra candidates for score filtering
+            candidate_count = limit * 4
+            results = await await_if_needed(
+                self._db.rpc(
+                    "hybrid_search_messages",
+                    {
+                        "query_embedding": query_embedding,
+                        "query_text": query,
+                        "match_count": candidate_count,
+                        "match_threshold": min_score,
+                    },
+                )
             )
-            return filtered
+
+            if results and isinstance(results, list):
+                # Filter by min_score and truncate to limit
+                filtered = [
+                    r for r in results
+                    if (r.get("similarity") or 0) >= min_score
+                ][:limit]
+                logger.info(
+                    "Memory search: %d candidates -> %d results (min_score=%.2f) for: %s",
+                    len(results), len(filtered), min_score, query[:50],
+                )
+                return filtered
 
         # Fall back to vector-only search
         results = await await_if_needed(
@@ -172,9 +490,70 @@ class MemoryService:
             logger.info("Vector search returned %d results", len(results))
             return results
 
+        local = self._search_local(query_embedding, limit, min_score)
+        if local:
+            logger.info("Local index search returned %d results", len(local))
+            return local
+
         # Final fallback to text search
         return await self._text_search_fallback(query, limit)
 
+    async def _rrf_search(
+        self,
+        query: str,
+        query_embedding: list[float],
+        limit: int,
+        candidates: tuple[int, int],
+    ) -> list[dict[str, Any]]:
+        """Fuse separate vector and full-text top-k lists by reciprocal rank."""
+        vector_count, text_count = candidates
+        results = await await_if_needed(
+            self._db.rpc(
+                "rrf_search_messages",
+                {
+                    "query_embedding": query_embedding,
+                    "query_text": query,
+                    "match_count": limit,
+                    "vector_count": max(vector_count, limit),
+                    "text_count": max(text_count, limit),
+                    "rrf_k": self._rrf_k,
+                },
+            )
+        )
+        return results if isinstance(results, list) else []
+
+    async def _search_summaries(
+        self,
+        archive: "MemoryArchive",
+        query_embedding: list[float],
+        limit: int,
+        min_score: float,
+    ) -> list[dict[str, Any]]:
+        try:
+            return await archive.search_summaries(query_embedding, limit, min_score)
+        except Exception as e:
+            logger.warning("Summary search failed: %s", e)
+            return []
+
+    async def _drill_down(
+        self,
+        archive: "MemoryArchive",
+        summaries: list[dict[str, Any]],
+        query_embedding: list[float],
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Swap summary hits for the archived messages behind them."""
+        try:
+            batches = await asyncio.gather(*(
+                archive.drill_down(summary, query_embedding, limit)
+                for summary in summaries
+            ))
+        except Exception as e:
+            logger.warning("Archive drill-down failed, keeping summaries: %s", e)
+            return summaries
+        detail = {row.get("id"): row for batch in batches for row in batch}
+        return list(detail.values()) or summaries
+
     async def _text_search_fallback(
         self,
         query: str,
@@ -190,15 +569,18 @@ class MemoryService:
             List of matching message dicts.
         """
         try:
-            response = (
-                await self._db.client.table("messages")
-                .select("id, role, content, source, created_at")
-                .textSearch("content", query)
-                .order("created_at", desc=True)
-                .limit(limit)
-                .execute()
+            results = await await_if_needed(
+                self._db.select(
+                    "messages",
+                    columns="id, role, content, source, created_at",
+                    filters={"content_tsv__search": query},
+                    order_by="created_at",
+                    order_desc=True,
+                    limit=limit,
+                )
             )
-            results = response.data if response.data else []
+            if not isinstance(results, list):
+                return []
             logger.info("Text search fallback returned %d results", len(results))
             return results
         except Exception as e:
@@ -228,7 +610,7 @@ class MemoryService:
         messages = await await_if_needed(
             self._db.select(
                 "messages",
-                columns="id, role, content, source, created_at",
+                columns="id, role, content, source, token_count, created_at",
                 order_by="created_at",
                 order_desc=True,
                 limit=effective_limit,
@@ -238,6 +620,14 @@ class MemoryService:
         # Reverse to get chronological order (oldest first)
         messages.reverse()
 
+        if self._pending:
+            # Overlay rows still waiting in the write-behind queue; the stored
+            # copy wins if a row was written between the two reads
+            by_id = {msg.get("id"): msg for msg in messages}
+            for row in list(self._pending.values()):
+                by_id.setdefault(row["id"], dict(row))
+            messages = sorted(by_id.values(), key=_created_at_key)[-effective_limit:]
+
         logger.debug("Retrieved %d recent messages for context", len(messages))
         return messages
 
@@ -251,7 +641,7 @@ class MemoryService:
 
         Gets the most recent messages for continuity, and if a query is provided,
         also searches memory for relevant historical messages that are not already
-        in the recent set.
+        in the recent set. Both lookups run concurrently.
 
         Args:
             query: Optional search query to pull relevant historical messages.
@@ -261,21 +651,11 @@ class MemoryService:
         Returns:
             List of context message dicts in chronological order.
         """
-        recent = await self.get_recent_messages(limit=recent_limit)
-        recent_ids = {msg.get("id") for msg in recent}
-
-        if query:
-            memory_results = await self.search_memory(query, limit=memory_limit)
-            # Add memory results that aren't already in recent messages
-            extra_context = [
-                msg for msg in memory_results
-                if msg.get("id") not in recent_ids
-            ]
-            if extra_context:
-                logger.debug(
-                    "Adding %d memory results to context", len(extra_context)
-                )
-                # Prepend memory context before recent messages
-                return extra_context + recent
+        if not query:
+            return await self.get_recent_messages(limit=recent_limit)
 
-        return recent
+        recent, memory_results = await asyncio.gather(
+            self.get_recent_messages(limit=recent_limit),
+            self.search_memory(query, limit=memory_limit),
+        )
+        return merge_context_messages(recent, memory_results)
@@ -6,6 +6,7 @@ Provides CRUD operations for notes stored in the Supabase notes table.
 from __future__ import annotations
 
 import logging
+import re
 from typing import Any, Optional
 
 from src.db.supabase_client import SupabaseClient
@@ -162,7 +163,7 @@ class NoteService:
     async def search_notes(self, query: str) -> list[dict[str, Any]]:
         """Search notes by title or content using full-text search.
 
-        Uses the Supabase RPC function or text search to find matching notes.
+        Matches the query case-insensitively against title and content.
 
         Args:
             query: Search query string.
@@ -173,13 +174,14 @@ class NoteService:
         if not query or not query.strip():
             return await self.list_notes()
 
-        try:
-            # Use Supabase text search on title and content
-            result = await self._db.client.table("notes").select("*").or_(
-                f"title.ilike.%{query}%,content.ilike.%{query}%"
-            ).order("created_at", desc=True).execute()
-
-            return result.data if result.data else []
-        except Exception as e:
-            logger.error("Failed to search notes: %s", e)
-            return []
+        # LIKE wildcards in the query are matched literally
+        pattern = "%" + re.sub(r"([\\%_])", r"\\\1", query.strip()) + "%"
+        notes: list[dict[str, Any]] = await await_if_needed(
+            self._db.select(
+                "notes",
+                filters={"or": [{"title__ilike": pattern}, {"content__ilike": pattern}]},
+                order_by="created_at",
+                order_desc=True,
+            )
+        )
+        return notes
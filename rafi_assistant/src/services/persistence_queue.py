@@ -0,0 +1,225 @@
+"""Write-behind persistence for conversation messages and the daily log.
+
+Storing a turn costs an embedding request and a database insert, and the
+user does not need either to finish before seeing the reply. The
+PersistenceQueue takes prepared rows and daily-log entries on a bounded
+asyncio queue; a background worker drains it in batches, embedding the
+batch with one request and writing it with one bulk insert.
+
+Queued messages are registered with MemoryService as pending, so
+get_recent_messages still returns turns that have not been flushed yet.
+The queue is flushed in the app lifespan shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from src.services.memory_files import MemoryFileService
+from src.services.memory_service import MemoryService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 1000
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL_SECONDS = 0.25
+DEFAULT_CLOSE_TIMEOUT_SECONDS = 10.0
+
+_MESSAGE = "message"
+_DAILY_LOG = "daily_log"
+# Ends the current batch window early so flush() and close() don't wait it out
+_FLUSH = "flush"
+
+
+class PersistenceQueue:
+    """Bounded write-behind queue drained by one background worker.
+
+    When the queue is full, enqueueing waits for space, which bounds memory
+    use and slows producers down rather than dropping turns. Before
+    :meth:`start` and after :meth:`close`, writes happen inline.
+    """
+
+    def __init__(
+        self,
+        memory: MemoryService,
+        memory_files: Optional[MemoryFileService] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self._memory = memory
+        self._memory_files = memory_files
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue(maxsize=max_size)
+        self._worker: Optional[asyncio.Task[None]] = None
+
+        # Metrics
+        self._batches = 0
+        self._messages_written = 0
+        self._failed = 0
+        self._max_depth = 0
+        self._total_flush_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self) -> None:
+        """Start the background worker."""
+        if not self.running:
+            self._worker = asyncio.create_task(self._run(), name="persistence-queue")
+            logger.info("Persistence queue started (batch=%d)", self._batch_size)
+
+    async def enqueue_message(
+        self,
+        role: str,
+        content: str,
+        source: str = "telegram_text",
+        *,
+        embedding: Optional[list[float]] = None,
+    ) -> Optional[dict[str, Any]]:
+        """Queue a message for storage.
+
+        Args:
+            role: Message role.
+            content: Message text.
+            source: Message source tag.
+            embedding: Precomputed embedding of ``content``; otherwise the
+                batch is embedded together at flush time. An empty list
+                (embedding already failed) stores the row without one.
+
+        Returns:
+            The prepared row (with its final id), or None for empty content.
+        """
+        row = self._memory.prepare_message(role, content, source, embedding=embedding)
+        if row is None:
+            return None
+        if not self.running:
+            await self._memory.store_messages([row])
+            return row
+
+        self._memory.add_pending(row)
+        await self._put((_MESSAGE, row))
+        return row
+
+    async def enqueue_daily_log(self, role: str, content: str) -> None:
+        """Queue a daily-log entry, stamped with the current time."""
+        if self._memory_files is None:
+            return
+        entry = (role, content, datetime.now(timezone.utc))
+        if not self.running:
+            self._memory_files.append_to_daily_log(*entry)
+            return
+        await self._put((_DAILY_LOG, entry))
+
+    async def _put(self, item: tuple[str, Any]) -> None:
+        await self._queue.put(item)
+        self._max_depth = max(self._max_depth, self._queue.qsize())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            # Give closely spaced writes (user turn, then reply) a chance to share a batch
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size and batch[-1][0] != _FLUSH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write(batch)
+            except Exception as e:
+                logger.exception("Write-behind batch failed: %s", e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: list[tuple[str, Any]]) -> None:
+        if all(kind == _FLUSH for kind, _ in batch):
+            return
+        started = time.perf_counter()
+        rows = [payload for kind, payload in batch if kind == _MESSAGE]
+        if rows:
+            try:
+                stored = await self._memory.store_messages(rows)
+                self._messages_written += len(stored)
+                self._failed += len(rows) - len(stored)
+            except Exception as e:
+                logger.error("Write-behind batch of %d messages failed: %s", len(rows), e)
+                self._failed += len(rows)
+
+        if self._memory_files is not None:
+            for kind, payload in batch:
+                if kind == _DAILY_LOG:
+                    self._memory_files.append_to_daily_log(*payload)
+
+        self._batches += 1
+        self._total_flush_seconds += time.perf_counter() - started
+
+    async def flush(self) -> None:
+        """Wait until everything queued so far has been written."""
+        if self.running:
+            await self._queue.put((_FLUSH, None))
+            await self._queue.join()
+
+    async def close(self, timeout: float = DEFAULT_CLOSE_TIMEOUT_SECONDS) -> None:
+        """Flush outstanding writes and stop the worker."""
+        worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        try:
+            if not worker.done():
+                # A full queue keeps the worker from waiting anyway
+                with contextlib.suppress(asyncio.QueueFull):
+                    self._queue.put_nowait((_FLUSH, None))
+                await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                "Persistence queue flush timed out; %d writes not persisted",
+                self._queue.qsize(),
+            )
+        finally:
+            worker.cancel()
+            try:
+                await worker
+            except (asyncio.CancelledError, Exception):
+                pass
+        logger.info("Persistence queue closed")
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of queue metrics for the dashboard."""
+        return {
+            "running": self.running,
+            "depth": self._queue.qsize(),
+            "max_depth": self._max_depth,
+            "capacity": self._queue.maxsize,
+            "pending_messages": self._memory.pending_count,
+            "batches": self._batches,
+            "messages_written": self._messages_written,
+            "failed": self._failed,
+            "avg_flush_ms": (
+                round(self._total_flush_seconds / self._batches * 1000, 1)
+                if self._batches
+                else 0.0
+            ),
+        }
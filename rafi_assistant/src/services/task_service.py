@@ -15,6 +15,9 @@ from src.utils.async_utils import await_if_needed
 
 logger = logging.getLogger(__name__)
 
+# Statuses of tasks that still need doing
+OPEN_STATUSES = ("pending", "in_progress")
+
 
 class TaskService:
     """Task CRUD operations backed by Supabase."""
@@ -217,24 +220,31 @@ class TaskService:
         Returns:
             List of pending and in_progress tasks.
         """
-        pending = await self.list_tasks(status="pending")
-        in_progress = await self.list_tasks(status="in_progress")
-        return pending + in_progress
+        tasks: list[dict[str, Any]] = await await_if_needed(
+            self._db.select(
+                "tasks",
+                filters={"status__in": list(OPEN_STATUSES)},
+                order_by="created_at",
+                order_desc=True,
+            )
+        )
+        return tasks
 
     async def get_overdue_tasks(self) -> list[dict[str, Any]]:
         """Get tasks that are past their due date and not completed.
 
         Returns:
-            List of overdue task dicts.
+            List of overdue task dicts, most overdue first.
         """
         now = datetime.now(timezone.utc).isoformat()
-        all_tasks = await self.get_pending_tasks()
-
-        overdue = []
-        for task in all_tasks:
-            due_date = task.get("due_date")
-            if due_date and due_date < now:
-                overdue.append(task)
+        overdue: list[dict[str, Any]] = await await_if_needed(
+            self._db.select(
+                "tasks",
+                filters={"status__in": list(OPEN_STATUSES), "due_date__lt": now},
+                order_by="due_date",
+                order_desc=False,
+            )
+        )
 
         logger.debug("Found %d overdue tasks", len(overdue))
         return overdue
@@ -5,6 +5,7 @@ entry point for tool execution across all channels (Telegram, WhatsApp, etc.)
 and the voice pipeline.
 """
 
+import asyncio
 import inspect
 import json
 import logging
@@ -12,6 +13,9 @@ from typing import Any, Callable, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Per-call limit for tools registered without their own timeout
+DEFAULT_TOOL_TIMEOUT_SECONDS = 60.0
+
 
 class ToolRegistry:
     """Registry of executable tools for Rafi.
@@ -31,6 +35,8 @@ class ToolRegistry:
         func: Callable,
         description: str,
         schema: Optional[Dict[str, Any]] = None,
+        parallel: bool = True,
+        timeout: Optional[float] = None,
     ) -> None:
         """Register a tool.
 
@@ -39,11 +45,17 @@ class ToolRegistry:
             func: Async or sync callable to execute.
             description: Human-readable description.
             schema: Optional OpenAI-format tool schema for LLM function calling.
+            parallel: False for tools that must not run alongside other tool
+                calls of the same turn (sending email, mouse/keyboard control).
+            timeout: Seconds a call may take before it is abandoned
+                (defaults to DEFAULT_TOOL_TIMEOUT_SECONDS).
         """
         self._tools[name] = {
             "func": func,
             "description": description,
             "schema": schema,
+            "parallel": parallel,
+            "timeout": timeout if timeout is not None else DEFAULT_TOOL_TIMEOUT_SECONDS,
         }
         logger.debug("Registered tool: %s", name)
 
@@ -69,9 +81,12 @@ class ToolRegistry:
 
         try:
             if inspect.iscoroutinefunction(tool["func"]):
-                result = await tool["func"](**kwargs)
+                call = tool["func"](**kwargs)
             else:
-                result = tool["func"](**kwargs)
+                # Sync tools run in a worker thread so they don't block the event
+                # loop; on timeout the thread is abandoned, not interrupted
+                call = asyncio.to_thread(tool["func"], **kwargs)
+            result = await asyncio.wait_for(call, tool["timeout"])
 
             if self.registry and hasattr(self.registry, "broadcast_tool_result"):
                 await self.registry.broadcast_tool_result(name, result)
@@ -80,6 +95,12 @@ class ToolRegistry:
                 return result
             return json.dumps(result, default=str)
 
+        except asyncio.TimeoutError:
+            logger.error("Tool timed out after %.0fs: %s", tool["timeout"], name)
+            if self.registry and hasattr(self.registry, "broadcast_tool_result"):
+                await self.registry.broadcast_tool_result(name, {"error": "timed out"})
+            return f"Error executing {name}: timed out after {tool['timeout']:.0f}s"
+
         except Exception as e:
             logger.error("Tool execution error (%s): %s", name, e)
             error_msg = f"Error executing {name}: {str(e)[:200]}"
@@ -87,6 +108,14 @@ class ToolRegistry:
                 await self.registry.broadcast_tool_result(name, {"error": str(e)})
             return error_msg
 
+    def is_parallel_safe(self, name: str) -> bool:
+        """Whether a tool may run concurrently with other tool calls.
+
+        Unknown tools count as safe; invoke() only returns an error for them.
+        """
+        tool = self._tools.get(name)
+        return tool is None or tool["parallel"]
+
     def get_openai_schemas(self) -> List[Dict[str, Any]]:
         """Return OpenAI-format tool schemas for all registered tools.
 
@@ -7,6 +7,7 @@ import numpy as np
 from deepgram import AsyncDeepgramClient
 from deepgram.core.events import EventType
 from deepgram.extensions.types.sockets import ListenV1ResultsEvent
+from src.llm.router import voice_request
 from src.llm.tool_definitions import ALL_TOOLS
 
 logger = logging.getLogger(__name__)
@@ -375,13 +376,14 @@ class ConversationManager:
                     "and conversational. Respond as if you can hear them perfectly."
                 )
 
-                response_dict = await self.registry.llm.chat(
-                    messages=[
-                        {"role": "system", "content": system_prompt + voice_context},
-                        {"role": "user", "content": text},
-                    ],
-                    tools=ALL_TOOLS,
-                )
+                with voice_request():
+                    response_dict = await self.registry.llm.chat(
+                        messages=[
+                            {"role": "system", "content": system_prompt + voice_context},
+                            {"role": "user", "content": text},
+                        ],
+                        tools=ALL_TOOLS,
+                    )
 
                 tool_calls = response_dict.get("tool_calls", [])
                 response = response_dict.get("content")
@@ -403,19 +405,20 @@ class ConversationManager:
                             )
 
                     if not response and result is not None:
-                        followup = await self.registry.llm.chat(
-                            messages=[
-                                {
-                                    "role": "system",
-                                    "content": (
-                                        f"You just executed a tool: {name}. "
-                                        f"Results: {result}. "
-                                        "Briefly summarize the outcome for a voice response."
-                                    ),
-                                },
-                                {"role": "user", "content": text},
-                            ]
-                        )
+                        with voice_request():
+                            followup = await self.registry.llm.chat(
+                                messages=[
+                                    {
+                                        "role": "system",
+                                        "content": (
+                                            f"You just executed a tool: {name}. "
+                                            f"Results: {result}. "
+                                            "Briefly summarize the outcome for a voice response."
+                                        ),
+                                    },
+                                    {"role": "user", "content": text},
+                                ]
+                            )
                         response = followup.get("content")
 
                 if response:
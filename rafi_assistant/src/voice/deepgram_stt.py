@@ -4,26 +4,41 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import httpx
 
 from src.security.sanitizer import sanitize_text
+from src.voice.http_pool import PooledHTTPClient
 
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 2
 RETRY_DELAY_SECONDS = 1.0
+REQUEST_TIMEOUT_SECONDS = 60.0
 
 
 class DeepgramSTT:
     """Transcribes audio files using the Deepgram API."""
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, http_client: Optional[PooledHTTPClient] = None) -> None:
         if not api_key:
             raise ValueError("Deepgram API key is required")
         self._api_key = api_key
         self._base_url = "https://api.deepgram.com/v1/listen"
+        self._http = http_client or PooledHTTPClient(
+            "https://api.deepgram.com",
+            name="deepgram",
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+
+    def http_stats(self) -> dict[str, Any]:
+        """Return connection pool metrics for the dashboard."""
+        return self._http.stats()
+
+    async def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self._http.aclose()
 
     async def transcribe_file(self, audio_path: str) -> Optional[str]:
         """Transcribe an audio file and return the text.
@@ -95,17 +110,17 @@ class DeepgramSTT:
             "punctuate": "true",
         }
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            with open(path, "rb") as audio_file:
-                audio_data = audio_file.read()
-
-            response = await client.post(
-                self._base_url,
-                headers=headers,
-                params=params,
-                content=audio_data,
-            )
-            response.raise_for_status()
+        with open(path, "rb") as audio_file:
+            audio_data = audio_file.read()
+
+        response = await self._http.post(
+            self._base_url,
+            headers=headers,
+            params=params,
+            content=audio_data,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
 
         result = response.json()
         transcript = self._extract_transcript(result)
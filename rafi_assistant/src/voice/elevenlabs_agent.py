@@ -10,6 +10,7 @@ from typing import Any, Optional
 import httpx
 
 from src.llm.tool_definitions import get_all_tool_schemas
+from src.voice.http_pool import PooledHTTPClient
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,7 @@ class ElevenLabsAgent:
         agent_name: str,
         personality: str,
         llm_model: str = "gpt-4o",
+        http_client: Optional[PooledHTTPClient] = None,
     ) -> None:
         if not api_key:
             raise ValueError("ElevenLabs API key is required")
@@ -36,6 +38,7 @@ class ElevenLabsAgent:
         self._personality = personality
         self._llm_model = llm_model
         self._base_url = "https://api.elevenlabs.io/v1"
+        self._http = http_client or PooledHTTPClient(self._base_url, name="elevenlabs")
         self._agent_id: Optional[str] = None
         self._playback_process: Optional[asyncio.subprocess.Process] = None
 
@@ -43,6 +46,14 @@ class ElevenLabsAgent:
     def agent_id(self) -> Optional[str]:
         return self._agent_id
 
+    def http_stats(self) -> dict[str, Any]:
+        """Return connection pool metrics for the dashboard."""
+        return self._http.stats()
+
+    async def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self._http.aclose()
+
     async def stop(self) -> None:
         """Stop any ongoing audio playback."""
         proc = self._playback_process
@@ -102,13 +113,12 @@ class ElevenLabsAgent:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self._base_url}/convai/agents/create",
-                    headers=headers,
-                    json=payload,
-                )
-                response.raise_for_status()
+            response = await self._http.post(
+                f"{self._base_url}/convai/agents/create",
+                headers=headers,
+                json=payload,
+            )
+            response.raise_for_status()
 
             result = response.json()
             self._agent_id = result.get("agent_id")
@@ -129,13 +139,12 @@ class ElevenLabsAgent:
                 )
                 payload["conversation_config"]["agent"]["prompt"].pop("tools", None)
                 try:
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        response = await client.post(
-                            f"{self._base_url}/convai/agents/create",
-                            headers=headers,
-                            json=payload,
-                        )
-                        response.raise_for_status()
+                    response = await self._http.post(
+                        f"{self._base_url}/convai/agents/create",
+                        headers=headers,
+                        json=payload,
+                    )
+                    response.raise_for_status()
                     result = response.json()
                     self._agent_id = result.get("agent_id")
                     if self._agent_id:
@@ -174,14 +183,13 @@ class ElevenLabsAgent:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self._base_url}/text-to-speech/{self._voice_id}",
-                    headers=headers,
-                    json=payload,
-                )
-                response.raise_for_status()
-                return response.content
+            response = await self._http.post(
+                f"{self._base_url}/text-to-speech/{self._voice_id}",
+                headers=headers,
+                json=payload,
+            )
+            response.raise_for_status()
+            return response.content
         except Exception as e:
             logger.error("ElevenLabs synthesize failed: %s", e)
             return None
@@ -203,36 +211,35 @@ class ElevenLabsAgent:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self._base_url}/text-to-speech/{self._voice_id}",
-                    headers=headers,
-                    json=payload,
+            response = await self._http.post(
+                f"{self._base_url}/text-to-speech/{self._voice_id}",
+                headers=headers,
+                json=payload,
+            )
+            response.raise_for_status()
+
+            # On macOS, use afplay to play the audio stream
+            import tempfile
+            import os
+            
+            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
+                f.write(response.content)
+                temp_path = f.name
+            
+            try:
+                # Run afplay as a subprocess that we can terminate
+                self._playback_process = await asyncio.create_subprocess_exec(
+                    "afplay", temp_path,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
                 )
-                response.raise_for_status()
-
-                # On macOS, use afplay to play the audio stream
-                import tempfile
-                import os
-                
-                with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-                    f.write(response.content)
-                    temp_path = f.name
-                
-                try:
-                    # Run afplay as a subprocess that we can terminate
-                    self._playback_process = await asyncio.create_subprocess_exec(
-                        "afplay", temp_path,
-                        stdout=asyncio.subprocess.DEVNULL,
-                        stderr=asyncio.subprocess.DEVNULL
-                    )
-                    await self._playback_process.wait()
-                finally:
-                    self._playback_process = None
-                    if os.path.exists(temp_path):
-                        os.unlink(temp_path)
-                
-                return True
+                await self._playback_process.wait()
+            finally:
+                self._playback_process = None
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+            
+            return True
         except Exception as e:
             logger.error(f"ElevenLabs speak failed: {e}")
             return False
@@ -250,13 +257,13 @@ class ElevenLabsAgent:
         headers = {"xi-api-key": self._api_key}
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.get(
-                    f"{self._base_url}/convai/conversation/get_signed_url",
-                    headers=headers,
-                    params={"agent_id": self._agent_id},
-                )
-                response.raise_for_status()
+            response = await self._http.get(
+                f"{self._base_url}/convai/conversation/get_signed_url",
+                headers=headers,
+                params={"agent_id": self._agent_id},
+                timeout=15.0,
+            )
+            response.raise_for_status()
 
             result = response.json()
             signed_url = result.get("signed_url")
@@ -292,12 +299,12 @@ class ElevenLabsAgent:
         headers = {"xi-api-key": self._api_key}
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.get(
-                    f"{self._base_url}/convai/conversations/{conversation_id}",
-                    headers=headers,
-                )
-                response.raise_for_status()
+            response = await self._http.get(
+                f"{self._base_url}/convai/conversations/{conversation_id}",
+                headers=headers,
+                timeout=15.0,
+            )
+            response.raise_for_status()
 
             return response.json()
 
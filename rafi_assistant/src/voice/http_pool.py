@@ -0,0 +1,187 @@
+"""Long-lived HTTP connection pools for the voice services.
+
+Creating an ``httpx.AsyncClient`` per request pays for DNS, TCP and TLS on
+every TTS or STT round-trip. PooledHTTPClient keeps one client per upstream
+host for the life of the app, with keep-alive, per-host connection limits,
+HTTP/2 when the ``h2`` package is installed, and request/connection metrics
+for the dashboard. It is closed in the app lifespan shutdown.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_TIMEOUT_SECONDS = 30.0
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 5
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+# httpcore trace event emitted once per newly opened TCP connection
+_CONNECT_EVENT = "connection.connect_tcp.complete"
+
+
+class PooledHTTPClient:
+    """A keep-alive ``httpx.AsyncClient`` for one upstream host, with metrics.
+
+    The underlying client is created lazily on first use and recreated if a
+    request arrives after :meth:`aclose`, so a late call during shutdown
+    degrades to a fresh connection instead of failing.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        name: str = "",
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+        http2: bool = True,
+        metrics: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+
+        self._base_url = base_url
+        self._name = name or base_url
+        self._timeout = timeout
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(max_keepalive_connections, max_connections),
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and not HTTP2_AVAILABLE:
+            logger.info("h2 not installed; %s will use HTTP/1.1", self._name)
+        self._http2 = http2 and HTTP2_AVAILABLE
+        self._metrics = metrics
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Metrics
+        self._requests = 0
+        self._failed = 0
+        self._in_flight = 0
+        self._connections_opened = 0
+        self._total_seconds = 0.0
+        self._http_versions: dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, base_url: str, config: Any, *, name: str = "") -> "PooledHTTPClient":
+        """Build a pool from an ``HTTPPoolConfig`` section."""
+        return cls(
+            base_url,
+            name=name,
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry_seconds,
+            http2=config.http2,
+            metrics=config.metrics,
+        )
+
+    @property
+    def http2(self) -> bool:
+        """Whether HTTP/2 is negotiated when the server supports it."""
+        return self._http2
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                timeout=self._timeout,
+                limits=self._limits,
+                http2=self._http2,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name == _CONNECT_EVENT:
+            self._connections_opened += 1
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request over the pooled connection.
+
+        Args:
+            method: HTTP method.
+            url: Path relative to the base URL, or an absolute URL.
+            timeout: Per-request timeout overriding the pool default.
+            **kwargs: Passed through to ``httpx.AsyncClient.request``.
+
+        Returns:
+            The response. Status errors are left to the caller.
+        """
+        client = self._get_client()
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        if self._metrics:
+            kwargs["extensions"] = {**kwargs.get("extensions", {}), "trace": self._trace}
+
+        self._in_flight += 1
+        start = time.monotonic()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._requests += 1
+            self._total_seconds += time.monotonic() - start
+
+        version = response.http_version
+        self._http_versions[version] = self._http_versions.get(version, 0) + 1
+        return response
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of pool metrics for the dashboard."""
+        return {
+            "http2": self._http2,
+            "max_connections": self._limits.max_connections,
+            "max_keepalive_connections": self._limits.max_keepalive_connections,
+            "requests": self._requests,
+            "failed": self._failed,
+            "in_flight": self._in_flight,
+            "connections_opened": self._connections_opened,
+            "connections_reused": (
+                max(0, self._requests - self._connections_opened) if self._metrics else 0
+            ),
+            "http_versions": dict(self._http_versions),
+            "avg_latency_ms": (
+                round(self._total_seconds / self._requests * 1000, 1) if self._requests else 0.0
+            ),
+        }
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+            logger.debug("HTTP pool for %s closed", self._name)
@@ -18,7 +18,7 @@ class TestReminderPipeline:
 
     Recursive dependency validation:
     - Calendar event created and cached
-    - Reminder scheduler detects upcoming event
+    - Reminder timer scheduled for the upcoming event
     - Quiet hours check executed before calling
     - Outbound call initiated (or Telegram fallback)
     - Event marked as reminded
@@ -65,7 +65,7 @@ class TestReminderPipeline:
             timezone="UTC",
         )
 
-        await job.run()
+        assert await job.load() == 0
         # With no events, no calls should be made
         mock_twilio.initiate_outbound_call.assert_not_called()
 
@@ -27,7 +27,7 @@ async def test_lifespan_initialization_current_wiring(mock_config):
         stack.enter_context(patch("src.main.CadService"))
         mock_browser_class = stack.enter_context(patch("src.main.BrowserService"))
         stack.enter_context(patch("src.main.ScreenService"))
-        stack.enter_context(patch("src.main.DeepgramSTT"))
+        mock_deepgram_class = stack.enter_context(patch("src.main.DeepgramSTT"))
         mock_twilio_class = stack.enter_context(patch("src.main.TwilioHandler"))
         mock_elevenlabs_class = stack.enter_context(patch("src.main.ElevenLabsAgent"))
         mock_registry_class = stack.enter_context(patch("src.main.ServiceRegistry"))
@@ -45,6 +45,7 @@ async def test_lifespan_initialization_current_wiring(mock_config):
 
         db = mock_db_class.return_value
         db.initialize = AsyncMock()
+        db.close = AsyncMock()
 
         llm = MagicMock()
         llm.close = AsyncMock()
@@ -69,6 +70,8 @@ async def test_lifespan_initialization_current_wiring(mock_config):
 
         mock_twilio_class.return_value.set_agent_id = MagicMock()
         mock_elevenlabs_class.return_value.create_agent = AsyncMock(return_value="agent-test")
+        mock_elevenlabs_class.return_value.close = AsyncMock()
+        mock_deepgram_class.return_value.close = AsyncMock()
 
         registry = mock_registry_class.return_value
         registry.tools = mock_tool_registry_class.return_value
@@ -77,7 +80,6 @@ async def test_lifespan_initialization_current_wiring(mock_config):
 
         scheduler = mock_scheduler_class.return_value
         scheduler.set_briefing_callback = MagicMock()
-        scheduler.set_reminder_callback = MagicMock()
         scheduler.set_calendar_sync_callback = MagicMock()
         scheduler.add_heartbeat = MagicMock()
         scheduler.setup_jobs = MagicMock()
@@ -85,7 +87,8 @@ async def test_lifespan_initialization_current_wiring(mock_config):
         scheduler.stop = MagicMock()
 
         mock_briefing_job_class.return_value.run = AsyncMock()
-        mock_reminder_job_class.return_value.run = AsyncMock()
+        mock_reminder_job_class.return_value.start = AsyncMock()
+        mock_reminder_job_class.return_value.stop = AsyncMock()
 
         channel_manager = mock_channel_manager_class.return_value
         channel_manager.register = MagicMock()
@@ -106,4 +109,9 @@ async def test_lifespan_initialization_current_wiring(mock_config):
         scheduler.stop.assert_called_once()
         browser.shutdown.assert_awaited_once()
         weather.close.assert_awaited_once()
+        mock_elevenlabs_class.return_value.close.assert_awaited_once()
+        mock_deepgram_class.return_value.close.assert_awaited_once()
         llm.close.assert_awaited_once()
+        db.close.assert_awaited_once()
+        mock_reminder_job_class.return_value.start.assert_awaited_once()
+        mock_reminder_job_class.return_value.stop.assert_awaited_once()
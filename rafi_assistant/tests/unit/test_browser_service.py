@@ -18,7 +18,7 @@ def browser_service():
     return BrowserService(config=MagicMock())
 
 @pytest.mark.anyio
-async def test_browser_browse_success(browser_service):
+async def test_browser_browse_success(browser_service, tmp_path):
     # Mock playwright
     mock_page = AsyncMock()
     mock_page.title.return_value = "Example Title"
@@ -31,7 +31,7 @@ async def test_browser_browse_success(browser_service):
     
     browser_service.context = mock_context
     
-    with patch("tempfile.gettempdir", return_value="/tmp"):
+    with patch("tempfile.tempdir", str(tmp_path)):
         result = await browser_service.browse("https://example.com", "Read the title")
         
         assert result["status"] == "success"
@@ -39,6 +39,25 @@ async def test_browser_browse_success(browser_service):
         assert "screenshot" in result
         mock_page.goto.assert_called_with("https://example.com", wait_until="networkidle")
 
+@pytest.mark.anyio
+async def test_concurrent_browses_get_distinct_screenshots(browser_service, tmp_path):
+    import asyncio
+
+    mock_page = AsyncMock()
+    mock_page.title.return_value = "Example Title"
+    mock_context = AsyncMock()
+    mock_context.new_page.return_value = mock_page
+    browser_service.context = mock_context
+
+    with patch("tempfile.tempdir", str(tmp_path)):
+        first, second = await asyncio.gather(
+            browser_service.browse("https://a.example"),
+            browser_service.browse("https://b.example"),
+        )
+
+    assert first["screenshot"] != second["screenshot"]
+    assert first["screenshot"].startswith(str(tmp_path))
+
 @pytest.mark.anyio
 async def test_browser_search_success(browser_service):
     mock_page = AsyncMock()
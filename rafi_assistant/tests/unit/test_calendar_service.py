@@ -8,6 +8,8 @@ All Google API calls are mocked.  Covers:
 - Handles empty calendar
 - Handles None location
 - OAuth token refresh on 401
+- Full and incremental (sync token) sync into the local store and events_cache
+- Reads and writes go through the store once it is fresh
 """
 
 from __future__ import annotations
@@ -261,3 +263,195 @@ class TestOAuthRefresh:
             except Exception:
                 # If the service doesn't implement retry, that is also documented
                 pass
+
+
+@pytest.mark.skipif(CalendarService is None, reason="CalendarService not yet implemented")
+class TestSyncEventsToCache:
+    """sync_events_to_cache bulk-upserts and prunes stale rows."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_and_stale_delete(self, mock_config):
+        events = [
+            _build_google_event("e1", "Standup"),
+            _build_google_event("e2", "Lunch", start_hours_from_now=3),
+        ]
+        google_svc = _mock_google_service(events)
+        db = MagicMock()
+        db.upsert_many = AsyncMock(return_value={"rows": [{}, {}], "failed": []})
+        db.delete = AsyncMock(return_value=True)
+
+        with patch.object(CalendarService, "_get_service", return_value=google_svc):
+            svc = CalendarService(config=mock_config, db=db)
+            synced = await svc.sync_events_to_cache()
+
+        assert synced == 2
+        db.upsert_many.assert_awaited_once()
+        table, rows = db.upsert_many.await_args.args
+        assert table == "events_cache"
+        assert [r["google_event_id"] for r in rows] == ["e1", "e2"]
+        assert db.upsert_many.await_args.kwargs["on_conflict"] == "google_event_id"
+
+        db.delete.assert_awaited_once()
+        table, filters = db.delete.await_args.args
+        assert table == "events_cache"
+        assert filters["google_event_id__not_in"] == ["e1", "e2"]
+        assert "end_time__gte" in filters and "start_time__lte" in filters
+
+    @pytest.mark.asyncio
+    async def test_failed_rows_not_counted(self, mock_config):
+        google_svc = _mock_google_service([_build_google_event("e1"), _build_google_event("e2")])
+        db = MagicMock()
+        db.upsert_many = AsyncMock(return_value={
+            "rows": [{}],
+            "failed": [{"index": 1, "row": {"google_event_id": "e2"}, "error": "bad"}],
+        })
+        db.delete = AsyncMock(return_value=False)
+
+        with patch.object(CalendarService, "_get_service", return_value=google_svc):
+            svc = CalendarService(config=mock_config, db=db)
+            assert await svc.sync_events_to_cache() == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_calendar_clears_window(self, mock_config):
+        google_svc = _mock_google_service([])
+        db = MagicMock()
+        db.upsert_many = AsyncMock(return_value={"rows": [], "failed": []})
+        db.delete = AsyncMock(return_value=True)
+
+        with patch.object(CalendarService, "_get_service", return_value=google_svc):
+            svc = CalendarService(config=mock_config, db=db)
+            assert await svc.sync_events_to_cache() == 0
+
+        _, filters = db.delete.await_args.args
+        assert "google_event_id__not_in" not in filters
+
+    @pytest.mark.asyncio
+    async def test_sync_listener_receives_cached_rows(self, mock_config):
+        google_svc = _mock_google_service([_build_google_event("e1")])
+        cached = [{"id": "c1", "google_event_id": "e1", "reminded": False}]
+        db = MagicMock()
+        db.upsert_many = AsyncMock(return_value={"rows": cached, "failed": []})
+        db.delete = AsyncMock(return_value=False)
+        listener = MagicMock()
+
+        with patch.object(CalendarService, "_get_service", return_value=google_svc):
+            svc = CalendarService(config=mock_config, db=db)
+            svc.set_sync_listener(listener)
+            await svc.sync_events_to_cache()
+
+        listener.assert_called_once_with(cached, [], True)
+
+
+def _paged_service(*pages: Dict[str, Any]) -> MagicMock:
+    """Google service whose events.list returns the given pages in turn."""
+    service = MagicMock(name="GoogleCalendarService")
+    service.events.return_value.list.return_value.execute.side_effect = list(pages)
+    return service
+
+
+def _sync_db() -> MagicMock:
+    db = MagicMock()
+    db.upsert_many = AsyncMock(side_effect=lambda table, rows, on_conflict: {
+        "rows": [{**row, "id": f"c-{row['google_event_id']}"} for row in rows],
+        "failed": [],
+    })
+    db.delete = AsyncMock(return_value=True)
+    return db
+
+
+@pytest.mark.skipif(CalendarService is None, reason="CalendarService not yet implemented")
+class TestIncrementalSync:
+    """sync() keeps a local store current with sync tokens; reads use the store."""
+
+    @pytest.mark.asyncio
+    async def test_full_sync_pages_then_incremental_applies_changes(self, mock_config):
+        google_svc = _paged_service(
+            {"items": [_build_google_event("e1")], "nextPageToken": "p2"},
+            {"items": [_build_google_event("e2")], "nextSyncToken": "t1"},
+            {
+                "items": [
+                    _build_google_event("e1", "Standup moved", start_hours_from_now=2),
+                    {"id": "e2", "status": "cancelled"},
+                ],
+                "nextSyncToken": "t2",
+            },
+        )
+        db = _sync_db()
+        listener = MagicMock()
+
+        with patch.object(CalendarService, "_get_service", return_value=google_svc):
+            svc = CalendarService(config=mock_config, db=db)
+            svc.set_sync_listener(listener)
+            assert await svc.sync_events_to_cache() == 2
+            assert await svc.sync_events_to_cache() == 1
+
+        calls = google_svc.events.return_value.list.call_args_list
+        assert "timeMin" in calls[0].kwargs and calls[0].kwargs["pageToken"] is None
+        assert calls[1].kwargs["pageToken"] == "p2"
+        assert calls[2].kwargs["syncToken"] == "t1"
+        assert "timeMin" not in calls[2].kwargs
+
+        # Only the changed event is re-upserted; the cancelled one is deleted
+        _, rows = db.upsert_many.await_args.args
+        assert [r["google_event_id"] for r in rows] == ["e1"]
+        db.delete.assert_awaited_with("events_cache", {"google_event_id__in": ["e2"]})
+        rows_arg, removed, full = listener.call_args.args
+        assert (removed, full) == (["e2"], False)
+        assert svc.store.sync_token == "t2"
+        assert svc.store.get("e1")["summary"] == "Standup moved"
+        assert svc.store.get("e2") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_token_triggers_full_sync(self, mock_config):
+        from googleapiclient.errors import HttpError
+
+        google_svc = _paged_service(
+            {"items": [_build_google_event("e1")], "nextSyncToken": "t1"},
+            HttpError(MagicMock(status=410), b"gone"),
+            {"items": [_build_google_event("e3")], "nextSyncToken": "t3"},
+        )
+
+        with patch.object(CalendarService, "_get_service", return_value=google_svc):
+            svc = CalendarService(config=mock_config, db=_sync_db())
+            await svc.sync()
+            result = await svc.sync()
+
+        assert result["full"] is True
+        assert result["removed"] == ["e1"]
+        assert svc.store.sync_token == "t3"
+
+    @pytest.mark.asyncio
+    async def test_list_events_served_from_fresh_store(self, mock_config):
+        google_svc = _paged_service(
+            {
+                "items": [
+                    _build_google_event("later", start_hours_from_now=30),
+                    _build_google_event("soon", start_hours_from_now=1),
+                ],
+                "nextSyncToken": "t1",
+            },
+        )
+
+        with patch.object(CalendarService, "_get_service", return_value=google_svc):
+            svc = CalendarService(config=mock_config, db=_sync_db())
+            await svc.sync()
+            today = await svc.list_events(days=1)
+            week = await svc.list_events(days=7)
+
+        assert [e["id"] for e in today] == ["soon"]
+        assert [e["id"] for e in week] == ["soon", "later"]
+        assert google_svc.events.return_value.list.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_update_the_store(self, mock_config):
+        created = _build_google_event("new", "Dentist", start_hours_from_now=5)
+        google_svc = _paged_service({"items": [], "nextSyncToken": "t1"})
+        google_svc.events.return_value.insert.return_value.execute.return_value = created
+
+        with patch.object(CalendarService, "_get_service", return_value=google_svc):
+            svc = CalendarService(config=mock_config, db=_sync_db())
+            await svc.sync()
+            await svc.create_event("Dentist", created["start"]["dateTime"], created["end"]["dateTime"])
+            assert [e["id"] for e in await svc.list_events(days=1)] == ["new"]
+            await svc.delete_event("new")
+            assert await svc.list_events(days=1) == []
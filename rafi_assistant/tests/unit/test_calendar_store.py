@@ -0,0 +1,110 @@
+"""Tests for src/services/calendar_store.py — the local calendar copy.
+
+Covers:
+- Reads need a sync token, a recent sync and a window covering the range
+- events_between includes events in progress and orders by start
+- All-day events are placed in the configured timezone
+- Incremental changes outside the window are dropped
+- save()/load() round-trips the token and events; bad files are ignored
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from src.services.calendar_store import MAX_STALENESS, CalendarEventStore
+
+NOW = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def _event(event_id: str, start: datetime, minutes: int = 30) -> dict[str, str]:
+    return {
+        "id": event_id,
+        "summary": event_id,
+        "start": start.isoformat(),
+        "end": (start + timedelta(minutes=minutes)).isoformat(),
+    }
+
+
+def _store(path=None, tz: str = "UTC") -> CalendarEventStore:
+    store = CalendarEventStore(path, timezone_name=tz)
+    store.replace(
+        [
+            _event("running", NOW - timedelta(minutes=10)),
+            _event("later", NOW + timedelta(hours=5)),
+            _event("soon", NOW + timedelta(hours=1)),
+            _event("past", NOW - timedelta(hours=3)),
+        ],
+        "t1",
+        NOW - timedelta(days=1),
+        NOW + timedelta(days=31),
+        NOW,
+    )
+    return store
+
+
+def test_covers_requires_fresh_token_and_window():
+    store = _store()
+
+    assert store.covers(NOW, NOW + timedelta(days=7), NOW)
+    assert not store.covers(NOW, NOW + timedelta(days=40), NOW)
+    assert not store.covers(NOW, NOW + timedelta(days=1), NOW + MAX_STALENESS + timedelta(seconds=1))
+    assert not CalendarEventStore().covers(NOW, NOW + timedelta(days=1), NOW)
+
+
+def test_events_between_orders_and_includes_running():
+    store = _store()
+
+    events = store.events_between(NOW, NOW + timedelta(days=1))
+
+    assert [e["id"] for e in events] == ["running", "soon", "later"]
+
+
+def test_all_day_events_use_local_midnight():
+    store = _store(tz="America/New_York")
+    store.apply([{"id": "holiday", "start": "2026-10-17", "end": "2026-10-18"}], [], "t2", NOW)
+
+    # 2026-10-17 00:00 in New York is 04:00 UTC
+    before = store.events_between(NOW, datetime(2026, 10, 17, 3, 0, tzinfo=timezone.utc))
+    after = store.events_between(NOW, datetime(2026, 10, 17, 5, 0, tzinfo=timezone.utc))
+
+    assert "holiday" not in [e["id"] for e in before]
+    assert "holiday" in [e["id"] for e in after]
+
+
+def test_apply_drops_changes_outside_window():
+    store = _store()
+
+    stored, removed = store.apply(
+        [_event("far", NOW + timedelta(days=90)), _event("soon", NOW + timedelta(days=100))],
+        ["past", "unknown"],
+        "t2",
+        NOW,
+    )
+
+    assert stored == []
+    assert sorted(removed) == ["past", "soon"]
+    assert store.sync_token == "t2"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "calendar.json"
+    _store(path).save()
+
+    loaded = CalendarEventStore(path)
+    loaded.load()
+
+    assert loaded.sync_token == "t1"
+    assert len(loaded) == 4
+    assert loaded.covers(NOW, NOW + timedelta(days=7), NOW)
+
+
+def test_unreadable_file_ignored(tmp_path):
+    path = tmp_path / "calendar.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    store = CalendarEventStore(path)
+    store.load()
+
+    assert store.sync_token is None
+    assert len(store) == 0
@@ -0,0 +1,259 @@
+"""Tests for src/llm/circuit_breaker.py and its use in LLMManager.
+
+Uses a fake clock. Covers:
+- A breaker opens on error rate or p95 latency once min_calls is reached
+- Old outcomes leave the rolling window
+- Half-open allows one probe; success closes, failure re-opens with a longer cooldown
+- LLMManager skips open providers, orders fallbacks by health and probes recovery
+- With every breaker open, the least unhealthy provider is probed early
+- A cancelled probe releases the half-open slot
+- chat_stream records outcomes and breaker_stats reports state
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.llm.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, percentile
+from src.llm.llm_manager import LLMManager
+from src.llm.streaming import done_event, text_event
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock, **kwargs: Any) -> CircuitBreaker:
+    options = {"min_calls": 4, "error_rate_threshold": 0.5, "cooldown_seconds": 30.0}
+    options.update(kwargs)
+    return CircuitBreaker(clock=clock, **options)
+
+
+def test_percentile_nearest_rank():
+    assert percentile([], 0.95) == 0.0
+    assert percentile([5.0, 1.0, 3.0, 2.0, 4.0], 0.5) == 3.0
+    assert percentile(list(range(1, 101)), 0.95) == 95
+
+
+def test_opens_on_error_rate_after_min_calls():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    breaker.record_failure(RuntimeError("down"))
+    breaker.record_failure(RuntimeError("down"))
+    breaker.record_success(100)
+    assert breaker.state == CLOSED  # below min_calls
+
+    breaker.record_failure(RuntimeError("down"))
+
+    assert breaker.state == OPEN
+    assert not breaker.acquire()
+    stats = breaker.stats()
+    assert stats["trips"] == 1 and stats["rejected"] == 1
+    assert stats["last_error"] == "RuntimeError: down"
+    assert stats["retry_in_s"] == 30.0
+
+
+def test_opens_on_p95_latency():
+    breaker = _breaker(FakeClock(), latency_threshold_ms=2000)
+
+    for ms in (500, 600, 700, 5000):
+        breaker.record_success(ms)
+
+    assert breaker.state == OPEN
+
+
+def test_old_outcomes_leave_the_window():
+    clock = FakeClock()
+    breaker = _breaker(clock, window_seconds=60)
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now += 61
+    breaker.record_failure()
+
+    assert breaker.state == CLOSED
+    assert breaker.stats()["calls"] == 1
+
+
+def test_half_open_single_probe_then_close():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.acquire()
+    assert not breaker.acquire()  # probe already in flight
+
+    breaker.record_success(200)
+
+    assert breaker.state == CLOSED
+    assert breaker.stats()["calls"] == 0
+
+
+def test_failed_probe_doubles_cooldown():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.acquire()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    clock.now += 30
+    assert breaker.state == OPEN
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+
+
+def _provider(content: str = "ok") -> AsyncMock:
+    provider = AsyncMock()
+    provider.chat.return_value = {
+        "role": "assistant",
+        "content": content,
+        "tool_calls": [],
+        "finish_reason": "stop",
+    }
+    return provider
+
+
+def _failing() -> AsyncMock:
+    provider = AsyncMock()
+    provider.chat.side_effect = RuntimeError("API down")
+    return provider
+
+
+MESSAGES = [{"role": "user", "content": "hello there"}]
+
+
+@pytest.mark.asyncio
+async def test_manager_skips_open_provider_and_probes_recovery():
+    clock = FakeClock()
+    broken, backup = _failing(), _provider("backup")
+    manager = LLMManager(
+        providers={"openai": broken, "groq": backup},
+        default="openai",
+        circuit_breaker={"min_calls": 2, "cooldown_seconds": 30.0, "clock": clock},
+    )
+
+    for _ in range(2):
+        assert (await manager.chat(MESSAGES))["content"] == "backup"
+    assert broken.chat.await_count == 2
+    assert manager.breaker_stats["openai"]["state"] == OPEN
+
+    # Open: the primary is not tried at all
+    assert (await manager.chat(MESSAGES))["content"] == "backup"
+    assert broken.chat.await_count == 2
+
+    # Half-open: one probe goes to the recovered primary, which closes the breaker
+    clock.now += 30
+    broken.chat.side_effect = None
+    broken.chat.return_value = {"role": "assistant", "content": "primary", "tool_calls": []}
+
+    assert (await manager.chat(MESSAGES))["content"] == "primary"
+    assert manager.breaker_stats["openai"]["state"] == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_manager_orders_fallbacks_by_health():
+    clock = FakeClock()
+    primary, flaky, healthy = _failing(), _provider("flaky"), _provider("healthy")
+    manager = LLMManager(
+        providers={"openai": primary, "gemini": flaky, "groq": healthy},
+        default="openai",
+        circuit_breaker={"min_calls": 10, "clock": clock},
+    )
+    manager._breakers["gemini"].record_failure()
+    manager._breakers["gemini"].record_success(100)
+
+    result = await manager.chat(MESSAGES)
+
+    assert result["content"] == "healthy"
+    flaky.chat.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_all_open_probes_least_unhealthy_provider():
+    clock = FakeClock()
+    provider = _failing()
+    manager = LLMManager(
+        providers={"openai": provider},
+        default="openai",
+        circuit_breaker={"min_calls": 1, "clock": clock},
+    )
+    await manager.chat(MESSAGES)
+    assert manager.breaker_stats["openai"]["state"] == OPEN
+
+    # The only provider is still tried, well before its cooldown ends
+    provider.chat = _provider("back").chat
+    result = await manager.chat(MESSAGES)
+
+    assert result["content"] == "back"
+    assert manager.breaker_stats["openai"]["state"] == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_slot():
+    clock = FakeClock()
+    provider = AsyncMock()
+    provider.chat.side_effect = asyncio.CancelledError()
+    manager = LLMManager(
+        providers={"openai": provider},
+        default="openai",
+        circuit_breaker={"min_calls": 1, "clock": clock},
+    )
+    manager._breakers["openai"].record_failure()
+    clock.now += 30
+
+    with pytest.raises(asyncio.CancelledError):
+        await manager.chat(MESSAGES)
+
+    assert manager._breakers["openai"].available()
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_records_outcomes():
+    clock = FakeClock()
+    response = {"role": "assistant", "content": "hi", "tool_calls": []}
+
+    async def stream(**kwargs: Any):
+        yield text_event("hi")
+        yield done_event(response)
+
+    async def broken_stream(**kwargs: Any):
+        raise RuntimeError("down")
+        yield  # pragma: no cover
+
+    primary, backup = AsyncMock(), AsyncMock()
+    primary.chat_stream = broken_stream
+    backup.chat_stream = stream
+    manager = LLMManager(
+        providers={"openai": primary, "groq": backup},
+        default="openai",
+        circuit_breaker={"min_calls": 5, "clock": clock},
+    )
+
+    events = [event async for event in manager.chat_stream(MESSAGES)]
+
+    assert events[-1]["type"] == "done"
+    stats = manager.breaker_stats
+    assert stats["openai"]["error_rate"] == 1.0
+    assert stats["groq"]["calls"] == 1 and stats["groq"]["error_rate"] == 0.0
+
+
+def test_breakers_disabled_by_default():
+    manager = LLMManager(providers={"openai": _provider()}, default="openai")
+
+    assert manager.breaker_stats == {}
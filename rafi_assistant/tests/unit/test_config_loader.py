@@ -211,6 +211,20 @@ class TestInvalidValues:
         with pytest.raises(ValueError, match="(?i)https"):
             load_config(path)
 
+    def test_asyncpg_backend_requires_database_url(self, tmp_path, test_config_dict):
+        data = copy.deepcopy(test_config_dict)
+        data["supabase"]["backend"] = "asyncpg"
+        path = _write_yaml(tmp_path, data)
+        with pytest.raises(ValueError, match="database_url"):
+            load_config(path)
+
+    def test_invalid_supabase_backend(self, tmp_path, test_config_dict):
+        data = copy.deepcopy(test_config_dict)
+        data["supabase"]["backend"] = "odbc"
+        path = _write_yaml(tmp_path, data)
+        with pytest.raises(ValueError, match="(?i)backend"):
+            load_config(path)
+
     def test_negative_user_id(self, tmp_path, test_config_dict):
         data = copy.deepcopy(test_config_dict)
         data["telegram"]["user_id"] = -1
@@ -269,6 +283,12 @@ class TestDefaults:
         config = load_config(path)
         assert config.elevenlabs.agent_name == "Rafi"
 
+    def test_supabase_backend_defaults_to_rest(self, tmp_path, test_config_dict):
+        path = _write_yaml(tmp_path, copy.deepcopy(test_config_dict))
+        config = load_config(path)
+        assert config.supabase.backend == "rest"
+        assert config.supabase.database_url == ""
+
     def test_google_refresh_token_default_empty(self, tmp_path, test_config_dict):
         data = copy.deepcopy(test_config_dict)
         del data["google"]["refresh_token"]
@@ -0,0 +1,104 @@
+"""Tests for src/services/context_builder.py — token-budgeted context.
+
+Covers:
+- Recent history is kept newest-first within the budget
+- Stored token_count values are used instead of recounting
+- Memory hits are capped by their share and deduplicated against history
+- fit() drops old history, then truncates tool results
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from src.llm.tokens import MESSAGE_OVERHEAD_TOKENS, count_message_tokens
+from src.services.context_builder import TRUNCATION_MARKER, ContextBuilder
+
+
+def _row(msg_id: str, content: str, tokens: int, role: str = "user") -> dict:
+    return {"id": msg_id, "role": role, "content": content, "token_count": tokens}
+
+
+USER = {"role": "user", "content": "what's next?"}
+
+
+def test_keeps_newest_history_within_budget():
+    recent = [_row(f"m{i}", f"turn {i}", 100) for i in range(10)]
+    builder = ContextBuilder(token_budget=500, memory_share=0.0)
+
+    messages = builder.build("sys", recent, [], USER)
+
+    contents = [m["content"] for m in messages[1:-1]]
+    assert contents == [f"turn {i}" for i in range(6, 10)]
+    assert messages[0] == {"role": "system", "content": "sys"}
+    assert messages[-1] is USER
+
+
+def test_uses_stored_token_count():
+    row = _row("m1", "short text", 999)
+
+    assert count_message_tokens(row) == 999 + MESSAGE_OVERHEAD_TOKENS
+    with patch("src.llm.tokens.count_tokens", side_effect=AssertionError("recounted")):
+        count_message_tokens(row)
+
+
+def test_memory_hits_capped_and_deduplicated():
+    recent = [_row("r1", "recent", 50)]
+    hits = [
+        _row("r1", "recent", 50),  # already in history
+        _row("h1", "huge hit", 5000),  # larger than the memory share
+        _row("h2", "small hit", 50),
+    ]
+    builder = ContextBuilder(token_budget=1000, memory_share=0.25)
+
+    messages = builder.build("sys", recent, hits, USER)
+
+    assert [m["content"] for m in messages[1:-1]] == ["small hit", "recent"]
+
+
+def test_no_room_returns_system_and_user_only():
+    builder = ContextBuilder(token_budget=5)
+
+    messages = builder.build("a long system prompt " * 20, [_row("m1", "x", 1)], [], USER)
+
+    assert [m["role"] for m in messages] == ["system", "user"]
+
+
+def test_fit_drops_history_before_truncating_tool_results():
+    messages = [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "old " * 200},
+        {"role": "user", "content": "question"},
+        {"role": "tool", "tool_call_id": "t1", "content": "result " * 50},
+    ]
+    builder = ContextBuilder(token_budget=200)
+
+    fitted, history_end = builder.fit(messages, history_end=2)
+
+    assert history_end == 1
+    assert [m["content"] for m in fitted[1:3]] == ["question", "result " * 50]
+
+
+def test_fit_truncates_largest_tool_result():
+    messages = [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "question"},
+        {"role": "tool", "tool_call_id": "t1", "content": "small"},
+        {"role": "tool", "tool_call_id": "t2", "content": "row data " * 500},
+    ]
+    builder = ContextBuilder(token_budget=300)
+
+    fitted, _ = builder.fit(messages, history_end=1)
+
+    assert fitted[2]["content"] == "small"
+    assert fitted[3]["content"].endswith(TRUNCATION_MARKER)
+    assert sum(count_message_tokens(m) for m in fitted) <= 300
+    # The caller's list is left untouched
+    assert messages[3]["content"] == "row data " * 500
+
+
+def test_invalid_budget():
+    with pytest.raises(ValueError):
+        ContextBuilder(token_budget=0)
@@ -9,6 +9,7 @@ import httpx
 import pytest
 
 from src.voice.deepgram_stt import DeepgramSTT
+from src.voice.http_pool import PooledHTTPClient
 
 
 @pytest.mark.asyncio
@@ -83,3 +84,32 @@ def test_extract_transcript_handles_missing_shape() -> None:
     assert DeepgramSTT._extract_transcript({}) is None
     assert DeepgramSTT._extract_transcript({"results": {}}) is None
     assert DeepgramSTT._extract_transcript({"results": {"channels": []}}) is None
+
+
+@pytest.mark.asyncio
+async def test_send_request_uses_pooled_client(tmp_path: Path):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={"results": {"channels": [{"alternatives": [{"transcript": "hi there"}]}]}},
+        )
+
+    http_client = PooledHTTPClient(
+        "https://api.deepgram.com",
+        transport=httpx.MockTransport(handler),
+    )
+    stt = DeepgramSTT(api_key="dg_key", http_client=http_client)
+    file_path = tmp_path / "audio.ogg"
+    file_path.write_bytes(b"dummy-audio")
+
+    assert await stt.transcribe_file(str(file_path)) == "hi there"
+    assert await stt.transcribe_file(str(file_path)) == "hi there"
+
+    assert len(requests) == 2
+    assert requests[0].headers["Authorization"] == "Token dg_key"
+    assert requests[0].content == b"dummy-audio"
+    assert stt.http_stats()["requests"] == 2
+    await stt.close()
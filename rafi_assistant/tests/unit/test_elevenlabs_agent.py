@@ -2,11 +2,27 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from typing import Callable
 
+import httpx
 import pytest
 
 from src.voice.elevenlabs_agent import ElevenLabsAgent, extract_transcript_text
+from src.voice.http_pool import PooledHTTPClient
+
+
+def _agent_with_transport(handler: Callable[[httpx.Request], httpx.Response]) -> ElevenLabsAgent:
+    http_client = PooledHTTPClient(
+        "https://api.elevenlabs.io/v1",
+        transport=httpx.MockTransport(handler),
+    )
+    return ElevenLabsAgent(
+        api_key="key",
+        voice_id="voice",
+        agent_name="Rafi",
+        personality="Friendly",
+        http_client=http_client,
+    )
 
 
 def test_constructor_requires_api_key() -> None:
@@ -21,16 +37,9 @@ def test_constructor_requires_voice_id() -> None:
 
 @pytest.mark.asyncio
 async def test_create_agent_sets_agent_id() -> None:
-    agent = ElevenLabsAgent(api_key="key", voice_id="voice", agent_name="Rafi", personality="Friendly")
-
-    with patch("src.voice.elevenlabs_agent.httpx.AsyncClient") as mock_client_cls:
-        client = mock_client_cls.return_value.__aenter__.return_value
-        response = MagicMock()
-        response.raise_for_status = MagicMock()
-        response.json.return_value = {"agent_id": "agent_abc"}
-        client.post = AsyncMock(return_value=response)
+    agent = _agent_with_transport(lambda request: httpx.Response(200, json={"agent_id": "agent_abc"}))
 
-        result = await agent.create_agent(webhook_url="https://example.com")
+    result = await agent.create_agent(webhook_url="https://example.com")
 
     assert result == "agent_abc"
     assert agent.agent_id == "agent_abc"
@@ -38,17 +47,36 @@ async def test_create_agent_sets_agent_id() -> None:
 
 @pytest.mark.asyncio
 async def test_create_agent_raises_when_agent_id_missing() -> None:
-    agent = ElevenLabsAgent(api_key="key", voice_id="voice", agent_name="Rafi", personality="Friendly")
+    agent = _agent_with_transport(lambda request: httpx.Response(200, json={}))
+
+    with pytest.raises(ValueError):
+        await agent.create_agent(webhook_url="https://example.com")
+
+
+@pytest.mark.asyncio
+async def test_requests_share_one_pooled_client() -> None:
+    paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path.endswith("/agents/create"):
+            return httpx.Response(200, json={"agent_id": "agent_abc"})
+        if request.url.path.endswith("/get_signed_url"):
+            return httpx.Response(200, json={"signed_url": "wss://signed"})
+        return httpx.Response(200, content=b"mp3-bytes")
+
+    agent = _agent_with_transport(handler)
+
+    await agent.create_agent(webhook_url="https://example.com")
+    assert await agent.synthesize("hello") == b"mp3-bytes"
+    assert await agent.get_signed_url() == "wss://signed"
 
-    with patch("src.voice.elevenlabs_agent.httpx.AsyncClient") as mock_client_cls:
-        client = mock_client_cls.return_value.__aenter__.return_value
-        response = MagicMock()
-        response.raise_for_status = MagicMock()
-        response.json.return_value = {}
-        client.post = AsyncMock(return_value=response)
+    stats = agent.http_stats()
+    assert stats["requests"] == 3
+    assert stats["failed"] == 0
+    assert paths[1] == "/v1/text-to-speech/voice"
 
-        with pytest.raises(ValueError):
-            await agent.create_agent(webhook_url="https://example.com")
+    await agent.close()
 
 
 @pytest.mark.asyncio
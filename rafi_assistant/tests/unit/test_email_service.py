@@ -7,6 +7,7 @@ All Gmail API calls are mocked.  Covers:
 - HTML stripping from email bodies
 - Handles empty inbox
 - Email body length truncation
+- Batched message fetch and metadata-only mode
 """
 
 from __future__ import annotations
@@ -80,7 +81,7 @@ def _mock_gmail_service(messages: List[Dict[str, Any]] | None = None):
     }
 
     # messages().get()
-    def get_message(userId="me", id="", format="full"):
+    def get_message(userId="me", id="", format="full", metadataHeaders=None):
         mock = MagicMock()
         for m in msg_list:
             if m["id"] == id:
@@ -91,6 +92,27 @@ def _mock_gmail_service(messages: List[Dict[str, Any]] | None = None):
 
     messages_resource.get.side_effect = get_message
 
+    # new_batch_http_request(): replays each added request through its callback
+    def new_batch(callback=None):
+        batch = MagicMock(name="BatchHttpRequest")
+        added: list = []
+        batch.add.side_effect = lambda request, request_id=None, callback=None: added.append(
+            (request, request_id)
+        )
+
+        def execute():
+            for request, request_id in added:
+                try:
+                    response, error = request.execute(), None
+                except Exception as exc:
+                    response, error = None, exc
+                callback(request_id, response, error)
+
+        batch.execute.side_effect = execute
+        return batch
+
+    service.new_batch_http_request.side_effect = new_batch
+
     # messages().send()
     messages_resource.send.return_value.execute.return_value = {
         "id": "sent_1",
@@ -279,3 +301,73 @@ class TestBodyTruncation:
 
         if isinstance(result, list) and len(result) > 0:
             assert "Short email" in str(result)
+
+
+@pytest.mark.skipif(EmailService is None, reason="EmailService not yet implemented")
+class TestBatchedFetch:
+    """Messages are fetched through Gmail batch requests, not one get per ID."""
+
+    @pytest.mark.asyncio
+    async def test_list_uses_single_batch(self, mock_config):
+        msgs = [_build_gmail_message(f"m{i}", f"Subject {i}") for i in range(5)]
+        gmail_svc = _mock_gmail_service(msgs)
+
+        with patch.object(EmailService, "_get_service", return_value=gmail_svc):
+            svc = EmailService(config=mock_config, db=MagicMock())
+            result = await svc.list_emails(count=5)
+
+        gmail_svc.new_batch_http_request.assert_called_once()
+        assert [e["id"] for e in result] == ["m0", "m1", "m2", "m3", "m4"]
+
+    @pytest.mark.asyncio
+    async def test_metadata_mode_skips_body(self, mock_config):
+        msgs = [_build_gmail_message("m1", "Heads up", body="Secret body")]
+        gmail_svc = _mock_gmail_service(msgs)
+
+        with patch.object(EmailService, "_get_service", return_value=gmail_svc):
+            svc = EmailService(config=mock_config, db=MagicMock())
+            result = await svc.list_emails(unread_only=True, message_format="metadata")
+
+        get_kwargs = gmail_svc.users().messages().get.call_args.kwargs
+        assert get_kwargs["format"] == "metadata"
+        assert "Subject" in get_kwargs["metadataHeaders"]
+        assert result[0]["subject"] == "Heads up"
+        assert result[0]["body"] == ""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_individual_gets_when_batch_fails(self, mock_config):
+        msgs = [_build_gmail_message("m1", "One"), _build_gmail_message("m2", "Two")]
+        gmail_svc = _mock_gmail_service(msgs)
+        gmail_svc.new_batch_http_request.side_effect = RuntimeError("batch endpoint down")
+
+        with patch.object(EmailService, "_get_service", return_value=gmail_svc):
+            svc = EmailService(config=mock_config, db=MagicMock())
+            result = await svc.search_emails("subject:One OR subject:Two")
+
+        assert [e["subject"] for e in result] == ["One", "Two"]
+
+    @pytest.mark.asyncio
+    async def test_failed_message_is_skipped(self, mock_config):
+        msgs = [_build_gmail_message("m1", "Good"), _build_gmail_message("m2", "Bad")]
+        gmail_svc = _mock_gmail_service(msgs)
+        original_get = gmail_svc.users().messages().get.side_effect
+
+        def flaky_get(**kwargs):
+            request = original_get(**kwargs)
+            if kwargs.get("id") == "m2":
+                request.execute.side_effect = RuntimeError("404")
+            return request
+
+        gmail_svc.users().messages().get.side_effect = flaky_get
+
+        with patch.object(EmailService, "_get_service", return_value=gmail_svc):
+            svc = EmailService(config=mock_config, db=MagicMock())
+            result = await svc.list_emails()
+
+        assert [e["id"] for e in result] == ["m1"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_format(self, mock_config):
+        svc = EmailService(config=mock_config, db=MagicMock())
+        with pytest.raises(ValueError):
+            await svc.list_emails(message_format="raw")
@@ -0,0 +1,73 @@
+"""Tests for src/llm/embedding_batcher.py — embed micro-batching.
+
+Covers:
+- Concurrent submissions within the window share one embed_many call
+- Duplicate texts in a batch are embedded once
+- max_batch triggers an immediate flush
+- Failures propagate to every waiter
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.llm.embedding_batcher import EmbeddingBatcher
+
+
+def _fake_embed_many() -> AsyncMock:
+    return AsyncMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_share_one_call():
+    embed_many = _fake_embed_many()
+    batcher = EmbeddingBatcher(embed_many, window_seconds=0.01)
+
+    results = await asyncio.gather(*(batcher.submit(t) for t in ["a", "bb", "ccc"]))
+
+    assert results == [[1.0], [2.0], [3.0]]
+    embed_many.assert_awaited_once_with(["a", "bb", "ccc"])
+    assert batcher.stats()["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_texts_embedded_once():
+    embed_many = _fake_embed_many()
+    batcher = EmbeddingBatcher(embed_many, window_seconds=0.01)
+
+    first, second = await asyncio.gather(batcher.submit("ok"), batcher.submit("ok"))
+
+    assert first == second == [2.0]
+    embed_many.assert_awaited_once_with(["ok"])
+
+
+@pytest.mark.asyncio
+async def test_max_batch_flushes_immediately():
+    embed_many = _fake_embed_many()
+    batcher = EmbeddingBatcher(embed_many, window_seconds=10.0, max_batch=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.submit("x"), batcher.submit("yy")), timeout=1.0,
+    )
+
+    assert results == [[1.0], [2.0]]
+
+
+@pytest.mark.asyncio
+async def test_failure_propagates_to_all_waiters():
+    embed_many = AsyncMock(side_effect=RuntimeError("api down"))
+    batcher = EmbeddingBatcher(embed_many, window_seconds=0.01)
+
+    results = await asyncio.gather(
+        batcher.submit("a"), batcher.submit("b"), return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        EmbeddingBatcher(AsyncMock(), window_seconds=0)
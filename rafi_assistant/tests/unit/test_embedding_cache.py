@@ -0,0 +1,111 @@
+"""Tests for src/llm/embedding_cache.py — content-hash embedding cache.
+
+Covers:
+- Keys depend on both model and text
+- LRU eviction at max_entries
+- Hit/miss counters
+- SQLite tier persists vectors across instances
+- Batched lookups and stores, in memory and on disk
+- Returned vectors are copies
+- Empty vectors are never cached
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from src.llm.embedding_cache import EmbeddingCache, embedding_cache_key
+
+
+def test_key_depends_on_model_and_text():
+    assert embedding_cache_key("m1", "hello") != embedding_cache_key("m2", "hello")
+    assert embedding_cache_key("m1", "hello") != embedding_cache_key("m1", "hello!")
+    assert embedding_cache_key("m1", "hello") == embedding_cache_key("m1", "hello")
+
+
+@pytest.mark.asyncio
+async def test_get_put_and_counters():
+    cache = EmbeddingCache(max_entries=4)
+
+    assert await cache.get("m", "thanks") is None
+    await cache.put("m", "thanks", [0.1, 0.2])
+
+    assert await cache.get("m", "thanks") == [0.1, 0.2]
+    assert await cache.get("other-model", "thanks") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    cache = EmbeddingCache(max_entries=2)
+    await cache.put("m", "a", [1.0])
+    await cache.put("m", "b", [2.0])
+    await cache.get("m", "a")  # a becomes most recently used
+    await cache.put("m", "c", [3.0])
+
+    assert await cache.get("m", "b") is None
+    assert await cache.get("m", "a") == [1.0]
+    assert await cache.get("m", "c") == [3.0]
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_vector_not_cached():
+    cache = EmbeddingCache()
+    await cache.put("m", "failed", [])
+    assert await cache.get("m", "failed") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_returned_vectors_are_copies():
+    cache = EmbeddingCache()
+    stored = [1.0, 2.0]
+    await cache.put("m", "text", stored)
+    stored.append(3.0)
+
+    first = await cache.get("m", "text")
+    assert first == [1.0, 2.0]
+    first.append(4.0)
+    assert await cache.get("m", "text") == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_disk_store_survives_new_instance(tmp_path):
+    path = tmp_path / "embeddings.sqlite"
+    first = EmbeddingCache(max_entries=8, path=path)
+    await first.put("m", "persist me", [0.5, -0.25, 1.0])
+    first.close()
+
+    second = EmbeddingCache(max_entries=8, path=path)
+    vector = await second.get("m", "persist me")
+
+    assert vector == pytest.approx([0.5, -0.25, 1.0])
+    assert second.stats()["disk_hits"] == 1
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_get_many_and_put_many(tmp_path):
+    path = tmp_path / "embeddings.sqlite"
+    first = EmbeddingCache(max_entries=8, path=path)
+    await first.put_many("m", {"a": [1.0], "b": [2.0], "failed": []})
+    first.close()
+
+    second = EmbeddingCache(max_entries=8, path=path)
+    await second.put("m", "c", [3.0])
+    found = await second.get_many("m", ["a", "c", "missing"])
+
+    assert found == {"a": pytest.approx([1.0]), "c": [3.0]}
+    stats = second.stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (2, 1, 1)
+    second.close()
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        EmbeddingCache(max_entries=0)
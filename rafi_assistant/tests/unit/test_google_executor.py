@@ -0,0 +1,126 @@
+"""Tests for src/services/google_executor.py — off-loop Google API calls.
+
+Covers:
+- Blocking calls run on worker threads, not the event loop thread
+- execute() calls request.execute()
+- Per-call timeouts raise GoogleApiTimeoutError
+- Queued calls are dropped when their caller times out
+- Metrics reflect completed/failed/timed-out calls
+- Shutdown rejects new calls
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.google_executor import GoogleApiExecutor, GoogleApiTimeoutError
+
+
+@pytest.mark.asyncio
+async def test_run_uses_worker_thread():
+    executor = GoogleApiExecutor(max_workers=2)
+    loop_thread = threading.get_ident()
+
+    worker_thread = await executor.run(threading.get_ident)
+
+    assert worker_thread != loop_thread
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_execute_calls_request_execute():
+    executor = GoogleApiExecutor()
+    request = MagicMock()
+    request.execute.return_value = {"items": []}
+
+    result = await executor.execute(request)
+
+    assert result == {"items": []}
+    request.execute.assert_called_once_with()
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_not_blocked_during_call():
+    executor = GoogleApiExecutor(max_workers=1)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    await asyncio.gather(executor.run(time.sleep, 0.1), ticker())
+
+    assert ticks == 5
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_raises_and_is_counted():
+    executor = GoogleApiExecutor(max_workers=1)
+
+    with pytest.raises(GoogleApiTimeoutError):
+        await executor.run(time.sleep, 0.2, timeout=0.02)
+
+    assert executor.stats()["timed_out"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queued_call_dropped_on_timeout():
+    executor = GoogleApiExecutor(max_workers=1)
+    release = threading.Event()
+    second = MagicMock()
+
+    blocker = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(GoogleApiTimeoutError):
+        await executor.run(second, timeout=0.02)
+
+    assert executor.queue_depth == 0
+    release.set()
+    await blocker
+    second.assert_not_called()
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_stats_track_success_and_failure():
+    executor = GoogleApiExecutor(max_workers=2)
+
+    def boom() -> None:
+        raise ValueError("bad request")
+
+    await executor.run(lambda: 1)
+    with pytest.raises(ValueError):
+        await executor.run(boom)
+
+    stats = executor.stats()
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["active"] == 0
+    assert stats["max_queue_depth"] >= 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_rejects_new_calls():
+    executor = GoogleApiExecutor()
+    executor.shutdown()
+
+    with pytest.raises(RuntimeError):
+        await executor.run(lambda: None)
+
+
+def test_invalid_worker_count():
+    with pytest.raises(ValueError):
+        GoogleApiExecutor(max_workers=0)
@@ -0,0 +1,130 @@
+"""Tests for src/voice/http_pool.py — pooled keep-alive HTTP client.
+
+Covers:
+- One underlying client is reused across requests
+- Request, failure and HTTP version metrics
+- New-connection counting from httpcore trace events
+- Per-request timeouts and config-driven limits
+- aclose releases the client and a later request reopens it
+"""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from src.config.loader import HTTPPoolConfig
+from src.voice.http_pool import PooledHTTPClient
+
+
+def _pool(handler, **kwargs) -> PooledHTTPClient:
+    return PooledHTTPClient(
+        "https://api.example.com",
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_reused_across_requests():
+    pool = _pool(lambda request: httpx.Response(200))
+
+    await pool.get("/a")
+    client = pool._client
+    await pool.post("/b", json={"x": 1})
+
+    assert pool._client is client
+    stats = pool.stats()
+    assert stats["requests"] == 2
+    assert stats["failed"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["http_versions"] == {"HTTP/1.1": 2}
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_request_counted():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    pool = _pool(handler)
+
+    with pytest.raises(httpx.ConnectError):
+        await pool.get("/a")
+
+    assert pool.stats()["requests"] == 1
+    assert pool.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_connection_events_counted():
+    pool = _pool(lambda request: httpx.Response(200))
+
+    await pool._trace("connection.connect_tcp.complete", {})
+    await pool._trace("http11.send_request_headers.started", {})
+    await pool.get("/a")
+    await pool.get("/b")
+
+    stats = pool.stats()
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 1
+
+
+@pytest.mark.asyncio
+async def test_trace_hook_skipped_without_metrics():
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(dict(request.extensions))
+        return httpx.Response(200)
+
+    await _pool(handler).get("/a")
+    await _pool(handler, metrics=False).get("/a")
+
+    assert "trace" in seen[0]
+    assert "trace" not in seen[1]
+
+
+@pytest.mark.asyncio
+async def test_per_request_timeout():
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.extensions["timeout"])
+        return httpx.Response(200)
+
+    pool = _pool(handler, timeout=30.0)
+    await pool.get("/a")
+    await pool.get("/b", timeout=5.0)
+
+    assert seen[0]["read"] == 30.0
+    assert seen[1]["read"] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_aclose_then_reopen():
+    pool = _pool(lambda request: httpx.Response(200))
+    await pool.get("/a")
+
+    await pool.aclose()
+    assert pool._client is None
+
+    await pool.get("/b")
+    assert pool._client is not None
+    await pool.aclose()
+
+
+def test_from_config_limits():
+    config = HTTPPoolConfig(max_connections=4, max_keepalive_connections=8, http2=False)
+
+    pool = PooledHTTPClient.from_config("https://api.example.com", config)
+
+    stats = pool.stats()
+    assert stats["max_connections"] == 4
+    assert stats["max_keepalive_connections"] == 4
+    assert stats["http2"] is False
+
+
+def test_invalid_limits_rejected():
+    with pytest.raises(ValueError):
+        PooledHTTPClient("https://api.example.com", max_connections=0)
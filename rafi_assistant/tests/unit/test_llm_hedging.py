@@ -0,0 +1,189 @@
+"""Tests for src/llm/hedging.py and hedged requests in LLMManager.
+
+Providers are fakes with controllable delays. Covers:
+- Hedge deadlines: default until measured, then the latency percentile, floored
+- The hedge-rate cap (token bucket) and its accounting
+- A slow primary is raced by a backup; the loser is cancelled
+- Fast primaries, calls off the voice path and capped requests are not hedged
+- If both hedged calls fail, the remaining providers are tried
+- chat_stream hedges the wait for the first event and closes the losing stream
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from src.llm.hedging import HedgePolicy
+from src.llm.llm_manager import LLMManager
+from src.llm.provider import LLMProvider
+from src.llm.router import voice_request
+from src.llm.streaming import done_event, text_event
+
+MESSAGES = [{"role": "user", "content": "turn on the lights"}]
+
+
+class FakeProvider(LLMProvider):
+    """Answers after ``delay`` seconds, or raises ``error``."""
+
+    def __init__(self, content: str, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.content = content
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+        self.stream_closed = False
+
+    async def chat(self, messages, tools=None, temperature=None, max_tokens=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return {"role": "assistant", "content": self.content, "tool_calls": []}
+
+    async def chat_stream(self, messages, tools=None, temperature=None, max_tokens=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise self.error
+            yield text_event(self.content)
+            yield done_event({"role": "assistant", "content": self.content, "tool_calls": []})
+        finally:
+            self.stream_closed = True
+
+    async def embed(self, text: str) -> list[float]:
+        return []
+
+    async def close(self) -> None:
+        pass
+
+
+def _manager(providers: dict[str, FakeProvider], **hedging: Any) -> LLMManager:
+    options = {"default_delay_ms": 20.0, "min_delay_ms": 0.0, "max_rate": 1.0, "burst": 1.0}
+    options.update(hedging)
+    return LLMManager(providers=providers, default=next(iter(providers)), hedging=options)
+
+
+def test_deadline_from_latency_percentile():
+    policy = HedgePolicy(percentile=0.9, min_samples=3, default_delay_ms=2000, min_delay_ms=300)
+
+    assert policy.delay_seconds("openai") == 2.0
+    for ms in (100, 200, 1000):
+        policy.record("openai", ms)
+    assert policy.delay_seconds("openai") == 1.0
+    for ms in (100, 100, 100, 100, 100, 100, 100, 100):
+        policy.record("groq", ms)
+    assert policy.delay_seconds("groq") == 0.3
+
+
+def test_rate_cap_token_bucket():
+    policy = HedgePolicy(max_rate=0.5, burst=1.0)
+    allowed = []
+    for _ in range(6):
+        policy.start_request()
+        allowed.append(policy.allow())
+
+    # Starts with one saved hedge, then earns one every second request
+    assert allowed == [True, False, True, False, True, False]
+    stats = policy.stats()
+    assert stats["hedged"] == 3 and stats["capped"] == 3 and stats["hedge_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_raced_by_backup():
+    primary, backup = FakeProvider("primary", delay=5), FakeProvider("backup", delay=0.01)
+    manager = _manager({"openai": primary, "groq": backup})
+
+    with voice_request():
+        result = await manager.chat(MESSAGES)
+
+    assert result["content"] == "backup"
+    assert primary.cancelled == 1
+    stats = manager.hedge_stats
+    assert stats["hedged"] == 1 and stats["backup_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_wins_race_after_hedge():
+    primary, backup = FakeProvider("primary", delay=0.05), FakeProvider("backup", delay=5)
+    manager = _manager({"openai": primary, "groq": backup})
+
+    with voice_request():
+        result = await manager.chat(MESSAGES)
+
+    assert result["content"] == "primary"
+    assert backup.cancelled == 1
+    assert manager.hedge_stats["primary_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_fast_off_voice_path_or_capped():
+    primary, backup = FakeProvider("primary", delay=0.05), FakeProvider("backup")
+    manager = _manager({"openai": primary, "groq": backup}, default_delay_ms=1000)
+
+    with voice_request():
+        assert (await manager.chat(MESSAGES))["content"] == "primary"
+    manager._hedge._default_delay_ms = 10
+    assert (await manager.chat(MESSAGES))["content"] == "primary"
+    assert backup.calls == 0
+
+    # The only saved hedge is spent on the first slow request
+    manager._hedge._tokens = 0.0
+    manager._hedge._max_rate = 0.1
+    with voice_request():
+        assert (await manager.chat(MESSAGES))["content"] == "primary"
+    assert backup.calls == 0
+    assert manager.hedge_stats["capped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_both_hedged_calls_fail_then_next_provider():
+    primary = FakeProvider("primary", delay=0.05, error=RuntimeError("down"))
+    backup = FakeProvider("backup", delay=0.03, error=RuntimeError("down too"))
+    third = FakeProvider("third")
+    manager = _manager({"openai": primary, "groq": backup, "gemini": third})
+
+    with voice_request():
+        result = await manager.chat(MESSAGES)
+
+    assert result["content"] == "third"
+    assert (primary.calls, backup.calls, third.calls) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_loser_releases_half_open_probe():
+    primary, backup = FakeProvider("primary", delay=5), FakeProvider("backup", delay=0.01)
+    manager = LLMManager(
+        providers={"openai": primary, "groq": backup},
+        default="openai",
+        hedging={"default_delay_ms": 20.0, "min_delay_ms": 0.0, "burst": 1.0},
+        circuit_breaker={"min_calls": 1, "cooldown_seconds": 0.0},
+    )
+    manager._breakers["openai"].record_failure()
+
+    with voice_request():
+        await manager.chat(MESSAGES)
+
+    assert manager._breakers["openai"].available()
+
+
+@pytest.mark.asyncio
+async def test_stream_hedges_first_event():
+    primary, backup = FakeProvider("primary", delay=5), FakeProvider("backup", delay=0.01)
+    manager = _manager({"openai": primary, "groq": backup})
+
+    with voice_request():
+        events = [event async for event in manager.chat_stream(MESSAGES)]
+
+    assert events[0] == text_event("backup")
+    assert events[-1]["response"]["content"] == "backup"
+    assert primary.stream_closed
+    assert "openai:first_event" not in manager.hedge_stats["deadlines_ms"]
+    assert "groq:first_event" in manager.hedge_stats["deadlines_ms"]
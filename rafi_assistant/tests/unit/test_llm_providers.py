@@ -6,6 +6,8 @@ Covers:
 - GroqProvider: correct base_url, model, embedding fallback
 - GeminiProvider: correct base_url, model, embedding fallback
 - LLMManager: switching, failover, graceful degradation, embed fallback
+- Prompt caching: Anthropic breakpoints, OpenAI stable prefix, usage counts
+- chat_stream: text deltas, tool-call assembly, failover before first event
 """
 
 from __future__ import annotations
@@ -105,6 +107,31 @@ class TestOpenAIProvider:
             assert len(result) == 1536
             assert result[0] == 0.1
 
+    @pytest.mark.asyncio
+    async def test_embed_many_sends_one_request_in_input_order(self, llm_config):
+        with patch("src.llm.openai_provider.AsyncOpenAI") as MockClient:
+            instance = MockClient.return_value
+            # API may return items out of order; index restores input order
+            items = []
+            for index, value in [(1, 0.2), (0, 0.1), (2, 0.3)]:
+                item = MagicMock()
+                item.index = index
+                item.embedding = [value] * 4
+                items.append(item)
+            response = MagicMock()
+            response.data = items
+            instance.embeddings.create = AsyncMock(return_value=response)
+
+            from src.llm.openai_provider import OpenAIProvider
+            provider = OpenAIProvider(config=llm_config)
+            provider._client = instance
+
+            result = await provider.embed_many(["a", "b", "c"])
+
+            instance.embeddings.create.assert_awaited_once()
+            assert instance.embeddings.create.call_args.kwargs["input"] == ["a", "b", "c"]
+            assert [v[0] for v in result] == [0.1, 0.2, 0.3]
+
     def test_custom_base_url_passed_to_client(self, llm_config):
         with patch("src.llm.openai_provider.AsyncOpenAI") as MockClient:
             from src.llm.openai_provider import OpenAIProvider
@@ -350,6 +377,33 @@ class TestGroqProvider:
             assert len(result) == 1536
             mock_oai.embeddings.create.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_embed_many_retries_via_openai_client(self, llm_config):
+        import httpx
+        from openai import APITimeoutError
+
+        with patch("src.llm.openai_provider.AsyncOpenAI"):
+            from src.llm.groq_provider import GroqProvider
+            provider = GroqProvider(config=llm_config)
+
+            item = MagicMock()
+            item.index = 0
+            item.embedding = [0.5] * 4
+            response = MagicMock()
+            response.data = [item]
+            mock_oai = AsyncMock()
+            mock_oai.embeddings.create = AsyncMock(side_effect=[
+                APITimeoutError(request=httpx.Request("POST", "https://api.openai.com")),
+                response,
+            ])
+            provider._openai_embed_client = mock_oai
+
+            with patch("src.llm.openai_provider.asyncio.sleep", new=AsyncMock()):
+                result = await provider.embed_many(["a"])
+
+            assert result == [[0.5] * 4]
+            assert mock_oai.embeddings.create.await_count == 2
+
     @pytest.mark.asyncio
     async def test_embed_raises_without_openai_key(self):
         config = LLMConfig(
@@ -571,6 +625,91 @@ class TestLLMManager:
         result = await manager.embed("test")
         assert result == []
 
+    @pytest.mark.asyncio
+    async def test_embed_served_from_cache_on_repeat(self):
+        from src.llm.embedding_cache import EmbeddingCache
+        from src.llm.llm_manager import LLMManager
+
+        p1 = self._make_mock_provider()
+        manager = LLMManager(
+            providers={"openai": p1},
+            default="openai",
+            embedding_provider=p1,
+            embedding_cache=EmbeddingCache(max_entries=16),
+            embedding_model="text-embedding-3-small",
+        )
+
+        first = await manager.embed("thanks")
+        second = await manager.embed("thanks")
+
+        assert first == second
+        p1.embed.assert_awaited_once_with("thanks")
+        assert manager.embedding_cache_stats["hits"] == 1
+        assert manager.embedding_cache_stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_embed_failure_not_cached(self):
+        from src.llm.embedding_cache import EmbeddingCache
+        from src.llm.llm_manager import LLMManager
+
+        p1 = self._make_mock_provider()
+        p1.embed.side_effect = [RuntimeError("embed failed"), [0.3] * 1536]
+        manager = LLMManager(
+            providers={"openai": p1},
+            default="openai",
+            embedding_provider=p1,
+            embedding_cache=EmbeddingCache(max_entries=16),
+        )
+
+        assert await manager.embed("retry me") == []
+        assert await manager.embed("retry me") == [0.3] * 1536
+        assert p1.embed.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_embed_many_dedupes_and_uses_cache(self):
+        from src.llm.embedding_cache import EmbeddingCache
+        from src.llm.llm_manager import LLMManager
+
+        p1 = self._make_mock_provider()
+        p1.embed_many.side_effect = lambda texts: [[float(len(t))] for t in texts]
+        manager = LLMManager(
+            providers={"openai": p1},
+            default="openai",
+            embedding_provider=p1,
+            embedding_cache=EmbeddingCache(max_entries=16),
+        )
+        await manager.embed("ok")  # primes the cache with [0.1] * 1536
+
+        result = await manager.embed_many(["ok", "hello", "hello", "hey"])
+
+        p1.embed_many.assert_awaited_once_with(["hello", "hey"])
+        assert result[0] == [0.1] * 1536
+        assert result[1] == result[2] == [5.0]
+        assert result[3] == [3.0]
+
+    @pytest.mark.asyncio
+    async def test_micro_batcher_merges_concurrent_embeds(self):
+        import asyncio
+
+        from src.llm.llm_manager import LLMManager
+
+        p1 = self._make_mock_provider()
+        p1.embed_many.side_effect = lambda texts: [[float(len(t))] for t in texts]
+        manager = LLMManager(
+            providers={"openai": p1},
+            default="openai",
+            embedding_provider=p1,
+            embedding_batch_window_ms=5,
+        )
+
+        results = await asyncio.gather(
+            manager.embed("a"), manager.embed("bb"), manager.embed("ccc"),
+        )
+
+        assert results == [[1.0], [2.0], [3.0]]
+        p1.embed_many.assert_awaited_once()
+        p1.embed.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_close_closes_all_providers(self):
         from src.llm.llm_manager import LLMManager
@@ -635,6 +774,409 @@ class TestLLMManager:
         assert call_order == ["a", "b", "c"]
 
 
+class TestContextTokenBudget:
+    """LLMManager exposes the prompt token budget for the next request."""
+
+    def test_budget_follows_active_provider(self):
+        from src.llm.llm_manager import LLMManager
+
+        manager = LLMManager(
+            providers={"openai": AsyncMock(), "groq": AsyncMock()},
+            default="openai",
+            context_token_budget=16000,
+            context_token_budgets={"groq": 6000},
+        )
+
+        assert manager.context_token_budget == 16000
+        manager.switch("groq")
+        assert manager.context_token_budget == 6000
+
+    def test_adaptive_routing_uses_smallest_budget(self):
+        from src.llm.llm_manager import LLMManager
+
+        manager = LLMManager(
+            providers={"openai": AsyncMock(), "groq": AsyncMock()},
+            default="openai",
+            routing_mode="adaptive",
+            context_token_budgets={"groq": 6000},
+        )
+
+        assert manager.context_token_budget == 6000
+
+
+# ---------------------------------------------------------------------------
+# Prompt caching
+# ---------------------------------------------------------------------------
+
+
+class TestPromptCaching:
+    """Cache breakpoints, stable prefixes and cached-token reporting."""
+
+    _TOOLS = [
+        {"type": "function", "function": {"name": "zeta", "description": "z", "parameters": {}}},
+        {"type": "function", "function": {"name": "alpha", "description": "a", "parameters": {}}},
+    ]
+
+    @pytest.mark.asyncio
+    async def test_anthropic_marks_system_and_tools_cacheable(self, llm_config):
+        text_block = MagicMock()
+        text_block.type = "text"
+        text_block.text = "hi"
+        response = MagicMock()
+        response.content = [text_block]
+        response.stop_reason = "end_turn"
+        response.usage.input_tokens = 20
+        response.usage.output_tokens = 5
+        response.usage.cache_read_input_tokens = 1500
+        response.usage.cache_creation_input_tokens = 0
+
+        with patch("src.llm.anthropic_provider.anthropic") as mock_anthropic:
+            mock_client = MagicMock()
+            mock_client.messages.create = AsyncMock(return_value=response)
+            mock_anthropic.AsyncAnthropic.return_value = mock_client
+
+            from src.llm.anthropic_provider import AnthropicProvider
+            provider = AnthropicProvider(config=llm_config, api_key="sk-ant-test")
+            provider._client = mock_client
+
+            result = await provider.chat(
+                messages=[
+                    {"role": "system", "content": "You are Rafi."},
+                    {"role": "user", "content": "hi"},
+                ],
+                tools=self._TOOLS,
+            )
+
+        kwargs = mock_client.messages.create.call_args.kwargs
+        assert kwargs["system"] == [
+            {"type": "text", "text": "You are Rafi.", "cache_control": {"type": "ephemeral"}},
+        ]
+        assert [t["name"] for t in kwargs["tools"]] == ["alpha", "zeta"]
+        assert kwargs["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in kwargs["tools"][0]
+        assert result["usage"]["cached_tokens"] == 1500
+        assert result["usage"]["prompt_tokens"] == 1520
+
+    def test_anthropic_caching_can_be_disabled(self):
+        config = LLMConfig(provider="anthropic", api_key="sk-ant-test", prompt_caching=False)
+        with patch("src.llm.anthropic_provider.anthropic"):
+            from src.llm.anthropic_provider import AnthropicProvider
+            provider = AnthropicProvider(config=config)
+
+        kwargs = provider._build_request(
+            [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}],
+            self._TOOLS,
+            None,
+            None,
+        )
+
+        assert kwargs["system"] == "sys"
+        assert all("cache_control" not in t for t in kwargs["tools"])
+
+    @pytest.mark.asyncio
+    async def test_openai_stable_prefix_and_cached_tokens(self, llm_config, mock_chat_response):
+        mock_chat_response.usage.prompt_tokens_details.cached_tokens = 1024
+
+        with patch("src.llm.openai_provider.AsyncOpenAI") as MockClient:
+            instance = MockClient.return_value
+            instance.chat.completions.create = AsyncMock(return_value=mock_chat_response)
+
+            from src.llm.openai_provider import OpenAIProvider
+            provider = OpenAIProvider(config=llm_config)
+            provider._client = instance
+
+            result = await provider.chat(
+                messages=[
+                    {"role": "user", "content": "earlier"},
+                    {"role": "system", "content": "You are Rafi."},
+                    {"role": "user", "content": "hi"},
+                ],
+                tools=self._TOOLS,
+            )
+            first_key = instance.chat.completions.create.call_args.kwargs["prompt_cache_key"]
+
+            await provider.chat(
+                messages=[{"role": "system", "content": "You are Rafi."}, {"role": "user", "content": "next"}],
+                tools=list(reversed(self._TOOLS)),
+            )
+
+        kwargs = instance.chat.completions.create.call_args.kwargs
+        assert kwargs["messages"][0]["role"] == "system"
+        assert [t["function"]["name"] for t in kwargs["tools"]] == ["alpha", "zeta"]
+        assert kwargs["prompt_cache_key"] == first_key
+        assert result["usage"] == {
+            "prompt_tokens": 10,
+            "completion_tokens": 5,
+            "cached_tokens": 1024,
+            "cache_write_tokens": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_groq_omits_prompt_cache_key(self, llm_config, mock_chat_response):
+        with patch("src.llm.openai_provider.AsyncOpenAI") as MockClient:
+            instance = MockClient.return_value
+            instance.chat.completions.create = AsyncMock(return_value=mock_chat_response)
+
+            from src.llm.groq_provider import GroqProvider
+            provider = GroqProvider(config=llm_config)
+            provider._client = instance
+
+            await provider.chat(messages=[{"role": "user", "content": "hi"}])
+
+        assert "prompt_cache_key" not in instance.chat.completions.create.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_manager_aggregates_cached_tokens(self):
+        from src.llm.llm_manager import LLMManager
+
+        provider = AsyncMock()
+        provider.chat.return_value = {
+            "role": "assistant",
+            "content": "ok",
+            "tool_calls": [],
+            "finish_reason": "stop",
+            "usage": {"prompt_tokens": 2000, "completion_tokens": 10, "cached_tokens": 1500, "cache_write_tokens": 0},
+        }
+        manager = LLMManager(providers={"openai": provider}, default="openai")
+
+        await manager.chat(messages=[{"role": "user", "content": "hi"}])
+        await manager.chat(messages=[{"role": "user", "content": "hi"}])
+
+        stats = manager.usage_stats["openai"]
+        assert stats["requests"] == 2
+        assert stats["cached_tokens"] == 3000
+        assert stats["cache_hit_rate"] == 0.75
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+
+class _FakeStream:
+    """Async iterator over prepared stream chunks."""
+
+    def __init__(self, chunks: list[Any]) -> None:
+        self._chunks = list(chunks)
+
+    def __aiter__(self) -> "_FakeStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if not self._chunks:
+            raise StopAsyncIteration
+        return self._chunks.pop(0)
+
+
+def _openai_chunk(content=None, tool_calls=None, finish_reason=None) -> MagicMock:
+    choice = MagicMock()
+    choice.delta.content = content
+    choice.delta.tool_calls = tool_calls
+    choice.finish_reason = finish_reason
+    chunk = MagicMock()
+    chunk.choices = [choice]
+    chunk.usage = None
+    return chunk
+
+
+def _openai_tool_delta(index, call_id=None, name=None, arguments=None) -> MagicMock:
+    delta = MagicMock()
+    delta.index = index
+    delta.id = call_id
+    delta.function.name = name
+    delta.function.arguments = arguments
+    return delta
+
+
+def _event(kind: str, **fields: Any) -> MagicMock:
+    event = MagicMock()
+    event.type = kind
+    for key, value in fields.items():
+        setattr(event, key, value)
+    return event
+
+
+async def _collect(stream) -> list[dict[str, Any]]:
+    return [event async for event in stream]
+
+
+class TestChatStream:
+    """chat_stream yields text deltas and a final assembled response."""
+
+    @pytest.mark.asyncio
+    async def test_openai_stream_text_and_tool_calls(self, llm_config):
+        chunks = [
+            _openai_chunk(content="Let me "),
+            _openai_chunk(content="check."),
+            _openai_chunk(tool_calls=[_openai_tool_delta(0, "call_1", "get_weather", '{"loc')]),
+            _openai_chunk(tool_calls=[_openai_tool_delta(0, arguments='ation": "NYC"}')]),
+            _openai_chunk(tool_calls=[_openai_tool_delta(1, "call_2", "list_tasks", "")]),
+            _openai_chunk(finish_reason="tool_calls"),
+        ]
+
+        with patch("src.llm.openai_provider.AsyncOpenAI") as MockClient:
+            instance = MockClient.return_value
+            instance.chat.completions.create = AsyncMock(return_value=_FakeStream(chunks))
+
+            from src.llm.openai_provider import OpenAIProvider
+            provider = OpenAIProvider(config=llm_config)
+            provider._client = instance
+
+            events = await _collect(provider.chat_stream(
+                messages=[{"role": "user", "content": "weather?"}],
+                tools=[{"type": "function", "function": {"name": "get_weather"}}],
+            ))
+
+        assert [e["text"] for e in events if e["type"] == "text"] == ["Let me ", "check."]
+        final = events[-1]["response"]
+        assert final["content"] == "Let me check."
+        assert final["finish_reason"] == "tool_calls"
+        assert [tc["id"] for tc in final["tool_calls"]] == ["call_1", "call_2"]
+        assert json.loads(final["tool_calls"][0]["function"]["arguments"]) == {"location": "NYC"}
+        assert final["tool_calls"][1]["function"]["arguments"] == "{}"
+        assert instance.chat.completions.create.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_openai_stream_truncates_history_on_context_overflow(self, llm_config):
+        import httpx
+        from openai import BadRequestError
+
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        overflow = BadRequestError(
+            "This model's maximum context length is 128000 tokens",
+            response=httpx.Response(400, request=request),
+            body={"code": "context_length_exceeded"},
+        )
+        messages = [{"role": "system", "content": "sys"}] + [
+            {"role": "user", "content": f"turn {i}"} for i in range(4)
+        ]
+
+        with patch("src.llm.openai_provider.AsyncOpenAI") as MockClient:
+            instance = MockClient.return_value
+            instance.chat.completions.create = AsyncMock(
+                side_effect=[overflow, _FakeStream([_openai_chunk(content="ok")])]
+            )
+
+            from src.llm.openai_provider import OpenAIProvider
+            provider = OpenAIProvider(config=llm_config)
+            provider._client = instance
+
+            events = await _collect(provider.chat_stream(messages=messages))
+
+        assert events[-1]["response"]["content"] == "ok"
+        retried = instance.chat.completions.create.call_args.kwargs["messages"]
+        assert [m["content"] for m in retried] == ["sys", "turn 2", "turn 3"]
+
+    @pytest.mark.asyncio
+    async def test_anthropic_stream_text_and_tool_use(self, llm_config):
+        text_block = MagicMock()
+        text_block.type = "text"
+        tool_block = MagicMock()
+        tool_block.type = "tool_use"
+        tool_block.id = "toolu_1"
+        tool_block.name = "get_weather"
+
+        def delta(kind: str, **fields: Any) -> MagicMock:
+            d = MagicMock()
+            d.type = kind
+            for key, value in fields.items():
+                setattr(d, key, value)
+            return d
+
+        events_in = [
+            _event("message_start", message=MagicMock()),
+            _event("content_block_start", index=0, content_block=text_block),
+            _event("content_block_delta", index=0, delta=delta("text_delta", text="On it")),
+            _event("content_block_stop", index=0),
+            _event("content_block_start", index=1, content_block=tool_block),
+            _event("content_block_delta", index=1, delta=delta("input_json_delta", partial_json='{"location"')),
+            _event("content_block_delta", index=1, delta=delta("input_json_delta", partial_json=': "NYC"}')),
+            _event("content_block_stop", index=1),
+            _event("message_delta", delta=delta("message_delta", stop_reason="tool_use"), usage=MagicMock()),
+            _event("message_stop"),
+        ]
+
+        with patch("src.llm.anthropic_provider.anthropic") as mock_anthropic:
+            mock_client = MagicMock()
+            mock_client.messages.create = AsyncMock(return_value=_FakeStream(events_in))
+            mock_anthropic.AsyncAnthropic.return_value = mock_client
+
+            from src.llm.anthropic_provider import AnthropicProvider
+            provider = AnthropicProvider(config=llm_config, api_key="sk-ant-test")
+            provider._client = mock_client
+
+            events = await _collect(provider.chat_stream(messages=[{"role": "user", "content": "hi"}]))
+
+        assert events[0] == {"type": "text", "text": "On it"}
+        final = events[-1]["response"]
+        assert final["content"] == "On it"
+        assert final["finish_reason"] == "tool_use"
+        assert final["tool_calls"][0]["id"] == "toolu_1"
+        assert json.loads(final["tool_calls"][0]["function"]["arguments"]) == {"location": "NYC"}
+
+    @pytest.mark.asyncio
+    async def test_default_stream_replays_chat(self, llm_config, mock_chat_response):
+        from src.llm.provider import LLMProvider
+
+        class ChatOnly(LLMProvider):
+            async def chat(self, messages, tools=None, temperature=None, max_tokens=None):
+                return {"role": "assistant", "content": "whole", "tool_calls": [], "finish_reason": "stop"}
+
+            async def embed(self, text):
+                return []
+
+            async def close(self):
+                return None
+
+        events = await _collect(ChatOnly().chat_stream(messages=[]))
+
+        assert events[0] == {"type": "text", "text": "whole"}
+        assert events[1]["type"] == "done"
+        assert events[1]["response"]["content"] == "whole"
+
+    @pytest.mark.asyncio
+    async def test_manager_falls_back_before_first_event(self):
+        from src.llm.llm_manager import LLMManager
+        from src.llm.streaming import done_event, text_event
+
+        async def broken_stream(**kwargs):
+            raise RuntimeError("API down")
+            yield  # pragma: no cover
+
+        async def working_stream(**kwargs):
+            yield text_event("hi")
+            yield done_event({"role": "assistant", "content": "hi", "tool_calls": [], "finish_reason": "stop"})
+
+        p_broken = AsyncMock()
+        p_broken.chat_stream = broken_stream
+        p_working = AsyncMock()
+        p_working.chat_stream = working_stream
+
+        manager = LLMManager(providers={"openai": p_broken, "groq": p_working}, default="openai")
+        events = await _collect(manager.chat_stream(messages=[{"role": "user", "content": "hi"}]))
+
+        assert events[0] == {"type": "text", "text": "hi"}
+        assert events[-1]["response"]["content"] == "hi"
+
+    @pytest.mark.asyncio
+    async def test_manager_does_not_fall_back_mid_stream(self):
+        from src.llm.llm_manager import LLMManager
+        from src.llm.streaming import text_event
+
+        async def flaky_stream(**kwargs):
+            yield text_event("partial")
+            raise RuntimeError("connection reset")
+
+        p_flaky = AsyncMock()
+        p_flaky.chat_stream = flaky_stream
+        p_other = AsyncMock()
+
+        manager = LLMManager(providers={"openai": p_flaky, "groq": p_other}, default="openai")
+
+        with pytest.raises(RuntimeError, match="connection reset"):
+            await _collect(manager.chat_stream(messages=[{"role": "user", "content": "hi"}]))
+
+
 # ---------------------------------------------------------------------------
 # Config: new provider fields
 # ---------------------------------------------------------------------------
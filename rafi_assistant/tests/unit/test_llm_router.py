@@ -0,0 +1,192 @@
+"""Tests for src/llm/router.py and adaptive routing in LLMManager.
+
+Covers:
+- The default provider is kept until others are measured, and within the switch margin
+- The fastest measured provider wins; failures count against it
+- A provider with no successful calls ranks last, never "fastest"
+- Tool support and context window exclude providers
+- On the voice path providers over the p95 SLO are avoided
+- Under-sampled providers are explored every Nth decision
+- LLMManager routes in adaptive mode and only records decisions in shadow mode
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.llm.llm_manager import LLMManager
+from src.llm.router import AdaptiveRouter, ProviderStats, voice_request
+
+MESSAGES = [{"role": "user", "content": "what's on my calendar?"}]
+
+
+class NoToolsProvider(AsyncMock):
+    SUPPORTS_TOOLS = False
+
+
+class SmallContextProvider(AsyncMock):
+    CONTEXT_WINDOW = 1000
+
+
+def _router(*names: str, **kwargs: Any) -> AdaptiveRouter:
+    options = {"min_samples": 3, "explore_every": 1000, "switch_margin": 0.2}
+    options.update(kwargs)
+    return AdaptiveRouter({name: AsyncMock() for name in names}, **options)
+
+
+def _measure(router: AdaptiveRouter, name: str, *latencies: float, ok: bool = True) -> None:
+    for ms in latencies:
+        router.record(name, ok, ms, {"content": "", "usage": {"completion_tokens": 100}})
+
+
+def test_provider_stats():
+    stats = ProviderStats(window=10)
+    stats.record(True, 1000, 100)
+    stats.record(True, 3000, 300)
+    stats.record(False, 0)
+
+    assert stats.p50_ms() == 1000
+    assert stats.p95_ms() == 3000
+    assert stats.tokens_per_second() == 100.0
+    assert stats.failure_rate() == pytest.approx(1 / 3)
+
+
+def test_default_kept_until_measured():
+    router = _router("openai", "groq")
+    _measure(router, "groq", 100, 100, 100)
+
+    assert router.choose(["openai", "groq"], "openai", MESSAGES) == ("openai", "default")
+
+
+def test_fastest_measured_provider_wins():
+    router = _router("openai", "groq")
+    _measure(router, "openai", 2000, 2000, 2000)
+    _measure(router, "groq", 500, 500, 500)
+
+    assert router.choose(["openai", "groq"], "openai", MESSAGES) == ("groq", "fastest")
+    assert router.stats()["picks"]["groq"] == 1
+
+
+def test_default_kept_within_margin():
+    router = _router("openai", "groq")
+    _measure(router, "openai", 1000, 1000, 1000)
+    _measure(router, "groq", 900, 900, 900)
+
+    assert router.choose(["openai", "groq"], "openai", MESSAGES)[0] == "openai"
+
+
+def test_failures_count_against_provider():
+    router = _router("openai", "groq")
+    _measure(router, "openai", 1000, 1000, 1000)
+    _measure(router, "groq", 500, 500, 500)
+    _measure(router, "groq", 0, 0, ok=False)
+
+    assert router.choose(["openai", "groq"], "openai", MESSAGES)[0] == "openai"
+
+
+def test_provider_without_successes_ranks_last():
+    router = _router("openai", "groq")
+    _measure(router, "openai", *[800] * 10)
+    _measure(router, "groq", *[0] * 10, ok=False)
+
+    assert router.choose(["openai", "groq"], "groq", MESSAGES) == ("openai", "fastest")
+    assert router.choose(["openai", "groq"], "openai", MESSAGES) == ("openai", "fastest")
+    with voice_request():
+        assert router.choose(["openai", "groq"], "groq", MESSAGES)[0] == "openai"
+
+
+def test_constraints_exclude_providers():
+    router = AdaptiveRouter(
+        {"openai": AsyncMock(), "plain": NoToolsProvider(), "small": SmallContextProvider()},
+        min_samples=1,
+        output_reserve_tokens=500,
+    )
+    _measure(router, "openai", 2000)
+    _measure(router, "plain", 100)
+    _measure(router, "small", 200)
+    tools = [{"type": "function", "function": {"name": "x", "parameters": {}}}]
+    long_prompt = [{"role": "user", "content": "word " * 2000}]
+
+    assert router.choose(["openai", "plain", "small"], "openai", MESSAGES, tools=tools)[0] == "small"
+    assert router.choose(["openai", "plain", "small"], "openai", long_prompt)[0] == "plain"
+    assert router.choose(["plain"], "plain", long_prompt, tools=tools) == ("plain", "no fit")
+
+
+def test_voice_path_avoids_providers_over_slo():
+    router = _router("openai", "groq", voice_slo_ms=2500)
+    # groq: fast median, slow tail
+    _measure(router, "groq", 300, 300, 300, 300, 6000)
+    _measure(router, "openai", 1200, 1200, 1200, 1200, 1500)
+
+    assert router.choose(["openai", "groq"], "groq", MESSAGES)[0] == "groq"
+    with voice_request():
+        assert router.choose(["openai", "groq"], "groq", MESSAGES) == ("openai", "fastest")
+
+
+def test_under_sampled_providers_explored():
+    router = _router("openai", "gemini", explore_every=3)
+    _measure(router, "openai", 1000, 1000, 1000)
+
+    picks = [router.choose(["openai", "gemini"], "openai", MESSAGES) for _ in range(3)]
+
+    assert picks[2] == ("gemini", "explore")
+    assert [p[0] for p in picks[:2]] == ["openai", "openai"]
+    assert router.stats()["explored"] == 1
+
+
+def _provider(content: str) -> AsyncMock:
+    provider = AsyncMock()
+    provider.chat.return_value = {
+        "role": "assistant",
+        "content": content,
+        "tool_calls": [],
+        "usage": {"completion_tokens": 10},
+    }
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_manager_adaptive_mode_routes_to_faster_provider():
+    openai, groq = _provider("openai"), _provider("groq")
+    manager = LLMManager(
+        providers={"openai": openai, "groq": groq},
+        default="openai",
+        routing_mode="adaptive",
+        router_options={"min_samples": 1, "explore_every": 1000},
+    )
+    manager._router.record("openai", True, 3000)
+    manager._router.record("groq", True, 400)
+
+    result = await manager.chat(MESSAGES)
+
+    assert result["content"] == "groq"
+    openai.chat.assert_not_awaited()
+    assert manager.router_stats["providers"]["groq"]["samples"] == 2
+
+
+@pytest.mark.asyncio
+async def test_manager_shadow_mode_keeps_traffic_on_active():
+    openai, groq = _provider("openai"), _provider("groq")
+    manager = LLMManager(
+        providers={"openai": openai, "groq": groq},
+        default="openai",
+        routing_mode="shadow",
+        router_options={"min_samples": 1, "explore_every": 1000},
+    )
+    manager._router.record("openai", True, 3000)
+    manager._router.record("groq", True, 400)
+
+    result = await manager.chat(MESSAGES)
+
+    assert result["content"] == "openai"
+    stats = manager.router_stats
+    assert stats["shadow_disagree"] == 1 and stats["picks"]["groq"] == 1
+    assert manager.context_token_budget == manager._budget_for("openai")
+
+
+def test_manager_rejects_unknown_routing_mode():
+    with pytest.raises(ValueError):
+        LLMManager(providers={"openai": AsyncMock()}, default="openai", routing_mode="cost")
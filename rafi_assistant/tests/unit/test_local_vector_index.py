@@ -0,0 +1,226 @@
+"""Tests for src/services/local_vector_index.py — in-process vector search.
+
+Uses small vectors in a temporary directory. Covers:
+- Added rows are searchable, best first, and persist across load()
+- Duplicate ids, missing and mis-sized embeddings are skipped
+- pgvector text embeddings are parsed
+- A torn append is trimmed on load
+- rebuild() replaces the index from a paged export and keeps concurrent adds
+- A failed export keeps the old files and leaves the index needing a rebuild
+- remove() rewrites the files without the given rows, also during a rebuild
+- MemoryService uses the index as primary or as a fallback, and mirrors stores
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.local_vector_index import META_FILE, VECTORS_FILE, LocalVectorIndex
+from src.services.memory_service import MemoryService
+
+
+def _row(row_id: str, embedding: Any, content: str = "hi") -> dict[str, Any]:
+    return {
+        "id": row_id,
+        "role": "user",
+        "content": content,
+        "source": "telegram_text",
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "embedding": embedding,
+    }
+
+
+@pytest.fixture
+def index(tmp_path) -> LocalVectorIndex:
+    idx = LocalVectorIndex(tmp_path, dim=3)
+    idx.load()
+    return idx
+
+
+def test_search_ranks_by_cosine(index, tmp_path):
+    added = index.add([
+        _row("a", [1, 0, 0]),
+        _row("b", [0.7, 0.7, 0]),
+        _row("c", "[0, 0, 2]"),
+    ])
+
+    results = index.search([1, 0.1, 0], limit=2)
+
+    assert added == 3
+    assert [r["id"] for r in results] == ["a", "b"]
+    assert results[0]["similarity"] == pytest.approx(0.995, abs=1e-3)
+    assert "embedding" not in results[0]
+
+    reloaded = LocalVectorIndex(tmp_path, dim=3)
+    reloaded.load()
+    assert reloaded.count == 3
+    assert reloaded.search([0, 0, 1], limit=1)[0]["id"] == "c"
+
+
+def test_invalid_and_duplicate_rows_skipped(index):
+    index.add([_row("a", [1, 0, 0])])
+
+    added = index.add([
+        _row("a", [0, 1, 0]),
+        _row("b", None),
+        _row("c", [1, 0]),
+        _row("d", [0, 0, 0]),
+    ])
+
+    assert added == 0
+    assert index.count == 1
+
+
+def test_min_score_filters(index):
+    index.add([_row("a", [1, 0, 0]), _row("b", [0, 1, 0])])
+
+    results = index.search([1, 0, 0], limit=5, min_score=0.5)
+
+    assert [r["id"] for r in results] == ["a"]
+
+
+def test_torn_append_trimmed_on_load(index, tmp_path):
+    index.add([_row("a", [1, 0, 0]), _row("b", [0, 1, 0])])
+    # Simulate a crash after the vector write but before the metadata write
+    with (tmp_path / VECTORS_FILE).open("ab") as f:
+        f.write(b"\0" * 12)
+    with (tmp_path / META_FILE).open("a") as f:
+        f.write('{"id": "c", "cont')
+
+    reloaded = LocalVectorIndex(tmp_path, dim=3)
+    reloaded.load()
+
+    assert reloaded.count == 2
+    assert (tmp_path / VECTORS_FILE).stat().st_size == 2 * 3 * 4
+    assert reloaded.search([0, 1, 0], limit=1)[0]["id"] == "b"
+
+
+@pytest.mark.asyncio
+async def test_rebuild_replaces_index_and_keeps_concurrent_adds(index, tmp_path):
+    index.add([_row("stale", [1, 0, 0])])
+
+    async def select_iter(*args: Any, **kwargs: Any):
+        yield [_row("a", [1, 0, 0]), _row("b", "[0, 1, 0]")]
+        # A message stored while the export is running
+        index.add([_row("new", [0, 0, 1])])
+        yield [_row("c", [0.5, 0.5, 0])]
+
+    db = MagicMock()
+    db.select_iter = MagicMock(side_effect=select_iter)
+
+    count = await index.rebuild(db)
+
+    assert count == 4
+    assert db.select_iter.call_args.kwargs["filters"] == {"embedding__isnull": False}
+    ids = {r["id"] for r in index.search([1, 1, 1], limit=10)}
+    assert ids == {"a", "b", "c", "new"}
+    assert not index.rebuilding
+    assert index.stats()["rows"] == 4
+    assert db.select_iter.call_args.kwargs["raise_on_error"] is True
+    reloaded = LocalVectorIndex(tmp_path, dim=3)
+    reloaded.load()
+    assert not reloaded.needs_rebuild
+
+
+@pytest.mark.asyncio
+async def test_failed_export_keeps_old_files(index, tmp_path):
+    index.add([_row("old", [1, 0, 0])])
+    assert index.needs_rebuild
+
+    async def select_iter(*args: Any, **kwargs: Any):
+        yield [_row("a", [0, 1, 0])]
+        raise ConnectionError("page 2 failed")
+
+    db = MagicMock()
+    db.select_iter = MagicMock(side_effect=select_iter)
+
+    with pytest.raises(ConnectionError):
+        await index.rebuild(db)
+
+    assert not index.rebuilding
+    assert [r["id"] for r in index.search([1, 1, 1], limit=10)] == ["old"]
+    assert not list(tmp_path.glob("*.tmp"))
+    reloaded = LocalVectorIndex(tmp_path, dim=3)
+    reloaded.load()
+    assert reloaded.count == 1
+    assert reloaded.needs_rebuild
+
+
+@pytest.mark.asyncio
+async def test_memory_service_primary_mode_skips_rpc(index):
+    index.add([_row("a", [1, 0, 0])])
+    db = MagicMock()
+    db.rpc = AsyncMock(return_value=[])
+    svc = MemoryService(db=db, llm=MagicMock())
+    svc.set_local_index(index, "primary")
+
+    results = await svc.search_memory("hi", query_embedding=[1, 0, 0])
+
+    assert [r["id"] for r in results] == ["a"]
+    db.rpc.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_memory_service_fallback_when_database_unreachable(index):
+    index.add([_row("a", [1, 0, 0])])
+    db = MagicMock()
+    db.rpc = AsyncMock(return_value=None)
+    db.embedding_search = AsyncMock(return_value=[])
+    svc = MemoryService(db=db, llm=MagicMock())
+    svc.set_local_index(index, "fallback")
+
+    results = await svc.search_memory("hi", query_embedding=[1, 0, 0])
+
+    assert [r["id"] for r in results] == ["a"]
+    db.rpc.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_memory_service_mirrors_stored_messages(index):
+    db = MagicMock()
+    db.insert = AsyncMock(return_value={"id": "m1", "role": "user", "content": "hi"})
+    db.insert_many = AsyncMock(
+        side_effect=lambda table, rows: {"rows": list(rows), "failed": []}
+    )
+    svc = MemoryService(db=db, llm=MagicMock())
+    svc.set_local_index(index)
+
+    await svc.store_message("user", "hi", embedding=[1, 0, 0])
+    row = svc.prepare_message("assistant", "hello", embedding=[0, 1, 0])
+    await svc.store_messages([row])
+
+    assert index.count == 2
+    assert index.search([0, 1, 0], limit=1)[0]["id"] == row["id"]
+
+
+def test_remove_rewrites_index_without_rows(index, tmp_path):
+    index.add([_row("a", [1, 0, 0]), _row("b", [0, 1, 0]), _row("c", [0, 0, 1])])
+
+    removed = index.remove(["b", "missing"])
+
+    assert removed == 1
+    assert {r["id"] for r in index.search([1, 1, 1], limit=10)} == {"a", "c"}
+    reloaded = LocalVectorIndex(tmp_path, dim=3)
+    reloaded.load()
+    assert reloaded.count == 2
+    assert reloaded.search([0, 0, 1], limit=1)[0]["id"] == "c"
+    # Removed ids can be indexed again
+    assert index.add([_row("b", [0, 1, 0])]) == 1
+
+
+@pytest.mark.asyncio
+async def test_removal_during_rebuild_applies_after_swap(index):
+    async def select_iter(*args: Any, **kwargs: Any):
+        yield [_row("a", [1, 0, 0]), _row("b", [0, 1, 0])]
+        # Archived after the export read it
+        index.remove(["b"])
+
+    db = MagicMock()
+    db.select_iter = MagicMock(side_effect=select_iter)
+
+    await index.rebuild(db)
+
+    assert {r["id"] for r in index.search([1, 1, 1], limit=10)} == {"a"}
@@ -0,0 +1,248 @@
+"""Tests for src/services/mailbox_cache.py and EmailService mailbox sync.
+
+Gmail and database calls are mocked. Covers:
+- Gmail queries translate to cache filters, or None for unsupported syntax
+- A first sync copies recent mail and stores the history id
+- Later syncs apply history.list deltas: adds, deletes, label changes (one
+  bulk upsert), spam
+- An expired history id (404) falls back to a full sync
+- Reads and simple searches with a full page of matches are served from
+  the cache; shorter searches and unread counts go to Gmail
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from src.services.email_service import EmailService
+from src.services.mailbox_cache import (
+    SEARCH_LIMIT,
+    MailboxCache,
+    email_from_row,
+    email_row,
+    parse_query,
+)
+from tests.unit.test_email_service import _build_gmail_message, _mock_gmail_service
+
+
+def test_parse_query_supported_operators():
+    assert parse_query('from:alice subject:"Q3 plan" budget is:unread') == {
+        "sender__ilike": "%alice%",
+        "subject__ilike": "%Q3 plan%",
+        "is_unread": True,
+        "search_tsv__search": "budget",
+    }
+    assert parse_query("to:bob_smith") == {"recipient__ilike": "%bob\\_smith%"}
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["has:attachment", "after:2026/01/01 invoice", "-from:alice", "a OR b", "", 'subject:"open'],
+)
+def test_parse_query_unsupported_returns_none(query):
+    assert parse_query(query) is None
+
+
+def test_row_round_trip():
+    email = {
+        "id": "m1",
+        "from": "a@example.com",
+        "to": "b@example.com",
+        "subject": "Hi",
+        "date": "Mon",
+        "snippet": "s",
+        "body": "b",
+        "labels": ["INBOX", "UNREAD"],
+        "thread_id": "t1",
+        "internal_date": "2026-01-01T00:00:00+00:00",
+    }
+
+    row = email_row(email, "2026-01-02T00:00:00+00:00")
+
+    assert row["is_unread"] is True
+    assert email_from_row(row) == email
+
+
+def _db(
+    state: list[dict[str, Any]] | None = None,
+    cached_ids: list[str] | None = None,
+    rows: list[dict[str, Any]] | None = None,
+) -> MagicMock:
+    db = MagicMock()
+
+    async def select(table: str, columns: str = "*", filters: Any = None, **kwargs: Any):
+        if table == "sync_state":
+            return state or []
+        if columns == "id" and filters and "id__in" in filters:
+            return [{"id": i} for i in cached_ids or [] if i in filters["id__in"]]
+        return rows or []
+
+    db.select = AsyncMock(side_effect=select)
+    db.upsert = AsyncMock(return_value={})
+    db.upsert_many = AsyncMock(side_effect=lambda table, rows, on_conflict: {"rows": rows, "failed": []})
+    db.update = AsyncMock(return_value={})
+    db.delete = AsyncMock(return_value=True)
+    return db
+
+
+def _service(*messages: dict[str, Any], history: list[Any] | None = None) -> MagicMock:
+    service = _mock_gmail_service(list(messages))
+    users = service.users.return_value
+    users.getProfile.return_value.execute.return_value = {"historyId": "100"}
+    if history is not None:
+        users.history.return_value.list.return_value.execute.side_effect = history
+    return service
+
+
+def _email_service(mock_config, db: MagicMock, service: MagicMock) -> EmailService:
+    svc = EmailService(config=mock_config, db=db, mailbox=MailboxCache(db))
+    svc._service = service
+    return svc
+
+
+@pytest.mark.asyncio
+async def test_first_sync_copies_mail_and_stores_history_id(mock_config):
+    db = _db()
+    service = _service(_build_gmail_message("m1"), _build_gmail_message("m2"))
+    svc = _email_service(mock_config, db, service)
+
+    result = await svc.sync()
+
+    assert result == {"full": True, "stored": 2, "relabeled": 0, "removed": 0}
+    _, rows = db.upsert_many.await_args.args
+    assert [r["id"] for r in rows] == ["m1", "m2"]
+    assert rows[0]["body"] and rows[0]["is_unread"] is True
+    assert rows[0]["internal_date"].startswith("2024-06-16")
+    # Rows the full sync did not rewrite are dropped
+    assert "synced_at__lt" in db.delete.await_args.args[1]
+    state = db.upsert.await_args.args[1]
+    assert (state["source"], state["cursor"]) == ("gmail", "100")
+
+
+@pytest.mark.asyncio
+async def test_history_sync_applies_deltas(mock_config):
+    db = _db(state=[{"source": "gmail", "cursor": "100"}], cached_ids=["old", "read"])
+    spam = _build_gmail_message("spam")
+    spam["labelIds"] = ["SPAM"]
+    read = _build_gmail_message("read")
+    read["labelIds"] = ["INBOX"]
+    service = _service(
+        _build_gmail_message("new"),
+        spam,
+        read,
+        history=[
+            {
+                "history": [
+                    {"messagesAdded": [{"message": {"id": "new"}}, {"message": {"id": "spam"}}]},
+                    {"labelsRemoved": [{"message": {"id": "read"}, "labelIds": ["UNREAD"]}]},
+                ],
+                "nextPageToken": "p2",
+                "historyId": "105",
+            },
+            {
+                "history": [{"messagesDeleted": [{"message": {"id": "old"}}]}],
+                "historyId": "110",
+            },
+        ],
+    )
+    svc = _email_service(mock_config, db, service)
+
+    result = await svc.sync()
+
+    assert result == {"full": False, "stored": 1, "relabeled": 1, "removed": 2}
+    history_calls = service.users.return_value.history.return_value.list.call_args_list
+    assert history_calls[0].kwargs["startHistoryId"] == "100"
+    assert history_calls[1].kwargs["pageToken"] == "p2"
+    (relabel_call, store_call) = db.upsert_many.await_args_list
+    assert relabel_call.args == (
+        "email_cache", [{"id": "read", "labels": ["INBOX"], "is_unread": False}]
+    )
+    assert [r["id"] for r in store_call.args[1]] == ["new"]
+    db.update.assert_not_awaited()
+    db.delete.assert_awaited_once_with("email_cache", {"id__in": ["old", "spam"]})
+    assert db.upsert.await_args.args[1]["cursor"] == "110"
+
+
+@pytest.mark.asyncio
+async def test_expired_history_id_triggers_full_sync(mock_config):
+    db = _db(state=[{"source": "gmail", "cursor": "1"}])
+    service = _service(
+        _build_gmail_message("m1"),
+        history=[HttpError(MagicMock(status=404), b"not found")],
+    )
+    svc = _email_service(mock_config, db, service)
+
+    result = await svc.sync()
+
+    assert result["full"] is True
+    assert db.upsert.await_args.args[1]["cursor"] == "100"
+
+
+@pytest.mark.asyncio
+async def test_reads_served_from_fresh_cache(mock_config):
+    rows = [{"id": f"c{i}", "sender": "alice@example.com"} for i in range(SEARCH_LIMIT)]
+    db = _db(rows=rows)
+    service = _service(_build_gmail_message("m1"))
+    svc = _email_service(mock_config, db, service)
+    await svc.sync()
+    messages = service.users.return_value.messages.return_value
+    list_calls = messages.list.call_count
+
+    await svc.list_emails(count=5, unread_only=True, message_format="metadata")
+    results = await svc.search_emails("from:alice budget")
+
+    assert len(results) == SEARCH_LIMIT
+    assert messages.list.call_count == list_calls
+    selects = [c for c in db.select.await_args_list if c.args[0] == "email_cache"]
+    assert selects[0].kwargs["filters"] == {"is_unread": True}
+    assert "body" not in selects[0].kwargs["columns"]
+    assert selects[1].kwargs["filters"] == {
+        "sender__ilike": "%alice%",
+        "search_tsv__search": "budget",
+    }
+
+
+@pytest.mark.asyncio
+async def test_short_local_search_falls_back_to_gmail(mock_config):
+    # The cache holds only recent mail; an older match is Gmail-only
+    db = _db()
+    service = _service(_build_gmail_message("old-invoice"))
+    svc = _email_service(mock_config, db, service)
+    await svc.sync()
+
+    results = await svc.search_emails("from:alice invoice")
+
+    assert [e["id"] for e in results] == ["old-invoice"]
+    list_call = service.users.return_value.messages.return_value.list.call_args
+    assert list_call.kwargs["q"] == "from:alice invoice"
+    assert svc.stats()["remote_searches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unread_count_asks_gmail(mock_config):
+    db = _db()
+    service = _service(_build_gmail_message("m1"))
+    service.users.return_value.messages.return_value.list.return_value.execute.return_value = {
+        "resultSizeEstimate": 731,
+    }
+    svc = _email_service(mock_config, db, service)
+
+    assert await svc.get_unread_count() == 731
+
+
+@pytest.mark.asyncio
+async def test_unsupported_search_goes_to_gmail(mock_config):
+    db = _db()
+    service = _service(_build_gmail_message("m1"))
+    svc = _email_service(mock_config, db, service)
+    await svc.sync()
+
+    results = await svc.search_emails("has:attachment")
+
+    assert [e["id"] for e in results] == ["m1"]
+    assert service.users.return_value.messages.return_value.list.call_args.kwargs["q"] == "has:attachment"
+    assert svc.stats()["remote_searches"] == 1
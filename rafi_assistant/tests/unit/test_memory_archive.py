@@ -0,0 +1,263 @@
+"""Tests for src/services/memory_archive.py — tiered memory.
+
+Database and LLM calls are mocked. Covers:
+- The cutoff is a local midnight, retention days back
+- Old messages are summarized per day and moved to the archive
+- A day whose summary fails stays hot; existing summaries are reused
+- A day with no topics is archived without a summary
+- max_days_per_run bounds the work per run; failed days have their own budget
+- Archived messages are removed from the local vector index
+- Summary search and drill-down results
+- MemoryService merges summaries into search and drills down on request
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.memory_archive import MemoryArchive, _parse_topics
+from src.services.memory_service import MemoryService
+
+
+def _msg(msg_id: str, created_at: str, content: str = "hi") -> dict[str, Any]:
+    return {"id": msg_id, "role": "user", "content": content, "created_at": created_at}
+
+
+def _pages(*pages: list[dict[str, Any]]):
+    async def select_iter(*args: Any, **kwargs: Any):
+        for page in pages:
+            yield page
+
+    return MagicMock(side_effect=select_iter)
+
+
+def _db(*pages: list[dict[str, Any]]) -> MagicMock:
+    db = MagicMock()
+    db.select_iter = _pages(*pages)
+    db.select = AsyncMock(return_value=[])
+    db.insert_many = AsyncMock(
+        side_effect=lambda table, rows: {
+            "rows": [{**row, "id": f"s{i}"} for i, row in enumerate(rows)],
+            "failed": [],
+        }
+    )
+    db.delete = AsyncMock(return_value=True)
+
+    async def rpc(name: str, params: dict[str, Any]) -> Any:
+        if name == "archive_messages":
+            return [{"moved": len(params["message_ids"])}]
+        return []
+
+    db.rpc = AsyncMock(side_effect=rpc)
+    return db
+
+
+def _llm(topics: list[dict[str, str]] | None = None) -> MagicMock:
+    llm = MagicMock()
+    payload = {"topics": topics if topics is not None else [{"topic": "trip", "summary": "Planned Rome."}]}
+    llm.chat = AsyncMock(return_value={"content": json.dumps(payload)})
+    llm.embed_many = AsyncMock(side_effect=lambda texts: [[0.1] * 3 for _ in texts])
+    return llm
+
+
+def test_cutoff_is_local_midnight():
+    archive = MemoryArchive(MagicMock(), MagicMock(), archive_after_days=30, timezone_name="America/New_York")
+
+    cutoff = archive.cutoff(datetime(2026, 3, 31, 2, 0, tzinfo=timezone.utc))
+
+    # 02:00 UTC on the 31st is still the 30th in New York
+    assert cutoff.isoformat() == "2026-02-28T00:00:00-05:00"
+
+
+def test_parse_topics_tolerates_prose_and_caps():
+    text = 'Sure! {"topics": [{"topic": "a", "summary": "x"}, {"summary": ""}, {"summary": "y"}]}'
+
+    assert _parse_topics(text, max_topics=5) == [
+        {"topic": "a", "summary": "x"},
+        {"topic": "general", "summary": "y"},
+    ]
+    assert _parse_topics('{"topics": []}', max_topics=5) == []
+    assert _parse_topics("no json", max_topics=5) is None
+
+
+@pytest.mark.asyncio
+async def test_run_summarizes_and_archives_each_day():
+    db = _db(
+        [_msg("m1", "2026-01-01T10:00:00+00:00"), _msg("m2", "2026-01-01T11:00:00+00:00")],
+        [_msg("m3", "2026-01-02T09:00:00+00:00")],
+    )
+    llm = _llm()
+    archive = MemoryArchive(db, llm, archive_after_days=30)
+
+    result = await archive.run(now=datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+    assert result == {"days": 2, "summaries": 2, "messages": 3}
+    assert db.select_iter.call_args.kwargs["filters"] == {
+        "created_at__lt": "2026-01-30T00:00:00+00:00"
+    }
+    summary_rows = db.insert_many.await_args_list[0].args[1]
+    assert summary_rows[0]["day"] == "2026-01-01"
+    assert summary_rows[0]["message_count"] == 2
+    assert summary_rows[0]["first_message_at"] == "2026-01-01T10:00:00+00:00"
+    assert summary_rows[0]["last_message_at"] == "2026-01-01T11:00:00+00:00"
+    archived = [c.args[1]["message_ids"] for c in db.rpc.await_args_list]
+    assert archived == [["m1", "m2"], ["m3"]]
+    assert archive.stats()["messages_archived"] == 3
+
+
+@pytest.mark.asyncio
+async def test_archived_messages_removed_from_local_index():
+    db = _db([_msg("m1", "2026-01-01T10:00:00+00:00"), _msg("m2", "2026-01-02T10:00:00+00:00")])
+    index = MagicMock()
+    index.remove.return_value = 2
+    archive = MemoryArchive(db, _llm(), archive_after_days=30)
+    archive.set_local_index(index)
+
+    await archive.run(now=datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+    index.remove.assert_called_once_with(["m1", "m2"])
+
+
+@pytest.mark.asyncio
+async def test_failed_summary_leaves_day_hot():
+    db = _db([_msg("m1", "2026-01-01T10:00:00+00:00")])
+    llm = _llm()
+    llm.chat = AsyncMock(return_value={"content": "Sorry, I can't help with that."})
+    archive = MemoryArchive(db, llm, archive_after_days=30)
+
+    result = await archive.run(now=datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+    assert result["days"] == 0
+    db.rpc.assert_not_awaited()
+    assert archive.stats()["days_failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_day_without_topics_is_archived():
+    db = _db([_msg("m1", "2026-01-01T10:00:00+00:00", "thanks!")])
+    archive = MemoryArchive(db, _llm(topics=[]), archive_after_days=30)
+
+    result = await archive.run(now=datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+    assert result == {"days": 1, "summaries": 0, "messages": 1}
+    db.insert_many.assert_not_awaited()
+    assert archive.stats()["days_without_topics"] == 1
+
+
+@pytest.mark.asyncio
+async def test_partial_summary_insert_is_rolled_back():
+    db = _db([_msg("m1", "2026-01-01T10:00:00+00:00")])
+    db.insert_many = AsyncMock(return_value={
+        "rows": [{"id": "s0"}],
+        "failed": [{"index": 1, "row": {}, "error": "bad"}],
+    })
+    llm = _llm(topics=[{"topic": "a", "summary": "x"}, {"topic": "b", "summary": "y"}])
+    archive = MemoryArchive(db, llm, archive_after_days=30)
+
+    result = await archive.run(now=datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+    assert result["days"] == 0
+    db.delete.assert_awaited_once_with("memory_summaries", {"id__in": ["s0"]})
+    db.rpc.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_existing_summaries_reused():
+    db = _db([_msg("m1", "2026-01-01T10:00:00+00:00")])
+    db.select = AsyncMock(return_value=[{"id": "old"}])
+    llm = _llm()
+    archive = MemoryArchive(db, llm, archive_after_days=30)
+
+    result = await archive.run(now=datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+    assert result["messages"] == 1
+    llm.chat.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_max_days_per_run():
+    db = _db([
+        _msg("m1", "2026-01-01T10:00:00+00:00"),
+        _msg("m2", "2026-01-02T10:00:00+00:00"),
+        _msg("m3", "2026-01-03T10:00:00+00:00"),
+    ])
+    archive = MemoryArchive(db, _llm(), archive_after_days=30, max_days_per_run=2)
+
+    result = await archive.run(now=datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+    assert result["days"] == 2
+    archived = [c.args[1]["message_ids"] for c in db.rpc.await_args_list]
+    assert archived == [["m1"], ["m2"]]
+
+
+@pytest.mark.asyncio
+async def test_failed_days_do_not_use_archive_budget():
+    db = _db([
+        _msg("m1", "2026-01-01T10:00:00+00:00", "bad"),
+        _msg("m2", "2026-01-02T10:00:00+00:00"),
+        _msg("m3", "2026-01-03T10:00:00+00:00"),
+        _msg("m4", "2026-01-04T10:00:00+00:00"),
+    ])
+    llm = _llm()
+    good = llm.chat.return_value
+
+    async def chat(messages: list[dict[str, Any]], **kwargs: Any) -> dict[str, Any]:
+        return {"content": "no json"} if "] bad" in messages[0]["content"] else good
+
+    llm.chat = AsyncMock(side_effect=chat)
+    archive = MemoryArchive(db, llm, archive_after_days=30, max_days_per_run=2)
+
+    result = await archive.run(now=datetime(2026, 3, 1, tzinfo=timezone.utc))
+
+    assert result["days"] == 2
+    archived = [c.args[1]["message_ids"] for c in db.rpc.await_args_list]
+    assert archived == [["m2"], ["m3"]]
+    assert archive.stats()["days_failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_summaries_and_drill_down():
+    db = MagicMock()
+    summary_row = {
+        "id": "s1",
+        "day": "2026-01-01",
+        "topic": "trip",
+        "content": "Planned Rome.",
+        "first_message_at": "2026-01-01T10:00:00+00:00",
+        "last_message_at": "2026-01-01T11:00:00+00:00",
+        "similarity": 0.8,
+    }
+    db.rpc = AsyncMock(side_effect=[[summary_row], [{"id": "m1", "content": "Rome?", "similarity": 0.9}]])
+    archive = MemoryArchive(db, MagicMock())
+
+    hits = await archive.search_summaries([0.1], limit=3)
+    detail = await archive.drill_down(hits[0], [0.1], limit=3)
+
+    assert hits[0]["tier"] == "summary"
+    assert hits[0]["content"].startswith("(Summary of conversation on 2026-01-01, trip)")
+    assert detail == [{"id": "m1", "content": "Rome?", "similarity": 0.9, "tier": "archive"}]
+    params = db.rpc.await_args_list[1].args[1]
+    assert params["range_start"] == "2026-01-01T10:00:00+00:00"
+    assert params["range_end"] == "2026-01-01T11:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_memory_service_merges_summaries_by_similarity():
+    db = MagicMock()
+    db.rpc = AsyncMock(return_value=[{"id": "h1", "content": "hot", "similarity": 0.5}])
+    archive = MagicMock()
+    archive.search_summaries = AsyncMock(return_value=[{"id": "s1", "similarity": 0.7, "tier": "summary"}])
+    archive.drill_down = AsyncMock(return_value=[{"id": "a1", "similarity": 0.9, "tier": "archive"}])
+    svc = MemoryService(db=db, llm=MagicMock())
+    svc.set_archive(archive)
+
+    results = await svc.search_memory("rome", limit=5, query_embedding=[0.1])
+    detailed = await svc.search_memory("rome", limit=5, query_embedding=[0.1], drill_down=True)
+
+    assert [r["id"] for r in results] == ["s1", "h1"]
+    assert [r["id"] for r in detailed] == ["a1", "h1"]
@@ -0,0 +1,106 @@
+"""Tests for src/services/memory_files.py — markdown memory file cache.
+
+Covers:
+- Unchanged files are served from cache without re-reading
+- External edits are picked up via mtime/size
+- _write_file refreshes the cache and bumps the version
+- build_system_prompt is cached until a file changes
+- get_section_items parses bullet lines per section
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from src.services.memory_files import MemoryFileService
+
+
+def _touch_later(path: Path) -> None:
+    """Push a file's mtime forward so an edit is visible even on coarse clocks."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_unchanged_file_not_reread(tmp_path):
+    (tmp_path / "SOUL.md").write_text("calm", encoding="utf-8")
+    svc = MemoryFileService(memory_dir=tmp_path)
+
+    assert svc.load_soul() == "calm"
+    with patch.object(Path, "read_text", side_effect=AssertionError("re-read")):
+        assert svc.load_soul() == "calm"
+
+
+def test_external_edit_invalidates_cache(tmp_path):
+    soul = tmp_path / "SOUL.md"
+    soul.write_text("calm", encoding="utf-8")
+    svc = MemoryFileService(memory_dir=tmp_path)
+    assert svc.load_soul() == "calm"
+    version = svc.version
+
+    soul.write_text("cheerful", encoding="utf-8")
+    _touch_later(soul)
+
+    assert svc.load_soul() == "cheerful"
+    assert svc.version > version
+
+
+def test_deleted_file_returns_empty(tmp_path):
+    user = tmp_path / "USER.md"
+    user.write_text("likes tea", encoding="utf-8")
+    svc = MemoryFileService(memory_dir=tmp_path)
+    assert svc.load_user() == "likes tea"
+
+    user.unlink()
+
+    assert svc.load_user() == ""
+
+
+def test_write_file_refreshes_cache(tmp_path):
+    svc = MemoryFileService(memory_dir=tmp_path)
+    version = svc.version
+
+    assert svc.append_to_memory("Key Facts", "Has a dog")
+
+    assert "Has a dog" in svc.load_memory()
+    assert svc.version > version
+
+
+def test_system_prompt_cached_until_files_change(tmp_path):
+    (tmp_path / "SOUL.md").write_text("calm", encoding="utf-8")
+    svc = MemoryFileService(memory_dir=tmp_path)
+
+    first = svc.build_system_prompt(agent_name="Rafi", client_name="Sam")
+    assert svc.build_system_prompt(agent_name="Rafi", client_name="Sam") is first
+
+    svc.update_user_preference("coffee", "black")
+    updated = svc.build_system_prompt(agent_name="Rafi", client_name="Sam")
+
+    assert updated is not first
+    assert "**coffee**: black" in updated
+
+
+def test_system_prompt_rebuilt_for_different_config(tmp_path):
+    svc = MemoryFileService(memory_dir=tmp_path)
+
+    assert "for Sam" in svc.build_system_prompt(client_name="Sam")
+    assert "for Alex" in svc.build_system_prompt(client_name="Alex")
+
+
+def test_get_section_items(tmp_path):
+    (tmp_path / "MEMORY.md").write_text(
+        "# Memory\n\n"
+        "## Key Facts\n- Has a dog\n\n"
+        "## Behavioral Adjustments\n<!-- learned -->\n- Be brief\n- Confirm emails\n\n"
+        "## Ongoing Projects\n- Kitchen remodel\n",
+        encoding="utf-8",
+    )
+    svc = MemoryFileService(memory_dir=tmp_path)
+
+    assert svc.get_section_items("MEMORY.md", "Behavioral Adjustments") == [
+        "- Be brief",
+        "- Confirm emails",
+    ]
+    assert svc.get_section_items("MEMORY.md", "Missing") == []
+    assert svc.get_section_items("NOPE.md", "Key Facts") == []
@@ -5,6 +5,8 @@ All Supabase and OpenAI calls are mocked.  Covers:
 - search_memory returns ranked results
 - get_recent_messages returns correct count
 - Handles empty history
+- RRF search mode and the full-text fallback
+- prepare_message / store_messages batch writes and pending-row overlay
 """
 
 from __future__ import annotations
@@ -160,6 +162,73 @@ class TestSearchMemory:
         assert result == []
 
 
+@pytest.mark.skipif(MemoryService is None, reason="MemoryService not yet implemented")
+class TestRRFSearch:
+    """search_mode="rrf" fuses vector and full-text top-k lists."""
+
+    @pytest.mark.asyncio
+    async def test_rrf_mode_passes_candidate_counts(self, mock_supabase, mock_openai, mock_config):
+        mock_supabase.rpc = AsyncMock(return_value=[
+            {**_message_record("m1"), "similarity": 0.8, "rank": 0.0},
+            {**_message_record("m2"), "similarity": 0.1, "rank": 0.3},
+            {**_message_record("m3"), "similarity": 0.1, "rank": 0.0},
+        ])
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai, search_mode="rrf", rrf_k=30)
+        result = await svc.search_memory(
+            "Johnson", limit=3, query_embedding=[0.1], vector_candidates=100,
+        )
+
+        name, params = mock_supabase.rpc.await_args.args
+        assert name == "rrf_search_messages"
+        assert params["vector_count"] == 100
+        assert params["text_count"] == 40
+        assert params["rrf_k"] == 30
+        # Lexical matches survive a low cosine score; pure misses do not
+        assert [r["id"] for r in result] == ["m1", "m2"]
+
+    @pytest.mark.asyncio
+    async def test_rrf_tolerates_null_similarity(self, mock_supabase, mock_openai, mock_config):
+        # Rows stored without an embedding come back as text-only hits
+        mock_supabase.rpc = AsyncMock(return_value=[
+            {**_message_record("m1"), "similarity": None, "rank": 0.4},
+            {**_message_record("m2"), "similarity": None, "rank": 0.0},
+        ])
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai, search_mode="rrf")
+        result = await svc.search_memory("Johnson", query_embedding=[0.1])
+
+        assert [r["id"] for r in result] == ["m1"]
+
+    @pytest.mark.asyncio
+    async def test_mode_override_per_call(self, mock_supabase, mock_openai, mock_config):
+        mock_supabase.rpc = AsyncMock(return_value=[])
+        mock_supabase.embedding_search = AsyncMock(return_value=[])
+        mock_supabase.select = AsyncMock(return_value=[])
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai)
+        await svc.search_memory("x", query_embedding=[0.1], mode="rrf")
+
+        assert mock_supabase.rpc.await_args.args[0] == "rrf_search_messages"
+
+    def test_invalid_mode_rejected(self, mock_supabase, mock_openai, mock_config):
+        with pytest.raises(ValueError):
+            MemoryService(db=mock_supabase, llm=mock_openai, search_mode="bm25")
+
+    @pytest.mark.asyncio
+    async def test_text_fallback_uses_tsvector_filter(self, mock_supabase, mock_openai, mock_config):
+        mock_supabase.rpc = AsyncMock(return_value=None)
+        mock_supabase.embedding_search = AsyncMock(return_value=[])
+        mock_supabase.select = AsyncMock(return_value=[_message_record("m1")])
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai)
+        result = await svc.search_memory("Johnson timeline", query_embedding=[0.1])
+
+        assert [r["id"] for r in result] == ["m1"]
+        filters = mock_supabase.select.await_args.kwargs["filters"]
+        assert filters == {"content_tsv__search": "Johnson timeline"}
+
+
 @pytest.mark.skipif(MemoryService is None, reason="MemoryService not yet implemented")
 class TestGetRecentMessages:
     """get_recent_messages returns the correct number of recent messages."""
@@ -209,3 +278,134 @@ class TestEmptyHistory:
         result = await svc.search_memory("anything")
 
         assert result == []
+
+
+@pytest.mark.skipif(MemoryService is None, reason="MemoryService not yet implemented")
+class TestPrecomputedEmbedding:
+    """Callers can pass an embedding they already computed."""
+
+    @pytest.mark.asyncio
+    async def test_store_message_skips_embed_with_embedding(self, mock_supabase, mock_openai, mock_config):
+        mock_supabase.insert = AsyncMock(return_value=_message_record())
+        mock_openai.embed = AsyncMock(return_value=_mock_embedding())
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai)
+        await svc.store_message("user", "hello", "telegram_text", embedding=[0.5] * 3)
+
+        mock_openai.embed.assert_not_called()
+        data = mock_supabase.insert.call_args[0][1]
+        assert data["embedding"] == [0.5] * 3
+
+    @pytest.mark.asyncio
+    async def test_search_memory_skips_embed_with_query_embedding(self, mock_supabase, mock_openai, mock_config):
+        mock_supabase.rpc = AsyncMock(return_value=[_message_record()])
+        mock_openai.embed = AsyncMock(return_value=_mock_embedding())
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai)
+        results = await svc.search_memory("schedule", query_embedding=[0.5] * 3)
+
+        assert len(results) == 1
+        mock_openai.embed.assert_not_called()
+        assert mock_supabase.rpc.call_args[0][1]["query_embedding"] == [0.5] * 3
+
+    @pytest.mark.asyncio
+    async def test_failed_embed_is_not_retried(self, mock_supabase, mock_openai, mock_config):
+        mock_openai.embed = AsyncMock(side_effect=RuntimeError("api down"))
+        mock_supabase.insert = AsyncMock(return_value=_message_record())
+        mock_supabase.select = AsyncMock(return_value=[_message_record()])
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai)
+        embedding = await svc.embed_text("hello")
+        await svc.store_message("user", "hello", embedding=embedding)
+        results = await svc.search_memory("hello", query_embedding=embedding)
+
+        assert embedding == []
+        assert mock_openai.embed.await_count == 1
+        assert "embedding" not in mock_supabase.insert.call_args[0][1]
+        assert len(results) == 1
+
+
+@pytest.mark.skipif(MemoryService is None, reason="MemoryService not yet implemented")
+class TestDeferredStorage:
+    """prepare_message / store_messages and the pending-row overlay."""
+
+    @pytest.mark.asyncio
+    async def test_store_messages_batches_embeddings(self, mock_supabase, mock_openai, mock_config):
+        mock_openai.embed_many = AsyncMock(return_value=[[0.3] * 3])
+        mock_supabase.insert_many = AsyncMock(
+            side_effect=lambda table, rows: {"rows": rows, "failed": []}
+        )
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai)
+        user = svc.prepare_message("user", "hi", "telegram_text", embedding=[0.5] * 3)
+        reply = svc.prepare_message("assistant", "hello!", "desktop_text")
+        # Embedding already failed for this one; it is stored without a vector
+        unembedded = svc.prepare_message("user", "again", "telegram_text", embedding=[])
+        stored = await svc.store_messages([user, reply, unembedded])
+
+        mock_openai.embed_many.assert_awaited_once_with(["hello!"])
+        assert [r["embedding"] for r in stored] == [[0.5] * 3, [0.3] * 3, None]
+        assert reply["source"] == "system"
+        assert user["created_at"] <= reply["created_at"]
+
+    @pytest.mark.asyncio
+    async def test_rejected_rows_retried_with_system_source(self, mock_supabase, mock_openai, mock_config):
+        mock_openai.embed_many = AsyncMock(return_value=[[0.3] * 3])
+        row = None
+
+        async def insert_many(table, rows):
+            if rows[0]["source"] != "system":
+                return {"rows": [], "failed": [{"index": 0, "row": rows[0], "error": "check"}]}
+            return {"rows": rows, "failed": []}
+
+        mock_supabase.insert_many = AsyncMock(side_effect=insert_many)
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai)
+        row = svc.prepare_message("user", "hi", "telegram_voice")
+        stored = await svc.store_messages([row])
+
+        assert len(stored) == 1
+        assert stored[0]["source"] == "system"
+        assert mock_supabase.insert_many.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_recent_messages_include_pending(self, mock_supabase, mock_openai, mock_config):
+        stored = _message_record("m1", "user", "Earlier")
+        mock_supabase.select = AsyncMock(return_value=[stored])
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai)
+        row = svc.prepare_message("user", "Not flushed yet", "telegram_text", embedding=[0.1])
+        svc.add_pending(row)
+
+        result = await svc.get_recent_messages(limit=20)
+
+        assert [m["content"] for m in result] == ["Earlier", "Not flushed yet"]
+        assert "embedding" not in result[1]
+
+        # Once stored, the overlay no longer supplies the row
+        mock_supabase.insert_many = AsyncMock(return_value={"rows": [row], "failed": []})
+        await svc.store_messages([row])
+        assert svc.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_overlay_respects_limit(self, mock_supabase, mock_openai, mock_config):
+        mock_supabase.select = AsyncMock(return_value=[_message_record("m1")])
+
+        svc = MemoryService(db=mock_supabase, llm=mock_openai)
+        for text in ("one", "two"):
+            svc.add_pending(svc.prepare_message("user", text, embedding=[0.1]))
+
+        result = await svc.get_recent_messages(limit=2)
+
+        assert [m["content"] for m in result] == ["one", "two"]
+
+
+def test_merge_context_messages_dedupes_and_excludes():
+    from src.services.memory_service import merge_context_messages
+
+    recent = [_message_record("a"), _message_record("current")]
+    hits = [_message_record("old"), _message_record("a"), _message_record("current")]
+
+    merged = merge_context_messages(recent, hits, exclude_ids=["current"])
+
+    assert [m["id"] for m in merged] == ["old", "a"]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -19,7 +20,10 @@ def base_message() -> ChannelMessage:
 @pytest.fixture
 def memory_mock() -> MagicMock:
     mock = MagicMock()
-    mock.store_message = AsyncMock()
+    mock.embed_text = AsyncMock(return_value=[0.1, 0.2, 0.3])
+    mock.store_message = AsyncMock(return_value={"id": "current"})
+    mock.get_recent_messages = AsyncMock(return_value=[])
+    mock.search_memory = AsyncMock(return_value=[])
     mock.get_context_messages = AsyncMock(return_value=[])
     return mock
 
@@ -124,7 +128,9 @@ async def test_process_non_tool_path_stores_user_and_assistant(
 
     assert result == "assistant reply"
     assert memory_mock.store_message.await_count == 2
-    memory_mock.store_message.assert_any_await("user", "hello", "telegram_text")
+    memory_mock.store_message.assert_any_await(
+        "user", "hello", "telegram_text", embedding=[0.1, 0.2, 0.3]
+    )
     memory_mock.store_message.assert_any_await("assistant", "assistant reply", "telegram_text")
 
 
@@ -304,3 +310,344 @@ def test_build_system_prompt_falls_back_without_memory_files(mock_config, memory
     assert mock_config.elevenlabs.agent_name in prompt
     assert mock_config.client.name in prompt
     assert "Always confirm before sending emails" in prompt
+
+
+@pytest.mark.asyncio
+async def test_process_embeds_once_and_shares_vector(
+    mock_config,
+    base_message,
+    memory_mock,
+    tool_registry_mock,
+    llm_mock,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(processor_module, "sanitize_text", lambda text, max_length=4096: text)
+    monkeypatch.setattr(processor_module, "detect_prompt_injection", lambda text: False)
+
+    processor = MessageProcessor(
+        config=mock_config,
+        llm=llm_mock,
+        memory=memory_mock,
+        tool_registry=tool_registry_mock,
+    )
+
+    await processor.process(base_message)
+
+    memory_mock.embed_text.assert_awaited_once_with("hello")
+    memory_mock.search_memory.assert_awaited_once_with(
+        "hello",
+        limit=processor_module.MEMORY_FETCH_LIMIT,
+        query_embedding=[0.1, 0.2, 0.3],
+    )
+    memory_mock.get_recent_messages.assert_awaited_once_with(
+        limit=processor_module.RECENT_FETCH_LIMIT
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_runs_context_stages_concurrently(
+    mock_config,
+    base_message,
+    memory_mock,
+    tool_registry_mock,
+    llm_mock,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(processor_module, "sanitize_text", lambda text, max_length=4096: text)
+    monkeypatch.setattr(processor_module, "detect_prompt_injection", lambda text: False)
+
+    async def slow_recent(limit: int = 20) -> list:
+        await asyncio.sleep(0.05)
+        return []
+
+    async def slow_criteria(**kwargs) -> list[str]:
+        await asyncio.sleep(0.05)
+        return ["criterion"]
+
+    memory_mock.get_recent_messages = AsyncMock(side_effect=slow_recent)
+    isc_mock = MagicMock()
+    isc_mock.should_generate_isc = AsyncMock(return_value=True)
+    isc_mock.generate_criteria = AsyncMock(side_effect=slow_criteria)
+
+    processor = MessageProcessor(
+        config=mock_config,
+        llm=llm_mock,
+        memory=memory_mock,
+        tool_registry=tool_registry_mock,
+        isc_service=isc_mock,
+    )
+
+    await processor.process(base_message)
+
+    timings = processor.last_stage_timings
+    assert {"embed", "store", "memory_search", "recent_history", "isc"} <= set(timings)
+    # Two 50ms stages overlapped rather than running back to back
+    assert timings["context_total"] < 95
+
+
+@pytest.mark.asyncio
+async def test_process_excludes_current_turn_and_survives_stage_failure(
+    mock_config,
+    base_message,
+    memory_mock,
+    tool_registry_mock,
+    llm_mock,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(processor_module, "sanitize_text", lambda text, max_length=4096: text)
+    monkeypatch.setattr(processor_module, "detect_prompt_injection", lambda text: False)
+    monkeypatch.setattr(processor_module, "wrap_user_input", lambda text: text)
+
+    memory_mock.get_recent_messages = AsyncMock(return_value=[
+        {"id": "older", "role": "assistant", "content": "earlier reply"},
+        {"id": "current", "role": "user", "content": "hello"},
+    ])
+    memory_mock.search_memory = AsyncMock(side_effect=RuntimeError("rpc down"))
+
+    processor = MessageProcessor(
+        config=mock_config,
+        llm=llm_mock,
+        memory=memory_mock,
+        tool_registry=tool_registry_mock,
+    )
+
+    result = await processor.process(base_message)
+
+    assert result == "ok"
+    sent = llm_mock.chat.await_args.kwargs["messages"]
+    assert [m["content"] for m in sent[1:]] == ["earlier reply", "hello"]
+
+
+@pytest.mark.asyncio
+async def test_process_streams_partials_when_callback_given(
+    mock_config,
+    base_message,
+    memory_mock,
+    tool_registry_mock,
+    llm_mock,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(processor_module, "sanitize_text", lambda text, max_length=4096: text)
+    monkeypatch.setattr(processor_module, "detect_prompt_injection", lambda text: False)
+
+    async def fake_stream(**kwargs):
+        yield {"type": "text", "text": "Hel"}
+        yield {"type": "text", "text": "lo!"}
+        yield {"type": "done", "response": {"content": "Hello!", "tool_calls": []}}
+
+    llm_mock.chat_stream = fake_stream
+    partials: list[str] = []
+
+    async def on_partial(text: str) -> None:
+        partials.append(text)
+
+    processor = MessageProcessor(
+        config=mock_config,
+        llm=llm_mock,
+        memory=memory_mock,
+        tool_registry=tool_registry_mock,
+    )
+
+    result = await processor.process(base_message, on_partial=on_partial)
+
+    assert result == "Hello!"
+    assert partials == ["Hel", "Hello!"]
+    llm_mock.chat.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_voice_marker_covers_only_reply_rounds(
+    mock_config,
+    base_message,
+    memory_mock,
+    tool_registry_mock,
+    llm_mock,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    from src.llm.router import in_voice_request
+
+    monkeypatch.setattr(processor_module, "sanitize_text", lambda text, max_length=4096: text)
+    monkeypatch.setattr(processor_module, "detect_prompt_injection", lambda text: False)
+
+    seen: dict[str, bool] = {}
+
+    async def reply(**kwargs):
+        seen["reply"] = in_voice_request()
+        return {"content": "ok", "tool_calls": []}
+
+    async def generate_criteria(**kwargs):
+        seen["isc"] = in_voice_request()
+        return []
+
+    isc = MagicMock()
+    isc.should_generate_isc = AsyncMock(return_value=True)
+    isc.generate_criteria = AsyncMock(side_effect=generate_criteria)
+    llm_mock.chat = AsyncMock(side_effect=reply)
+
+    processor = MessageProcessor(
+        config=mock_config,
+        llm=llm_mock,
+        memory=memory_mock,
+        tool_registry=tool_registry_mock,
+        isc_service=isc,
+    )
+
+    await processor.process(base_message, voice=True)
+
+    assert seen == {"reply": True, "isc": False}
+
+
+@pytest.mark.asyncio
+async def test_process_packs_history_into_token_budget(
+    mock_config,
+    base_message,
+    memory_mock,
+    tool_registry_mock,
+    llm_mock,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(processor_module, "sanitize_text", lambda text, max_length=4096: text)
+    monkeypatch.setattr(processor_module, "detect_prompt_injection", lambda text: False)
+    monkeypatch.setattr(processor_module, "wrap_user_input", lambda text: text)
+
+    memory_mock.get_recent_messages = AsyncMock(return_value=[
+        {"id": f"m{i}", "role": "user", "content": f"turn {i}", "token_count": 400}
+        for i in range(10)
+    ])
+    llm_mock.context_token_budget = 2000
+
+    processor = MessageProcessor(
+        config=mock_config,
+        llm=llm_mock,
+        memory=memory_mock,
+        tool_registry=tool_registry_mock,
+    )
+
+    await processor.process(base_message)
+
+    sent = llm_mock.chat.await_args.kwargs["messages"]
+    history = [m["content"] for m in sent[1:-1]]
+    assert history and len(history) < 10
+    # The newest turns are the ones kept
+    assert history[-1] == "turn 9"
+    assert sent[-1]["content"] == "hello"
+
+
+@pytest.mark.asyncio
+async def test_process_queues_writes_when_persistence_given(
+    mock_config,
+    base_message,
+    memory_mock,
+    tool_registry_mock,
+    llm_mock,
+    memory_files_mock,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(processor_module, "sanitize_text", lambda text, max_length=4096: text)
+    monkeypatch.setattr(processor_module, "detect_prompt_injection", lambda text: False)
+    monkeypatch.setattr(processor_module, "wrap_user_input", lambda text: text)
+
+    persistence = MagicMock()
+    persistence.enqueue_message = AsyncMock(return_value={"id": "queued"})
+    persistence.enqueue_daily_log = AsyncMock()
+    llm_mock.chat = AsyncMock(return_value={"content": "assistant reply", "tool_calls": []})
+
+    processor = MessageProcessor(
+        config=mock_config,
+        llm=llm_mock,
+        memory=memory_mock,
+        tool_registry=tool_registry_mock,
+        memory_files=memory_files_mock,
+        persistence=persistence,
+    )
+
+    result = await processor.process(base_message)
+
+    assert result == "assistant reply"
+    memory_mock.store_message.assert_not_called()
+    memory_files_mock.append_to_daily_log.assert_not_called()
+    persistence.enqueue_message.assert_any_await(
+        "user", "hello", "telegram_text", embedding=[0.1, 0.2, 0.3]
+    )
+    persistence.enqueue_message.assert_any_await("assistant", "assistant reply", "telegram_text")
+    assert [c.args[0] for c in persistence.enqueue_daily_log.await_args_list] == [
+        "user",
+        "assistant",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invoke_tools_runs_parallel_calls_concurrently_in_call_order(
+    mock_config,
+    memory_mock,
+    llm_mock,
+):
+    from src.tools.tool_registry import ToolRegistry
+
+    events: list[str] = []
+
+    def slow(name: str, delay: float):
+        async def run() -> str:
+            events.append(f"start {name}")
+            await asyncio.sleep(delay)
+            events.append(f"end {name}")
+            return name
+        return run
+
+    tools = ToolRegistry()
+    tools.register_tool("calendar", slow("calendar", 0.05), "calendar")
+    tools.register_tool("weather", slow("weather", 0.01), "weather")
+    tools.register_tool("send_email", slow("send_email", 0), "send", parallel=False)
+    tools.register_tool("tasks", slow("tasks", 0), "tasks")
+
+    processor = MessageProcessor(
+        config=mock_config,
+        llm=llm_mock,
+        memory=memory_mock,
+        tool_registry=tools,
+    )
+
+    results = await processor._invoke_tools(
+        [("calendar", {}), ("weather", {}), ("send_email", {}), ("tasks", {})]
+    )
+
+    assert results == ["calendar", "weather", "send_email", "tasks"]
+    # calendar and weather overlap; send_email waits for both and runs alone
+    assert events[:2] == ["start calendar", "start weather"]
+    assert events.index("start send_email") > events.index("end calendar")
+    assert events.index("start tasks") > events.index("end send_email")
+
+
+@pytest.mark.asyncio
+async def test_invoke_tools_bounded_concurrency(
+    mock_config,
+    memory_mock,
+    tool_registry_mock,
+    llm_mock,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(processor_module, "MAX_PARALLEL_TOOLS", 2)
+    running = 0
+    peak = 0
+
+    async def invoke(name: str, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return f"{name}:{kwargs['n']}"
+
+    tool_registry_mock.invoke = AsyncMock(side_effect=invoke)
+    tool_registry_mock.is_parallel_safe.return_value = True
+    processor = MessageProcessor(
+        config=mock_config,
+        llm=llm_mock,
+        memory=memory_mock,
+        tool_registry=tool_registry_mock,
+    )
+
+    results = await processor._invoke_tools([("t", {"n": i}) for i in range(5)])
+
+    assert results == [f"t:{i}" for i in range(5)]
+    assert peak == 2
@@ -5,6 +5,7 @@ All Supabase calls are mocked.  Covers:
 - Read (list) notes
 - Update note
 - Delete note
+- Search notes with an escaped ILIKE filter
 - Handles null/missing fields
 """
 
@@ -144,6 +145,23 @@ class TestDeleteNote:
         mock_supabase.table.return_value.delete.assert_called_once()
 
 
+@pytest.mark.skipif(NoteService is None, reason="NoteService not yet implemented")
+class TestSearchNotes:
+    """search_notes matches title or content in the database."""
+
+    @pytest.mark.asyncio
+    async def test_search_uses_or_ilike_filter(self, mock_supabase, mock_config):
+        mock_supabase.select = AsyncMock(return_value=[_note_record()])
+
+        svc = NoteService(mock_supabase)
+        result = await svc.search_notes("  50%_off ")
+
+        assert len(result) == 1
+        filters = mock_supabase.select.await_args.kwargs["filters"]
+        pattern = "%50\\%\\_off%"
+        assert filters == {"or": [{"title__ilike": pattern}, {"content__ilike": pattern}]}
+
+
 @pytest.mark.skipif(NoteService is None, reason="NoteService not yet implemented")
 class TestNullHandling:
     """Handles null/missing fields in note records."""
@@ -0,0 +1,127 @@
+"""Tests for src/services/persistence_queue.py — write-behind persistence.
+
+Covers:
+- Queued messages are written in one batch and become visible meanwhile
+- Daily-log entries are written in order with their original timestamps
+- close() flushes outstanding writes
+- Writes happen inline when the worker is not running
+- A failing batch does not stop the worker
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.memory_service import MemoryService
+from src.services.persistence_queue import PersistenceQueue
+
+
+def _memory(insert_many=None) -> MemoryService:
+    db = MagicMock()
+    db.select = AsyncMock(return_value=[])
+    db.insert_many = insert_many or AsyncMock(
+        side_effect=lambda table, rows: {"rows": list(rows), "failed": []}
+    )
+    llm = MagicMock()
+    llm.embed_many = AsyncMock(side_effect=lambda texts: [[0.1] for _ in texts])
+    return MemoryService(db=db, llm=llm)
+
+
+@pytest.mark.asyncio
+async def test_messages_batched_and_visible_before_flush():
+    memory = _memory()
+    queue = PersistenceQueue(memory, flush_interval=0.05)
+    queue.start()
+
+    user = await queue.enqueue_message("user", "hi", embedding=[0.5])
+    await queue.enqueue_message("assistant", "hello")
+
+    recent = await memory.get_recent_messages(limit=10)
+    assert [m["content"] for m in recent] == ["hi", "hello"]
+    assert recent[0]["id"] == user["id"]
+
+    await queue.flush()
+
+    memory._db.insert_many.assert_awaited_once()
+    rows = memory._db.insert_many.await_args.args[1]
+    assert [r["content"] for r in rows] == ["hi", "hello"]
+    memory._llm.embed_many.assert_awaited_once_with(["hello"])
+    assert memory.pending_count == 0
+    assert queue.stats()["messages_written"] == 2
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_daily_log_written_in_order():
+    memory_files = MagicMock()
+    queue = PersistenceQueue(_memory(), memory_files=memory_files, flush_interval=0)
+    queue.start()
+
+    await queue.enqueue_daily_log("user", "hi")
+    await queue.enqueue_daily_log("assistant", "hello")
+    await queue.flush()
+
+    calls = memory_files.append_to_daily_log.call_args_list
+    assert [c.args[:2] for c in calls] == [("user", "hi"), ("assistant", "hello")]
+    assert calls[0].args[2] <= calls[1].args[2]
+    await queue.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_outstanding_writes():
+    memory = _memory()
+    queue = PersistenceQueue(memory, flush_interval=10)
+    queue.start()
+
+    await queue.enqueue_message("user", "hi", embedding=[0.5])
+    await queue.close()
+
+    memory._db.insert_many.assert_awaited_once()
+    assert not queue.running
+
+
+@pytest.mark.asyncio
+async def test_inline_writes_when_not_started():
+    memory = _memory()
+    memory_files = MagicMock()
+    queue = PersistenceQueue(memory, memory_files=memory_files)
+
+    row = await queue.enqueue_message("user", "hi", embedding=[0.5])
+    await queue.enqueue_daily_log("user", "hi")
+
+    assert row is not None
+    memory._db.insert_many.assert_awaited_once()
+    memory_files.append_to_daily_log.assert_called_once()
+    assert await queue.enqueue_message("user", "   ") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_does_not_stop_worker():
+    insert_many = AsyncMock(
+        side_effect=[RuntimeError("db down"), {"rows": [{"id": "x"}], "failed": []}]
+    )
+    memory = _memory(insert_many)
+    queue = PersistenceQueue(memory, flush_interval=0)
+    queue.start()
+
+    await queue.enqueue_message("user", "first", embedding=[0.5])
+    await queue.flush()
+    await queue.enqueue_message("user", "second", embedding=[0.5])
+    await queue.flush()
+
+    assert queue.running
+    stats = queue.stats()
+    assert stats["failed"] == 1
+    assert stats["messages_written"] == 1
+    assert memory.pending_count == 0
+    await queue.close()
+
+
+def test_invalid_sizes_rejected():
+    with pytest.raises(ValueError):
+        PersistenceQueue(_memory(), max_size=0)
+    with pytest.raises(ValueError):
+        PersistenceQueue(_memory(), batch_size=0)
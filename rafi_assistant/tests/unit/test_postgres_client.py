@@ -0,0 +1,225 @@
+"""Tests for src/db/postgres_client.py — the asyncpg database backend.
+
+The asyncpg pool is faked; SQL is checked as generated. Covers:
+- Binary pgvector encoding round-trips
+- Filter suffixes and OR groups translate to parameterized WHERE clauses
+- Identifiers are validated before being interpolated
+- insert/upsert/update/delete/select SQL and row shapes
+- Hot-path RPCs use fixed prepared SQL with defaults
+"""
+
+from __future__ import annotations
+
+import struct
+from decimal import Decimal
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.db.postgres_client import (
+    PostgresClient,
+    _decode_timestamp,
+    _insert_sql,
+    _where,
+    decode_vector,
+    encode_vector,
+)
+
+
+class _FakePool:
+    """Records queries and returns canned rows."""
+
+    def __init__(self, rows: list[dict[str, Any]] | None = None) -> None:
+        self.rows = rows if rows is not None else []
+        self.queries: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def fetch(self, sql: str, *args: Any) -> list[dict[str, Any]]:
+        self.queries.append((sql, args))
+        return self.rows
+
+
+def _client(rows: list[dict[str, Any]] | None = None) -> tuple[PostgresClient, _FakePool]:
+    db = PostgresClient(config=MagicMock())
+    pool = _FakePool(rows)
+    db._pool = pool
+    return db, pool
+
+
+def test_vector_round_trip():
+    data = encode_vector([0.5, -1.0, 2.25])
+
+    assert struct.unpack("!HH", data[:4]) == (3, 0)
+    assert len(data) == 4 + 3 * 4
+    assert decode_vector(data) == [0.5, -1.0, 2.25]
+    assert decode_vector(encode_vector("[1, 2]")) == [1.0, 2.0]
+
+
+def test_timestamp_decoded_as_iso():
+    assert _decode_timestamp("2026-10-16 12:00:00.5+00") == "2026-10-16T12:00:00.500000+00:00"
+    assert _decode_timestamp("infinity") == "infinity"
+
+
+def test_where_clause_from_filters():
+    args: list[Any] = []
+
+    sql = _where(
+        {
+            "reminded": False,
+            "start_time__gte": "2026-01-01",
+            "id__not_in": ["a", "b"],
+            "snoozed_until": None,
+        },
+        args,
+    )
+
+    assert sql == (
+        ' WHERE "reminded" = $1 AND "start_time" >= $2'
+        ' AND NOT ("id" = ANY($3)) AND "snoozed_until" IS NULL'
+    )
+    assert args == [False, "2026-01-01", ["a", "b"]]
+
+
+def test_or_groups_and_patterns():
+    args: list[Any] = []
+
+    sql = _where(
+        {
+            "status__in": ["pending"],
+            "or": [{"title__ilike": "%a%"}, {"due__isnull": False, "done__neq": None}],
+        },
+        args,
+    )
+
+    assert sql == (
+        ' WHERE "status" = ANY($1) AND (("title" ILIKE $2)'
+        ' OR ("due" IS NOT NULL AND "done" IS NOT NULL))'
+    )
+    assert args == [["pending"], "%a%"]
+
+
+def test_search_filter_uses_websearch_tsquery():
+    args: list[Any] = []
+
+    sql = _where({"content_tsv__search": "dog walk"}, args)
+
+    assert sql == " WHERE \"content_tsv\" @@ websearch_to_tsquery('english', $1)"
+    assert args == ["dog walk"]
+
+
+@pytest.mark.asyncio
+async def test_select_iter_orders_by_cursor_columns():
+    db, pool = _client([{"id": 1, "ts": "t"}])
+
+    pages = [page async for page in db.select_iter("t", order_by="ts", page_size=2)]
+
+    assert pages == [[{"id": 1, "ts": "t"}]]
+    assert pool.queries[0][0] == 'SELECT * FROM "t" ORDER BY "ts" ASC, "id" ASC LIMIT $1'
+
+
+def test_identifiers_validated():
+    with pytest.raises(ValueError):
+        _where({"id; DROP TABLE messages": 1}, [])
+
+
+def test_upsert_sql_uses_defaults_for_missing_keys():
+    args: list[Any] = []
+
+    sql = _insert_sql("t", [{"k": 1, "a": 2}, {"k": 3}], args, on_conflict="k")
+
+    assert sql == (
+        'INSERT INTO "t" ("k", "a") VALUES ($1, $2), ($3, DEFAULT)'
+        ' ON CONFLICT ("k") DO UPDATE SET "a" = EXCLUDED."a" RETURNING *'
+    )
+    assert args == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_select_builds_query_and_converts_rows():
+    db, pool = _client([{"id": "1", "score": Decimal("0.5")}])
+
+    rows = await db.select(
+        "messages",
+        columns="id, score",
+        filters={"role": "user"},
+        order_by="created_at",
+        limit=5,
+    )
+
+    assert rows == [{"id": "1", "score": 0.5}]
+    sql, args = pool.queries[0]
+    assert sql == (
+        'SELECT "id", "score" FROM "messages" WHERE "role" = $1'
+        ' ORDER BY "created_at" DESC LIMIT $2'
+    )
+    assert args == ("user", 5)
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete():
+    db, pool = _client([{"id": "1"}])
+
+    assert await db.update("tasks", {"id": "1"}, {"status": "done"}) == {"id": "1"}
+    assert await db.delete("tasks", {"id": "1"}) is True
+
+    assert pool.queries[0] == ('UPDATE "tasks" SET "status" = $1 WHERE "id" = $2 RETURNING *', ("done", "1"))
+    assert pool.queries[1] == ('DELETE FROM "tasks" WHERE "id" = $1 RETURNING 1', ("1",))
+
+
+@pytest.mark.asyncio
+async def test_unfiltered_delete_refused():
+    db, pool = _client()
+
+    assert await db.delete("tasks", {}) is False
+    assert pool.queries == []
+
+
+@pytest.mark.asyncio
+async def test_hot_rpcs_use_prepared_sql():
+    db, pool = _client([{"id": "1", "similarity": 0.9}])
+
+    result = await db.rpc(
+        "hybrid_search_messages",
+        {"query_embedding": [0.1], "query_text": "dogs", "match_count": 3},
+    )
+
+    assert result == [{"id": "1", "similarity": 0.9}]
+    assert pool.queries[0] == (
+        "SELECT * FROM hybrid_search_messages($1, $2, $3, $4)",
+        ([0.1], "dogs", 3, 0.5),
+    )
+
+
+@pytest.mark.asyncio
+async def test_rrf_rpc_fills_candidate_defaults():
+    db, pool = _client([])
+
+    await db.rpc(
+        "rrf_search_messages",
+        {"query_embedding": [0.1], "query_text": "dogs", "match_count": 3, "vector_count": 80},
+    )
+
+    assert pool.queries[0] == (
+        "SELECT * FROM rrf_search_messages($1, $2, $3, $4, $5, $6)",
+        ([0.1], "dogs", 3, 80, 40, 60),
+    )
+
+
+@pytest.mark.asyncio
+async def test_other_rpcs_use_named_arguments():
+    db, pool = _client([])
+
+    await db.rpc("cleanup", {"days": 30})
+
+    assert pool.queries[0] == ('SELECT * FROM "cleanup"("days" => $1)', (30,))
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_single_statement():
+    db, pool = _client([{"k": 1}, {"k": 2}])
+
+    result = await db.upsert_many("t", [{"k": 1}, {"k": 2}], on_conflict="k")
+
+    assert len(pool.queries) == 1
+    assert "ON CONFLICT (\"k\") DO NOTHING" in pool.queries[0][0]
+    assert result["failed"] == []
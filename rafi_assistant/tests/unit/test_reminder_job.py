@@ -0,0 +1,177 @@
+"""Tests for src/scheduling/reminder_job.py and timer_heap.py — event reminders.
+
+Database and Twilio calls are mocked; timers use short real delays. Covers:
+- TimerHeap fires in time order, replaces and cancels keyed timers
+- Fire times: lead time before start, pending snooze, none when reminded/past
+- load() schedules from events_cache; apply_sync() applies full and incremental syncs
+- snooze_reminder() persists snoozed_until and re-arms the timer
+- A due reminder is delivered and marked reminded
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.scheduling.reminder_job import ReminderJob
+from src.scheduling.timer_heap import TimerHeap
+
+
+def _in(seconds: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+def _event(event_id: str, start: datetime, **extra: Any) -> dict[str, Any]:
+    return {
+        "id": event_id,
+        "summary": f"Event {event_id}",
+        "start_time": start.isoformat(),
+        "reminded": False,
+        **extra,
+    }
+
+
+def _job(db: MagicMock | None = None, lead: int = 15) -> ReminderJob:
+    twilio = MagicMock()
+    twilio.initiate_outbound_call = AsyncMock(return_value="CA123")
+    return ReminderJob(
+        supabase_client=db or MagicMock(),
+        twilio_handler=twilio,
+        reminder_lead_minutes=lead,
+        quiet_hours_start="00:00",
+        quiet_hours_end="00:00",
+        timezone="UTC",
+    )
+
+
+@pytest.mark.asyncio
+async def test_timer_heap_fires_in_order_and_honours_cancel():
+    fired: list[str] = []
+
+    async def callback(key: str, payload: Any) -> None:
+        fired.append(key)
+
+    timers = TimerHeap(callback)
+    timers.start()
+    timers.schedule("b", _in(0.04))
+    timers.schedule("a", _in(0.02))
+    timers.schedule("c", _in(0.03))
+    timers.cancel("c")
+    # Rescheduling replaces the earlier timer for the key
+    timers.schedule("a", _in(0.05))
+
+    await asyncio.sleep(0.15)
+    await timers.stop()
+
+    assert fired == ["b", "a"]
+    assert len(timers) == 0
+    assert timers.stats()["fired"] == 2
+
+
+@pytest.mark.asyncio
+async def test_timer_heap_wakes_for_earlier_timer():
+    fired: list[str] = []
+
+    async def callback(key: str, payload: Any) -> None:
+        fired.append(key)
+
+    timers = TimerHeap(callback)
+    timers.start()
+    timers.schedule("later", _in(60))
+    await asyncio.sleep(0.01)
+    timers.schedule("soon", _in(0.01))
+
+    await asyncio.sleep(0.05)
+    await timers.stop()
+
+    assert fired == ["soon"]
+    assert timers.next_fire_time() is not None
+
+
+def test_fire_time_rules():
+    job = _job(lead=15)
+    start = _in(3600)
+
+    assert job._fire_time(_event("e", start)) == start - timedelta(minutes=15)
+    assert job._fire_time(_event("e", start, reminded=True)) is None
+    assert job._fire_time(_event("e", _in(-60))) is None
+    snoozed = _in(600)
+    assert job._fire_time(_event("e", _in(-60), snoozed_until=snoozed.isoformat())) == snoozed
+
+
+@pytest.mark.asyncio
+async def test_load_schedules_pending_events():
+    db = MagicMock()
+    db.select = AsyncMock(return_value=[_event("e1", _in(3600)), _event("e2", _in(7200))])
+    job = _job(db)
+
+    assert await job.load() == 2
+
+    filters = db.select.await_args.kwargs["filters"]
+    assert filters["reminded"] is False
+    assert [list(term) for term in filters["or"]] == [["start_time__gte"], ["snoozed_until__gte"]]
+
+
+def test_full_sync_replaces_timers():
+    job = _job()
+    job.schedule_event(_event("kept", _in(3600)))
+    job.schedule_event(_event("gone", _in(3600)))
+    job.schedule_event(_event("snoozed", _in(-60), snoozed_until=_in(300).isoformat()))
+
+    job.apply_sync(
+        [
+            _event("kept", _in(7200)),
+            _event("new", _in(3600)),
+            _event("done", _in(3600), reminded=True),
+        ],
+        full=True,
+    )
+
+    assert sorted(job._timers.keys()) == ["kept", "new", "snoozed"]
+
+
+def test_incremental_sync_drops_only_removed_events():
+    job = _job()
+    job.schedule_event(_event("a", _in(3600), google_event_id="g-a"))
+    job.schedule_event(_event("b", _in(3600), google_event_id="g-b"))
+
+    job.apply_sync([_event("c", _in(3600), google_event_id="g-c")], removed=["g-a"])
+
+    assert sorted(job._timers.keys()) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_snooze_rearms_timer():
+    db = MagicMock()
+    db.update = AsyncMock(return_value=None)
+    job = _job(db)
+    job.schedule_event(_event("e1", _in(60), reminded=True))
+
+    assert await job.snooze_reminder("e1", snooze_minutes=10) is True
+
+    table, filters, data = db.update.await_args.args
+    assert (table, filters, data["reminded"]) == ("events_cache", {"id": "e1"}, False)
+    fire_at = job._timers.next_fire_time()
+    assert fire_at is not None
+    assert timedelta(minutes=9) < fire_at - datetime.now(timezone.utc) <= timedelta(minutes=10)
+
+
+@pytest.mark.asyncio
+async def test_due_reminder_delivered_and_marked():
+    db = MagicMock()
+    db.update = AsyncMock(return_value={})
+    job = _job(db, lead=15)
+    # Starts in ten minutes: already inside the lead time, so it fires at once
+    job.schedule_event(_event("e1", _in(600)))
+
+    job._timers.start()
+    await asyncio.sleep(0.05)
+    await job.stop()
+
+    job._twilio.initiate_outbound_call.assert_awaited_once()
+    db.update.assert_awaited_once_with("events_cache", {"id": "e1"}, {"reminded": True})
+    assert job._events["e1"]["reminded"] is True
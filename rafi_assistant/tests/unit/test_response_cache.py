@@ -0,0 +1,128 @@
+"""Tests for src/llm/response_cache.py and its use in LLMManager.
+
+Uses a fake clock. Covers:
+- Keys are canonical: key order does not matter, sampling parameters do
+- Entries expire after their TTL and the least recently used is evicted
+- Cached responses are copies
+- LLMManager only caches calls inside cache_responses(), never error responses
+- Per-call-site hit metrics, and ISCService reusing a cached answer
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.llm.llm_manager import LLMManager
+from src.llm.response_cache import ResponseCache, cache_responses, response_cache_key
+from src.services.isc_service import ISCService
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+MESSAGES = [{"role": "user", "content": "extract insights"}]
+
+
+def test_key_is_canonical():
+    base = response_cache_key([{"role": "user", "content": "hi"}], None, 0.0, 500)
+
+    assert response_cache_key([{"content": "hi", "role": "user"}], [], 0.0, 500) == base
+    assert response_cache_key([{"role": "user", "content": "hi"}], None, 0.2, 500) != base
+    assert response_cache_key([{"role": "user", "content": "hi"}], None, 0.0, 800) != base
+
+
+def test_ttl_and_lru_eviction():
+    clock = FakeClock()
+    cache = ResponseCache(max_entries=2, clock=clock)
+    cache.put("a", {"content": "A"}, ttl_seconds=10)
+    cache.put("b", {"content": "B"}, ttl_seconds=100)
+    assert cache.get("a", "site") == {"content": "A"}  # a is now most recent
+
+    cache.put("c", {"content": "C"}, ttl_seconds=100)
+    assert cache.get("b", "site") is None
+
+    clock.now += 11
+    assert cache.get("a", "site") is None
+    assert cache.get("c", "site") == {"content": "C"}
+    stats = cache.stats()
+    assert (stats["evictions"], stats["expired"], stats["hits"], stats["misses"]) == (1, 1, 2, 2)
+
+
+def test_cached_response_is_a_copy():
+    cache = ResponseCache()
+    cache.put("k", {"content": "x", "tool_calls": []}, ttl_seconds=60)
+
+    cache.get("k", "site")["tool_calls"].append("mutated")
+
+    assert cache.get("k", "site")["tool_calls"] == []
+
+
+def _manager(provider: AsyncMock, clock: FakeClock | None = None) -> LLMManager:
+    return LLMManager(
+        providers={"openai": provider},
+        default="openai",
+        response_cache=ResponseCache(clock=clock or FakeClock()),
+    )
+
+
+def _provider(content: str = "answer") -> AsyncMock:
+    provider = AsyncMock()
+    provider.chat.return_value = {"role": "assistant", "content": content, "tool_calls": []}
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_manager_caches_only_opted_in_calls():
+    provider = _provider()
+    manager = _manager(provider)
+
+    await manager.chat(MESSAGES, temperature=0.2)
+    await manager.chat(MESSAGES, temperature=0.2)
+    assert provider.chat.await_count == 2
+
+    with cache_responses(60, "promotion"):
+        first = await manager.chat(MESSAGES, temperature=0.2)
+        second = await manager.chat(MESSAGES, temperature=0.2)
+
+    assert first == second
+    assert provider.chat.await_count == 3
+    assert manager.response_cache_stats["by_call_site"] == {"promotion": {"hits": 1, "misses": 1}}
+
+
+@pytest.mark.asyncio
+async def test_manager_expires_entries_and_skips_failures():
+    clock = FakeClock()
+    provider = AsyncMock()
+    provider.chat.side_effect = RuntimeError("down")
+    manager = _manager(provider, clock)
+
+    with cache_responses(60, "heartbeat"):
+        assert (await manager.chat(MESSAGES))["finish_reason"] == "error"
+        provider.chat.side_effect = None
+        provider.chat.return_value = {"role": "assistant", "content": "ok", "tool_calls": []}
+        assert (await manager.chat(MESSAGES))["content"] == "ok"
+        assert (await manager.chat(MESSAGES))["content"] == "ok"
+        clock.now += 61
+        await manager.chat(MESSAGES)
+
+    # Failure (not cached), miss, hit, miss after expiry
+    assert provider.chat.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_isc_generation_reuses_cached_answer():
+    provider = _provider('["Email sent to Bob"]')
+    isc = ISCService(llm=_manager(provider))
+
+    first = await isc.generate_criteria("email Bob the report", ["send_email"])
+    second = await isc.generate_criteria("email Bob the report", ["send_email"])
+
+    assert first == second == ["Email sent to Bob"]
+    assert provider.chat.await_count == 1
@@ -47,24 +47,15 @@ def test_setup_briefing_job_adds_job_with_callback(mock_config) -> None:
     assert kwargs["id"] == "morning_briefing"
 
 
-def test_setup_reminder_job_skips_without_callback(mock_config) -> None:
+def test_setup_jobs_does_not_poll_reminders(mock_config) -> None:
     scheduler = _make_scheduler(mock_config)
+    scheduler.set_briefing_callback(MagicMock())
+    scheduler.set_calendar_sync_callback(MagicMock())
 
-    scheduler._setup_reminder_job()
+    scheduler.setup_jobs()
 
-    scheduler._scheduler.add_job.assert_not_called()
-
-
-def test_setup_reminder_job_adds_job(mock_config) -> None:
-    scheduler = _make_scheduler(mock_config)
-    callback = MagicMock()
-    scheduler.set_reminder_callback(callback)
-
-    scheduler._setup_reminder_job()
-
-    scheduler._scheduler.add_job.assert_called_once()
-    kwargs = scheduler._scheduler.add_job.call_args.kwargs
-    assert kwargs["id"] == "reminder_check"
+    job_ids = [c.kwargs["id"] for c in scheduler._scheduler.add_job.call_args_list]
+    assert job_ids == ["morning_briefing", "calendar_sync"]
 
 
 def test_setup_calendar_sync_job_adds_job(mock_config) -> None:
@@ -0,0 +1,244 @@
+"""Tests for src/db/supabase_client.py — bulk writes and filter operators.
+
+The PostgREST query builder is mocked. Covers:
+- insert_many / upsert_many chunk rows into bulk requests
+- A rejected row is isolated by bisection and reported by index
+- Transport errors fail the whole chunk without bisecting
+- __in / __not_in filters on delete
+- isnull, ilike, full-text and OR-group filters, multi-column ordering
+- select_iter pages with a keyset cursor, and can raise on a failed page
+"""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from postgrest.exceptions import APIError
+
+from postgrest import AsyncPostgrestClient
+
+from src.db.supabase_client import SupabaseClient, _apply_filters, keyset_filter
+
+
+class _Table:
+    """Records bulk write payloads; rejects chunks containing a bad row."""
+
+    def __init__(self, bad_value: Any = None, error: Exception | None = None) -> None:
+        self.calls: list[list[dict[str, Any]]] = []
+        self.bad_value = bad_value
+        self.error = error
+        self.upsert_kwargs: dict[str, Any] = {}
+
+    def insert(self, rows: list[dict[str, Any]]) -> MagicMock:
+        return self._query(rows)
+
+    def upsert(self, rows: list[dict[str, Any]], **kwargs: Any) -> MagicMock:
+        self.upsert_kwargs = kwargs
+        return self._query(rows)
+
+    def _query(self, rows: list[dict[str, Any]]) -> MagicMock:
+        self.calls.append(rows)
+        query = MagicMock()
+        if self.error is not None:
+            query.execute = AsyncMock(side_effect=self.error)
+        elif any(row.get("v") == self.bad_value for row in rows):
+            query.execute = AsyncMock(side_effect=APIError({"message": "bad row", "code": "23502"}))
+        else:
+            query.execute = AsyncMock(return_value=MagicMock(data=list(rows)))
+        return query
+
+
+def _client(table: _Table) -> SupabaseClient:
+    db = SupabaseClient(config=MagicMock())
+    db._client = MagicMock()
+    db._client.table.return_value = table
+    return db
+
+
+@pytest.mark.asyncio
+async def test_insert_many_chunks_rows():
+    table = _Table()
+    db = _client(table)
+    rows = [{"v": i} for i in range(5)]
+
+    result = await db.insert_many("t", rows, chunk_size=2)
+
+    assert [len(c) for c in table.calls] == [2, 2, 1]
+    assert result["rows"] == rows
+    assert result["failed"] == []
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_passes_on_conflict():
+    table = _Table()
+    db = _client(table)
+
+    result = await db.upsert_many("t", [{"v": 1}, {"v": 2}], on_conflict="key")
+
+    assert len(table.calls) == 1
+    assert table.upsert_kwargs == {"on_conflict": "key"}
+    assert len(result["rows"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_bad_row_isolated_by_bisection():
+    table = _Table(bad_value=5)
+    db = _client(table)
+    rows = [{"v": i} for i in range(8)]
+
+    result = await db.insert_many("t", rows)
+
+    assert [f["index"] for f in result["failed"]] == [5]
+    assert result["failed"][0]["row"] == {"v": 5}
+    assert "bad row" in result["failed"][0]["error"]
+    assert [r["v"] for r in result["rows"]] == [0, 1, 2, 3, 4, 6, 7]
+
+
+@pytest.mark.asyncio
+async def test_transport_error_fails_chunk_without_bisecting():
+    table = _Table(error=ConnectionError("down"))
+    db = _client(table)
+
+    result = await db.insert_many("t", [{"v": i} for i in range(4)], chunk_size=4)
+
+    assert len(table.calls) == 1
+    assert [f["index"] for f in result["failed"]] == [0, 1, 2, 3]
+    assert result["rows"] == []
+
+
+@pytest.mark.asyncio
+async def test_empty_rows_make_no_requests():
+    table = _Table()
+    db = _client(table)
+
+    assert await db.upsert_many("t", []) == {"rows": [], "failed": []}
+    assert table.calls == []
+
+
+@pytest.mark.asyncio
+async def test_delete_with_in_filters():
+    db = SupabaseClient(config=MagicMock())
+    db._client = MagicMock()
+    query = db._client.table.return_value.delete.return_value
+    query.gte.return_value = query
+    query.not_.in_.return_value = query
+    query.execute = AsyncMock(return_value=MagicMock(data=[{"id": 1}]))
+
+    deleted = await db.delete("t", {"start__gte": "2026-01-01", "key__not_in": ["a", "b"]})
+
+    assert deleted is True
+    query.gte.assert_called_once_with("start", "2026-01-01")
+    query.not_.in_.assert_called_once_with("key", ["a", "b"])
+
+
+def _params(filters: dict[str, Any]) -> dict[str, list[str]]:
+    query = AsyncPostgrestClient("http://localhost").from_("t").select("*")
+    params = _apply_filters(query, filters).request.params
+    return {key: params.get_list(key) for key in params.keys() if key != "select"}
+
+
+def test_null_and_pattern_filters():
+    params = _params({"due__isnull": True, "done__isnull": False, "owner": None, "title__ilike": "%a%"})
+
+    assert params == {
+        "due": ["is.null"],
+        "done": ["not.is.null"],
+        "owner": ["is.null"],
+        "title": ["ilike.%a%"],
+    }
+
+
+def test_or_groups_render_logic_tree():
+    params = _params({
+        "status": "open",
+        "or": [
+            {"due__lt": "2026-01-01T00:00:00+00:00"},
+            {"priority__in": ["high", 'say "hi"'], "due__isnull": True},
+        ],
+    })
+
+    assert params["status"] == ["eq.open"]
+    assert params["or"] == [
+        '(due.lt."2026-01-01T00:00:00+00:00",'
+        'and(priority.in.("high","say \\"hi\\""),due.is.null))'
+    ]
+
+
+def test_search_filter_uses_websearch_syntax():
+    params = _params({
+        "content_tsv__search": "dog walk",
+        "or": [{"title_tsv__search": "cat"}, {"id": 1}],
+    })
+
+    assert params["content_tsv"] == ["wfts(english).dog walk"]
+    assert params["or"] == ['(title_tsv.wfts(english)."cat",id.eq."1")']
+
+
+def test_keyset_filter_breaks_ties_on_id():
+    assert keyset_filter("id", {"id": 5}, order_desc=False) == {"id__gt": 5}
+    assert keyset_filter("ts", {"ts": "t1", "id": 5}, order_desc=True) == {
+        "or__cursor": [{"ts__lt": "t1"}, {"ts": "t1", "id__lt": 5}]
+    }
+
+
+@pytest.mark.asyncio
+async def test_select_iter_pages_with_cursor():
+    rows = [{"id": i, "ts": f"t{i // 2}"} for i in range(5)]
+    db = SupabaseClient(config=MagicMock())
+    db.select = AsyncMock(side_effect=[rows[:2], rows[2:4], rows[4:]])
+
+    pages = [page async for page in db.select_iter("t", filters={"x": 1}, order_by="ts", page_size=2)]
+
+    assert pages == [rows[:2], rows[2:4], rows[4:]]
+    calls = db.select.await_args_list
+    assert calls[0].kwargs["filters"] == {"x": 1}
+    assert calls[0].kwargs["order_by"] == "ts,id"
+    assert calls[1].kwargs["filters"] == {
+        "x": 1,
+        "or__cursor": [{"ts__gt": "t0"}, {"ts": "t0", "id__gt": 1}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_select_iter_stops_on_empty_page():
+    db = SupabaseClient(config=MagicMock())
+    db.select = AsyncMock(side_effect=[[{"id": 1}, {"id": 2}], []])
+
+    pages = [page async for page in db.select_iter("t", page_size=2)]
+
+    assert pages == [[{"id": 1}, {"id": 2}]]
+    assert db.select.await_args_list[1].kwargs["filters"] == {"id__gt": 2}
+
+
+@pytest.mark.asyncio
+async def test_select_iter_raises_on_page_error_when_asked():
+    db = SupabaseClient(config=MagicMock())
+    db._select_rows = AsyncMock(side_effect=[[{"id": 1}, {"id": 2}], RuntimeError("timeout")])
+
+    pages = []
+    with pytest.raises(RuntimeError):
+        async for page in db.select_iter("t", page_size=2, raise_on_error=True):
+            pages.append(page)
+
+    assert pages == [[{"id": 1}, {"id": 2}]]
+
+
+@pytest.mark.asyncio
+async def test_select_orders_by_several_columns():
+    query = AsyncPostgrestClient("http://localhost").from_("t").select("*")
+    captured = {}
+
+    async def execute():
+        captured["order"] = query.request.params.get("order")
+        return MagicMock(data=[])
+
+    db = SupabaseClient(config=MagicMock())
+    db._client = MagicMock()
+    db._client.table.return_value.select.return_value = query
+    query.execute = execute
+
+    await db.select("t", order_by="ts, id", order_desc=False)
+
+    assert captured["order"] == "ts.asc,id.asc"
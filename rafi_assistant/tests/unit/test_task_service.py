@@ -7,6 +7,7 @@ All Supabase calls are mocked.  Covers:
 - update_task
 - delete_task
 - complete_task sets status correctly
+- get_pending_tasks / get_overdue_tasks filter in the database
 - Handles null/missing fields
 """
 
@@ -208,6 +209,38 @@ class TestCompleteTask:
         assert result is not None
 
 
+@pytest.mark.skipif(TaskService is None, reason="TaskService not yet implemented")
+class TestOpenTasks:
+    """Open and overdue task queries push their filters to the database."""
+
+    @pytest.mark.asyncio
+    async def test_get_pending_tasks_single_query(self, mock_supabase, mock_config):
+        mock_supabase.select = AsyncMock(return_value=[_task_record()])
+
+        svc = TaskService(mock_supabase)
+        result = await svc.get_pending_tasks()
+
+        assert len(result) == 1
+        mock_supabase.select.assert_awaited_once()
+        filters = mock_supabase.select.await_args.kwargs["filters"]
+        assert filters == {"status__in": ["pending", "in_progress"]}
+
+    @pytest.mark.asyncio
+    async def test_get_overdue_tasks_filters_due_date(self, mock_supabase, mock_config):
+        mock_supabase.select = AsyncMock(return_value=[_task_record()])
+
+        svc = TaskService(mock_supabase)
+        result = await svc.get_overdue_tasks()
+
+        assert len(result) == 1
+        kwargs = mock_supabase.select.await_args.kwargs
+        assert kwargs["filters"]["status__in"] == ["pending", "in_progress"]
+        cutoff = datetime.fromisoformat(kwargs["filters"]["due_date__lt"])
+        assert abs((datetime.now(timezone.utc) - cutoff).total_seconds()) < 60
+        assert kwargs["order_by"] == "due_date"
+        assert kwargs["order_desc"] is False
+
+
 @pytest.mark.skipif(TaskService is None, reason="TaskService not yet implemented")
 class TestNullHandling:
     """Handles null/missing fields gracefully."""
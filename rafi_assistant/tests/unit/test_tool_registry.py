@@ -125,3 +125,70 @@ async def test_get_openai_schemas_filters_none():
 
     schemas = tool_reg.get_openai_schemas()
     assert len(schemas) == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_invocation_timeout():
+    """Test that a slow async tool is abandoned after its timeout."""
+    import asyncio
+
+    registry = MagicMock()
+    registry.broadcast_tool_result = AsyncMock()
+    tool_reg = ToolRegistry(registry)
+
+    async def slow():
+        await asyncio.sleep(5)
+        return "late"
+
+    tool_reg.register_tool("slow", slow, "Slow tool", timeout=0.01)
+
+    result = await tool_reg.invoke("slow")
+
+    assert result == "Error executing slow: timed out after 0s"
+    registry.broadcast_tool_result.assert_awaited_once_with("slow", {"error": "timed out"})
+
+
+def test_is_parallel_safe():
+    """Test the parallel opt-out metadata."""
+    tool_reg = ToolRegistry()
+
+    tool_reg.register_tool("read", lambda: "", "desc")
+    tool_reg.register_tool("send", lambda: "", "desc", parallel=False)
+
+    assert tool_reg.is_parallel_safe("read")
+    assert not tool_reg.is_parallel_safe("send")
+    assert tool_reg.is_parallel_safe("unknown")
+
+
+@pytest.mark.asyncio
+async def test_sync_tool_runs_off_the_event_loop_with_timeout():
+    """Test that a slow sync tool neither blocks the loop nor outlives its timeout."""
+    import asyncio
+    import threading
+
+    tool_reg = ToolRegistry()
+    release = threading.Event()
+
+    def blocking():
+        release.wait(5)
+        return "late"
+
+    tool_reg.register_tool("blocking", blocking, "Blocking tool", timeout=0.05)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    try:
+        result = await tool_reg.invoke("blocking")
+    finally:
+        task.cancel()
+        release.set()
+
+    assert result == "Error executing blocking: timed out after 0s"
+    assert ticks > 1